@@ -0,0 +1,154 @@
+"""Benchmark the memory held by many parsed versions of one code.
+
+The corpus mimics the consolidated versions of a single code: every
+version repeats the articles of the previous one, changes a few of them
+and adds amendment notes. The versions are parsed once and pickled; the
+memory is measured while loading them back as separate parse results and
+into a ``DocumentCorpus``, so parsing does not slow down the tracing.
+Run with ``python benchmarks/bench_corpus_memory.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import pickle
+import time
+import tracemalloc
+from typing import Callable
+
+from leropa.parser import DocumentCorpus, ParseResult, parse_document
+
+# Function loading documents and returning what keeps them alive.
+Builder = Callable[[], object]
+
+
+def _article(index: int, version: int, changes: int) -> str:
+    """Build the markup of one article as it reads in a version.
+
+    Args:
+        index: Number of the article.
+        version: Number of the version.
+        changes: Number of versions between two changes of an article.
+
+    Returns:
+        Markup of the article.
+    """
+
+    # Each article is rewritten every ``changes`` versions and keeps one
+    # amendment note per rewrite.
+    revision = (version + index) // changes
+    notes = "".join(
+        f'<span class="S_PAR" id="id_note{index}_{r}">(la 01-01-20{r:02d}, '
+        f"Alin. (1) al art. {index} a fost modificat de art. I din LEGEA "
+        f"nr. {r} din 10 aprilie 2012, publicată în MONITORUL OFICIAL nr. "
+        f"{r * 3} din 17 aprilie 2012)</span>"
+        for r in range(revision)
+    )
+    return (
+        f'<span class="S_ART" id="id_art{index}">'
+        f'<span class="S_ART_TTL" id="id_art{index}_ttl">Articolul {index}'
+        f'</span><span class="S_ART_BDY" id="id_art{index}_bdy">'
+        f'<span class="S_ALN" id="id_aln{index}">'
+        f'<span class="S_ALN_TTL" id="id_aln{index}_ttl">(1)</span>'
+        f'<span class="S_ALN_BDY" id="id_aln{index}_bdy">Textul articolului '
+        f"{index}, în redactarea {revision}, privind obligațiile părților "
+        f"și termenele aplicabile acestora.{notes}</span></span>"
+        f'<span class="S_ALN" id="id_aln{index}b">'
+        f'<span class="S_ALN_TTL" id="id_aln{index}b_ttl">(2)</span>'
+        f'<span class="S_ALN_BDY" id="id_aln{index}b_bdy">Dispozițiile '
+        f"alin. (1) se aplică în mod corespunzător.</span></span>"
+        f"</span></span>"
+    )
+
+
+def build_versions(
+    versions: int, articles: int, changes: int
+) -> list[tuple[str, str]]:
+    """Build the pages of every version of a code.
+
+    Args:
+        versions: Number of consolidated versions.
+        articles: Number of articles in the code.
+        changes: Number of versions between two changes of an article.
+
+    Returns:
+        Version identifier and page of each version, oldest first.
+    """
+
+    pages = []
+    for version in range(versions):
+        body = "".join(
+            _article(index, version, changes)
+            for index in range(1, articles + 1)
+        )
+        html = (
+            "<html><head><title>CODUL CIVIL</title></head><body>"
+            f'<span class="S_CAP_TTL" id="id_cap1_ttl">Capitolul I</span>'
+            f'<span class="S_CAP_BDY" id="id_cap1_bdy">{body}</span>'
+            "</body></html>"
+        )
+        pages.append((str(1000 + version), html))
+    return pages
+
+
+def _measure(build: Builder) -> tuple[object, float]:
+    """Build documents and return the memory they keep alive.
+
+    Args:
+        build: Function loading the documents and holding them.
+
+    Returns:
+        What ``build`` returned and the size in mebibytes of the memory
+        allocated by it and still alive.
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    held = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held, size / 2**20
+
+
+def main() -> None:
+    """Run the benchmark and print the memory used."""
+
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--versions", type=int, default=50)
+    arg_parser.add_argument("--articles", type=int, default=200)
+    arg_parser.add_argument("--changes", type=int, default=10)
+    args = arg_parser.parse_args()
+
+    pages = build_versions(args.versions, args.articles, args.changes)
+    start = time.perf_counter()
+    dumps = [pickle.dumps(parse_document(html, v)) for v, html in pages]
+    parse_time = time.perf_counter() - start
+
+    def separate() -> list[ParseResult]:
+        return [pickle.loads(dump) for dump in dumps]
+
+    def shared() -> DocumentCorpus:
+        corpus = DocumentCorpus()
+        for dump in dumps:
+            corpus.add(pickle.loads(dump))
+        return corpus
+
+    _, separate_size = _measure(separate)
+    start = time.perf_counter()
+    corpus = shared()
+    add_time = time.perf_counter() - start
+    _, shared_size = _measure(shared)
+
+    print(f"{args.versions} versions of {args.articles} articles")
+    print(f"parse time:        {parse_time:.2f}s")
+    print(f"separate results:  {separate_size:.1f} MiB")
+    print(f"document corpus:   {shared_size:.1f} MiB")
+    print(f"reduction:         {separate_size / shared_size:.1f}x")
+    print(f"sharing time:      {add_time:.2f}s")
+    print(f"sharing:           {corpus.stats()}")
+
+
+if __name__ == "__main__":
+    main()
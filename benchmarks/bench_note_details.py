@@ -0,0 +1,165 @@
+"""Benchmark amendment note parsing on a note-heavy synthetic corpus.
+
+The corpus mimics the consolidated versions of a single law: every
+version repeats the notes of the previous one and adds a few new ones.
+Run with ``python benchmarks/bench_note_details.py``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from typing import Callable
+
+from leropa.parser.note_details import clear_note_cache, parse_note_details
+
+# Function turning a note text into its parsed fields.
+NoteParser = Callable[[str], dict[str, str | None]]
+
+# Months used to build dates in long form.
+_MONTHS = ("ianuarie", "aprilie", "iulie", "octombrie")
+
+
+def _reference_details(text: str) -> dict[str, str | None]:
+    """Parse a note with one uncompiled search per field.
+
+    This is the extraction used before the note-detail engine and serves
+    as the baseline.
+
+    Args:
+        text: Note text with normalized whitespace.
+
+    Returns:
+        Dictionary with parsed fields.
+    """
+
+    date_match = re.search(r"la (\d{2}[.-]\d{2}[.-]\d{4})", text)
+    subject_match = None
+    if date_match:
+        subject_match = re.search(r",\s*(.*?)\s+a fost", text)
+    law_match = re.search(
+        r"LEGEA nr\.\s*(\d+)\s+din\s+([0-9]{1,2} [a-zăâîșț]+ [0-9]{4})",
+        text,
+        re.IGNORECASE,
+    )
+    monitor_match = re.search(
+        r"MONITORUL OFICIAL nr\.\s*(\d+)\s+din\s+"
+        r"([0-9]{1,2} [a-zăâîșț]+ [0-9]{4})",
+        text,
+        re.IGNORECASE,
+    )
+    replace_match = re.search(
+        r'înlocuirea sintagmei "([^"]+)" cu sintagma "([^"]+)"',
+        text,
+        re.IGNORECASE,
+    )
+    return {
+        "date": date_match.group(1) if date_match else None,
+        "subject": subject_match.group(1) if subject_match else None,
+        "law_number": law_match.group(1) if law_match else None,
+        "law_date": law_match.group(2) if law_match else None,
+        "monitor_number": monitor_match.group(1) if monitor_match else None,
+        "monitor_date": monitor_match.group(2) if monitor_match else None,
+        "replaced": replace_match.group(1) if replace_match else None,
+        "replacement": replace_match.group(2) if replace_match else None,
+    }
+
+
+def _note(index: int) -> str:
+    """Build the text of a synthetic note.
+
+    Args:
+        index: Number of the note.
+
+    Returns:
+        Note text; one in four notes carries no amendment details.
+    """
+
+    if index % 4 == 3:
+        return f"Notă. Articolul {index} se aplică în mod corespunzător."
+    month = _MONTHS[index % len(_MONTHS)]
+    return (
+        f"(la {index % 28 + 1:02d}-0{index % 9 + 1}-20{index % 20:02d}, "
+        f"Alin. ({index % 5 + 1}) al art. {index} a fost modificat de "
+        f"art. I din LEGEA nr. {index} din {index % 28 + 1} {month} 2012, "
+        f"publicată în MONITORUL OFICIAL nr. {index * 3} din "
+        f"{index % 28 + 1} {month} 2012, prin înlocuirea sintagmei "
+        f'"termenul {index}" cu sintagma "termenul {index + 1}".)'
+    )
+
+
+def build_corpus(versions: int, notes: int, added: int) -> list[list[str]]:
+    """Build the note texts of every version of a document.
+
+    Args:
+        versions: Number of consolidated versions.
+        notes: Number of notes in the first version.
+        added: Number of notes each later version adds.
+
+    Returns:
+        Note texts of each version, oldest first.
+    """
+
+    return [
+        [_note(i) for i in range(notes + version * added)]
+        for version in range(versions)
+    ]
+
+
+def _run(parse: NoteParser, corpus: list[list[str]]) -> float:
+    """Parse every note of the corpus and return the elapsed time.
+
+    Args:
+        parse: Note parser to measure.
+        corpus: Note texts of each version.
+
+    Returns:
+        Elapsed time in seconds.
+    """
+
+    start = time.perf_counter()
+    for version in corpus:
+        for text in version:
+            parse(text)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark and print the timings."""
+
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--versions", type=int, default=50)
+    arg_parser.add_argument("--notes", type=int, default=2000)
+    arg_parser.add_argument("--added", type=int, default=20)
+    args = arg_parser.parse_args()
+
+    corpus = build_corpus(args.versions, args.notes, args.added)
+    total = sum(len(version) for version in corpus)
+
+    # The engine must agree with the reference on every note.
+    for text in corpus[-1]:
+        assert parse_note_details(text) == _reference_details(text), text
+
+    reference = _run(_reference_details, corpus)
+
+    # Without memoization: every note is parsed again in each version.
+    uncached = time.perf_counter()
+    for version in corpus:
+        clear_note_cache()
+        for text in version:
+            parse_note_details(text)
+    uncached = time.perf_counter() - uncached
+
+    clear_note_cache()
+    cached = _run(parse_note_details, corpus)
+
+    print(f"{total} notes in {args.versions} versions")
+    print(f"reference:          {reference:.3f}s")
+    print(f"compiled, uncached: {uncached:.3f}s")
+    print(f"compiled, memoized: {cached:.3f}s")
+    print(f"speedup:            {reference / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,450 @@
+"""Convert many documents in a process pool with a resumable manifest."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import multiprocessing
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+)
+
+from leropa.json_utils import json_dumps_line, json_loads
+from leropa.parser.article_path import ArticlePath
+from leropa.parser.engine import DEFAULT_ENGINE
+from leropa.parser.fetch_document import CACHE_DIR, fetch_html, parse_cached
+from leropa.parser.fetch_documents import DEFAULT_RATE, _Downloader
+from leropa.parser.fetcher import Fetcher
+from leropa.parser.iter_articles import iter_article_paths
+from leropa.parser.unstructure import unstructure
+from leropa.serialization import dumps
+from leropa.xlsx import write_workbook
+
+# Types for parsed documents and manifest records.
+JSONDict = Dict[str, Any]
+ManifestMap = Dict[str, JSONDict]
+
+# Output formats mapped to the extension of the files they produce. Both
+# line-delimited formats are JSON Lines: ``jsonl`` holds one article per
+# line with its location, ``document-jsonl`` the whole document.
+FORMAT_EXTENSIONS = {
+    "json": ".json",
+    "yaml": ".yaml",
+    "xlsx": ".xlsx",
+    "jsonl": ".jsonl",
+    "document-jsonl": ".document.jsonl",
+}
+
+# Sections of a parsed document written after its header by
+# ``document_lines``, with the record type of their entries.
+DOCUMENT_SECTIONS = (
+    ("articles", "article"),
+    ("books", "book"),
+    ("annexes", "annex"),
+)
+
+# Name of the manifest file inside the output directory.
+MANIFEST_NAME = "manifest.jsonl"
+
+
+def article_records(doc: JSONDict, html: str) -> Iterator[JSONDict]:
+    """Yield the articles of a parsed document with their location.
+
+    The location of each article is read from the spans enclosing it in
+    ``html``, with the same path builder as ``iter_articles``, so the
+    lines match the ones written by ``leropa convert --format jsonl``.
+
+    Args:
+        doc: Parsed document structure.
+        html: Page content the document was parsed from.
+
+    Yields:
+        Article dictionaries with an added ``path`` entry.
+    """
+
+    # Repeated identifiers are matched to their locations in order.
+    paths: Dict[str, deque[JSONDict]] = defaultdict(deque)
+    for article_id, path in iter_article_paths(html):
+        paths[article_id].append(unstructure(path))
+
+    for article in doc.get("articles", []):
+        record = dict(article)
+        queue = paths.get(article["article_id"])
+        record["path"] = (
+            queue.popleft() if queue else unstructure(ArticlePath())
+        )
+        yield record
+
+
+def document_lines(doc: JSONDict) -> Iterator[str]:
+    """Yield a whole parsed document as JSON Lines records.
+
+    The first record holds the document metadata; one record follows for
+    each article, book and annex. Every record is an object with a
+    ``type`` naming the section and the entry itself under ``data``, so
+    the document can be processed or rebuilt while it is being read.
+
+    Args:
+        doc: Parsed document structure.
+
+    Yields:
+        One compact JSON record per line, newline included.
+    """
+
+    header = {"type": "document", "data": doc.get("document")}
+    yield json_dumps_line(header) + "\n"
+    for key, record_type in DOCUMENT_SECTIONS:
+        for entry in doc.get(key, []):
+            record = {"type": record_type, "data": entry}
+            yield json_dumps_line(record) + "\n"
+
+
+def write_document(
+    doc: JSONDict,
+    target: Path,
+    output_format: str,
+    html: Optional[str] = None,
+) -> None:
+    """Write a parsed document to ``target``.
+
+    Args:
+        doc: Parsed document structure.
+        target: Output file.
+        output_format: One of the keys of ``FORMAT_EXTENSIONS``.
+        html: Page content the document was parsed from; required for
+            the ``jsonl`` format, which takes article locations from it.
+
+    Throws:
+        ValueError: If ``jsonl`` output is requested without ``html``.
+    """
+
+    if output_format == "xlsx":
+        write_workbook(doc, target)
+    elif output_format == "jsonl":
+        if html is None:
+            raise ValueError("The jsonl format needs the page HTML.")
+        records = article_records(doc, html)
+        lines = (json_dumps_line(r) + "\n" for r in records)
+        target.write_text("".join(lines), encoding="utf-8")
+    elif output_format == "document-jsonl":
+        with target.open("w", encoding="utf-8") as stream:
+            stream.writelines(document_lines(doc))
+    else:
+        target.write_bytes(dumps(doc, output_format))
+
+
+def _file_sha256(path: Path) -> str:
+    """Return the SHA-256 digest of a file.
+
+    Args:
+        path: File to hash.
+
+    Returns:
+        Hexadecimal digest of the file content.
+    """
+
+    digest = hashlib.sha256()
+    with path.open("rb") as stream:
+        while chunk := stream.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def convert_one(
+    ver_id: str,
+    out_dir: Path,
+    formats: List[str],
+    cache_dir: Optional[Path] = None,
+    engine: str = DEFAULT_ENGINE,
+    html: Optional[str] = None,
+) -> JSONDict:
+    """Fetch, parse and write one document in every requested format.
+
+    The document is parsed once and written in each format from the same
+    structure. Runs in the worker processes of ``run_batch``, which hands
+    over the page it downloaded.
+
+    Args:
+        ver_id: Identifier for the document version.
+        out_dir: Directory receiving the output files.
+        formats: Output formats to write.
+        cache_dir: Directory used for caching downloaded HTML files.
+        engine: Tree builder used to parse the HTML.
+        html: Page content; fetched through the cache when missing.
+
+    Returns:
+        Manifest record with the status, timings and written files.
+    """
+
+    record: JSONDict = {"ver_id": ver_id, "status": "ok", "error": None}
+    timings: Dict[str, float] = {}
+    outputs: Dict[str, JSONDict] = {}
+    start = time.perf_counter()
+    try:
+        if html is None:
+            html = fetch_html(ver_id, cache_dir)
+        timings["fetch"] = time.perf_counter() - start
+
+        mark = time.perf_counter()
+        doc = parse_cached(html, ver_id, cache_dir, engine)
+        timings["parse"] = time.perf_counter() - mark
+
+        mark = time.perf_counter()
+        for output_format in formats:
+            name = f"{ver_id}{FORMAT_EXTENSIONS[output_format]}"
+            write_document(doc, out_dir / name, output_format, html)
+            outputs[output_format] = {
+                "file": name,
+                "sha256": _file_sha256(out_dir / name),
+                "bytes": (out_dir / name).stat().st_size,
+            }
+        timings["write"] = time.perf_counter() - mark
+    except Exception as exc:
+        # Failures are recorded so the batch carries on with other ids.
+        record["status"] = "error"
+        record["error"] = f"{type(exc).__name__}: {exc}"
+
+    timings["total"] = time.perf_counter() - start
+    record["seconds"] = {k: round(v, 4) for k, v in timings.items()}
+    record["outputs"] = outputs
+    return record
+
+
+def read_manifest(path: Path) -> ManifestMap:
+    """Return the latest manifest record of each document.
+
+    Args:
+        path: Manifest file; a missing file yields no records.
+
+    Returns:
+        Records keyed by version identifier.
+    """
+
+    records: ManifestMap = {}
+    if not path.exists():
+        return records
+
+    with path.open(encoding="utf-8") as stream:
+        for line in stream:
+            # A line cut short by an interrupted run is ignored.
+            try:
+                record = json_loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and "ver_id" in record:
+                records[record["ver_id"]] = record
+    return records
+
+
+def is_done(record: JSONDict, formats: Iterable[str], out_dir: Path) -> bool:
+    """Return ``True`` if a document needs no further work.
+
+    Args:
+        record: Latest manifest record of the document.
+        formats: Output formats requested now.
+        out_dir: Directory holding the output files.
+
+    Returns:
+        Whether the document succeeded before in every requested format
+        and its files are still present with the recorded size.
+    """
+
+    if record.get("status") != "ok":
+        return False
+
+    outputs = record.get("outputs") or {}
+    for output_format in formats:
+        output = outputs.get(output_format)
+        if output is None:
+            return False
+        target = out_dir / output["file"]
+        if not target.exists() or target.stat().st_size != output["bytes"]:
+            return False
+    return True
+
+
+def read_ids(path: Path) -> List[str]:
+    """Read version identifiers from a text file.
+
+    Args:
+        path: File with one identifier per line; blank lines and lines
+            starting with ``#`` are skipped.
+
+    Returns:
+        Identifiers in file order without repetitions.
+    """
+
+    ids: Dict[str, None] = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            ids[line] = None
+    return list(ids)
+
+
+async def _convert_pending(
+    pending: List[str],
+    out_dir: Path,
+    formats: List[str],
+    executor: Executor,
+    downloader: _Downloader,
+    engine: str,
+) -> AsyncGenerator[JSONDict, None]:
+    """Download pages within the rate limit and convert them in workers.
+
+    Args:
+        pending: Identifiers of the documents to convert.
+        out_dir: Directory receiving the output files.
+        formats: Output formats to write for every document.
+        executor: Pool running ``convert_one``.
+        downloader: Rate-limited downloader shared by the whole batch.
+        engine: Tree builder used to parse the HTML.
+
+    Yields:
+        The manifest record of each document as soon as it finishes.
+    """
+
+    loop = asyncio.get_running_loop()
+
+    async def convert(ver_id: str) -> JSONDict:
+        """Download one page, then convert it in a worker process."""
+
+        start = time.perf_counter()
+        try:
+            html = await downloader.html(ver_id)
+        except Exception as exc:
+            # Failed downloads are recorded like failed conversions.
+            seconds = round(time.perf_counter() - start, 4)
+            return {
+                "ver_id": ver_id,
+                "status": "error",
+                "error": f"{type(exc).__name__}: {exc}",
+                "seconds": {"fetch": seconds, "total": seconds},
+                "outputs": {},
+            }
+        fetched = time.perf_counter() - start
+
+        record = await loop.run_in_executor(
+            executor,
+            convert_one,
+            ver_id,
+            out_dir,
+            formats,
+            downloader.cache_dir,
+            engine,
+            html,
+        )
+
+        # The worker only timed reading the page it was handed.
+        seconds = record["seconds"]
+        seconds["total"] = round(seconds["total"] + fetched, 4)
+        seconds["fetch"] = round(fetched, 4)
+        return record
+
+    tasks = [asyncio.ensure_future(convert(ver_id)) for ver_id in pending]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def run_batch(
+    ver_ids: Iterable[str],
+    out_dir: Path,
+    formats: List[str],
+    workers: Optional[int] = None,
+    cache_dir: Optional[Path] = None,
+    engine: str = DEFAULT_ENGINE,
+    resume: bool = True,
+    concurrency: int = 4,
+    rate: float = DEFAULT_RATE,
+    fetcher: Optional[Fetcher] = None,
+) -> Iterator[JSONDict]:
+    """Convert documents in a process pool, recording a manifest.
+
+    Pages are downloaded in this process, at most ``concurrency`` at a
+    time and no faster than ``rate`` per second and host, like in
+    ``fetch_documents``; cached pages skip the limit. Each page is handed
+    to one pool of worker processes shared by the whole batch, which
+    parses it and writes the outputs. Each finished document appends a
+    record to ``manifest.jsonl`` in the output directory, so an
+    interrupted batch can be restarted and skips documents that are
+    already done.
+
+    Args:
+        ver_ids: Identifiers of the document versions.
+        out_dir: Directory receiving the output files and the manifest.
+        formats: Output formats to write for every document.
+        workers: Number of worker processes; defaults to the CPU count.
+        cache_dir: Directory used for caching downloaded HTML files.
+        engine: Tree builder used to parse the HTML.
+        resume: Skip documents the manifest records as done.
+        concurrency: Maximum number of downloads in flight.
+        rate: Downloads started per second and per host.
+        fetcher: Downloader to use instead of a new pooled one.
+
+    Yields:
+        The manifest record of each document as soon as it finishes;
+        skipped documents are yielded first with ``status`` ``skipped``.
+    """
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST_NAME
+    done = read_manifest(manifest_path) if resume else {}
+
+    pending: List[str] = []
+    for ver_id in dict.fromkeys(ver_ids):
+        if ver_id in done and is_done(done[ver_id], formats, out_dir):
+            yield {"ver_id": ver_id, "status": "skipped"}
+        else:
+            pending.append(ver_id)
+    if not pending:
+        return
+
+    # Worker processes are spawned so they do not inherit threads or open
+    # connections of the caller.
+    executor = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    own_fetcher = fetcher is None
+    fetcher = fetcher or Fetcher(pool_size=concurrency)
+
+    # The downloads run on a private event loop driven one record at a
+    # time, so records are still handed out as they finish.
+    loop = asyncio.new_event_loop()
+    downloader = _Downloader(
+        fetcher, cache_dir or CACHE_DIR, concurrency, rate, burst=1
+    )
+    records = _convert_pending(
+        pending, out_dir, formats, executor, downloader, engine
+    )
+    try:
+        with manifest_path.open("a", encoding="utf-8") as manifest:
+            while True:
+                try:
+                    record = loop.run_until_complete(anext(records))
+                except StopAsyncIteration:
+                    break
+                manifest.write(json_dumps_line(record) + "\n")
+                manifest.flush()
+                yield record
+    finally:
+        loop.run_until_complete(records.aclose())
+        loop.close()
+        downloader.close()
+        executor.shutdown(wait=True, cancel_futures=True)
+        if own_fetcher:
+            fetcher.close()
@@ -1,3 +1,4 @@
+import asyncio
 import importlib
 import logging
 import subprocess
@@ -5,15 +6,23 @@ import sys
 from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
 from types import ModuleType
-from typing import Optional
+from typing import IO, Any, Optional
 
 import click
-import yaml  # type: ignore
 from dotenv import load_dotenv  # type: ignore[import-not-found]
 
 from leropa import parser
-from leropa.json_utils import json_dumps
+from leropa.batch import (
+    FORMAT_EXTENSIONS,
+    document_lines,
+    read_ids,
+    run_batch,
+    write_document,
+)
+from leropa.json_utils import json_dumps_line
 from leropa.llm import available_models
+from leropa.parser.unstructure import unstructure
+from leropa.serialization import dumps, dumps_json
 from leropa.xlsx import write_workbook
 
 try:
@@ -76,15 +85,43 @@ def cli(debug: bool, trace: bool, log_file: Optional[str] = None) -> None:
 @click.option(
     "--format",
     "output_format",
-    type=click.Choice(["json", "yaml", "xlsx"]),
+    type=click.Choice([*FORMAT_EXTENSIONS, "parquet"]),
     default="json",
-    help="Output format.",
+    help=(
+        "Output format. jsonl writes one article per line with the "
+        "containers it sits in; document-jsonl writes the whole document, "
+        "the header line followed by one line per article, book and "
+        "annex; parquet writes one file per table into the output "
+        "directory."
+    ),
+)
+@click.option(
+    "--engine",
+    type=click.Choice(list(parser.ENGINE_MODULES)),
+    default=parser.DEFAULT_ENGINE,
+    show_default=True,
+    help="HTML tree builder used by the parser.",
+)
+@click.option(
+    "--parsed-cache/--no-parsed-cache",
+    default=True,
+    show_default=True,
+    help="Reuse parsed documents stored in the cache directory.",
+)
+@click.option(
+    "--revalidate",
+    is_flag=True,
+    default=False,
+    help="Ask the server whether the cached HTML is still current.",
 )
 def convert(
     ver_id: str,
     cache_dir: Optional[str] = None,
     output_path: Optional[str] = None,
     output_format: str = "json",
+    engine: str = parser.DEFAULT_ENGINE,
+    parsed_cache: bool = True,
+    revalidate: bool = False,
 ) -> None:
     """Convert a document identifier to structured data.
 
@@ -94,9 +131,6 @@ def convert(
 
     cache_path = Path(cache_dir) if cache_dir else None
 
-    # Retrieve and parse the document structure.
-    doc = parser.fetch_document(ver_id, cache_path)
-
     # Determine the output file path if one was provided. When the user
     # passes a directory, generate the file name using the document
     # identifier and the chosen format extension.
@@ -104,23 +138,46 @@ def convert(
     if output_path:
         final_path = Path(output_path)
 
-        # Mapping from format names to file extensions.
-        extensions = {"json": ".json", "yaml": ".yaml", "xlsx": ".xlsx"}
-
         # If the provided path is a directory, build the file path inside it.
-        if final_path.is_dir():
-            final_path = final_path / f"{ver_id}{extensions[output_format]}"
+        # Parquet output is always a directory of table files.
+        if final_path.is_dir() and output_format != "parquet":
+            extension = FORMAT_EXTENSIONS[output_format]
+            final_path = final_path / f"{ver_id}{extension}"
+
+    # Stream articles straight from the cached HTML file without building
+    # the whole document, keeping memory flat for large documents.
+    if output_format == "jsonl":
+        html_stream = parser.open_html(
+            ver_id, cache_path, revalidate=revalidate
+        )
+        with html_stream:
+            _write_article_lines(html_stream, final_path, engine)
+        return
+
+    # Retrieve and parse the document structure.
+    try:
+        doc = parser.fetch_document(
+            ver_id,
+            cache_path,
+            engine=engine,
+            use_parsed_cache=parsed_cache,
+            revalidate=revalidate,
+        )
+    except ValueError as exc:
+        raise click.ClickException(str(exc)) from exc
 
-    if output_format == "json":
-        content = json_dumps(doc)
+    if output_format == "document-jsonl":
+        # Write each record as soon as it is serialized, so the document is
+        # never held as one string.
         if final_path:
-            final_path.write_text(content, encoding="utf-8")
+            write_document(doc, final_path, output_format)
         else:
-            click.echo(content)
-    elif output_format == "yaml":
-        content = yaml.safe_dump(doc, allow_unicode=True, sort_keys=False)
+            for line in document_lines(doc):
+                click.echo(line, nl=False)
+    elif output_format in ("json", "yaml"):
+        content = dumps(doc, output_format)
         if final_path:
-            final_path.write_text(content, encoding="utf-8")
+            final_path.write_bytes(content)
         else:
             click.echo(content)
     elif output_format == "xlsx":
@@ -130,6 +187,433 @@ def convert(
         # Write the structured data to the workbook using the dedicated
         # helper function that organizes sheets and tables.
         write_workbook(doc, final_path)
+    elif output_format == "parquet":
+        if final_path is None:
+            raise click.UsageError(
+                "Output directory is required for parquet format."
+            )
+
+        # Imported here so pyarrow is only loaded for Parquet output.
+        from leropa.columnar import write_parquet
+
+        try:
+            write_parquet(doc, final_path)
+        except ValueError as exc:
+            raise click.ClickException(str(exc)) from exc
+
+
+def _write_article_lines(
+    html_stream: IO[str], final_path: Optional[Path], engine: str
+) -> None:
+    """Write one JSON line per article of ``html_stream``.
+
+    Args:
+        html_stream: Text stream over the cached HTML of the document.
+        final_path: Output file, or ``None`` to print to the console.
+        engine: HTML tree builder used to parse each article.
+
+    Throws:
+        click.ClickException: If the parser engine cannot be used.
+    """
+
+    stream = final_path.open("w", encoding="utf-8") if final_path else None
+    try:
+        for article, path in parser.iter_articles(html_stream, engine=engine):
+            # Each line holds the article and where it sits in the document.
+            record = unstructure(article)
+            record["path"] = unstructure(path)
+            line = json_dumps_line(record)
+            if stream is not None:
+                stream.write(line + "\n")
+            else:
+                click.echo(line)
+    except ValueError as exc:
+        raise click.ClickException(str(exc)) from exc
+    finally:
+        if stream is not None:
+            stream.close()
+
+
+@cli.command("convert-many")
+@click.argument("ver_ids", nargs=-1, required=True)
+@click.option(
+    "--output",
+    "output_dir",
+    type=click.Path(file_okay=False, dir_okay=True),
+    required=True,
+    help="Directory receiving one file per document.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "yaml", "xlsx"]),
+    default="json",
+    help="Output format.",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, dir_okay=True),
+    default=None,
+    help="Directory for the HTML cache.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Maximum number of downloads in flight.",
+)
+@click.option(
+    "--rate",
+    type=click.FloatRange(min=0, min_open=True),
+    default=parser.DEFAULT_RATE,
+    show_default=True,
+    help="Downloads started per second on the portal.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of parsing processes [default: CPU count].",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(list(parser.ENGINE_MODULES)),
+    default=parser.DEFAULT_ENGINE,
+    show_default=True,
+    help="HTML tree builder used by the parser.",
+)
+def convert_many(
+    ver_ids: tuple[str, ...],
+    output_dir: str,
+    output_format: str = "json",
+    cache_dir: Optional[str] = None,
+    concurrency: int = 4,
+    rate: float = parser.DEFAULT_RATE,
+    workers: Optional[int] = None,
+    engine: str = parser.DEFAULT_ENGINE,
+) -> None:
+    """Convert several document identifiers concurrently.
+
+    Documents are written as soon as they are parsed, one file per
+    identifier named after it.
+
+    Args:
+        ver_ids: Identifiers of the document versions to convert.
+        output_dir: Directory receiving the converted documents.
+    """
+
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    async def run() -> list[str]:
+        """Convert the documents and return the failed identifiers."""
+
+        failed: list[str] = []
+        results = parser.fetch_documents(
+            ver_ids,
+            concurrency=concurrency,
+            cache_dir=Path(cache_dir) if cache_dir else None,
+            engine=engine,
+            rate=rate,
+            workers=workers,
+        )
+        async for result in results:
+            if result.document is None:
+                failed.append(result.ver_id)
+                click.echo(f"{result.ver_id}: {result.error}", err=True)
+                continue
+
+            target = out_dir / f"{result.ver_id}.{output_format}"
+            write_document(result.document, target, output_format)
+            click.echo(str(target))
+        return failed
+
+    failed = asyncio.run(run())
+    if failed:
+        raise click.ClickException(
+            f"{len(failed)} of {len(set(ver_ids))} documents failed."
+        )
+
+
+@cli.command("convert-batch")
+@click.option(
+    "--ids-file",
+    type=click.Path(exists=True, dir_okay=False),
+    required=True,
+    help="Text file with one document identifier per line.",
+)
+@click.option(
+    "--output",
+    "output_dir",
+    type=click.Path(file_okay=False, dir_okay=True),
+    required=True,
+    help="Directory receiving the documents and the manifest.",
+)
+@click.option(
+    "--format",
+    "output_formats",
+    type=click.Choice(list(FORMAT_EXTENSIONS)),
+    multiple=True,
+    default=["json"],
+    show_default=True,
+    help=(
+        "Output format; repeat to write several from one parse. jsonl "
+        "holds one article per line, document-jsonl the whole document."
+    ),
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of worker processes [default: CPU count].",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, dir_okay=True),
+    default=None,
+    help="Directory for the HTML cache.",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(list(parser.ENGINE_MODULES)),
+    default=parser.DEFAULT_ENGINE,
+    show_default=True,
+    help="HTML tree builder used by the parser.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Maximum number of downloads in flight.",
+)
+@click.option(
+    "--rate",
+    type=click.FloatRange(min=0, min_open=True),
+    default=parser.DEFAULT_RATE,
+    show_default=True,
+    help="Downloads started per second on the portal.",
+)
+@click.option(
+    "--resume/--no-resume",
+    default=True,
+    show_default=True,
+    help="Skip documents the manifest records as done.",
+)
+def convert_batch(
+    ids_file: str,
+    output_dir: str,
+    output_formats: tuple[str, ...] = ("json",),
+    workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    engine: str = parser.DEFAULT_ENGINE,
+    concurrency: int = 4,
+    rate: float = parser.DEFAULT_RATE,
+    resume: bool = True,
+) -> None:
+    """Convert the documents listed in a file with a pool of processes.
+
+    Pages are downloaded by this process within the portal rate limit
+    and handed to the worker processes for parsing and writing. Every
+    finished document is recorded in ``manifest.jsonl`` inside the
+    output directory with its status, timings and output hashes, so an
+    interrupted batch picks up where it stopped when run again.
+
+    Args:
+        ids_file: File listing the identifiers to convert.
+        output_dir: Directory receiving the converted documents.
+    """
+
+    ver_ids = read_ids(Path(ids_file))
+    records = run_batch(
+        ver_ids,
+        Path(output_dir),
+        list(dict.fromkeys(output_formats)),
+        workers=workers,
+        cache_dir=Path(cache_dir) if cache_dir else None,
+        engine=engine,
+        resume=resume,
+        concurrency=concurrency,
+        rate=rate,
+    )
+
+    failed = 0
+    for record in records:
+        if record["status"] == "error":
+            failed += 1
+            click.echo(f"{record['ver_id']}: {record['error']}", err=True)
+        else:
+            click.echo(f"{record['ver_id']}: {record['status']}")
+
+    if failed:
+        raise click.ClickException(
+            f"{failed} of {len(ver_ids)} documents failed."
+        )
+
+
+@cli.command("crawl-history")
+@click.argument("ver_id")
+@click.option(
+    "--output",
+    "output_dir",
+    type=click.Path(file_okay=False, dir_okay=True),
+    required=True,
+    help="Directory receiving one file per version and the manifest.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "yaml", "xlsx"]),
+    default="json",
+    help="Output format.",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, dir_okay=True),
+    default=None,
+    help="Directory for the HTML cache.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Maximum number of downloads in flight.",
+)
+@click.option(
+    "--rate",
+    type=click.FloatRange(min=0, min_open=True),
+    default=parser.DEFAULT_RATE,
+    show_default=True,
+    help="Downloads started per second on the portal.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of parsing processes [default: CPU count].",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(list(parser.ENGINE_MODULES)),
+    default=parser.DEFAULT_ENGINE,
+    show_default=True,
+    help="HTML tree builder used by the parser.",
+)
+@click.option(
+    "--max-versions",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Stop after this many versions.",
+)
+def crawl_history(
+    ver_id: str,
+    output_dir: str,
+    output_format: str = "json",
+    cache_dir: Optional[str] = None,
+    concurrency: int = 4,
+    rate: float = parser.DEFAULT_RATE,
+    workers: Optional[int] = None,
+    engine: str = parser.DEFAULT_ENGINE,
+    max_versions: Optional[int] = None,
+) -> None:
+    """Convert every version in the history of a document.
+
+    Each version is written to its own file as soon as it is parsed, and
+    ``manifest.json`` lists all versions in chronological order.
+
+    Args:
+        ver_id: Identifier of the version the crawl starts from.
+        output_dir: Directory receiving the converted versions.
+    """
+
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    async def run() -> list[parser.DocumentResult]:
+        """Convert the versions and return their outcomes."""
+
+        outcomes: list[parser.DocumentResult] = []
+        results = parser.crawl_history(
+            ver_id,
+            concurrency=concurrency,
+            cache_dir=Path(cache_dir) if cache_dir else None,
+            engine=engine,
+            rate=rate,
+            workers=workers,
+            max_versions=max_versions,
+        )
+        async for result in results:
+            outcomes.append(result)
+            if result.document is None:
+                click.echo(f"{result.ver_id}: {result.error}", err=True)
+                continue
+
+            target = out_dir / f"{result.ver_id}.{output_format}"
+            write_document(result.document, target, output_format)
+            click.echo(str(target))
+        return outcomes
+
+    outcomes = asyncio.run(run())
+    manifest = _history_manifest(ver_id, outcomes, output_format)
+    (out_dir / "manifest.json").write_bytes(dumps_json(manifest))
+
+    failed = [o.ver_id for o in outcomes if o.document is None]
+    if failed:
+        raise click.ClickException(
+            f"{len(failed)} of {len(outcomes)} versions failed."
+        )
+
+
+def _history_manifest(
+    ver_id: str,
+    outcomes: list[parser.DocumentResult],
+    output_format: str,
+) -> dict[str, Any]:
+    """Describe the versions written by ``crawl-history``.
+
+    Args:
+        ver_id: Identifier of the version the crawl started from.
+        outcomes: Outcome of every version that was fetched.
+        output_format: Extension of the written files.
+
+    Returns:
+        Manifest listing the versions in chronological order, with
+        versions of unknown date last.
+    """
+
+    # Dates only appear in the history lists of the other versions.
+    dates: dict[str, str] = {}
+    for outcome in outcomes:
+        if outcome.document is None:
+            continue
+        for entry in outcome.document["document"].get("history") or []:
+            dates.setdefault(entry["ver_id"], entry["date"])
+
+    def sort_key(outcome: parser.DocumentResult) -> tuple[int, str]:
+        """Order versions by date, turning dd.mm.yyyy into yyyymmdd."""
+
+        date = dates.get(outcome.ver_id)
+        if date is None:
+            return (1, outcome.ver_id)
+        day, month, year = date.split(".")
+        return (0, f"{year}{month}{day}")
+
+    versions = []
+    for outcome in sorted(outcomes, key=sort_key):
+        doc = outcome.document
+        versions.append(
+            {
+                "ver_id": outcome.ver_id,
+                "date": dates.get(outcome.ver_id),
+                "title": doc["document"].get("title") if doc else None,
+                "file": (f"{outcome.ver_id}.{output_format}" if doc else None),
+                "status": "ok" if doc else "error",
+                "error": outcome.error,
+            }
+        )
+    return {"start": ver_id, "versions": versions}
 
 
 def _import_llm_module(module: str) -> ModuleType:
@@ -295,6 +779,34 @@ def export_md(
     )
 
 
+@cli.command("export-parquet")
+@click.argument(
+    "input_dir", type=click.Path(exists=True, file_okay=False, dir_okay=True)
+)
+@click.argument("output_dir", type=click.Path(file_okay=False, dir_okay=True))
+def export_parquet(input_dir: str, output_dir: str) -> None:
+    """Collect converted documents into one Parquet dataset.
+
+    Every JSON or YAML document under ``input_dir`` is flattened into the
+    tables of the Excel export; each table is written to one
+    ``<table>.parquet`` file in ``output_dir``.
+
+    Args:
+        input_dir: Folder containing converted JSON or YAML documents.
+        output_dir: Destination folder for the Parquet files.
+    """
+
+    # Imported here so pyarrow is only loaded for Parquet output.
+    from leropa.columnar import export_dataset
+
+    paths = sorted(p for p in Path(input_dir).rglob("*") if p.is_file())
+    try:
+        count = export_dataset(paths, Path(output_dir))
+    except ValueError as exc:
+        raise click.ClickException(str(exc)) from exc
+    click.echo(f"Exported {count} documents @ {output_dir}")
+
+
 @cli.group()
 @click.option(
     "--collection",
@@ -0,0 +1,349 @@
+"""Export the flattened document tables as Parquet files.
+
+The tables are the ones of the Excel export: one per kind of object,
+each row pointing to its container through ``parent_id`` and to its
+children through lists of identifiers. Every table has a fixed schema
+and a ``document_id`` column holding the version of the document the row
+comes from, so the tables of many documents can be stacked and joined.
+"""
+
+from __future__ import annotations
+
+import functools
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Dict, Iterable, List, Optional, Type
+
+from leropa.serialization import FILE_FORMATS, read_file
+from leropa.xlsx import _flatten
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+# Parsed document structure and the Arrow tables built from it.
+JSONDict = Dict[str, Any]
+Tables = Dict[str, Any]
+
+# Number of rows buffered per table before a dataset writes a row group.
+ROW_GROUP_ROWS = 65536
+
+# Column holding the version of the document a row belongs to.
+DOCUMENT_COLUMN = "document_id"
+
+# Columns of the note fields, shared by notes and document notes.
+_NOTE_COLUMNS = (
+    "note_id",
+    "text",
+    "date",
+    "subject",
+    "law_number",
+    "law_date",
+    "monitor_number",
+    "monitor_date",
+    "replaced",
+    "replacement",
+)
+
+
+def _require_pyarrow() -> None:
+    """Make sure the Arrow library can be used.
+
+    Throws:
+        ValueError: If ``pyarrow`` is not installed.
+    """
+
+    if pa is None:
+        raise ValueError(
+            "The parquet format requires the pyarrow package; install it "
+            "with `pip install leropa[parquet]`."
+        )
+
+
+@functools.cache
+def table_schemas() -> Dict[str, Any]:
+    """Return the schema of every table, in the order they are written.
+
+    Returns:
+        Arrow schema keyed by table name.
+
+    Throws:
+        ValueError: If ``pyarrow`` is not installed.
+    """
+
+    _require_pyarrow()
+    text = pa.string()
+    ids = pa.list_(pa.string())
+
+    def schema(*columns: tuple[str, Any]) -> Any:  # noqa: ANN401
+        """Build a schema starting with the document column."""
+
+        return pa.schema([(DOCUMENT_COLUMN, text), *columns])
+
+    note = pa.struct([(name, text) for name in _NOTE_COLUMNS])
+    return {
+        "Document": schema(
+            ("source", text),
+            ("ver_id", text),
+            ("title", text),
+            ("description", text),
+            ("keywords", text),
+            ("history", ids),
+            ("prev_ver", text),
+            ("next_ver", text),
+            ("kind", text),
+            ("state", text),
+            ("date", pa.list_(pa.int32())),
+            ("document_note", note),
+            ("issuer", pa.list_(text)),
+            ("published", pa.list_(text)),
+            ("books", ids),
+        ),
+        "HistoryEntry": schema(
+            ("ver_id", text), ("date", text), ("parent_id", text)
+        ),
+        "Book": schema(
+            ("book_id", text),
+            ("title", text),
+            ("description", text),
+            ("titles", ids),
+            ("chapters", ids),
+            ("sections", ids),
+            ("articles", ids),
+            ("parent_id", text),
+        ),
+        "Title": schema(
+            ("title_id", text),
+            ("title", text),
+            ("description", text),
+            ("chapters", ids),
+            ("sections", ids),
+            ("articles", ids),
+            ("parent_id", text),
+        ),
+        "Chapter": schema(
+            ("chapter_id", text),
+            ("title", text),
+            ("description", text),
+            ("sections", ids),
+            ("articles", ids),
+            ("parent_id", text),
+        ),
+        "Section": schema(
+            ("section_id", text),
+            ("title", text),
+            ("description", text),
+            ("level", pa.int32()),
+            ("subsections", ids),
+            ("articles", ids),
+            ("parent_id", text),
+        ),
+        "Article": schema(
+            ("article_id", text),
+            ("label", text),
+            ("full_text", text),
+            ("paragraphs", ids),
+            ("notes", ids),
+            ("parent_id", text),
+        ),
+        "Paragraph": schema(
+            ("par_id", text),
+            ("text", text),
+            ("label", text),
+            ("subparagraphs", ids),
+            ("notes", ids),
+            ("parent_id", text),
+        ),
+        "SubParagraph": schema(
+            ("sub_id", text),
+            ("label", text),
+            ("text", text),
+            ("parent_id", text),
+        ),
+        "Note": schema(
+            *((name, text) for name in _NOTE_COLUMNS), ("parent_id", text)
+        ),
+    }
+
+
+def document_tables(doc: JSONDict) -> Tables:
+    """Build the Arrow tables of one parsed document.
+
+    The rows are the ones of the Excel export; ``doc`` is left unchanged.
+
+    Args:
+        doc: Parsed document structure.
+
+    Returns:
+        One table per name of ``table_schemas``, empty when the document
+        has no rows of that kind.
+
+    Throws:
+        ValueError: If ``pyarrow`` is not installed.
+    """
+
+    schemas = table_schemas()
+    document_id = doc.get("document", {}).get("ver_id")
+    sheets = _flatten(doc)
+
+    tables: Tables = {}
+    for name, schema in schemas.items():
+        rows = sheets.get(name, [])
+
+        # The flattened rows join child identifiers with commas; split
+        # them back into lists for the typed list columns.
+        split = [
+            field.name
+            for field in schema
+            if field.type == pa.list_(pa.string())
+        ]
+        for row in rows:
+            row[DOCUMENT_COLUMN] = document_id
+            for column in split:
+                value = row.get(column)
+                if isinstance(value, str):
+                    row[column] = value.split(",") if value else []
+
+        tables[name] = pa.Table.from_pylist(rows, schema=schema)
+    return tables
+
+
+def write_parquet(doc: JSONDict, out_dir: Path) -> List[Path]:
+    """Write the tables of one document as Parquet files.
+
+    Args:
+        doc: Parsed document structure.
+        out_dir: Directory receiving one ``<table>.parquet`` file per
+            table; created when missing.
+
+    Returns:
+        Paths of the written files.
+
+    Throws:
+        ValueError: If ``pyarrow`` is not installed.
+    """
+
+    with ParquetDataset(out_dir) as dataset:
+        dataset.add(doc)
+    return dataset.paths
+
+
+class ParquetDataset:
+    """Parquet files collecting the tables of many documents.
+
+    Each table is written to one file as documents are added. Rows are
+    buffered and written in large row groups, so the files stay efficient
+    to scan however small the documents are.
+
+    Attributes:
+        out_dir: Directory receiving one ``<table>.parquet`` file per
+            table.
+        documents: Number of documents added so far.
+    """
+
+    def __init__(self: "ParquetDataset", out_dir: Path) -> None:
+        """Open the files of the dataset.
+
+        Args:
+            out_dir: Directory receiving the files; created when missing.
+
+        Throws:
+            ValueError: If ``pyarrow`` is not installed.
+        """
+
+        schemas = table_schemas()
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self.out_dir = out_dir
+        self.documents = 0
+        self._writers = {
+            name: pq.ParquetWriter(out_dir / f"{name}.parquet", schema)
+            for name, schema in schemas.items()
+        }
+        self._pending: Dict[str, List[Any]] = {name: [] for name in schemas}
+        self._pending_rows = dict.fromkeys(schemas, 0)
+
+    @property
+    def paths(self: "ParquetDataset") -> List[Path]:
+        """Return the paths of the files, in table order."""
+
+        return [self.out_dir / f"{name}.parquet" for name in self._writers]
+
+    def __enter__(self: "ParquetDataset") -> "ParquetDataset":
+        """Return the dataset for use in a ``with`` block."""
+
+        return self
+
+    def __exit__(
+        self: "ParquetDataset",
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Write the buffered rows and close the files."""
+
+        self.close()
+
+    def add(self: "ParquetDataset", doc: JSONDict) -> None:
+        """Add the tables of one document to the dataset.
+
+        Args:
+            doc: Parsed document structure.
+        """
+
+        for name, table in document_tables(doc).items():
+            if not table.num_rows:
+                continue
+            self._pending[name].append(table)
+            self._pending_rows[name] += table.num_rows
+            if self._pending_rows[name] >= ROW_GROUP_ROWS:
+                self._flush(name)
+        self.documents += 1
+
+    def _flush(self: "ParquetDataset", name: str) -> None:
+        """Write the buffered rows of one table as a row group.
+
+        Args:
+            name: Name of the table.
+        """
+
+        if self._pending[name]:
+            table = pa.concat_tables(self._pending[name])
+            self._writers[name].write_table(table, row_group_size=len(table))
+        self._pending[name] = []
+        self._pending_rows[name] = 0
+
+    def close(self: "ParquetDataset") -> None:
+        """Write the buffered rows and close the files."""
+
+        for name, writer in self._writers.items():
+            self._flush(name)
+            writer.close()
+
+
+def export_dataset(paths: Iterable[Path], out_dir: Path) -> int:
+    """Collect stored JSON or YAML documents into one Parquet dataset.
+
+    Args:
+        paths: Document files; files of other types, and JSON or YAML
+            files not holding a parsed document, are skipped.
+        out_dir: Directory receiving one ``<table>.parquet`` file per
+            table.
+
+    Returns:
+        Number of documents written.
+
+    Throws:
+        ValueError: If ``pyarrow`` is not installed.
+    """
+
+    with ParquetDataset(out_dir) as dataset:
+        for path in paths:
+            if path.suffix.lower() not in FILE_FORMATS:
+                continue
+            doc = read_file(path)
+            if isinstance(doc, dict) and "document" in doc:
+                dataset.add(doc)
+    return dataset.documents
@@ -2,64 +2,173 @@
 
 from __future__ import annotations
 
-import time
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict, Tuple
 
-import yaml  # type: ignore[import-untyped]
-
-from leropa.json_utils import json_loads
 from leropa.parser.document_info import DocumentInfo
+from leropa.parser.structure import structure
+from leropa.serialization import file_format, loads_yaml
+from leropa.sidecar_cache import read_document_file
 
 # Types for cache storage and JSON mappings.
 JSONDict = Dict[str, Any]
-CacheEntry = Tuple[float, DocumentInfo]
-CacheStore = Dict[Path, CacheEntry]
+CacheEntry = Tuple[int, int, DocumentInfo]
+CacheStore = OrderedDict[Path, CacheEntry]
+
+# Largest number of documents whose metadata is kept in memory.
+CACHE_SIZE = int(os.environ.get("LEROPA_DOCUMENT_INFO_CACHE", 1024))
+
+# Bytes read at first when looking for the header of a JSON document; the
+# read size doubles until the header is complete.
+_HEADER_CHUNK = 64 * 1024
 
-# Global in-memory cache and its time-to-live in seconds.
-_CACHE: CacheStore = {}
-_TTL_SECONDS = 15 * 60
+# Start of a JSON document whose first key is ``document``.
+_JSON_HEADER = re.compile(rb'\A\s*\{\s*"document"\s*:\s*')
+
+# Global in-memory cache, least recently used entries first.
+_CACHE: CacheStore = OrderedDict()
+_LOCK = threading.Lock()
 
 
 def load_document_info(path: Path) -> DocumentInfo:
-    """Return document metadata for ``path`` using a timed cache.
+    """Return document metadata for ``path`` using a bounded cache.
+
+    Entries are checked against the modification time and size of the
+    file, so a rewritten file is read again; the least recently used
+    entries are dropped beyond ``CACHE_SIZE`` documents.
 
     Args:
         path: Location of the JSON or YAML file containing the document.
 
     Returns:
-        Parsed ``DocumentInfo`` describing the document.
+        ``DocumentInfo`` describing the document, with the values stored
+        in the file.
     """
-    now = time.time()
-    cached = _CACHE.get(path)
-
-    # Return cached entry when still valid.
-    if cached and now - cached[0] < _TTL_SECONDS:
-        return cached[1]
 
-    # Load document structure and build ``DocumentInfo`` from the ``document``
-    # section of the file.
-    data = _load_document_file(path)
-    info = DocumentInfo(**data["document"])
-
-    # Store fresh entry in the cache.
-    _CACHE[path] = (now, info)
+    stat = path.stat()
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    # Return the cached entry when the file did not change.
+    with _LOCK:
+        cached = _CACHE.get(path)
+        if cached is not None and cached[:2] == signature:
+            _CACHE.move_to_end(path)
+            return cached[2]
+
+    # Build ``DocumentInfo`` from the ``document`` section of the file.
+    # The stored values were normalized when the document was parsed, so
+    # they are restored without running the initializer again.
+    info: DocumentInfo = structure(read_document_header(path), DocumentInfo)
+
+    # Store the fresh entry, dropping the least recently used ones.
+    with _LOCK:
+        _CACHE[path] = (*signature, info)
+        _CACHE.move_to_end(path)
+        while len(_CACHE) > CACHE_SIZE:
+            _CACHE.popitem(last=False)
     return info
 
 
-def _load_document_file(path: Path) -> JSONDict:
-    """Read a structured document file from ``path``.
+def read_document_header(path: Path) -> JSONDict:
+    """Read the ``document`` section of a document file.
+
+    Documents written by leropa start with that section, so only the
+    leading part of the file is read and decoded. Files laid out in
+    another way are decoded in full.
 
     Args:
         path: Location of the JSON or YAML document file.
 
     Returns:
-        Parsed document dictionary.
+        The ``document`` mapping of the file.
+
+    Throws:
+        ValueError: If the file holds no ``document`` mapping.
     """
 
-    text = path.read_text(encoding="utf-8")
+    if file_format(path) == "json":
+        header = _read_json_header(path)
+    else:
+        header = _read_yaml_header(path)
+
+    # Fall back to decoding the whole file.
+    if header is None:
+        data = read_document_file(path)
+        header = data.get("document") if isinstance(data, dict) else None
+    if not isinstance(header, dict):
+        raise ValueError(f"{path.name} does not hold a document")
+    return header
+
+
+def _read_json_header(path: Path) -> Any:  # noqa: ANN401
+    """Decode the leading ``document`` value of a JSON file.
+
+    Args:
+        path: Location of the JSON file.
+
+    Returns:
+        The decoded value, or ``None`` if the file does not start with a
+        ``document`` key.
+    """
+
+    decoder = json.JSONDecoder()
+    size = _HEADER_CHUNK
+    with path.open("rb") as stream:
+        content = stream.read(size)
+        match = _JSON_HEADER.match(content)
+        if match is None:
+            return None
+
+        while True:
+            # A character cut at the end of the chunk is dropped; the
+            # value is then incomplete and more bytes are read.
+            text = content[match.end() :].decode("utf-8", "ignore")
+            try:
+                value, _ = decoder.raw_decode(text)
+                return value
+            except json.JSONDecodeError:
+                more = stream.read(size)
+                if not more:
+                    return None
+                content += more
+                size *= 2
+
+
+def _read_yaml_header(path: Path) -> Any:  # noqa: ANN401
+    """Decode the leading ``document`` block of a YAML file.
+
+    The block ends at the first line that is not indented, which starts
+    the next top-level key.
+
+    Args:
+        path: Location of the YAML file.
+
+    Returns:
+        The decoded value, or ``None`` if the file does not start with a
+        ``document`` key.
+    """
 
-    # Decode JSON or YAML depending on file extension.
-    if path.suffix == ".json":
-        return json_loads(text)  # type: ignore[return-value]
-    return yaml.safe_load(text)
+    lines: list[bytes] = []
+    with path.open("rb") as stream:
+        for line in stream:
+            if not lines:
+                # Skip blank lines, comments and the document marker
+                # before the first key.
+                if not line.strip() or line.startswith((b"#", b"---")):
+                    continue
+                if not line.startswith(b"document:"):
+                    return None
+            elif line.strip() and not line[:1].isspace():
+                if not line.startswith(b"#"):
+                    break
+            lines.append(line)
+
+    if not lines:
+        return None
+    data = loads_yaml(b"".join(lines))
+    return data.get("document") if isinstance(data, dict) else None
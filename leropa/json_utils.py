@@ -8,6 +8,7 @@ except ImportError:  # pragma: no cover - optional dependency
     orjson = None  # type: ignore[assignment]
 
 import json
+from typing import Any, Callable
 
 
 def json_dumps(data: object) -> str:
@@ -27,6 +28,41 @@ def json_dumps(data: object) -> str:
     return json.dumps(data, ensure_ascii=False)
 
 
+def json_dumps_line(data: object) -> str:
+    """Serialize data to a single-line JSON string.
+
+    Args:
+        data: Data structure to serialize.
+
+    Returns:
+        Compact JSON representation of ``data`` without newlines, suitable
+        for one record of a JSON Lines file.
+    """
+
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, ensure_ascii=False)
+
+
+def json_dumps_bytes(
+    data: object, default: Callable[[Any], Any] | None = None
+) -> bytes:
+    """Serialize data to UTF-8 encoded JSON bytes.
+
+    Args:
+        data: Data structure to serialize.
+        default: Function returning a serializable value for objects the
+            encoder does not support.
+
+    Returns:
+        The same JSON as ``json_dumps``, encoded as UTF-8.
+    """
+
+    if orjson is not None:
+        return orjson.dumps(data, default=default, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, default=default).encode()
+
+
 def json_loads(data: str | bytes) -> object:
     """Deserialize JSON data from a string or bytes.
 
@@ -8,9 +8,8 @@ import re
 import uuid
 from typing import Any, Dict, List, Tuple
 
-import yaml
-
 from leropa.json_utils import json_loads
+from leropa.serialization import dumps_yaml
 
 # Optional token-aware chunking.
 try:
@@ -268,12 +267,7 @@ def export_folder(
                     }
 
                     # YAML front-matter.
-                    yaml_data = yaml.safe_dump(
-                        meta,
-                        sort_keys=False,
-                        allow_unicode=True,
-                        default_flow_style=False,
-                    )
+                    yaml_data = dumps_yaml(meta).decode()
                     yaml_front_matter = f"---\n{yaml_data}---\n"
 
                     # Body as Markdown with a clear heading.
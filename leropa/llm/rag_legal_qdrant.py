@@ -77,7 +77,6 @@ from pathlib import Path
 from typing import Any, Dict, Generator, List, Literal, Optional, Tuple, cast
 
 import requests
-import yaml  # type: ignore[import]
 from attrs import asdict
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
@@ -93,6 +92,7 @@ from tqdm import tqdm  # type: ignore
 
 from leropa.document_cache import load_document_info
 from leropa.json_utils import json_loads
+from leropa.sidecar_cache import read_document_file
 from leropa.web.utils import DOCUMENTS_DIR
 
 # Optional re-ranker (CPU ok). If unavailable, pipeline still works.
@@ -250,8 +250,8 @@ def _read_yaml_file(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
         Tuple of document object and list of article objects.
     """
 
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+    # Repeated ingests load the binary copy of the file.
+    data = read_document_file(Path(path))
 
     return cast(Dict[str, Any], data), _extract_articles(data)
 
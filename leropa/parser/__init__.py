@@ -1,6 +1,50 @@
 """Parser package for legal documents."""
 
-from .fetch_document import fetch_document
-from .parse_html import parse_html
+from .article_path import ArticlePath
+from .crawl_history import crawl_history
+from .document_corpus import DocumentCorpus
+from .document_result import DocumentResult
+from .engine import DEFAULT_ENGINE, ENGINE_MODULES, available_engines
+from .fetch_document import fetch_document, fetch_html, open_html
+from .fetch_documents import DEFAULT_RATE, DocumentPipeline, fetch_documents
+from .fetched_page import FetchedPage
+from .fetcher import Fetcher
+from .html_cache import HtmlCache
+from .iter_articles import iter_article_paths, iter_articles
+from .lazy_document import LazyDocument, parse_lazy
+from .parse_html import PARTS, parse_document, parse_html
+from .parse_result import ParseResult
+from .structure import structure
+from .trim_html import trim_html
+from .unstructure import to_json_bytes, unstructure
 
-__all__ = ["fetch_document", "parse_html"]
+__all__ = [
+    "ArticlePath",
+    "DEFAULT_ENGINE",
+    "DEFAULT_RATE",
+    "DocumentCorpus",
+    "DocumentPipeline",
+    "DocumentResult",
+    "ENGINE_MODULES",
+    "FetchedPage",
+    "Fetcher",
+    "HtmlCache",
+    "LazyDocument",
+    "PARTS",
+    "ParseResult",
+    "available_engines",
+    "crawl_history",
+    "fetch_document",
+    "fetch_documents",
+    "fetch_html",
+    "iter_article_paths",
+    "iter_articles",
+    "open_html",
+    "parse_document",
+    "parse_html",
+    "parse_lazy",
+    "structure",
+    "to_json_bytes",
+    "trim_html",
+    "unstructure",
+]
@@ -0,0 +1,28 @@
+"""Location of an article inside the document hierarchy."""
+
+from __future__ import annotations
+
+from attrs import define
+
+
+@define(slots=True)
+class ArticlePath:
+    """Location of an article inside the document hierarchy.
+
+    Each identifier is the ``id`` of the closest enclosing container body
+    in the source HTML, the same element the full parser attaches the
+    article to.
+
+    Attributes:
+        book_id: Identifier of the enclosing book body.
+        title_id: Identifier of the enclosing title body.
+        chapter_id: Identifier of the enclosing chapter body.
+        section_id: Identifier of the enclosing section or point body.
+        subsection_id: Identifier of the enclosing subsection body.
+    """
+
+    book_id: str | None = None
+    title_id: str | None = None
+    chapter_id: str | None = None
+    section_id: str | None = None
+    subsection_id: str | None = None
@@ -0,0 +1,30 @@
+"""Location of an article in the source HTML."""
+
+from __future__ import annotations
+
+from attrs import define
+
+
+@define(slots=True)
+class ArticleSpan:
+    """Location of an article in the source HTML.
+
+    Offsets index the HTML text the span was found in; ``start`` to
+    ``end`` covers the whole ``S_ART`` element, tags included.
+
+    Attributes:
+        article_id: Identifier of the article.
+        start: Offset of the opening ``S_ART`` tag.
+        open_end: Offset just after the opening tag.
+        close_start: Offset of the closing tag.
+        end: Offset just after the closing tag.
+        has_body: Whether the article holds an ``S_ART_BDY`` span; articles
+            without one are left out of the parsed document.
+    """
+
+    article_id: str
+    start: int
+    open_end: int
+    close_start: int
+    end: int
+    has_body: bool = False
@@ -0,0 +1,88 @@
+"""Follow the version history of a document across all consolidations."""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import AsyncIterator
+
+from .document_result import DocumentResult
+from .engine import DEFAULT_ENGINE
+from .fetch_documents import DEFAULT_RATE, DocumentPipeline
+from .fetcher import Fetcher
+
+
+def history_ver_ids(result: DocumentResult) -> list[str]:
+    """Return the versions listed in the history of a parsed document.
+
+    Args:
+        result: Outcome of fetching one version.
+
+    Returns:
+        Identifiers of the versions linked from the document, in the order
+        of the history list; empty when the version failed.
+    """
+
+    if result.document is None:
+        return []
+    history = result.document["document"].get("history") or []
+    return [entry["ver_id"] for entry in history]
+
+
+async def crawl_history(
+    ver_id: str,
+    concurrency: int = 4,
+    cache_dir: Path | None = None,
+    engine: str = DEFAULT_ENGINE,
+    use_parsed_cache: bool = True,
+    rate: float = DEFAULT_RATE,
+    burst: int = 1,
+    workers: int | None = None,
+    max_versions: int | None = None,
+    fetcher: Fetcher | None = None,
+    executor: Executor | None = None,
+) -> AsyncIterator[DocumentResult]:
+    """Fetch and parse every version reachable from ``ver_id``.
+
+    Starting from one version, the history list of each parsed version is
+    followed to the other consolidations of the act. Every version is
+    fetched once, however many histories mention it, and versions are
+    downloaded and parsed concurrently through the HTML cache.
+
+    Args:
+        ver_id: Identifier of the version the crawl starts from.
+        concurrency: Maximum number of downloads in flight.
+        cache_dir: Directory used for caching downloaded HTML files.
+        engine: Tree builder used to parse the HTML.
+        use_parsed_cache: Reuse and store parsed documents.
+        rate: Downloads started per second and per host.
+        burst: Downloads a host may receive back to back.
+        workers: Number of parsing processes; defaults to the CPU count.
+        max_versions: Stop following links after this many versions.
+        fetcher: Downloader to use instead of a new pooled one.
+        executor: Pool used for parsing instead of new worker processes.
+
+    Yields:
+        The outcome of each version as soon as it is known.
+    """
+
+    pipeline = DocumentPipeline(
+        concurrency=concurrency,
+        cache_dir=cache_dir,
+        engine=engine,
+        use_parsed_cache=use_parsed_cache,
+        rate=rate,
+        burst=burst,
+        workers=workers,
+        fetcher=fetcher,
+        executor=executor,
+    )
+    async with pipeline:
+        pipeline.submit(ver_id)
+        async for result in pipeline.results():
+            # Queue the versions this one links to before handing it out.
+            for linked in history_ver_ids(result):
+                if max_versions and len(pipeline.seen) >= max_versions:
+                    break
+                pipeline.submit(linked)
+            yield result
@@ -0,0 +1,214 @@
+"""Hold many parsed documents, sharing what they have in common."""
+
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+import attrs
+
+from .annex import Annex
+from .article import Article
+from .book import Book
+from .chapter import Chapter
+from .document_info import DocumentInfo
+from .engine import DEFAULT_ENGINE
+from .history_entry import HistoryEntry
+from .note import Note
+from .paragraph import Paragraph
+from .parse_html import parse_document
+from .parse_result import ParseResult
+from .section import Section
+from .sub_paragraph import SubParagraph
+from .title import Title
+
+# Content of an object: its class and the canonical value of each field,
+# with nested objects standing in by identity.
+ContentKey = tuple[Any, ...]
+
+# Classes whose instances are shared between documents.
+SHARED_CLASSES = frozenset(
+    {
+        Annex,
+        Article,
+        Book,
+        Chapter,
+        HistoryEntry,
+        Note,
+        Paragraph,
+        Section,
+        SubParagraph,
+        Title,
+    }
+)
+
+
+class DocumentCorpus:
+    """Parsed documents holding a single copy of their common content.
+
+    Consolidated versions of a law repeat most of their articles, notes
+    and labels. When a document is added, every string is replaced by
+    the copy the corpus already holds, and every article, paragraph,
+    note and container whose content equals one seen before is replaced
+    by that instance, so identical content is stored once.
+
+    Shared objects appear in several documents at once and must be
+    treated as read-only; changing one changes every document using it.
+
+    Attributes:
+        documents: Parsed documents keyed by version identifier.
+    """
+
+    def __init__(self: "DocumentCorpus") -> None:
+        """Create an empty corpus."""
+
+        self.documents: dict[str, ParseResult] = {}
+        self._strings: dict[str, str] = {}
+        self._objects: dict[ContentKey, Any] = {}
+        self._seen = 0
+
+    def __len__(self: "DocumentCorpus") -> int:
+        """Return the number of documents in the corpus."""
+
+        return len(self.documents)
+
+    def __contains__(self: "DocumentCorpus", ver_id: object) -> bool:
+        """Return ``True`` if the corpus holds the version ``ver_id``."""
+
+        return ver_id in self.documents
+
+    def __getitem__(self: "DocumentCorpus", ver_id: str) -> ParseResult:
+        """Return the document of the version ``ver_id``."""
+
+        return self.documents[ver_id]
+
+    def __iter__(self: "DocumentCorpus") -> Iterator[str]:
+        """Iterate over the version identifiers, in insertion order."""
+
+        return iter(self.documents)
+
+    def intern(self: "DocumentCorpus", value: str) -> str:
+        """Return the copy of ``value`` held by the corpus.
+
+        Args:
+            value: String to intern.
+
+        Returns:
+            An equal string, shared by every user of the corpus.
+        """
+
+        return self._strings.setdefault(value, value)
+
+    def _value(self: "DocumentCorpus", value: Any) -> Any:  # noqa: ANN401
+        """Return the canonical form of a field value.
+
+        Args:
+            value: Field value of a parser object.
+
+        Returns:
+            Interned string, shared object, or list of those.
+        """
+
+        if isinstance(value, str):
+            return self._strings.setdefault(value, value)
+        if isinstance(value, list):
+            return [self._value(item) for item in value]
+        if attrs.has(type(value)):
+            return self._share(value)
+        return value
+
+    def _share(self: "DocumentCorpus", obj: Any) -> Any:  # noqa: ANN401
+        """Return the instance of the corpus equal to ``obj``.
+
+        Children are made canonical first, so two objects have the same
+        content exactly when their canonical children are the same
+        instances. The fields of ``obj`` are updated in place.
+
+        Args:
+            obj: Parser object to share.
+
+        Returns:
+            The instance already held with the same content, or ``obj``.
+        """
+
+        key: list[Any] = [type(obj)]
+        for field in attrs.fields(type(obj)):
+            value = self._value(getattr(obj, field.name))
+            setattr(obj, field.name, value)
+            key.append(_identity(value))
+
+        if type(obj) not in SHARED_CLASSES:
+            return obj
+        self._seen += 1
+        return self._objects.setdefault(tuple(key), obj)
+
+    def add(self: "DocumentCorpus", result: ParseResult) -> ParseResult:
+        """Add a parsed document to the corpus.
+
+        Args:
+            result: Parsed document; its objects are taken over by the
+                corpus and may be replaced by shared ones.
+
+        Returns:
+            The document as stored, built from shared content.
+        """
+
+        document: DocumentInfo = self._share(result.document)
+        stored = ParseResult(
+            document=document,
+            articles=[self._share(a) for a in result.articles],
+            books=[self._share(b) for b in result.books],
+            annexes=[self._share(a) for a in result.annexes],
+        )
+        self.documents[document.ver_id] = stored
+        return stored
+
+    def add_html(
+        self: "DocumentCorpus",
+        html: str,
+        ver_id: str,
+        engine: str = DEFAULT_ENGINE,
+    ) -> ParseResult:
+        """Parse a page and add the document to the corpus.
+
+        Args:
+            html: Raw HTML content of the legal document.
+            ver_id: Identifier for the document version.
+            engine: Tree builder used to parse the HTML.
+
+        Returns:
+            The document as stored.
+        """
+
+        return self.add(parse_document(html, ver_id, engine))
+
+    def stats(self: "DocumentCorpus") -> dict[str, int]:
+        """Return how much content the documents share.
+
+        Returns:
+            Number of shareable objects added, of distinct ones kept and
+            of distinct strings.
+        """
+
+        return {
+            "objects": self._seen,
+            "unique_objects": len(self._objects),
+            "unique_strings": len(self._strings),
+        }
+
+
+def _identity(value: Any) -> Any:  # noqa: ANN401
+    """Return a hashable stand-in for a canonical field value.
+
+    Args:
+        value: Canonical field value.
+
+    Returns:
+        The value itself for scalars, the identity of shared objects and
+        a tuple for lists.
+    """
+
+    if isinstance(value, list):
+        return tuple(_identity(item) for item in value)
+    if attrs.has(type(value)):
+        return id(value)
+    return value
@@ -0,0 +1,22 @@
+"""Outcome of fetching and parsing one document version."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from attrs import define
+
+
+@define(slots=True)
+class DocumentResult:
+    """Outcome of fetching and parsing one document version.
+
+    Attributes:
+        ver_id: Identifier for the document version.
+        document: Parsed document structure, ``None`` if it failed.
+        error: Description of the failure, ``None`` on success.
+    """
+
+    ver_id: str
+    document: dict[str, Any] | None = None
+    error: str | None = None
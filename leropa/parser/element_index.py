@@ -0,0 +1,106 @@
+"""Index of document elements by id, class and tag name."""
+
+from __future__ import annotations
+
+from typing import Any
+
+# Elements grouped under a lookup key, in document order.
+ElementMap = dict[str, list[Any]]
+
+
+class ElementIndex:
+    """Index of document elements by id, class and tag name.
+
+    The index is built with a single walk over the tree, so looking up
+    metadata spans, the document sheet or an annex body does not require
+    scanning the whole document again. Elements detached from the tree
+    after the index was built are still returned.
+
+    Attributes:
+        ids: Elements keyed by their ``id`` attribute.
+        classes: Elements keyed by each of their classes.
+        names: Elements keyed by tag name.
+    """
+
+    def __init__(self: "ElementIndex", soup: Any) -> None:  # noqa: ANN401
+        """Index every element below ``soup``.
+
+        Args:
+            soup: Parsed document tree.
+        """
+
+        self.ids: ElementMap = {}
+        self.classes: ElementMap = {}
+        self.names: ElementMap = {}
+
+        for tag in soup.find_all():
+            self.names.setdefault(tag.name, []).append(tag)
+
+            # Identifiers are usually unique but the first one wins.
+            tag_id = tag.get("id")
+            if tag_id:
+                self.ids.setdefault(tag_id, []).append(tag)
+
+            for cls in tag.get("class", []):
+                self.classes.setdefault(cls, []).append(tag)
+
+    def by_id(
+        self: "ElementIndex", element_id: str, name: str | None = None
+    ) -> Any:  # noqa: ANN401
+        """Return the first element with the given identifier.
+
+        Args:
+            element_id: Value of the ``id`` attribute.
+            name: Tag name the element must have, if any.
+
+        Returns:
+            The matching element or ``None``.
+        """
+
+        for tag in self.ids.get(element_id, []):
+            if name is None or tag.name == name:
+                return tag
+        return None
+
+    def by_class(
+        self: "ElementIndex", cls: str, name: str | None = None
+    ) -> list[Any]:
+        """Return all elements carrying the given class.
+
+        Args:
+            cls: Class to look up.
+            name: Tag name the elements must have, if any.
+
+        Returns:
+            Matching elements in document order.
+        """
+
+        tags = self.classes.get(cls, [])
+        if name is None:
+            return list(tags)
+        return [tag for tag in tags if tag.name == name]
+
+    def by_name(self: "ElementIndex", name: str) -> list[Any]:
+        """Return all elements with the given tag name.
+
+        Args:
+            name: Tag name to look up.
+
+        Returns:
+            Matching elements in document order.
+        """
+
+        return list(self.names.get(name, []))
+
+    def first(self: "ElementIndex", name: str) -> Any:  # noqa: ANN401
+        """Return the first element with the given tag name.
+
+        Args:
+            name: Tag name to look up.
+
+        Returns:
+            The first matching element or ``None``.
+        """
+
+        tags = self.names.get(name)
+        return tags[0] if tags else None
@@ -0,0 +1,75 @@
+"""Select the tree builder used to turn HTML into a searchable tree."""
+
+from __future__ import annotations
+
+import importlib.util
+from typing import Any
+
+from bs4 import BeautifulSoup
+
+# Name of the tree builder used when the caller does not pick one.
+DEFAULT_ENGINE = "html.parser"
+
+# Supported tree builders mapped to the module each one needs installed.
+ENGINE_MODULES: dict[str, str | None] = {
+    "html.parser": None,
+    "lxml": "lxml",
+}
+
+
+def available_engines() -> list[str]:
+    """Return the tree builders that can be used in this environment.
+
+    Returns:
+        Engine names whose optional dependencies are installed, with the
+        default engine first.
+    """
+
+    engines: list[str] = []
+    for name, module in ENGINE_MODULES.items():
+        # Builders without a module requirement are always available.
+        if module is None or importlib.util.find_spec(module) is not None:
+            engines.append(name)
+    return engines
+
+
+def make_soup(html: str, engine: str = DEFAULT_ENGINE) -> Any:  # noqa: ANN401
+    """Build a searchable tree for ``html`` using ``engine``.
+
+    All engines expose the same BeautifulSoup API, so the extraction code
+    in the parser runs unchanged on top of them. The ``lxml`` engine keeps
+    the native lxml tree behind a thin adapter instead of converting it
+    into BeautifulSoup objects, which makes it considerably faster on
+    large pages.
+
+    Args:
+        html: Raw HTML content to parse.
+        engine: Name of the tree builder to use.
+
+    Returns:
+        The parsed document tree.
+
+    Throws:
+        ValueError: If the engine is unknown or its dependency is missing.
+    """
+
+    # Reject names that are not part of the supported set.
+    if engine not in ENGINE_MODULES:
+        raise ValueError(
+            f"Unknown parser engine: {engine}. "
+            f"Expected one of: {', '.join(ENGINE_MODULES)}"
+        )
+
+    # Report a missing optional dependency with an installation hint.
+    if engine not in available_engines():
+        raise ValueError(
+            f"The {engine} parser engine is not installed. "
+            f"Install it with `pip install leropa[{engine}]`."
+        )
+
+    if engine == "lxml":
+        from .lxml_tree import parse_lxml
+
+        return parse_lxml(html)
+
+    return BeautifulSoup(html, engine)
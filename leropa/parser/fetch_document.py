@@ -2,40 +2,195 @@
 
 from __future__ import annotations
 
+import io
 from pathlib import Path
-from typing import Any
-
-import requests  # type: ignore[import-untyped]
+from typing import IO, Any
 
+from .engine import DEFAULT_ENGINE
+from .fetcher import Fetcher
+from .html_cache import HtmlCache
 from .parse_html import parse_html
+from .result_cache import ResultCache, result_key
 
 CACHE_DIR = Path.home() / ".leropa"
 
+# Fetcher shared by calls that do not pass their own, created on first use.
+_DEFAULT_FETCHER: Fetcher | None = None
+
+
+def default_fetcher() -> Fetcher:
+    """Return the fetcher shared by calls that do not pass their own.
+
+    Returns:
+        Process-wide fetcher keeping its connections open between calls.
+    """
+
+    global _DEFAULT_FETCHER
+    if _DEFAULT_FETCHER is None:
+        _DEFAULT_FETCHER = Fetcher()
+    return _DEFAULT_FETCHER
+
+
+def _cached_store(
+    ver_id: str,
+    cache_dir: Path | None,
+    fetcher: Fetcher | None,
+    revalidate: bool,
+) -> HtmlCache:
+    """Open the HTML cache, downloading the page unless already present.
+
+    Args:
+        ver_id: Identifier for the document version to fetch.
+        cache_dir: Directory used for caching downloaded HTML files.
+        fetcher: Downloader to use instead of the shared one.
+        revalidate: Ask the server whether a cached page is still current.
+
+    Returns:
+        The open cache, holding the page of ``ver_id``.
+    """
+
+    store = HtmlCache(cache_dir or CACHE_DIR)
+    try:
+        cached = ver_id in store
+        if cached and not revalidate:
+            return store
+
+        # Cached pages are only downloaded again when they changed.
+        etag, last_modified = (
+            store.validators(ver_id) if cached else (None, None)
+        )
+        fetcher = fetcher or default_fetcher()
+        page = fetcher.fetch(ver_id, etag, last_modified)
+        if page is not None:
+            store.put(ver_id, page.text, page.etag, page.last_modified)
+    except BaseException:
+        store.close()
+        raise
+    return store
+
+
+def fetch_html(
+    ver_id: str,
+    cache_dir: Path | None = None,
+    fetcher: Fetcher | None = None,
+    revalidate: bool = False,
+) -> str:
+    """Return document HTML, downloading it into the cache if needed.
+
+    Args:
+        ver_id: Identifier for the document version to fetch.
+        cache_dir: Directory used for caching downloaded HTML files.
+        fetcher: Downloader to use instead of the shared one.
+        revalidate: Ask the server whether a cached page is still current.
+
+    Returns:
+        Page content.
+    """
+
+    with _cached_store(ver_id, cache_dir, fetcher, revalidate) as store:
+        return store.get(ver_id) or ""
+
+
+def open_html(
+    ver_id: str,
+    cache_dir: Path | None = None,
+    fetcher: Fetcher | None = None,
+    revalidate: bool = False,
+) -> IO[str]:
+    """Open document HTML as a text stream, downloading it if needed.
+
+    The page is decompressed while it is read, which keeps memory use low
+    when the caller streams through it.
+
+    Args:
+        ver_id: Identifier for the document version to fetch.
+        cache_dir: Directory used for caching downloaded HTML files.
+        fetcher: Downloader to use instead of the shared one.
+        revalidate: Ask the server whether a cached page is still current.
+
+    Returns:
+        Text stream over the page; the caller closes it.
+    """
+
+    with _cached_store(ver_id, cache_dir, fetcher, revalidate) as store:
+        stream = store.open(ver_id)
+    return stream or io.StringIO()
+
 
 def fetch_document(
-    ver_id: str, cache_dir: Path | None = None
+    ver_id: str,
+    cache_dir: Path | None = None,
+    engine: str = DEFAULT_ENGINE,
+    use_parsed_cache: bool = True,
+    fetcher: Fetcher | None = None,
+    revalidate: bool = False,
 ) -> dict[str, Any]:
     """Fetch document HTML, using local cache when possible.
 
+    Parsed documents are cached as well, keyed by the content of the HTML
+    and a fingerprint of the parser code, so converting a document again
+    only costs loading the stored result.
+
     Args:
         ver_id: Identifier for the document version to fetch.
         cache_dir: Directory used for caching downloaded HTML files.
+        engine: Tree builder used to parse the HTML.
+        use_parsed_cache: Reuse and store parsed documents.
+        fetcher: Downloader to use instead of the shared one.
+        revalidate: Ask the server whether a cached page is still current.
 
     Returns:
         Parsed document structure.
     """
 
     cache_dir = cache_dir or CACHE_DIR
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    cache_file = cache_dir / f"{ver_id}.html"
-
-    if cache_file.exists():
-        html = cache_file.read_text(encoding="utf-8")
-    else:
-        url = f"https://legislatie.just.ro/Public/DetaliiDocument/{ver_id}"
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        html = response.text
-        cache_file.write_text(html, encoding="utf-8")
-
-    return parse_html(html, ver_id)
+    html = fetch_html(ver_id, cache_dir, fetcher, revalidate)
+    return parse_cached(html, ver_id, cache_dir, engine, use_parsed_cache)
+
+
+def cached_html(ver_id: str, cache_dir: Path | None = None) -> str | None:
+    """Return document HTML if it is already cached.
+
+    Args:
+        ver_id: Identifier for the document version.
+        cache_dir: Directory used for caching downloaded HTML files.
+
+    Returns:
+        Page content, or ``None`` if the page was never downloaded.
+    """
+
+    with HtmlCache(cache_dir or CACHE_DIR) as store:
+        return store.get(ver_id)
+
+
+def parse_cached(
+    html: str,
+    ver_id: str,
+    cache_dir: Path | None = None,
+    engine: str = DEFAULT_ENGINE,
+    use_parsed_cache: bool = True,
+) -> dict[str, Any]:
+    """Parse document HTML, reusing a stored result when available.
+
+    Args:
+        html: Page content.
+        ver_id: Identifier for the document version.
+        cache_dir: Directory holding the parsed-result cache.
+        engine: Tree builder used to parse the HTML.
+        use_parsed_cache: Reuse and store parsed documents.
+
+    Returns:
+        Parsed document structure.
+    """
+
+    if not use_parsed_cache:
+        return parse_html(html, ver_id, engine=engine)
+
+    # Only parse when no result is stored for this exact HTML.
+    results = ResultCache(cache_dir or CACHE_DIR)
+    key = result_key(html.encode("utf-8"), ver_id, engine)
+    doc = results.load(key)
+    if doc is None:
+        doc = parse_html(html, ver_id, engine=engine)
+        results.store(key, doc)
+    return doc
@@ -0,0 +1,322 @@
+"""Fetch and parse many document versions concurrently."""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from pathlib import Path
+from typing import AsyncIterator, Iterable
+from urllib.parse import urlsplit
+
+from .document_result import DocumentResult
+from .engine import DEFAULT_ENGINE
+from .fetch_document import CACHE_DIR, cached_html, fetch_html, parse_cached
+from .fetcher import Fetcher
+from .rate_limit import TokenBucket
+
+# Rate limiters keyed by the host they guard.
+BucketMap = dict[str, TokenBucket]
+
+# Downloads started per second and per host when the caller sets no rate.
+DEFAULT_RATE = 2.0
+
+
+class _Downloader:
+    """Download pages concurrently within per-host rate limits.
+
+    Attributes:
+        fetcher: Downloader shared by all worker threads.
+        cache_dir: Directory used for caching downloaded HTML files.
+    """
+
+    def __init__(
+        self: "_Downloader",
+        fetcher: Fetcher,
+        cache_dir: Path,
+        concurrency: int,
+        rate: float,
+        burst: int,
+    ) -> None:
+        """Initialize the downloader.
+
+        Args:
+            fetcher: Downloader shared by all worker threads.
+            cache_dir: Directory used for caching downloaded HTML files.
+            concurrency: Maximum number of downloads in flight.
+            rate: Downloads started per second and per host.
+            burst: Downloads a host may receive back to back.
+        """
+
+        self.fetcher = fetcher
+        self.cache_dir = cache_dir
+        self._rate = rate
+        self._burst = burst
+        self._buckets: BucketMap = {}
+        self._slots = asyncio.Semaphore(concurrency)
+        self._threads = ThreadPoolExecutor(max_workers=concurrency)
+
+    def close(self: "_Downloader") -> None:
+        """Stop the worker threads."""
+
+        self._threads.shutdown(wait=True)
+
+    def _bucket(self: "_Downloader", ver_id: str) -> TokenBucket:
+        """Return the rate limiter of the host serving ``ver_id``.
+
+        Args:
+            ver_id: Identifier for the document version.
+
+        Returns:
+            Token bucket shared by all pages of the same host.
+        """
+
+        host = urlsplit(self.fetcher.url(ver_id)).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(self._rate, self._burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    async def html(self: "_Downloader", ver_id: str) -> str:
+        """Return the page of ``ver_id``, downloading it if needed.
+
+        Cached pages are served without touching the rate limit.
+
+        Args:
+            ver_id: Identifier for the document version.
+
+        Returns:
+            Page content.
+        """
+
+        loop = asyncio.get_running_loop()
+        async with self._slots:
+            html = await loop.run_in_executor(
+                self._threads, cached_html, ver_id, self.cache_dir
+            )
+            if html is not None:
+                return html
+
+            await self._bucket(ver_id).acquire()
+            return await loop.run_in_executor(
+                self._threads, fetch_html, ver_id, self.cache_dir, self.fetcher
+            )
+
+
+class DocumentPipeline:
+    """Download and parse document versions as they are submitted.
+
+    Up to ``concurrency`` pages are downloaded at the same time, and new
+    downloads to the same host start at no more than ``rate`` per second.
+    Each page is handed to a pool of worker processes for parsing as soon
+    as it arrives, while the remaining downloads carry on. Versions can be
+    submitted while results are being consumed; each identifier is only
+    processed once.
+
+    Use the pipeline as an asynchronous context manager so the worker
+    threads and processes are released.
+
+    Attributes:
+        cache_dir: Directory used for caching downloaded HTML files.
+        engine: Tree builder used to parse the HTML.
+        use_parsed_cache: Reuse and store parsed documents.
+        seen: Identifiers submitted so far, in submission order.
+    """
+
+    def __init__(
+        self: "DocumentPipeline",
+        concurrency: int = 4,
+        cache_dir: Path | None = None,
+        engine: str = DEFAULT_ENGINE,
+        use_parsed_cache: bool = True,
+        rate: float = DEFAULT_RATE,
+        burst: int = 1,
+        workers: int | None = None,
+        fetcher: Fetcher | None = None,
+        executor: Executor | None = None,
+    ) -> None:
+        """Initialize the pipeline.
+
+        Args:
+            concurrency: Maximum number of downloads in flight.
+            cache_dir: Directory used for caching downloaded HTML files.
+            engine: Tree builder used to parse the HTML.
+            use_parsed_cache: Reuse and store parsed documents.
+            rate: Downloads started per second and per host.
+            burst: Downloads a host may receive back to back.
+            workers: Number of parsing processes; defaults to the CPU
+                count.
+            fetcher: Downloader to use instead of a new pooled one.
+            executor: Pool used for parsing instead of new worker
+                processes.
+        """
+
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.engine = engine
+        self.use_parsed_cache = use_parsed_cache
+        self.seen: dict[str, None] = {}
+
+        self._own_fetcher = fetcher is None
+        self._fetcher = fetcher or Fetcher(pool_size=concurrency)
+        self._own_executor = executor is None
+        if executor is None:
+            # Worker processes are spawned rather than forked because the
+            # download threads are already running.
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        self._executor = executor
+        self._downloader = _Downloader(
+            self._fetcher, self.cache_dir, concurrency, rate, burst
+        )
+        self._pending: set[asyncio.Future[DocumentResult]] = set()
+
+    async def __aenter__(self: "DocumentPipeline") -> "DocumentPipeline":
+        """Return the pipeline for use in an ``async with`` block."""
+
+        return self
+
+    async def __aexit__(
+        self: "DocumentPipeline",
+        *exc_info: object,
+    ) -> None:
+        """Release the pipeline when leaving an ``async with`` block."""
+
+        await self.aclose()
+
+    async def aclose(self: "DocumentPipeline") -> None:
+        """Cancel unfinished work and release threads and processes."""
+
+        for task in self._pending:
+            task.cancel()
+        await asyncio.gather(*self._pending, return_exceptions=True)
+        self._pending.clear()
+
+        self._downloader.close()
+        if self._own_executor:
+            self._executor.shutdown(wait=True)
+        if self._own_fetcher:
+            self._fetcher.close()
+
+    def submit(self: "DocumentPipeline", ver_id: str) -> bool:
+        """Schedule a document version unless it was submitted before.
+
+        Args:
+            ver_id: Identifier for the document version.
+
+        Returns:
+            ``True`` if the version was scheduled, ``False`` if it was
+            already known.
+        """
+
+        if ver_id in self.seen:
+            return False
+        self.seen[ver_id] = None
+        self._pending.add(asyncio.ensure_future(self._process(ver_id)))
+        return True
+
+    async def _process(
+        self: "DocumentPipeline", ver_id: str
+    ) -> DocumentResult:
+        """Download and parse one document version.
+
+        Args:
+            ver_id: Identifier for the document version.
+
+        Returns:
+            The outcome for the version.
+        """
+
+        loop = asyncio.get_running_loop()
+        try:
+            html = await self._downloader.html(ver_id)
+            doc = await loop.run_in_executor(
+                self._executor,
+                parse_cached,
+                html,
+                ver_id,
+                self.cache_dir,
+                self.engine,
+                self.use_parsed_cache,
+            )
+        except Exception as exc:
+            # Failures are reported per document instead of aborting.
+            return DocumentResult(ver_id=ver_id, error=str(exc))
+        return DocumentResult(ver_id=ver_id, document=doc)
+
+    async def results(
+        self: "DocumentPipeline",
+    ) -> AsyncIterator[DocumentResult]:
+        """Yield outcomes as they complete until nothing is pending.
+
+        Versions submitted while iterating are waited for as well.
+
+        Yields:
+            The outcome of each submitted version.
+        """
+
+        while self._pending:
+            done, self._pending = await asyncio.wait(
+                self._pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield task.result()
+
+
+async def fetch_documents(
+    ver_ids: Iterable[str],
+    concurrency: int = 4,
+    cache_dir: Path | None = None,
+    engine: str = DEFAULT_ENGINE,
+    use_parsed_cache: bool = True,
+    rate: float = DEFAULT_RATE,
+    burst: int = 1,
+    workers: int | None = None,
+    fetcher: Fetcher | None = None,
+    executor: Executor | None = None,
+) -> AsyncIterator[DocumentResult]:
+    """Fetch and parse document versions concurrently.
+
+    Downloads and parsing run in a ``DocumentPipeline``. Results are
+    yielded in completion order; failures are reported in the result
+    instead of stopping the other documents.
+
+    Args:
+        ver_ids: Identifiers of the document versions. Repeated
+            identifiers are fetched once.
+        concurrency: Maximum number of downloads in flight.
+        cache_dir: Directory used for caching downloaded HTML files.
+        engine: Tree builder used to parse the HTML.
+        use_parsed_cache: Reuse and store parsed documents.
+        rate: Downloads started per second and per host.
+        burst: Downloads a host may receive back to back.
+        workers: Number of parsing processes; defaults to the CPU count.
+        fetcher: Downloader to use instead of a new pooled one.
+        executor: Pool used for parsing instead of new worker processes.
+
+    Yields:
+        The outcome of each document version as soon as it is known.
+    """
+
+    pipeline = DocumentPipeline(
+        concurrency=concurrency,
+        cache_dir=cache_dir,
+        engine=engine,
+        use_parsed_cache=use_parsed_cache,
+        rate=rate,
+        burst=burst,
+        workers=workers,
+        fetcher=fetcher,
+        executor=executor,
+    )
+    async with pipeline:
+        for ver_id in ver_ids:
+            pipeline.submit(ver_id)
+        async for result in pipeline.results():
+            yield result
@@ -0,0 +1,21 @@
+"""Document page downloaded from the portal."""
+
+from __future__ import annotations
+
+from attrs import define
+
+
+@define(slots=True)
+class FetchedPage:
+    """Document page downloaded from the portal.
+
+    Attributes:
+        text: Decoded page content.
+        etag: Value of the ``ETag`` response header, if any.
+        last_modified: Value of the ``Last-Modified`` response header, if
+            any.
+    """
+
+    text: str
+    etag: str | None = None
+    last_modified: str | None = None
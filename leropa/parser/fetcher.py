@@ -0,0 +1,214 @@
+"""Download document pages over pooled, retrying HTTP connections."""
+
+from __future__ import annotations
+
+import email.utils
+import logging
+import time
+from typing import Callable
+
+import requests  # type: ignore[import-untyped]
+from requests.adapters import HTTPAdapter  # type: ignore[import-untyped]
+
+from .fetched_page import FetchedPage
+
+# Function used to wait between attempts; replaced in tests.
+SleepFunc = Callable[[float], None]
+
+# Address of the page of a document version, without the identifier.
+BASE_URL = "https://legislatie.just.ro/Public/DetaliiDocument/"
+
+# Content codings accepted from the server; requests decodes them.
+ACCEPT_ENCODING = "gzip, deflate"
+
+# Response statuses worth retrying: throttling and server-side failures.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Transport errors worth retrying.
+_RETRY_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+logger = logging.getLogger(__name__)
+
+
+class Fetcher:
+    """Download document pages over pooled, retrying HTTP connections.
+
+    One ``requests`` session is kept for the lifetime of the fetcher, so
+    consecutive downloads reuse open keep-alive connections. Compressed
+    transfer is requested explicitly, cached pages can be revalidated
+    with their ``ETag`` and ``Last-Modified`` values, and throttled or
+    failed requests are retried with a bounded exponential backoff.
+
+    Attributes:
+        base_url: Address of a document page without the identifier.
+        timeout: Seconds to wait for the server on each attempt.
+        max_retries: Number of retries after the first attempt.
+        backoff: Delay before the first retry, doubled on each retry.
+        max_backoff: Upper bound for the delay between attempts.
+        session: HTTP session holding the connection pool.
+    """
+
+    def __init__(
+        self: "Fetcher",
+        base_url: str = BASE_URL,
+        timeout: float = 30,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_backoff: float = 8,
+        pool_size: int = 10,
+        session: requests.Session | None = None,
+        sleep: SleepFunc = time.sleep,
+    ) -> None:
+        """Initialize the fetcher.
+
+        Args:
+            base_url: Address of a document page without the identifier.
+            timeout: Seconds to wait for the server on each attempt.
+            max_retries: Number of retries after the first attempt.
+            backoff: Delay before the first retry, doubled on each retry.
+            max_backoff: Upper bound for the delay between attempts.
+            pool_size: Number of connections kept open per host.
+            session: Session to use instead of a new pooled one.
+            sleep: Function used to wait between attempts.
+        """
+
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_size, pool_maxsize=pool_size
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        self.session = session
+
+    def close(self: "Fetcher") -> None:
+        """Close the pooled connections."""
+
+        self.session.close()
+
+    def __enter__(self: "Fetcher") -> "Fetcher":
+        """Return the fetcher for use in a ``with`` block."""
+
+        return self
+
+    def __exit__(self: "Fetcher", *exc_info: object) -> None:
+        """Close the fetcher when leaving a ``with`` block."""
+
+        self.close()
+
+    def url(self: "Fetcher", ver_id: str) -> str:
+        """Return the address of the page of ``ver_id``.
+
+        Args:
+            ver_id: Identifier for the document version.
+
+        Returns:
+            Absolute URL of the page.
+        """
+
+        return f"{self.base_url}{ver_id}"
+
+    def _delay(
+        self: "Fetcher", attempt: int, response: requests.Response | None
+    ) -> float:
+        """Return how long to wait before the next attempt.
+
+        Args:
+            attempt: Number of the attempt that just failed, from zero.
+            response: Response of the failed attempt, if any.
+
+        Returns:
+            Delay in seconds, never above ``max_backoff``.
+        """
+
+        delay = self.backoff * (2**attempt)
+
+        # Honour the delay asked for by the server, within the bound.
+        # Error responses are falsy, so compare with ``None`` explicitly.
+        retry_after = (
+            response.headers.get("Retry-After")
+            if response is not None
+            else None
+        )
+        if retry_after:
+            if retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            else:
+                # Malformed dates keep the backoff delay.
+                try:
+                    when = email.utils.parsedate_to_datetime(retry_after)
+                except (TypeError, ValueError):
+                    when = None
+                if when is not None:
+                    delay = max(delay, when.timestamp() - time.time())
+        return min(max(delay, 0.0), self.max_backoff)
+
+    def fetch(
+        self: "Fetcher",
+        ver_id: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> FetchedPage | None:
+        """Download the page of ``ver_id``.
+
+        Args:
+            ver_id: Identifier for the document version.
+            etag: ``ETag`` of a cached copy to revalidate.
+            last_modified: ``Last-Modified`` value of a cached copy.
+
+        Returns:
+            The downloaded page, or ``None`` if the server confirmed that
+            the cached copy is still current.
+
+        Throws:
+            requests.HTTPError: If the server answers with an error status,
+                after the retries for transient errors are used up.
+            requests.RequestException: If the server cannot be reached
+                after the retries are used up.
+        """
+
+        headers: dict[str, str] = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        url = self.url(ver_id)
+        attempt = 0
+        while True:
+            response: requests.Response | None = None
+            try:
+                response = self.session.get(
+                    url, headers=headers, timeout=self.timeout
+                )
+            except _RETRY_ERRORS:
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    break
+                if attempt >= self.max_retries:
+                    break
+
+            # Wait before trying again, longer after each failure.
+            delay = self._delay(attempt, response)
+            logger.debug("Retrying %s in %.1fs", url, delay)
+            self._sleep(delay)
+            attempt += 1
+
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        return FetchedPage(
+            text=response.text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
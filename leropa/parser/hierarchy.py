@@ -0,0 +1,641 @@
+"""Build the book, title, chapter and section hierarchy in a single pass."""
+
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from attrs import define
+
+from .book import Book
+from .chapter import Chapter
+from .section import Section
+from .title import Title
+
+DEFAULT_BOOK_ID = "default_book"
+DEFAULT_CHAPTER_ID = "default_chapter"
+
+# Open container bodies keyed by their class, innermost last.
+OpenBodies = dict[str, list["ContainerInfo"]]
+
+# Most recent label or description span seen for each class.
+LastSeen = dict[str, Any]
+
+# Article tags paired with the containers enclosing them.
+ArticleTagList = list[tuple[Any, "ArticleContainers"]]
+
+# Identifiers already attached to a list, keyed by owner and list name.
+Membership = dict[tuple[int, str], set[str]]
+
+# Body classes of the containers, with the classes of the spans holding
+# their label and description. Points carry their description inline.
+_CONTAINER_CLASSES = {
+    "S_CRT_BDY": ("S_CRT_TTL", "S_CRT_DEN"),
+    "S_TTL_BDY": ("S_TTL_TTL", "S_TTL_DEN"),
+    "S_CAP_BDY": ("S_CAP_TTL", "S_CAP_DEN"),
+    "S_SEC_BDY": ("S_SEC_TTL", "S_SEC_DEN"),
+    "S_PCT_BDY": ("S_PCT_TTL", None),
+    "S_SSEC_BDY": ("S_SSEC_TTL", "S_SSEC_DEN"),
+}
+
+# Label and description classes whose latest occurrence is tracked.
+_MARKER_CLASSES = frozenset(
+    cls
+    for pair in _CONTAINER_CLASSES.values()
+    for cls in pair
+    if cls is not None
+)
+
+# Numeric section titles such as "1.2." that imply nesting.
+_NUMERIC_TITLE = re.compile(r"(\d+(?:\.\d+)*)\.?")
+
+
+@define(slots=True)
+class ContainerInfo:
+    """Identifier and labels of a container body found in the HTML.
+
+    Attributes:
+        container_id: Identifier of the container body.
+        title: Text of the closest preceding label span.
+        description: Text of the closest preceding description span, or
+            the direct text of a point body.
+    """
+
+    container_id: str
+    title: str
+    description: str | None = None
+
+
+@define(slots=True)
+class ArticleContainers:
+    """Closest container bodies enclosing an article.
+
+    Attributes:
+        book: Enclosing book body.
+        title: Enclosing title body.
+        chapter: Enclosing chapter body.
+        section: Enclosing section body, or point body when there is none.
+        subsection: Enclosing subsection body.
+    """
+
+    book: ContainerInfo | None = None
+    title: ContainerInfo | None = None
+    chapter: ContainerInfo | None = None
+    section: ContainerInfo | None = None
+    subsection: ContainerInfo | None = None
+
+
+def _container_info(
+    body: Any,  # noqa: ANN401
+    body_class: str,
+    last_seen: LastSeen,
+) -> ContainerInfo:
+    """Describe a container body from the labels seen before it.
+
+    Args:
+        body: Container body tag.
+        body_class: Class identifying the kind of container.
+        last_seen: Latest label and description spans seen so far.
+
+    Returns:
+        Identifier, label and description of the container.
+    """
+
+    title_class, desc_class = _CONTAINER_CLASSES[body_class]
+    title_tag = last_seen.get(title_class)
+    title = title_tag.get_text(strip=True) if title_tag else ""
+
+    # Points keep their description as direct text inside the body.
+    if desc_class is None:
+        desc_text = body.find(string=True, recursive=False)
+        description = desc_text.strip() if desc_text else None
+    else:
+        desc_tag = last_seen.get(desc_class)
+        description = desc_tag.get_text(strip=True) if desc_tag else None
+
+    return ContainerInfo(
+        container_id=body.get("id", ""),
+        title=title,
+        description=description,
+    )
+
+
+def _innermost(open_bodies: OpenBodies, cls: str) -> ContainerInfo | None:
+    """Return the innermost open body of the given class.
+
+    Args:
+        open_bodies: Open container bodies keyed by class.
+        cls: Body class to look up.
+
+    Returns:
+        The innermost open body, or ``None`` when none is open.
+    """
+
+    stack = open_bodies.get(cls)
+    return stack[-1] if stack else None
+
+
+def collect_articles(soup: Any) -> ArticleTagList:  # noqa: ANN401
+    """Walk the document once, pairing each article with its containers.
+
+    The walk keeps a stack of open container bodies per class and the most
+    recent label and description spans, which are the ones a backwards
+    search from a container body would find. It uses an explicit stack
+    rather than recursion, so deeply nested markup does not exhaust the
+    interpreter stack, and it descends into articles, so nested articles
+    are collected too.
+
+    Args:
+        soup: Parsed document tree.
+
+    Returns:
+        Article tags in document order with their enclosing containers.
+    """
+
+    articles: ArticleTagList = []
+    open_bodies: OpenBodies = {cls: [] for cls in _CONTAINER_CLASSES}
+    last_seen: LastSeen = {}
+
+    # Tags still to visit, last one first. A list of classes marks the end
+    # of a span and names the container bodies to close there.
+    pending: list[Any] = [soup]
+    while pending:
+        tag = pending.pop()
+        if isinstance(tag, list):
+            for cls in tag:
+                open_bodies[cls].pop()
+            continue
+
+        if tag.name == "span":
+            classes = tag.get("class", [])
+
+            # Remember labels and descriptions for the bodies that follow.
+            for cls in classes:
+                if cls in _MARKER_CLASSES:
+                    last_seen[cls] = tag
+
+            # Pair the article with the bodies around it.
+            if "S_ART" in classes:
+                section = _innermost(open_bodies, "S_SEC_BDY")
+                if section is None:
+                    section = _innermost(open_bodies, "S_PCT_BDY")
+                containers = ArticleContainers(
+                    book=_innermost(open_bodies, "S_CRT_BDY"),
+                    title=_innermost(open_bodies, "S_TTL_BDY"),
+                    chapter=_innermost(open_bodies, "S_CAP_BDY"),
+                    section=section,
+                    subsection=_innermost(open_bodies, "S_SSEC_BDY"),
+                )
+                articles.append((tag, containers))
+
+            # Open the container bodies this span represents until its
+            # descendants were visited.
+            opened = [cls for cls in classes if cls in _CONTAINER_CLASSES]
+            for cls in opened:
+                open_bodies[cls].append(_container_info(tag, cls, last_seen))
+            if opened:
+                pending.append(opened)
+
+        # Text nodes are strings with both engines and hold no spans.
+        children = [c for c in tag.children if not isinstance(c, str)]
+        pending.extend(reversed(children))
+    return articles
+
+
+class HierarchyBuilder:
+    """Incrementally attach articles to books, titles, chapters and sections.
+
+    Containers are created the first time an article inside them is seen
+    and linked to their parents following the same rules the parser has
+    always used, including placeholder books and chapters for orphaned
+    containers and nesting of numerically titled sections. Membership of
+    each child list is tracked in a set so every step is constant time.
+
+    Attributes:
+        books: Books keyed by identifier, in creation order.
+        titles: Titles keyed by identifier.
+        chapters: Chapters keyed by identifier.
+        sections: Sections and subsections keyed by identifier.
+        section_titles: Sections keyed by their numeric title.
+    """
+
+    def __init__(self: "HierarchyBuilder") -> None:
+        """Initialize empty registries."""
+
+        self.books: dict[str, Book] = {}
+        self.titles: dict[str, Title] = {}
+        self.chapters: dict[str, Chapter] = {}
+        self.sections: dict[str, Section] = {}
+        self.section_titles: dict[str, Section] = {}
+        self._members: Membership = {}
+
+    def _has(
+        self: "HierarchyBuilder",
+        owner: object,
+        field_name: str,
+        child_id: str,
+    ) -> bool:
+        """Return ``True`` if ``child_id`` is listed in ``owner``.
+
+        Args:
+            owner: Container holding the child list.
+            field_name: Name of the child list.
+            child_id: Identifier of the child.
+
+        Returns:
+            Whether the child is already attached.
+        """
+
+        members = self._members.get((id(owner), field_name))
+        return members is not None and child_id in members
+
+    def _attach(
+        self: "HierarchyBuilder",
+        owner: object,
+        field_name: str,
+        child: object,
+        child_id: str,
+    ) -> None:
+        """Append ``child`` to a list of ``owner`` and record it.
+
+        Args:
+            owner: Container holding the child list.
+            field_name: Name of the child list.
+            child: Object to append.
+            child_id: Identifier of the child.
+        """
+
+        getattr(owner, field_name).append(child)
+        self._members.setdefault((id(owner), field_name), set()).add(child_id)
+
+    def _detach(
+        self: "HierarchyBuilder",
+        owner: object,
+        field_name: str,
+        child: object,
+        child_id: str,
+    ) -> None:
+        """Remove ``child`` from a list of ``owner`` if it is attached.
+
+        Args:
+            owner: Container holding the child list.
+            field_name: Name of the child list.
+            child: Object to remove.
+            child_id: Identifier of the child.
+        """
+
+        if self._has(owner, field_name, child_id):
+            getattr(owner, field_name).remove(child)
+            self._members[(id(owner), field_name)].discard(child_id)
+
+    def _default_book(self: "HierarchyBuilder") -> Book:
+        """Return a placeholder book when the source lacks one.
+
+        Returns:
+            Placeholder book instance.
+        """
+
+        # Retrieve the existing placeholder book if present.
+        book = self.books.get(DEFAULT_BOOK_ID)
+        if book is None:
+            # Create a new empty book to attach orphaned structures.
+            book = Book(book_id=DEFAULT_BOOK_ID, title="")
+            self.books[DEFAULT_BOOK_ID] = book
+
+        return book
+
+    def _default_chapter(self: "HierarchyBuilder") -> Chapter:
+        """Return a placeholder chapter when the source lacks one.
+
+        Returns:
+            Placeholder chapter instance.
+        """
+
+        # Retrieve the existing placeholder chapter if present.
+        chapter = self.chapters.get(DEFAULT_CHAPTER_ID)
+        if chapter is None:
+            # Create a new empty chapter to host orphaned sections.
+            chapter = Chapter(
+                chapter_id=DEFAULT_CHAPTER_ID, title="", description=None
+            )
+            self.chapters[DEFAULT_CHAPTER_ID] = chapter
+
+        return chapter
+
+    def _book(
+        self: "HierarchyBuilder", info: ContainerInfo | None
+    ) -> Book | None:
+        """Retrieve or create the book described by ``info``.
+
+        Args:
+            info: Enclosing book body, if any.
+
+        Returns:
+            Book instance, or ``None`` when the article has no book.
+        """
+
+        if info is None:
+            return None
+
+        # Use the book body identifier to deduplicate books.
+        book = self.books.get(info.container_id)
+        if book is None:
+            book = Book(
+                book_id=info.container_id,
+                title=info.title,
+                description=info.description,
+            )
+            self.books[info.container_id] = book
+        return book
+
+    def _title(
+        self: "HierarchyBuilder",
+        info: ContainerInfo | None,
+        book: Book | None,
+    ) -> Title | None:
+        """Retrieve or create the title described by ``info``.
+
+        Args:
+            info: Enclosing title body, if any.
+            book: Parent book instance if available.
+
+        Returns:
+            Title instance, or ``None`` when the article has no title.
+        """
+
+        if info is None:
+            return None
+
+        # Use the title body identifier to deduplicate titles.
+        title_id = info.container_id
+        title_obj = self.titles.get(title_id)
+        if title_obj is None:
+            title_obj = Title(
+                title_id=title_id,
+                title=info.title,
+                description=info.description,
+            )
+            self.titles[title_id] = title_obj
+
+        # Attach the title to the parent book if needed.
+        if book and not self._has(book, "titles", title_id):
+            self._attach(book, "titles", title_obj, title_id)
+
+        return title_obj
+
+    def _chapter(
+        self: "HierarchyBuilder",
+        info: ContainerInfo | None,
+        title: Title | None,
+        book: Book | None,
+    ) -> Chapter | None:
+        """Retrieve or create the chapter described by ``info``.
+
+        Args:
+            info: Enclosing chapter body, if any.
+            title: Parent title instance if available.
+            book: Parent book instance if available.
+
+        Returns:
+            Chapter instance, or ``None`` when the article has no chapter.
+        """
+
+        if info is None:
+            return None
+
+        # Use the chapter body identifier to deduplicate chapters.
+        chapter_id = info.container_id
+        chapter = self.chapters.get(chapter_id)
+        if chapter is None:
+            chapter = Chapter(
+                chapter_id=chapter_id,
+                title=info.title,
+                description=info.description,
+            )
+            self.chapters[chapter_id] = chapter
+
+        # Attach the chapter to the parent title or book.
+        if title and not self._has(title, "chapters", chapter_id):
+            self._attach(title, "chapters", chapter, chapter_id)
+        elif book and not self._has(book, "chapters", chapter_id):
+            self._attach(book, "chapters", chapter, chapter_id)
+
+        return chapter
+
+    def _numeric_parent(
+        self: "HierarchyBuilder", section: Section
+    ) -> Section | None:
+        """Register a numerically titled section and find its parent.
+
+        Args:
+            section: Newly created section.
+
+        Returns:
+            Section whose number is the prefix of this one, if any.
+        """
+
+        match = _NUMERIC_TITLE.fullmatch(section.title.strip())
+        if not match:
+            return None
+
+        # The nesting depth follows the number of components.
+        number = match.group(1)
+        section.level = number.count(".") + 1
+        self.section_titles[number] = section
+
+        # Find parent by removing the last component.
+        parent_key = ".".join(number.split(".")[:-1])
+        return self.section_titles.get(parent_key)
+
+    def _section(
+        self: "HierarchyBuilder",
+        info: ContainerInfo | None,
+        chapter: Chapter | None,
+        title: Title | None,
+        book: Book | None,
+    ) -> Section | None:
+        """Retrieve or create the section described by ``info``.
+
+        Args:
+            info: Enclosing section or point body, if any.
+            chapter: Parent chapter instance if available.
+            title: Parent title instance if available.
+            book: Parent book instance if available.
+
+        Returns:
+            Section instance, or ``None`` when the article has no section.
+        """
+
+        if info is None:
+            return None
+
+        # Use the section body identifier to deduplicate sections.
+        section_id = info.container_id
+        section = self.sections.get(section_id)
+        if section is None:
+            section = Section(
+                section_id=section_id,
+                title=info.title,
+                description=info.description,
+            )
+            self.sections[section_id] = section
+
+            # Nest numerically titled sections under their parent section.
+            parent = self._numeric_parent(section)
+            if parent and not self._has(parent, "subsections", section_id):
+                self._attach(parent, "subsections", section, section_id)
+                return section
+
+        # Attach the section to the parent container only if no numeric
+        # parent was found.
+        if chapter and not self._has(chapter, "sections", section_id):
+            self._attach(chapter, "sections", section, section_id)
+        elif title and not self._has(title, "sections", section_id):
+            self._attach(title, "sections", section, section_id)
+        elif book and not self._has(book, "sections", section_id):
+            self._attach(book, "sections", section, section_id)
+
+        return section
+
+    def _subsection(
+        self: "HierarchyBuilder",
+        info: ContainerInfo | None,
+        section: Section | None,
+    ) -> Section | None:
+        """Retrieve or create the subsection described by ``info``.
+
+        Args:
+            info: Enclosing subsection body, if any.
+            section: Parent section instance if available.
+
+        Returns:
+            Subsection instance, or ``None`` when not applicable.
+        """
+
+        if not section or info is None:
+            return None
+
+        # Use the subsection body identifier to deduplicate subsections.
+        sub_id = info.container_id
+        subsection = self.sections.get(sub_id)
+        if subsection is None:
+            subsection = Section(
+                section_id=sub_id,
+                title=info.title,
+                description=info.description,
+            )
+            self.sections[sub_id] = subsection
+
+            # Nest numerically titled subsections under their parent.
+            parent = self._numeric_parent(subsection)
+            if parent and not self._has(parent, "subsections", sub_id):
+                self._attach(parent, "subsections", subsection, sub_id)
+                return subsection
+
+        # Attach the subsection to the provided parent section if no
+        # numeric parent was found.
+        if not self._has(section, "subsections", sub_id):
+            self._attach(section, "subsections", subsection, sub_id)
+
+        return subsection
+
+    def add_article(
+        self: "HierarchyBuilder",
+        article_id: str,
+        containers: ArticleContainers,
+    ) -> None:
+        """Attach an article to the containers enclosing it.
+
+        Args:
+            article_id: Identifier of the article.
+            containers: Closest container bodies enclosing the article.
+        """
+
+        # Ensure parent containers exist and retrieve them.
+        book = self._book(containers.book)
+        title_obj = self._title(containers.title, book)
+
+        # When a title is present without a book, create a placeholder book.
+        if title_obj and book is None:
+            book = self._default_book()
+
+            # Attach the title to the placeholder book if not already linked.
+            if not self._has(book, "titles", title_obj.title_id):
+                self._attach(book, "titles", title_obj, title_obj.title_id)
+
+        chapter = self._chapter(containers.chapter, title_obj, book)
+
+        # When a chapter lacks a parent book or title,
+        # create a book placeholder.
+        if chapter and not (book or title_obj):
+            book = self._default_book()
+
+            # Attach the chapter to the placeholder book if needed.
+            if not self._has(book, "chapters", chapter.chapter_id):
+                self._attach(book, "chapters", chapter, chapter.chapter_id)
+
+        section = self._section(containers.section, chapter, title_obj, book)
+
+        # Create missing hierarchy for sections without a parent chapter.
+        if section and chapter is None:
+            self._adopt_orphan_section(section, title_obj, book)
+            chapter = self.chapters[DEFAULT_CHAPTER_ID]
+
+        subsection = self._subsection(containers.subsection, section)
+
+        # Attach the article id to the deepest container available.
+        if subsection:
+            subsection.articles.append(article_id)
+        elif section:
+            section.articles.append(article_id)
+        elif chapter:
+            chapter.articles.append(article_id)
+        elif title_obj:
+            title_obj.articles.append(article_id)
+        elif book:
+            book.articles.append(article_id)
+
+    def _adopt_orphan_section(
+        self: "HierarchyBuilder",
+        section: Section,
+        title_obj: Title | None,
+        book: Book | None,
+    ) -> None:
+        """Move a section without chapter under the placeholder chapter.
+
+        Args:
+            section: Section lacking a parent chapter.
+            title_obj: Parent title instance if available.
+            book: Parent book instance if available.
+        """
+
+        # Ensure a placeholder book exists.
+        if book is None:
+            book = self._default_book()
+
+        # Create or retrieve the placeholder chapter.
+        chapter = self._default_chapter()
+
+        # Attach the chapter to the available parent container.
+        if title_obj:
+            # Link title to the placeholder book if not already done.
+            if not self._has(book, "titles", title_obj.title_id):
+                self._attach(book, "titles", title_obj, title_obj.title_id)
+
+            if not self._has(title_obj, "chapters", chapter.chapter_id):
+                self._attach(
+                    title_obj, "chapters", chapter, chapter.chapter_id
+                )
+
+            # Remove the section from the title if it was attached there.
+            self._detach(title_obj, "sections", section, section.section_id)
+        else:
+            if not self._has(book, "chapters", chapter.chapter_id):
+                self._attach(book, "chapters", chapter, chapter.chapter_id)
+
+            # Remove the section from the book if it was attached there.
+            self._detach(book, "sections", section, section.section_id)
+
+        # Finally, attach the section to the placeholder chapter.
+        if not self._has(chapter, "sections", section.section_id):
+            self._attach(chapter, "sections", section, section.section_id)
@@ -0,0 +1,583 @@
+"""Compressed, content-addressed store for downloaded document pages."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import importlib.util
+import io
+import logging
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import IO, Any
+
+from .trim_html import trim_html
+
+logger = logging.getLogger(__name__)
+
+# Name of the directory holding the store inside the cache directory.
+HTML_DIR = "html"
+
+# Name of the index database inside the store directory.
+INDEX_NAME = "index.sqlite3"
+
+# Byte budget for the compressed blobs used when neither the caller nor
+# the ``LEROPA_HTML_CACHE_MAX_BYTES`` variable sets one.
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+# Environment variable overriding ``DEFAULT_MAX_BYTES``; ``0`` turns the
+# budget off.
+MAX_BYTES_ENV = "LEROPA_HTML_CACHE_MAX_BYTES"
+
+# Seconds during which repeated reads of a blob keep its recorded access
+# time, so most cache hits do not have to write to the shared index.
+ACCESS_INTERVAL = 3600.0
+
+# Whether pages are cut down to the parsed content before they are stored
+# when the caller does not say. Can be set with ``LEROPA_HTML_CACHE_TRIM``.
+DEFAULT_TRIM = os.environ.get("LEROPA_HTML_CACHE_TRIM", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Supported compression codecs mapped to the file suffix of their blobs.
+CODEC_SUFFIXES = {"zstd": ".html.zst", "gzip": ".html.gz"}
+
+# Level used by each codec; both favour speed over the last few percent.
+_ZSTD_LEVEL = 10
+_GZIP_LEVEL = 6
+
+# Tables of the index: blobs by content digest, versions pointing at them
+# and the HTTP validators each version was served with. Several versions
+# with identical pages share one blob.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS blobs_accessed ON blobs (accessed);
+CREATE TABLE IF NOT EXISTS versions (
+    ver_id TEXT PRIMARY KEY,
+    digest TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS versions_digest ON versions (digest);
+CREATE TABLE IF NOT EXISTS validators (
+    ver_id TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT
+);
+"""
+
+
+def default_codec() -> str:
+    """Return the best compression codec available in this environment.
+
+    Returns:
+        ``"zstd"`` when the ``zstandard`` package is installed, ``"gzip"``
+        otherwise.
+    """
+
+    if importlib.util.find_spec("zstandard") is not None:
+        return "zstd"
+    return "gzip"
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    """Compress ``data`` with ``codec``.
+
+    Args:
+        data: Bytes to compress.
+        codec: Name of the compression codec.
+
+    Returns:
+        Compressed bytes.
+    """
+
+    if codec == "zstd":
+        import zstandard  # type: ignore[import-not-found]
+
+        return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(data)
+    return gzip.compress(data, compresslevel=_GZIP_LEVEL, mtime=0)
+
+
+def _open_decompressed(path: Path, codec: str) -> IO[bytes]:
+    """Open a blob for reading its decompressed content.
+
+    Args:
+        path: Location of the blob.
+        codec: Name of the codec the blob was written with.
+
+    Returns:
+        Binary stream yielding the original bytes.
+    """
+
+    if codec == "zstd":
+        import zstandard  # type: ignore[import-not-found]
+
+        raw = path.open("rb")
+        return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    return gzip.open(path, "rb")
+
+
+def configured_max_bytes(
+    variable: str = MAX_BYTES_ENV, default: int = DEFAULT_MAX_BYTES
+) -> int | None:
+    """Return a byte budget set in the environment.
+
+    Args:
+        variable: Environment variable holding the budget.
+        default: Budget used when the variable is unset or invalid.
+
+    Returns:
+        The value of ``variable``, ``default`` when it is unset or
+        invalid, or ``None`` when it is ``0`` or negative, which turns
+        the budget off.
+    """
+
+    value = os.environ.get(variable, "").strip()
+    if not value:
+        return default
+
+    # A bad value must not stop the cache from working.
+    try:
+        max_bytes = int(value)
+    except ValueError:
+        logger.warning(
+            "Ignoring invalid %s value %r; using %d bytes.",
+            variable,
+            value,
+            default,
+        )
+        return default
+    return max_bytes if max_bytes > 0 else None
+
+
+def normalize_newlines(html: str) -> str:
+    """Translate line endings the way text-mode file reads do.
+
+    Args:
+        html: Page content as downloaded.
+
+    Returns:
+        Content with ``\\n`` line endings only.
+    """
+
+    return html.replace("\r\n", "\n").replace("\r", "\n")
+
+
+class HtmlCache:
+    """Compressed, content-addressed store for downloaded document pages.
+
+    Pages are compressed and stored once per distinct content, in files
+    named after their SHA-256 digest and spread over subdirectories named
+    after the first two characters of the digest. A small SQLite index
+    maps version identifiers to digests and records the size and the last
+    access of each blob; access times are refreshed at most once every
+    ``ACCESS_INTERVAL`` seconds, so reads rarely write to the index. Blobs
+    no version points at any more are deleted, and when a byte budget is
+    set the least recently used blobs are deleted once the store grows
+    past it. With ``trim``
+    set, scripts, styles and page chrome are cut out of the pages before
+    they are stored; the parser returns the same result for them.
+
+    Blobs are written to a temporary file and renamed into place, so a
+    reader never sees a partial page. Pages cached by older releases as
+    flat ``<ver_id>.html`` files are moved into the store on first use.
+
+    Attributes:
+        cache_dir: Base cache directory.
+        root: Directory holding the blobs and the index.
+        max_bytes: Byte budget for the compressed blobs, if any.
+        codec: Compression codec used for new blobs.
+        trim: Whether pages are trimmed with ``trim_html`` when stored.
+    """
+
+    def __init__(
+        self: "HtmlCache",
+        cache_dir: Path,
+        max_bytes: int | None = None,
+        codec: str | None = None,
+        trim: bool | None = None,
+    ) -> None:
+        """Open the store inside ``cache_dir``.
+
+        Args:
+            cache_dir: Base cache directory.
+            max_bytes: Byte budget for the compressed blobs; ``0`` turns
+                it off. Defaults to the value of ``configured_max_bytes``.
+            codec: Compression codec for new blobs; the best available one
+                by default.
+            trim: Trim pages before storing them; defaults to
+                ``DEFAULT_TRIM``.
+
+        Throws:
+            ValueError: If the codec is unknown or not installed.
+        """
+
+        codec = codec or default_codec()
+        if codec not in CODEC_SUFFIXES:
+            raise ValueError(f"Unknown compression codec: {codec}")
+        if codec == "zstd" and default_codec() != "zstd":
+            raise ValueError(
+                "The zstd codec requires the zstandard package; install it "
+                "with `pip install leropa[zstd]`."
+            )
+
+        self.cache_dir = cache_dir
+        self.root = cache_dir / HTML_DIR
+        if max_bytes is None:
+            self.max_bytes = configured_max_bytes()
+        else:
+            self.max_bytes = max_bytes if max_bytes > 0 else None
+        self.codec = codec
+        self.trim = DEFAULT_TRIM if trim is None else trim
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        self._db = sqlite3.connect(
+            self.root / INDEX_NAME, timeout=30, isolation_level=None
+        )
+        self._db.executescript(_SCHEMA)
+
+    def close(self: "HtmlCache") -> None:
+        """Close the index database."""
+
+        self._db.close()
+
+    def __enter__(self: "HtmlCache") -> "HtmlCache":
+        """Return the store for use in a ``with`` block."""
+
+        return self
+
+    def __exit__(self: "HtmlCache", *exc_info: Any) -> None:  # noqa: ANN401
+        """Close the store when leaving a ``with`` block."""
+
+        self.close()
+
+    def _blob_path(self: "HtmlCache", digest: str, codec: str) -> Path:
+        """Return the file holding the blob with ``digest``.
+
+        Args:
+            digest: SHA-256 digest of the page content.
+            codec: Codec the blob is compressed with.
+
+        Returns:
+            Path of the blob file.
+        """
+
+        return self.root / digest[:2] / f"{digest}{CODEC_SUFFIXES[codec]}"
+
+    def _lookup(self: "HtmlCache", ver_id: str) -> tuple[str, str] | None:
+        """Return the digest and codec of the blob stored for ``ver_id``.
+
+        Legacy flat files are imported when the index has no entry.
+
+        Args:
+            ver_id: Identifier of the document version.
+
+        Returns:
+            Digest and codec of the blob, or ``None`` if nothing is cached.
+        """
+
+        row = self._db.execute(
+            "SELECT blobs.digest, blobs.codec, blobs.accessed FROM versions "
+            "JOIN blobs ON blobs.digest = versions.digest "
+            "WHERE versions.ver_id = ?",
+            (ver_id,),
+        ).fetchone()
+        if row is None:
+            return self._import_legacy(ver_id)
+
+        # Blobs deleted behind the index's back count as missing.
+        digest, codec, accessed = row
+        if not self._blob_path(digest, codec).exists():
+            self._forget(digest)
+            return None
+
+        # Eviction only needs a coarse order, so the access time is only
+        # written once it is old enough to matter.
+        now = time.time()
+        if now - accessed >= ACCESS_INTERVAL:
+            self._db.execute(
+                "UPDATE blobs SET accessed = ? WHERE digest = ?",
+                (now, digest),
+            )
+        return digest, codec
+
+    def _import_legacy(
+        self: "HtmlCache", ver_id: str
+    ) -> tuple[str, str] | None:
+        """Move a page cached as a flat ``<ver_id>.html`` into the store.
+
+        Args:
+            ver_id: Identifier of the document version.
+
+        Returns:
+            Digest and codec of the imported blob, or ``None``.
+        """
+
+        legacy = self.cache_dir / f"{ver_id}.html"
+        if not legacy.is_file():
+            return None
+
+        self.put(ver_id, legacy.read_text(encoding="utf-8"))
+        legacy.unlink()
+        return self._lookup(ver_id)
+
+    def __contains__(self: "HtmlCache", ver_id: object) -> bool:
+        """Return ``True`` if a page is cached for ``ver_id``."""
+
+        return isinstance(ver_id, str) and self._lookup(ver_id) is not None
+
+    def digest(self: "HtmlCache", ver_id: str) -> str | None:
+        """Return the content digest of the page cached for ``ver_id``.
+
+        Args:
+            ver_id: Identifier of the document version.
+
+        Returns:
+            Hexadecimal SHA-256 digest of the page, or ``None``.
+        """
+
+        found = self._lookup(ver_id)
+        return found[0] if found else None
+
+    def get(self: "HtmlCache", ver_id: str) -> str | None:
+        """Return the page cached for ``ver_id``.
+
+        Args:
+            ver_id: Identifier of the document version.
+
+        Returns:
+            Page content, or ``None`` if nothing is cached.
+        """
+
+        stream = self.open(ver_id)
+        if stream is None:
+            return None
+        with stream:
+            return stream.read()
+
+    def open(self: "HtmlCache", ver_id: str) -> IO[str] | None:
+        """Open the page cached for ``ver_id`` as a text stream.
+
+        The page is decompressed while it is read, so it never has to be
+        held in memory as a whole.
+
+        Args:
+            ver_id: Identifier of the document version.
+
+        Returns:
+            Text stream over the page, or ``None`` if nothing is cached.
+        """
+
+        found = self._lookup(ver_id)
+        if found is None:
+            return None
+
+        binary = _open_decompressed(self._blob_path(*found), found[1])
+        return io.TextIOWrapper(binary, encoding="utf-8")
+
+    def validators(
+        self: "HtmlCache", ver_id: str
+    ) -> tuple[str | None, str | None]:
+        """Return the HTTP validators the page of ``ver_id`` came with.
+
+        Args:
+            ver_id: Identifier of the document version.
+
+        Returns:
+            The ``ETag`` and ``Last-Modified`` values, ``None`` if unknown.
+        """
+
+        row = self._db.execute(
+            "SELECT etag, last_modified FROM validators WHERE ver_id = ?",
+            (ver_id,),
+        ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def put(
+        self: "HtmlCache",
+        ver_id: str,
+        html: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> str:
+        """Store the page of ``ver_id``.
+
+        A blob the version pointed at before is deleted when no other
+        version shares it.
+
+        Args:
+            ver_id: Identifier of the document version.
+            html: Page content.
+            etag: ``ETag`` the page was served with.
+            last_modified: ``Last-Modified`` value the page was served with.
+
+        Returns:
+            Hexadecimal SHA-256 digest of the stored page.
+        """
+
+        html = normalize_newlines(html)
+        if self.trim:
+            html = trim_html(html)
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+
+        # Identical pages are only written once.
+        row = self._db.execute(
+            "SELECT codec FROM blobs WHERE digest = ?", (digest,)
+        ).fetchone()
+        codec = row[0] if row else self.codec
+        path = self._blob_path(digest, codec)
+        if row is None or not path.exists():
+            payload = _compress(data, codec)
+            self._write_atomic(path, payload)
+            size = len(payload)
+        else:
+            size = path.stat().st_size
+
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            # Blob the version pointed at before, if its page changed.
+            previous = self._db.execute(
+                "SELECT blobs.digest, blobs.codec FROM versions "
+                "JOIN blobs ON blobs.digest = versions.digest "
+                "WHERE versions.ver_id = ? AND versions.digest != ?",
+                (ver_id, digest),
+            ).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO blobs (digest, codec, size, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                (digest, codec, size, time.time()),
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO versions (ver_id, digest) "
+                "VALUES (?, ?)",
+                (ver_id, digest),
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO validators "
+                "(ver_id, etag, last_modified) VALUES (?, ?, ?)",
+                (ver_id, etag, last_modified),
+            )
+
+            # The page of the version changed; its old blob goes away
+            # unless another version still uses it.
+            if previous is not None and not self._orphaned(previous[0]):
+                previous = None
+            if previous is not None:
+                self._db.execute(
+                    "DELETE FROM blobs WHERE digest = ?", (previous[0],)
+                )
+            self._db.execute("COMMIT")
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+
+        if previous is not None:
+            self._blob_path(*previous).unlink(missing_ok=True)
+        self.evict(keep=digest)
+        return digest
+
+    @staticmethod
+    def _write_atomic(path: Path, payload: bytes) -> None:
+        """Write ``payload`` to ``path`` through a temporary file.
+
+        Args:
+            path: Destination file.
+            payload: Bytes to write.
+        """
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as stream:
+                stream.write(payload)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def total_bytes(self: "HtmlCache") -> int:
+        """Return the size of all compressed blobs.
+
+        Returns:
+            Number of bytes used by the blobs.
+        """
+
+        row = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs")
+        return int(row.fetchone()[0])
+
+    def _orphaned(self: "HtmlCache", digest: str) -> bool:
+        """Return ``True`` if no version points at the blob ``digest``.
+
+        Args:
+            digest: Digest of the blob.
+
+        Returns:
+            Whether the blob is unreferenced.
+        """
+
+        row = self._db.execute(
+            "SELECT 1 FROM versions WHERE digest = ? LIMIT 1", (digest,)
+        ).fetchone()
+        return row is None
+
+    def _forget(self: "HtmlCache", digest: str) -> None:
+        """Remove a blob and the versions pointing at it from the index.
+
+        Args:
+            digest: Digest of the blob.
+        """
+
+        self._db.execute(
+            "DELETE FROM validators WHERE ver_id IN "
+            "(SELECT ver_id FROM versions WHERE digest = ?)",
+            (digest,),
+        )
+        self._db.execute("DELETE FROM versions WHERE digest = ?", (digest,))
+        self._db.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+
+    def evict(self: "HtmlCache", keep: str | None = None) -> int:
+        """Delete least recently used blobs until the budget is met.
+
+        Args:
+            keep: Digest of a blob that must not be deleted.
+
+        Returns:
+            Number of blobs deleted.
+        """
+
+        if self.max_bytes is None:
+            return 0
+
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return 0
+
+        # Walk blobs from the oldest access until enough space is freed,
+        # starting with blobs no version points at.
+        victims: list[tuple[str, str]] = []
+        rows = self._db.execute(
+            "SELECT digest, codec, size FROM blobs ORDER BY EXISTS "
+            "(SELECT 1 FROM versions WHERE versions.digest = blobs.digest), "
+            "accessed"
+        ).fetchall()
+        for digest, codec, size in rows:
+            if excess <= 0:
+                break
+            if digest == keep:
+                continue
+            victims.append((digest, codec))
+            excess -= size
+
+        for digest, codec in victims:
+            self._forget(digest)
+            self._blob_path(digest, codec).unlink(missing_ok=True)
+        return len(victims)
@@ -0,0 +1,378 @@
+"""Stream articles out of a document without building the whole tree."""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import IO, Iterator
+
+from .article import Article
+from .article_path import ArticlePath
+from .engine import DEFAULT_ENGINE, make_soup
+from .utils import _parse_article
+
+# Sources accepted by ``iter_articles``: HTML text, a path or a text file.
+HtmlSource = str | os.PathLike[str] | IO[str]
+
+# Article together with its location in the document hierarchy.
+ArticleWithPath = tuple[Article, ArticlePath]
+
+# Article identifier together with its location in the document hierarchy.
+ArticleIdWithPath = tuple[str, ArticlePath]
+
+# Classes and ids of the ``span`` elements currently open.
+SpanStack = list[tuple[list[str], str]]
+
+# Raw article fragments waiting to be parsed, with their identifier and
+# location.
+FragmentQueue = deque[tuple[str, str, ArticlePath]]
+
+# Depth in the span stack, start offset, identifier and location of each
+# open article.
+OpenArticle = tuple[int, int, str, ArticlePath]
+OpenArticles = list[OpenArticle]
+
+# Start offset, identifier, raw fragment and location of completed nested
+# articles.
+NestedFragments = list[tuple[int, str, str, ArticlePath]]
+
+# Number of characters read from a file at a time.
+CHUNK_SIZE = 64 * 1024
+
+# Container body classes mapped to the ``ArticlePath`` field they fill.
+# Section bodies are preferred over point bodies, as in the full parser.
+_CONTAINER_FIELDS = (
+    ("S_CRT_BDY", "book_id"),
+    ("S_TTL_BDY", "title_id"),
+    ("S_CAP_BDY", "chapter_id"),
+    ("S_SEC_BDY", "section_id"),
+    ("S_PCT_BDY", "section_id"),
+    ("S_SSEC_BDY", "subsection_id"),
+)
+
+
+def _path_from_stack(stack: SpanStack) -> ArticlePath:
+    """Build the article location from the currently open spans.
+
+    Args:
+        stack: Classes and ids of the open ``span`` elements.
+
+    Returns:
+        Identifiers of the closest enclosing containers.
+    """
+
+    path = ArticlePath()
+    for cls, field_name in _CONTAINER_FIELDS:
+        # Keep an identifier already set by a preferred class.
+        if getattr(path, field_name) is not None:
+            continue
+
+        # Walk from the innermost span outwards to find the closest body.
+        for classes, span_id in reversed(stack):
+            if cls in classes:
+                setattr(path, field_name, span_id)
+                break
+
+    # Subsections only count when the article also sits in a section.
+    if path.section_id is None:
+        path.subsection_id = None
+    return path
+
+
+class _ArticleScanner(HTMLParser):
+    """Event-based scanner cutting ``S_ART`` spans out of an HTML stream.
+
+    The scanner only tracks the stack of open ``span`` elements. Raw input
+    is kept just long enough to slice out the article currently open, so
+    memory use depends on the largest article rather than on the whole
+    document. Articles nested in another article are cut out as well and
+    handed out after it, in document order, and articles still open at
+    the end of the input run to its end, as the tree builders close them.
+
+    Attributes:
+        ready: Article identifiers and fragments completed so far, with
+            their location.
+    """
+
+    def __init__(self: "_ArticleScanner") -> None:
+        """Initialize the scanner state."""
+
+        super().__init__(convert_charrefs=False)
+        self.ready: FragmentQueue = deque()
+
+        # Open spans and the raw input not yet released.
+        self._stack: SpanStack = []
+        self._buffer = ""
+        self._buffer_start = 0
+        self._fed = 0
+
+        # Position of the tag being parsed, the open articles, the article
+        # closed by the current end tag and the nested articles completed
+        # before the article holding them.
+        self._tag_start = 0
+        self._articles: OpenArticles = []
+        self._closing: OpenArticle | None = None
+        self._nested: NestedFragments = []
+
+    def _absolute(self: "_ArticleScanner", index: int) -> int:
+        """Convert an index into ``rawdata`` to an offset in the stream.
+
+        Args:
+            index: Position inside the pending raw data.
+
+        Returns:
+            Offset from the start of the document.
+        """
+
+        return self._fed - len(self.rawdata) + index
+
+    def feed(self: "_ArticleScanner", data: str) -> None:
+        """Scan the next chunk of the document.
+
+        Args:
+            data: Next piece of HTML text.
+        """
+
+        self._buffer += data
+        self._fed += len(data)
+        super().feed(data)
+
+        # Release the input nobody can refer to any more: everything before
+        # the outermost open article, or before the unparsed remainder.
+        if self._articles:
+            keep_from = self._articles[0][1]
+        else:
+            keep_from = self._absolute(0)
+        drop = keep_from - self._buffer_start
+        if drop > 0:
+            self._buffer = self._buffer[drop:]
+            self._buffer_start = keep_from
+
+    def parse_starttag(self: "_ArticleScanner", i: int) -> int:
+        """Remember where the tag starts before parsing it.
+
+        Args:
+            i: Position of the tag inside the pending raw data.
+
+        Returns:
+            Position after the tag, as reported by the base class.
+        """
+
+        self._tag_start = self._absolute(i)
+        return super().parse_starttag(i)
+
+    def parse_endtag(self: "_ArticleScanner", i: int) -> int:
+        """Emit the article fragment once its closing tag is consumed.
+
+        Args:
+            i: Position of the tag inside the pending raw data.
+
+        Returns:
+            Position after the tag, as reported by the base class.
+        """
+
+        end = super().parse_endtag(i)
+        if self._closing is not None and end >= 0:
+            _, start, article_id, path = self._closing
+            self._closing = None
+            self._complete(start, self._absolute(end), article_id, path)
+        return end
+
+    def _complete(
+        self: "_ArticleScanner",
+        start: int,
+        stop: int,
+        article_id: str,
+        path: ArticlePath,
+    ) -> None:
+        """Cut out a completed article and release it when possible.
+
+        Args:
+            start: Offset of the article start tag.
+            stop: Offset after the end of the article.
+            article_id: Identifier of the article span.
+            path: Location of the article.
+        """
+
+        # Slice the article out of the retained raw input.
+        fragment = self._buffer[
+            start - self._buffer_start : stop - self._buffer_start
+        ]
+        self._nested.append((start, article_id, fragment, path))
+
+        # Nested articles close first but follow their parent in the
+        # document, so they wait until the outermost article completes.
+        if not self._articles:
+            self._nested.sort(key=lambda item: item[0])
+            self.ready.extend(item[1:] for item in self._nested)
+            self._nested = []
+
+    def close(self: "_ArticleScanner") -> None:
+        """Scan the rest of the input and complete the open articles."""
+
+        super().close()
+        while self._articles:
+            _, start, article_id, path = self._articles.pop()
+            self._complete(start, self._fed, article_id, path)
+
+    def handle_starttag(
+        self: "_ArticleScanner",
+        tag: str,
+        attrs: list[tuple[str, str | None]],
+    ) -> None:
+        """Track opened spans and detect the start of an article.
+
+        Args:
+            tag: Lower-cased tag name.
+            attrs: Attributes of the tag.
+        """
+
+        if tag != "span":
+            return
+
+        # Remember the classes and identifier of the span.
+        values = dict(attrs)
+        classes = (values.get("class") or "").split()
+        span_id = values.get("id") or ""
+        self._stack.append((classes, span_id))
+
+        # Start capturing when an article opens.
+        if "S_ART" in classes:
+            path = _path_from_stack(self._stack[:-1])
+            depth = len(self._stack)
+            self._articles.append((depth, self._tag_start, span_id, path))
+
+    def handle_endtag(self: "_ArticleScanner", tag: str) -> None:
+        """Track closed spans and detect the end of an article.
+
+        Args:
+            tag: Lower-cased tag name.
+        """
+
+        if tag != "span" or not self._stack:
+            return
+
+        # Closing the span that opened an article completes it.
+        if self._articles and len(self._stack) == self._articles[-1][0]:
+            self._closing = self._articles.pop()
+        self._stack.pop()
+
+
+def _iter_chunks(source: HtmlSource) -> Iterator[str]:
+    """Yield the HTML text of ``source`` in chunks.
+
+    Args:
+        source: HTML text, path to an HTML file or an open text file.
+
+    Yields:
+        Consecutive pieces of the document.
+    """
+
+    # HTML already held in memory is scanned in place.
+    if isinstance(source, str):
+        yield source
+        return
+
+    # Paths are opened here and closed when the iteration ends.
+    if isinstance(source, os.PathLike):
+        with Path(source).open(encoding="utf-8") as stream:
+            yield from _iter_chunks(stream)
+        return
+
+    while chunk := source.read(CHUNK_SIZE):
+        yield chunk
+
+
+def _drain(scanner: _ArticleScanner, engine: str) -> Iterator[ArticleWithPath]:
+    """Parse and hand out the articles completed so far.
+
+    Args:
+        scanner: Scanner holding the completed article fragments.
+        engine: Tree builder used to parse each article.
+
+    Yields:
+        Each parsed article together with its location.
+    """
+
+    while scanner.ready:
+        _, fragment, path = scanner.ready.popleft()
+
+        # Articles without a body are skipped, as in ``parse_html``.
+        art_tag = make_soup(fragment, engine).find("span", class_="S_ART")
+        article = _parse_article(art_tag) if art_tag else None
+        if article is not None:
+            yield article, path
+
+
+def _drain_paths(scanner: _ArticleScanner) -> Iterator[ArticleIdWithPath]:
+    """Hand out the identifiers and locations completed so far.
+
+    Args:
+        scanner: Scanner holding the completed article fragments.
+
+    Yields:
+        Each article identifier together with its location.
+    """
+
+    while scanner.ready:
+        article_id, _, path = scanner.ready.popleft()
+        yield article_id, path
+
+
+def iter_articles(
+    html_or_file: HtmlSource, engine: str = DEFAULT_ENGINE
+) -> Iterator[ArticleWithPath]:
+    """Yield the articles of a document one at a time.
+
+    The document is scanned incrementally and each article is parsed as
+    soon as its ``S_ART`` span closes, so only the article being processed
+    is held in memory. Articles are identical to the ones returned by
+    ``parse_html``, which also skips articles without a body; articles
+    nested in another one follow it, and an article left open runs to the
+    end of the document.
+
+    Args:
+        html_or_file: HTML text, path to an HTML file or an open text file.
+        engine: Tree builder used to parse each article.
+
+    Yields:
+        Each article together with its location in the hierarchy.
+    """
+
+    scanner = _ArticleScanner()
+    for chunk in _iter_chunks(html_or_file):
+        scanner.feed(chunk)
+        yield from _drain(scanner, engine)
+
+    # Flush whatever the scanner still holds back at the end of input.
+    scanner.close()
+    yield from _drain(scanner, engine)
+
+
+def iter_article_paths(
+    html_or_file: HtmlSource,
+) -> Iterator[ArticleIdWithPath]:
+    """Yield the identifier and location of every article of a document.
+
+    Locations are built exactly as in ``iter_articles``, from the
+    containers enclosing each ``S_ART`` span, but no article is parsed.
+    Articles without a body, which ``iter_articles`` skips, are included.
+
+    Args:
+        html_or_file: HTML text, path to an HTML file or an open text file.
+
+    Yields:
+        Each article identifier together with its location, in the order
+        used by ``iter_articles``.
+    """
+
+    scanner = _ArticleScanner()
+    for chunk in _iter_chunks(html_or_file):
+        scanner.feed(chunk)
+        yield from _drain_paths(scanner)
+
+    # Flush whatever the scanner still holds back at the end of input.
+    scanner.close()
+    yield from _drain_paths(scanner)
@@ -0,0 +1,380 @@
+"""Parse the outline of a document and its articles only on demand."""
+
+from __future__ import annotations
+
+import html as html_lib
+import re
+from typing import Any, Iterator
+
+from .annex import Annex
+from .article import Article
+from .article_span import ArticleSpan
+from .book import Book
+from .document_info import DocumentInfo
+from .element_index import ElementIndex
+from .engine import DEFAULT_ENGINE, make_soup
+from .hierarchy import HierarchyBuilder, collect_articles
+from .metadata_prefix import METADATA_MARKERS, METADATA_TAGS
+from .parse_html import _annexes, _articles, _document_info
+from .unstructure import unstructure
+from .utils import _parse_article
+
+# Spans of the articles found in a page, in document order.
+SpanList = list[ArticleSpan]
+
+# Articles parsed so far, keyed by their position in the document.
+ArticleCache = dict[int, Article | None]
+
+# Comments, raw text elements and ``span`` tags, in document order. Only
+# the ``span`` tags are used; the others are matched so that markup inside
+# them is skipped.
+_SPAN_TAGS = re.compile(
+    r"(?P<comment><!--.*?(?:-->|\Z))"
+    r"|(?P<raw><(?P<raw_name>script|style)\b.*?(?:</(?P=raw_name)\s*>|\Z))"
+    r"|(?P<open><span(?:\s(?:[^>\"']|\"[^\"]*\"|'[^']*')*)?/?>)"
+    r"|(?P<close></span\s*>)",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Attributes of a start tag, with double-quoted, single-quoted or bare
+# values.
+_ATTRIBUTE = re.compile(
+    r"([^\s\"'>/=]+)(?:\s*=\s*(?:\"([^\"]*)\"|'([^']*)'|([^\s>]+)))?"
+)
+
+# Body left in place of an article body when the outline is parsed.
+_BODY_STUB = '<span class="S_ART_BDY"></span>'
+
+# Markers of elements read by the outline parse; articles containing one
+# are kept whole in the outline.
+_OUTLINE_MARKERS = (*METADATA_MARKERS, "S_ANX_TTL")
+
+
+def _attribute(tag: str, name: str) -> str | None:
+    """Return the value of an attribute of a start tag.
+
+    Args:
+        tag: Text of the start tag.
+        name: Lower-cased attribute name.
+
+    Returns:
+        Attribute value with character references resolved, or ``None``
+        when the tag does not have the attribute.
+    """
+
+    for match in _ATTRIBUTE.finditer(tag, 5):
+        if match.group(1).lower() == name:
+            value = match.group(2)
+            if value is None:
+                value = match.group(3)
+            if value is None:
+                value = match.group(4) or ""
+            return html_lib.unescape(value)
+    return None
+
+
+def find_article_spans(html: str) -> SpanList:
+    """Return where the outermost articles of a page lie.
+
+    Only ``span`` tags are looked at, skipping comments, scripts and
+    styles, so the page is scanned with a single regular expression
+    instead of being tokenized.
+
+    Args:
+        html: Raw HTML content of the legal document.
+
+    Returns:
+        Spans of the articles in document order.
+    """
+
+    return _scan_article_spans(html)[0]
+
+
+def _scan_article_spans(html: str) -> tuple[SpanList, bool]:
+    """Return where the outermost articles of a page lie.
+
+    Args:
+        html: Raw HTML content of the legal document.
+
+    Returns:
+        Spans of the articles in document order, and whether the spans
+        of the page are well formed: every span closed, no stray or
+        self-closing span and no article nested in another one. The tree
+        builders repair other pages in ways the scan does not follow.
+    """
+
+    spans: SpanList = []
+    depth = 0
+    current: ArticleSpan | None = None
+    open_depth = 0
+    regular = True
+    for match in _SPAN_TAGS.finditer(html):
+        kind = match.lastgroup
+        if kind == "close":
+            if not depth:
+                regular = False
+                continue
+            depth -= 1
+            if current is not None and depth < open_depth:
+                current.close_start = match.start()
+                current.end = match.end()
+                spans.append(current)
+                current = None
+            continue
+        if kind != "open":
+            continue
+
+        tag = match.group()
+        depth += 1
+
+        # Only article spans and their bodies matter; the attributes of
+        # the other spans are not even looked at.
+        if "S_ART" in tag:
+            classes = (_attribute(tag, "class") or "").split()
+        else:
+            classes = []
+        if current is not None:
+            if "S_ART_BDY" in classes:
+                current.has_body = True
+            elif "S_ART" in classes:
+                regular = False
+        elif "S_ART" in classes:
+            # Start recording when an article opens outside another one.
+            current = ArticleSpan(
+                article_id=_attribute(tag, "id") or "",
+                start=match.start(),
+                open_end=match.end(),
+                close_start=match.end(),
+                end=match.end(),
+            )
+            open_depth = depth
+
+        # Self-closing spans have no content and no closing tag; lxml
+        # reads them as opening tags, though.
+        if tag.endswith("/>"):
+            regular = False
+            depth -= 1
+            if current is not None and depth < open_depth:
+                spans.append(current)
+                current = None
+
+    # An article left open ends with the page.
+    if current is not None:
+        current.close_start = current.end = len(html)
+        spans.append(current)
+    return spans, regular and not depth
+
+
+def _outline(html: str, spans: SpanList) -> str:
+    """Return the page with the article bodies left out.
+
+    Each article keeps its opening and closing tags, plus an empty body
+    when it had one, so the hierarchy sees the same articles. Articles
+    that contain elements read for the metadata or the annexes are kept
+    whole.
+
+    Args:
+        html: Raw HTML content of the legal document.
+        spans: Spans of the outermost articles of the page.
+
+    Returns:
+        Reduced page.
+    """
+
+    pieces: list[str] = []
+    done = 0
+    for span in spans:
+        inner = html[span.open_end : span.close_start]
+        if any(marker in inner for marker in _OUTLINE_MARKERS) or (
+            METADATA_TAGS.search(inner)
+        ):
+            continue
+
+        pieces.append(html[done : span.open_end])
+        if span.has_body:
+            pieces.append(_BODY_STUB)
+        done = span.close_start
+    pieces.append(html[done:])
+    return "".join(pieces)
+
+
+class LazyDocument:
+    """Parsed document whose articles are only parsed when accessed.
+
+    The metadata, the hierarchy of books, titles, chapters and sections,
+    the annexes and the location of every article in the source are
+    extracted up front from the page with the article bodies left out.
+    Paragraphs and notes of an article are parsed the first time the
+    article is requested, from its own slice of the page, and kept for
+    later calls.
+
+    Attributes:
+        ver_id: Identifier for the document version.
+        engine: Tree builder used to parse the HTML.
+        document: Metadata of the document.
+        books: Hierarchy of the document, as ``parse_html`` builds it.
+        annexes: Annexes attached at the end of the document.
+        spans: Source span of each article, keyed by article identifier.
+    """
+
+    def __init__(
+        self: "LazyDocument",
+        html: str,
+        ver_id: str,
+        engine: str = DEFAULT_ENGINE,
+    ) -> None:
+        """Parse the outline of a document.
+
+        Args:
+            html: Raw HTML content of the legal document.
+            ver_id: Identifier for the document version.
+            engine: Tree builder used to parse the HTML.
+        """
+
+        self.ver_id = ver_id
+        self.engine = engine
+        self._html = html
+        self._cache: ArticleCache = {}
+        self.books: list[Book] = []
+        self.spans: dict[str, ArticleSpan] = {}
+        self._ids: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._order: SpanList = []
+
+        # Malformed spans may move article text into the containers once
+        # the tree is repaired, which the outline would lose; such pages
+        # are parsed in full.
+        spans, regular = _scan_article_spans(html)
+        if not regular:
+            self._parse_all()
+            return
+
+        soup = make_soup(_outline(html, spans), engine)
+        index = ElementIndex(soup)
+        self.document: DocumentInfo = _document_info(index, ver_id, True)
+        self.annexes: list[Annex] = _annexes(index)
+
+        # Attach the articles with a body to the hierarchy, in the order
+        # the full parser visits them.
+        found = collect_articles(soup)
+        if [tag.get("id", "") for tag, _ in found] != [
+            span.article_id for span in spans
+        ]:
+            # The scan and the tree disagree on malformed markup; parse
+            # everything from the full page instead.
+            self._parse_all()
+            return
+
+        hierarchy = HierarchyBuilder()
+        for (art_tag, containers), span in zip(found, spans):
+            if art_tag.find("span", class_="S_ART_BDY") is None:
+                continue
+            hierarchy.add_article(span.article_id, containers)
+            self.spans.setdefault(span.article_id, span)
+            self._positions.setdefault(span.article_id, len(self._ids))
+            self._ids.append(span.article_id)
+            self._order.append(span)
+        self.books = list(hierarchy.books.values())
+
+    def _parse_all(self: "LazyDocument") -> None:
+        """Parse the whole document from the full page."""
+
+        soup = make_soup(self._html, self.engine)
+        index = ElementIndex(soup)
+        self.document = _document_info(index, self.ver_id, True)
+        self.annexes = _annexes(index)
+        articles, hierarchy = _articles(soup)
+        self.books = list(hierarchy.books.values())
+        for pos, article in enumerate(articles):
+            self._cache[pos] = article
+            self._positions.setdefault(article.article_id, pos)
+            self._ids.append(article.article_id)
+
+    @property
+    def article_ids(self: "LazyDocument") -> list[str]:
+        """Identifiers of the articles, in document order."""
+
+        return list(self._ids)
+
+    def __len__(self: "LazyDocument") -> int:
+        """Return the number of articles in the document."""
+
+        return len(self._ids)
+
+    def _article_at(self: "LazyDocument", pos: int) -> Article | None:
+        """Return the article at ``pos``, parsing it if needed.
+
+        Args:
+            pos: Position of the article in the document.
+
+        Returns:
+            The parsed article.
+        """
+
+        if pos not in self._cache:
+            span = self._order[pos]
+            fragment = self._html[span.start : span.end]
+            art_tag: Any = make_soup(fragment, self.engine).find(
+                "span", class_="S_ART"
+            )
+            self._cache[pos] = _parse_article(art_tag) if art_tag else None
+        return self._cache[pos]
+
+    def article(self: "LazyDocument", article_id: str) -> Article | None:
+        """Return an article, parsing its body on first access.
+
+        Args:
+            article_id: Identifier of the article.
+
+        Returns:
+            The first article with that identifier, or ``None`` if the
+            document has no such article.
+        """
+
+        pos = self._positions.get(article_id)
+        if pos is None:
+            return None
+        return self._article_at(pos)
+
+    def articles(self: "LazyDocument") -> Iterator[Article]:
+        """Yield every article in document order, parsing as needed.
+
+        Yields:
+            Each parsed article.
+        """
+
+        for pos in range(len(self)):
+            article = self._article_at(pos)
+            if article is not None:
+                yield article
+
+    def to_dict(self: "LazyDocument") -> dict[str, Any]:
+        """Parse the remaining articles and return the whole document.
+
+        Returns:
+            The same structure ``parse_html`` returns for the page.
+        """
+
+        return {
+            "document": unstructure(self.document),
+            "articles": [unstructure(a) for a in self.articles()],
+            "books": [unstructure(b) for b in self.books],
+            "annexes": [unstructure(a) for a in self.annexes],
+        }
+
+
+def parse_lazy(
+    html: str, ver_id: str, engine: str = DEFAULT_ENGINE
+) -> LazyDocument:
+    """Parse the outline of a document, leaving article bodies for later.
+
+    Args:
+        html: Raw HTML content of the legal document.
+        ver_id: Identifier for the document version.
+        engine: Tree builder used to parse the HTML.
+
+    Returns:
+        Document whose articles are parsed when first accessed.
+    """
+
+    return LazyDocument(html, ver_id, engine)
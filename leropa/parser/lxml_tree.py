@@ -0,0 +1,549 @@
+"""BeautifulSoup-compatible view over a native lxml document tree.
+
+The parser only relies on a small part of the BeautifulSoup API: searching
+by tag name, class and id, walking to parents and siblings, reading
+attributes, extracting text and detaching elements. ``LxmlTag`` implements
+that subset on top of an ``lxml.html`` tree so the same extraction code can
+run on a tree built in C instead of pure Python.
+
+Detached elements are recorded in a set shared by the whole document rather
+than being removed from the lxml tree. lxml stores the text that follows an
+element in the element itself, so physically removing it would either drop
+that text or merge it into a neighbouring string, both of which change the
+output of ``get_text``.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+from lxml import etree  # type: ignore[import-untyped]
+from lxml import html as lxml_html  # type: ignore[import-untyped]
+
+# Value accepted for ``class_`` filters: one class or a list of classes.
+ClassFilter = str | list[str] | None
+
+# Attribute filters passed as ``attrs`` to the search helpers.
+AttrFilter = dict[str, str] | None
+
+# Tags whose text content BeautifulSoup does not report in ``get_text``.
+_NON_TEXT_TAGS = frozenset({"script", "style", "template"})
+
+
+def _is_element(node: Any) -> bool:  # noqa: ANN401
+    """Return ``True`` when ``node`` is an element rather than a comment.
+
+    Args:
+        node: Node from the lxml tree.
+
+    Returns:
+        Whether the node is a regular element.
+    """
+
+    return isinstance(node.tag, str)
+
+
+def _class_matches(node: Any, class_: ClassFilter) -> bool:  # noqa: ANN401
+    """Check whether ``node`` carries one of the requested classes.
+
+    Args:
+        node: Element to check.
+        class_: Class or list of classes to look for.
+
+    Returns:
+        ``True`` when no filter is given or one of the classes matches.
+    """
+
+    if class_ is None:
+        return True
+
+    value = node.get("class")
+    if not value:
+        return False
+
+    # Compare individual class tokens like BeautifulSoup does.
+    tokens = value.split()
+    if isinstance(class_, str):
+        return class_ in tokens or value == class_
+    return any(cls in tokens for cls in class_)
+
+
+class LxmlDocument:
+    """Shared state for all wrappers created from one lxml tree.
+
+    Attributes:
+        root: Root ``html`` element of the document.
+        removed: Elements detached through ``extract`` or ``decompose``.
+        ids: Elements carrying an ``id`` attribute, built on first use.
+    """
+
+    __slots__ = ("root", "removed", "ids")
+
+    def __init__(self: "LxmlDocument", root: Any) -> None:  # noqa: ANN401
+        """Initialize the document state.
+
+        Args:
+            root: Root element returned by the lxml parser.
+        """
+
+        self.root = root
+        self.removed: set[Any] = set()
+        self.ids: dict[str, list[Any]] | None = None
+
+    def by_id(self: "LxmlDocument", id: str) -> list[Any]:
+        """Return the elements whose ``id`` attribute equals ``id``.
+
+        Args:
+            id: Identifier to look up.
+
+        Returns:
+            Matching elements in document order.
+        """
+
+        # Index all identifiers in one pass the first time one is needed.
+        if self.ids is None:
+            self.ids = {}
+            for node in self.root.iterfind(".//*[@id]"):
+                self.ids.setdefault(node.get("id"), []).append(node)
+            if self.root.get("id") is not None:
+                self.ids.setdefault(self.root.get("id"), []).insert(
+                    0, self.root
+                )
+        return self.ids.get(id, [])
+
+
+class LxmlTag:
+    """Element wrapper exposing the BeautifulSoup API used by the parser.
+
+    Attributes:
+        element: Wrapped lxml element.
+        document: Shared document state.
+    """
+
+    __slots__ = ("element", "document", "_is_root")
+
+    def __init__(
+        self: "LxmlTag",
+        element: Any,  # noqa: ANN401
+        document: LxmlDocument,
+        is_root: bool = False,
+    ) -> None:
+        """Wrap ``element`` from ``document``.
+
+        Args:
+            element: Element to wrap.
+            document: Shared state of the tree the element belongs to.
+            is_root: Whether the wrapper stands for the whole document, in
+                which case searches include the root element itself.
+        """
+
+        self.element = element
+        self.document = document
+        self._is_root = is_root
+
+    @property
+    def name(self: "LxmlTag") -> str:
+        """Tag name of the wrapped element."""
+
+        return self.element.tag
+
+    @property
+    def title(self: "LxmlTag") -> "LxmlTag | None":
+        """First ``title`` element in the tree, like ``soup.title``."""
+
+        return self.find("title")
+
+    def _wrap(self: "LxmlTag", node: Any) -> "LxmlTag":  # noqa: ANN401
+        """Wrap another element of the same document.
+
+        Args:
+            node: Element to wrap.
+
+        Returns:
+            Wrapper sharing this document state.
+        """
+
+        return LxmlTag(node, self.document)
+
+    def _is_detached(
+        self: "LxmlTag",
+        node: Any,  # noqa: ANN401
+        stop: Any = None,  # noqa: ANN401
+    ) -> bool:
+        """Return ``True`` when ``node`` sits inside a detached subtree.
+
+        Args:
+            node: Element to check.
+            stop: Ancestor at which the check ends, the root by default.
+
+        Returns:
+            Whether ``node`` or one of its ancestors below ``stop`` was
+            detached.
+        """
+
+        removed = self.document.removed
+        current = node
+        while current is not None and current is not stop:
+            if current in removed:
+                return True
+            current = current.getparent()
+        return False
+
+    def _candidates(
+        self: "LxmlTag",
+        name: str | None,
+        id: str | None,
+        recursive: bool,
+    ) -> Iterator[Any]:
+        """Yield the elements a search has to consider, in document order.
+
+        Args:
+            name: Tag name to filter on, if any.
+            id: ``id`` attribute to filter on, if any.
+            recursive: Search all descendants instead of direct children.
+
+        Yields:
+            Elements below this one that are still attached.
+        """
+
+        element = self.element
+        removed = self.document.removed
+
+        # Direct children only need to be checked one by one.
+        if not recursive:
+            for child in element:
+                if _is_element(child) and child not in removed:
+                    yield child
+            return
+
+        # Let lxml do the filtering in C whenever possible.
+        if id is not None and self._is_root:
+            nodes: Iterator[Any] = iter(self.document.by_id(id))
+        elif id is not None:
+            nodes = iter(element.xpath("descendant::*[@id=$id]", id=id))
+        else:
+            nodes = element.iter(name or etree.Element)
+
+        for node in nodes:
+            if node is element and not self._is_root:
+                continue
+
+            # Skip nodes living inside a detached subtree.
+            if removed and self._is_detached(node, element):
+                continue
+            yield node
+
+    def _strings(self: "LxmlTag", node: Any) -> Iterator[str]:  # noqa: ANN401
+        """Yield the text nodes below ``node`` in document order.
+
+        Args:
+            node: Element whose text content is collected.
+
+        Yields:
+            Text pieces, excluding comments and detached elements but
+            keeping the text that follows a detached element.
+        """
+
+        if node.tag in _NON_TEXT_TAGS:
+            return
+        if node.text:
+            yield node.text
+        removed = self.document.removed
+        for child in node:
+            if _is_element(child) and child not in removed:
+                yield from self._strings(child)
+            if child.tail:
+                yield child.tail
+
+    @property
+    def children(self: "LxmlTag") -> Iterator["LxmlTag | str"]:
+        """Direct child elements and text nodes, like ``Tag.children``."""
+
+        node = self.element
+        if node.tag in _NON_TEXT_TAGS:
+            return
+        if node.text:
+            yield node.text
+
+        # Text following a child is stored on the child as its tail.
+        removed = self.document.removed
+        for child in node:
+            if _is_element(child) and child not in removed:
+                yield self._wrap(child)
+            if child.tail:
+                yield child.tail
+
+    def get(
+        self: "LxmlTag",
+        key: str,
+        default: Any = None,  # noqa: ANN401
+    ) -> Any:  # noqa: ANN401
+        """Return an attribute value.
+
+        Args:
+            key: Attribute name.
+            default: Value returned when the attribute is missing.
+
+        Returns:
+            The attribute value, with ``class`` split into a list.
+        """
+
+        value = self.element.get(key)
+        if value is None:
+            return default
+        if key == "class":
+            return value.split()
+        return value
+
+    def get_text(
+        self: "LxmlTag", separator: str = "", strip: bool = False
+    ) -> str:
+        """Return the text content of the element.
+
+        Args:
+            separator: String placed between text pieces.
+            strip: Strip each piece and drop the empty ones.
+
+        Returns:
+            Concatenated text content.
+        """
+
+        # Use the C iterator when nothing has been detached.
+        if (
+            not self.document.removed
+            and self.element.tag not in _NON_TEXT_TAGS
+        ):
+            pieces: Iterator[str] = self.element.itertext()
+        else:
+            pieces = self._strings(self.element)
+
+        if strip:
+            return separator.join(p.strip() for p in pieces if p.strip())
+        return separator.join(pieces)
+
+    def _matches(
+        self: "LxmlTag",
+        node: Any,  # noqa: ANN401
+        name: str | None,
+        class_: ClassFilter,
+        id: str | None,
+        attrs: AttrFilter,
+    ) -> bool:
+        """Check ``node`` against the search filters.
+
+        Args:
+            node: Element to check.
+            name: Required tag name.
+            class_: Required class or classes.
+            id: Required ``id`` attribute.
+            attrs: Other required attribute values.
+
+        Returns:
+            Whether all filters match.
+        """
+
+        if name is not None and node.tag != name:
+            return False
+        if id is not None and node.get("id") != id:
+            return False
+        if attrs:
+            for key, value in attrs.items():
+                if node.get(key) != value:
+                    return False
+        return _class_matches(node, class_)
+
+    def find_all(
+        self: "LxmlTag",
+        name: str | None = None,
+        attrs: AttrFilter = None,
+        recursive: bool = True,
+        class_: ClassFilter = None,
+        id: str | None = None,
+    ) -> list["LxmlTag"]:
+        """Return all matching elements below this one.
+
+        Args:
+            name: Required tag name.
+            attrs: Required attribute values.
+            recursive: Search all descendants instead of direct children.
+            class_: Required class or classes.
+            id: Required ``id`` attribute.
+
+        Returns:
+            Matching elements in document order.
+        """
+
+        return [
+            self._wrap(node)
+            for node in self._candidates(name, id, recursive)
+            if self._matches(node, name, class_, id, attrs)
+        ]
+
+    def find(
+        self: "LxmlTag",
+        name: str | None = None,
+        attrs: AttrFilter = None,
+        recursive: bool = True,
+        string: bool | None = None,
+        class_: ClassFilter = None,
+        id: str | None = None,
+    ) -> Any:  # noqa: ANN401
+        """Return the first matching element or direct text node.
+
+        Args:
+            name: Required tag name.
+            attrs: Required attribute values.
+            recursive: Search all descendants instead of direct children.
+            string: When ``True`` return the first text node instead.
+            class_: Required class or classes.
+            id: Required ``id`` attribute.
+
+        Returns:
+            Matching wrapper or string, or ``None`` when nothing matches.
+        """
+
+        if string:
+            return self._first_string(recursive)
+
+        for node in self._candidates(name, id, recursive):
+            if self._matches(node, name, class_, id, attrs):
+                return self._wrap(node)
+        return None
+
+    def _first_string(self: "LxmlTag", recursive: bool) -> str | None:
+        """Return the first text node below the element.
+
+        Args:
+            recursive: Look into descendants instead of direct children.
+
+        Returns:
+            The first text node or ``None``.
+        """
+
+        if recursive:
+            return next(self._strings(self.element), None)
+
+        # Direct text lives in the element text and in the children tails.
+        if self.element.text:
+            return self.element.text
+        for child in self.element:
+            if child.tail:
+                return child.tail
+        return None
+
+    def find_parent(
+        self: "LxmlTag",
+        name: str | None = None,
+        class_: ClassFilter = None,
+    ) -> "LxmlTag | None":
+        """Return the closest ancestor matching the filters.
+
+        Args:
+            name: Required tag name.
+            class_: Required class or classes.
+
+        Returns:
+            Matching ancestor or ``None``.
+        """
+
+        for node in self.element.iterancestors():
+            if self._matches(node, name, class_, None, None):
+                return self._wrap(node)
+        return None
+
+    def find_previous(
+        self: "LxmlTag",
+        name: str | None = None,
+        class_: str | None = None,
+    ) -> "LxmlTag | None":
+        """Return the closest element preceding this one in the document.
+
+        Args:
+            name: Required tag name.
+            class_: Required class.
+
+        Returns:
+            Matching element or ``None``.
+        """
+
+        # Walk backwards: first the subtrees of the preceding siblings,
+        # latest one first, then the parent itself, and so on upwards. The
+        # nearest match is usually a close sibling, so this stops early.
+        node = self.element
+        while node is not None:
+            for sibling in node.itersiblings(preceding=True):
+                if not _is_element(sibling):
+                    continue
+                for candidate in reversed(
+                    list(sibling.iter(name or etree.Element))
+                ):
+                    if self._matches(
+                        candidate, name, class_, None, None
+                    ) and not self._is_detached(candidate):
+                        return self._wrap(candidate)
+            node = node.getparent()
+            if node is not None and self._matches(
+                node, name, class_, None, None
+            ):
+                return self._wrap(node)
+        return None
+
+    def find_next_sibling(
+        self: "LxmlTag",
+        name: str | None = None,
+        class_: ClassFilter = None,
+    ) -> "LxmlTag | None":
+        """Return the first following sibling matching the filters.
+
+        Args:
+            name: Required tag name.
+            class_: Required class or classes.
+
+        Returns:
+            Matching sibling or ``None``.
+        """
+
+        removed = self.document.removed
+        for node in self.element.itersiblings():
+            if not _is_element(node) or node in removed:
+                continue
+            if self._matches(node, name, class_, None, None):
+                return self._wrap(node)
+        return None
+
+    def extract(self: "LxmlTag") -> "LxmlTag":
+        """Detach the element from the document.
+
+        Returns:
+            The same wrapper, which can still be searched on its own.
+        """
+
+        self.document.removed.add(self.element)
+        return self
+
+    def decompose(self: "LxmlTag") -> None:
+        """Detach the element and discard it."""
+
+        self.document.removed.add(self.element)
+
+
+def parse_lxml(html: str) -> LxmlTag:
+    """Parse ``html`` into a BeautifulSoup-compatible lxml tree.
+
+    Args:
+        html: Raw HTML content.
+
+    Returns:
+        Wrapper standing for the whole document.
+    """
+
+    # Parse bytes with an explicit encoding so declarations inside the
+    # document cannot conflict with the already decoded text. Without
+    # ``huge_tree`` libxml2 drops elements nested more than 256 levels
+    # deep, which the default engine keeps.
+    parser = lxml_html.HTMLParser(encoding="utf-8", huge_tree=True)
+    data = html.encode("utf-8") if html.strip() else b"<html></html>"
+    root = etree.fromstring(data, parser)
+    if root is None:
+        root = etree.fromstring(b"<html></html>", parser)
+    return LxmlTag(root, LxmlDocument(root), is_root=True)
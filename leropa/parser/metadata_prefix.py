@@ -0,0 +1,207 @@
+"""Find where the metadata of a document page ends."""
+
+from __future__ import annotations
+
+import re
+from html.parser import HTMLParser
+
+# Tag name of each open element, with whether it guards metadata.
+OpenStack = list[tuple[str, bool]]
+
+# Class prefixes of the spans that start the structured legal text.
+_BODY_PREFIXES = (
+    "S_CRT",
+    "S_TTL",
+    "S_CAP",
+    "S_SEC",
+    "S_SSEC",
+    "S_PCT",
+    "S_ART",
+    "S_ANX",
+)
+
+# Spans whose text ends up in the document metadata.
+_METADATA_CLASSES = frozenset({"S_HDR", "S_EMT_BDY", "S_PUB_BDY"})
+
+# Elements that never have a closing tag.
+_VOID_TAGS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "source",
+        "track",
+        "wbr",
+    }
+)
+
+# Markers of the elements the document metadata is read from; finding one
+# after the cut means the page does not follow the usual layout.
+METADATA_MARKERS = ("istoric_fa", "fisaact", *sorted(_METADATA_CLASSES))
+METADATA_TAGS = re.compile(r"<(?:meta|title)\b", re.IGNORECASE)
+
+
+def _is_body_class(cls: str) -> bool:
+    """Return ``True`` if ``cls`` belongs to the structured legal text.
+
+    Args:
+        cls: One class of a ``span`` element.
+
+    Returns:
+        Whether the class names a container, an article or an annex.
+    """
+
+    for prefix in _BODY_PREFIXES:
+        if cls == prefix or cls.startswith(prefix + "_"):
+            return True
+    return False
+
+
+class _BodyFound(Exception):
+    """Raised by the scanner to stop at the start of the legal text."""
+
+
+class _PrefixScanner(HTMLParser):
+    """Event-based scanner stopping at the first span of the legal text.
+
+    Elements holding metadata are tracked while they are open: the
+    history block, the metadata spans and the parent of the document
+    sheet, whose following ``S_NTA`` sibling is the document note. The
+    scan only stops at a body span once all of them are closed.
+
+    Attributes:
+        end: Offset of the first body span, once found.
+    """
+
+    def __init__(self: "_PrefixScanner") -> None:
+        """Initialize the scanner state."""
+
+        super().__init__(convert_charrefs=False)
+        self.end: int | None = None
+        self._stack: OpenStack = []
+        self._guards = 0
+        self._tag_start = 0
+
+    def parse_starttag(self: "_PrefixScanner", i: int) -> int:
+        """Remember where the tag starts before parsing it.
+
+        Args:
+            i: Position of the tag inside the raw data.
+
+        Returns:
+            Position after the tag, as reported by the base class.
+        """
+
+        self._tag_start = i
+        return super().parse_starttag(i)
+
+    def handle_starttag(
+        self: "_PrefixScanner",
+        tag: str,
+        attrs: list[tuple[str, str | None]],
+    ) -> None:
+        """Track open elements and stop at the first body span.
+
+        Args:
+            tag: Lower-cased tag name.
+            attrs: Attributes of the tag.
+        """
+
+        values = dict(attrs)
+        classes = (values.get("class") or "").split()
+        element_id = values.get("id")
+
+        if tag == "span" and not self._guards:
+            if any(_is_body_class(cls) for cls in classes):
+                self.end = self._tag_start
+                raise _BodyFound
+
+        # The document note is a sibling of the sheet, so the parent of
+        # the sheet has to be closed before the scan may stop.
+        if element_id == "fisaact" and self._stack:
+            name, guarded = self._stack[-1]
+            if not guarded:
+                self._stack[-1] = (name, True)
+                self._guards += 1
+
+        if tag in _VOID_TAGS:
+            return
+        guarded = element_id == "istoric_fa" or bool(
+            _METADATA_CLASSES.intersection(classes)
+        )
+        self._stack.append((tag, guarded))
+        self._guards += guarded
+
+    def handle_startendtag(
+        self: "_PrefixScanner",
+        tag: str,
+        attrs: list[tuple[str, str | None]],
+    ) -> None:
+        """Treat self-closing tags as elements without content.
+
+        Args:
+            tag: Lower-cased tag name.
+            attrs: Attributes of the tag.
+        """
+
+        if tag not in _VOID_TAGS:
+            self.handle_starttag(tag, attrs)
+            self.handle_endtag(tag)
+
+    def handle_endtag(self: "_PrefixScanner", tag: str) -> None:
+        """Close the innermost open element with the same name.
+
+        Args:
+            tag: Lower-cased tag name.
+        """
+
+        # Stray closing tags are ignored, as browsers do.
+        for index in range(len(self._stack) - 1, -1, -1):
+            if self._stack[index][0] == tag:
+                break
+        else:
+            return
+
+        for _, guarded in self._stack[index:]:
+            self._guards -= guarded
+        del self._stack[index:]
+
+
+def metadata_end(html: str) -> int | None:
+    """Return the offset where the legal text of a page starts.
+
+    Everything ``parse_html`` reads for the document metadata and history
+    sits before that offset, so the text up to it can be parsed on its
+    own when the articles are not needed.
+
+    Args:
+        html: Raw HTML content of the legal document.
+
+    Returns:
+        Offset of the first container, article or annex span, or ``None``
+        when the page has no legal text or keeps metadata after it.
+    """
+
+    scanner = _PrefixScanner()
+    try:
+        scanner.feed(html)
+    except _BodyFound:
+        pass
+    end = scanner.end
+    if end is None:
+        return None
+
+    # Fall back to the whole page when metadata shows up after the cut.
+    for marker in METADATA_MARKERS:
+        if html.find(marker, end) >= 0:
+            return None
+    if METADATA_TAGS.search(html, end):
+        return None
+    return end
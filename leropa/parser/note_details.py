@@ -0,0 +1,133 @@
+"""Extract structured fields from amendment notes."""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+# Parsed note fields keyed by the ``Note`` attribute they fill.
+NoteDetails = dict[str, str | None]
+
+# Parsed note fields in the order of ``NOTE_FIELDS``.
+NoteValues = tuple[str | None, ...]
+
+# Names of the fields extracted from a note, as used by ``Note``.
+NOTE_FIELDS = (
+    "date",
+    "subject",
+    "law_number",
+    "law_date",
+    "monitor_number",
+    "monitor_date",
+    "replaced",
+    "replacement",
+)
+
+# Number of distinct note texts whose fields are remembered. Consolidated
+# versions of a law repeat the same notes, so the cache is shared by every
+# document parsed in the process.
+NOTE_CACHE_SIZE = 16384
+
+# Day, month name and year, as in "10 aprilie 2012".
+_LONG_DATE = r"([0-9]{1,2} [a-zăâîșț]+ [0-9]{4})"
+
+# Patterns for the individual fields.
+_DATE = re.compile(r"la (\d{2}[.-]\d{2}[.-]\d{4})")
+_SUBJECT = re.compile(r",\s*(.*?)\s+a fost")
+_LAW = re.compile(rf"LEGEA nr\.\s*(\d+)\s+din\s+{_LONG_DATE}", re.IGNORECASE)
+_MONITOR = re.compile(
+    rf"MONITORUL OFICIAL nr\.\s*(\d+)\s+din\s+{_LONG_DATE}", re.IGNORECASE
+)
+_REPLACE = re.compile(
+    r'înlocuirea sintagmei "([^"]+)" cu sintagma "([^"]+)"', re.IGNORECASE
+)
+
+# Every field pattern needs one of these literals: a date follows "la ",
+# law and gazette numbers follow "nr." in any case and the replaced text
+# is quoted. Cheap substring checks for them reject most notes that carry
+# no details without running any of the field patterns.
+_DATE_MARK = "la "
+_NUMBER_MARK = "nr."
+_QUOTE_MARK = '"'
+
+# Fields of a note that carries no details.
+_EMPTY: NoteValues = (None,) * len(NOTE_FIELDS)
+
+
+@lru_cache(maxsize=NOTE_CACHE_SIZE)
+def _note_values(text: str) -> NoteValues:
+    """Extract the note fields from ``text``.
+
+    Args:
+        text: Note text with normalized whitespace.
+
+    Returns:
+        Field values in the order of ``NOTE_FIELDS``.
+    """
+
+    # Find out which of the field patterns may match.
+    has_date = _DATE_MARK in text
+    has_number = _NUMBER_MARK in text.lower()
+    has_quotes = _QUOTE_MARK in text
+    if not (has_date or has_number or has_quotes):
+        return _EMPTY
+
+    date = subject = None
+    if has_date:
+        date_match = _DATE.search(text)
+        if date_match:
+            date = date_match.group(1)
+
+            # The subject is only reported for dated notes.
+            subject_match = _SUBJECT.search(text)
+            if subject_match:
+                subject = subject_match.group(1)
+
+    law_number = law_date = monitor_number = monitor_date = None
+    if has_number:
+        law_match = _LAW.search(text)
+        if law_match:
+            law_number, law_date = law_match.groups()
+        monitor_match = _MONITOR.search(text)
+        if monitor_match:
+            monitor_number, monitor_date = monitor_match.groups()
+
+    replaced = replacement = None
+    if has_quotes:
+        replace_match = _REPLACE.search(text)
+        if replace_match:
+            replaced, replacement = replace_match.groups()
+
+    return (
+        date,
+        subject,
+        law_number,
+        law_date,
+        monitor_number,
+        monitor_date,
+        replaced,
+        replacement,
+    )
+
+
+def parse_note_details(text: str) -> NoteDetails:
+    """Extract structured information from an amendment note.
+
+    Results are memoized by note text, so notes repeated across the
+    versions of a document are only parsed once.
+
+    Args:
+        text: Note text with normalized whitespace.
+
+    Returns:
+        Dictionary with parsed fields, defaulting to ``None`` when data is
+        missing.
+    """
+
+    return dict(zip(NOTE_FIELDS, _note_values(text)))
+
+
+def clear_note_cache() -> None:
+    """Forget the fields remembered for previously parsed notes."""
+
+    _note_values.cache_clear()
@@ -3,101 +3,90 @@
 from __future__ import annotations
 
 import re
-from typing import Any
-
-from attrs import asdict
-from bs4 import BeautifulSoup
+from typing import Any, Iterable
 
 from .annex import Annex
-from .book import Book
-from .chapter import Chapter
 from .document_info import DocumentInfo
+from .element_index import ElementIndex
+from .engine import DEFAULT_ENGINE, make_soup
+from .hierarchy import (
+    DEFAULT_BOOK_ID,
+    DEFAULT_CHAPTER_ID,
+    HierarchyBuilder,
+    collect_articles,
+)
 from .history_entry import HistoryEntry
+from .metadata_prefix import metadata_end
 from .note import Note
-from .section import Section
-from .title import Title
+from .parse_result import ParseResult
+from .text_view import NodeList, TextView
 from .types import ArticleDataList, HistoryList
+from .unstructure import unstructure
 from .utils import (
-    _ensure_book,
-    _ensure_chapter,
-    _ensure_section,
-    _ensure_subsection,
-    _ensure_title,
     _normalize_whitespace,
     _note_from_tag,
+    _note_from_text,
     _parse_article,
 )
 
-DEFAULT_BOOK_ID = "default_book"
-DEFAULT_CHAPTER_ID = "default_chapter"
-
-
-def _get_default_book(books: dict[str, Book]) -> Book:
-    """Return a placeholder book when the source lacks one.
-
-    Args:
-        books: Mapping of existing books keyed by identifier.
-
-    Returns:
-        Placeholder book instance.
-    """
+__all__ = [
+    "DEFAULT_BOOK_ID",
+    "DEFAULT_CHAPTER_ID",
+    "PARTS",
+    "parse_document",
+    "parse_html",
+]
 
-    # Retrieve the existing placeholder book if present.
-    book = books.get(DEFAULT_BOOK_ID)
-    if book is None:
-        # Create a new empty book to attach orphaned structures.
-        book = Book(book_id=DEFAULT_BOOK_ID, title="")
-        books[DEFAULT_BOOK_ID] = book
+# Sections of a document that ``parse_html`` can extract.
+PARTS = frozenset({"document", "history", "articles", "books", "annexes"})
 
-    return book
+# Sections that need the legal text and not just the page header.
+_BODY_PARTS = frozenset({"articles", "books", "annexes"})
 
 
-def _get_default_chapter(chapters: dict[str, Chapter]) -> Chapter:
-    """Return a placeholder chapter when the source lacks one.
+def _find_meta(index: ElementIndex, name: str) -> Any:  # noqa: ANN401
+    """Return the first ``meta`` tag with the given ``name`` attribute.
 
     Args:
-        chapters: Mapping of existing chapters keyed by identifier.
+        index: Element index of the document.
+        name: Value of the ``name`` attribute.
 
     Returns:
-        Placeholder chapter instance.
+        The matching tag or ``None``.
     """
 
-    # Retrieve the existing placeholder chapter if present.
-    chapter = chapters.get(DEFAULT_CHAPTER_ID)
-    if chapter is None:
-        # Create a new empty chapter to host orphaned sections.
-        chapter = Chapter(
-            chapter_id=DEFAULT_CHAPTER_ID, title="", description=None
-        )
-        chapters[DEFAULT_CHAPTER_ID] = chapter
-
-    return chapter
+    for tag in index.by_name("meta"):
+        if tag.get("name") == name:
+            return tag
+    return None
 
 
-def parse_html(html: str, ver_id: str) -> dict[str, Any]:
-    """Parse HTML content into structured data.
+def _document_info(
+    index: ElementIndex, ver_id: str, with_history: bool
+) -> DocumentInfo:
+    """Extract the metadata of the document.
 
     Args:
-        html: Raw HTML content of the legal document.
+        index: Element index of the document.
         ver_id: Identifier for the document version.
+        with_history: Collect the consolidation history as well.
 
     Returns:
-        Structured representation of the document.
+        Metadata of the document.
     """
 
-    soup = BeautifulSoup(html, "html.parser")
-
     # Extract document metadata from meta tags.
-    meta_title: Any = soup.find("meta", attrs={"name": "title"})
-    description_tag: Any = soup.find("meta", attrs={"name": "description"})
-    keywords_tag: Any = soup.find("meta", attrs={"name": "keywords"})
+    meta_title: Any = _find_meta(index, "title")
+    description_tag: Any = _find_meta(index, "description")
+    keywords_tag: Any = _find_meta(index, "keywords")
 
     # Fall back to the HTML title when meta title is missing.
+    title_tag = index.first("title")
     title = (
         meta_title.get("content")
         if meta_title and meta_title.get("content")
-        else soup.title.get_text(strip=True)
-        if soup.title
+        else title_tag.get_text(strip=True)
+        if title_tag
         else None
     )
 
@@ -111,30 +100,58 @@ def parse_html(html: str, ver_id: str) -> dict[str, Any]:
 
     sub_header = [
         _normalize_whitespace(itr_tag.get_text())
-        for itr_tag in soup.find_all("span", class_="S_HDR")
+        for itr_tag in index.by_class("S_HDR", "span")
     ]
     if description is None and sub_header:
         description = " ".join(sub_header)
 
     issuer = [
         _normalize_whitespace(itr_tag.get_text())
-        for itr_tag in soup.find_all("span", class_="S_EMT_BDY")
+        for itr_tag in index.by_class("S_EMT_BDY", "span")
     ]
     published = [
         _normalize_whitespace(itr_tag.get_text())
-        for itr_tag in soup.find_all("span", class_="S_PUB_BDY")
+        for itr_tag in index.by_class("S_PUB_BDY", "span")
     ]
 
+    # The note attached to the whole document follows the document sheet.
     document_note = None
-    sheet_el = soup.find("span", id="fisaact")
-    assert sheet_el is not None
-    notes_el = sheet_el.find_next_sibling(class_="S_NTA")
+    sheet_el = index.by_id("fisaact", "span")
+    notes_el = sheet_el.find_next_sibling(class_="S_NTA") if sheet_el else None
     if notes_el:
         document_note = _note_from_tag(notes_el)
 
+    history = _history(index) if with_history else []
+    source = f"https://legislatie.just.ro/Public/DetaliiDocument/{ver_id}"
+
+    # Store metadata and history in the document info.
+    return DocumentInfo(
+        source=source,
+        ver_id=ver_id,
+        title=title,
+        description=description,
+        keywords=keywords,
+        history=history,
+        prev_ver=history[0].ver_id if history else None,
+        document_note=document_note,
+        issuer=issuer,
+        published=published,
+    )
+
+
+def _history(index: ElementIndex) -> HistoryList:
+    """Collect the other versions listed in the consolidation history.
+
+    Args:
+        index: Element index of the document.
+
+    Returns:
+        History entries in the order of the list.
+    """
+
     # Collect historical versions from the consolidation list.
     history: HistoryList = []
-    history_div: Any = soup.find("div", id="istoric_fa")
+    history_div: Any = index.by_id("istoric_fa", "div")
     if history_div:
         # Iterate through all links representing previous versions.
         for link in history_div.find_all("a"):
@@ -166,112 +183,24 @@ def parse_html(html: str, ver_id: str) -> dict[str, Any]:
                 )
             )
 
-    # Store all parsed articles for backward compatibility.
-    parsed_articles: ArticleDataList = []
-
-    # Collect annexes attached at the end of the document.
-    parsed_annexes: list[Annex] = []
-
-    # Temporary registries for hierarchical structures to avoid duplicates.
-    books: dict[str, Book] = {}
-    titles: dict[str, Title] = {}
-    chapters: dict[str, Chapter] = {}
-    sections: dict[str, Section] = {}
-    section_titles: dict[str, Section] = {}
-
-    for art_tag in soup.find_all("span", class_="S_ART"):
-        # Parse the article tag into a dataclass.
-        article = _parse_article(art_tag)
-        if article is None:
-            continue
+    return history
 
-        # Ensure parent containers exist and retrieve them.
-        book = _ensure_book(art_tag, books)
-        title_obj = _ensure_title(art_tag, titles, book)
 
-        # When a title is present without a book, create a placeholder book.
-        if title_obj and book is None:
-            book = _get_default_book(books)
+def _annexes(index: ElementIndex) -> list[Annex]:
+    """Parse the annexes that follow the main body.
 
-            # Attach the title to the placeholder book if not already linked.
-            if all(t.title_id != title_obj.title_id for t in book.titles):
-                book.titles.append(title_obj)
-
-        chapter = _ensure_chapter(art_tag, chapters, title_obj, book)
-
-        # When a chapter lacks a parent book or title,
-        # create a book placeholder.
-        if chapter and not (book or title_obj):
-            book = _get_default_book(books)
-
-            # Attach the chapter to the placeholder book if needed.
-            if all(c.chapter_id != chapter.chapter_id for c in book.chapters):
-                book.chapters.append(chapter)
-
-        section = _ensure_section(
-            art_tag, sections, section_titles, chapter, title_obj, book
-        )
-
-        # Create missing hierarchy for sections without a parent chapter.
-        if section and chapter is None:
-            # Ensure a placeholder book exists.
-            if book is None:
-                book = _get_default_book(books)
-
-            # Create or retrieve the placeholder chapter.
-            chapter = _get_default_chapter(chapters)
-
-            # Attach the chapter to the available parent container.
-            if title_obj:
-                # Link title to the placeholder book if not already done.
-                if all(t.title_id != title_obj.title_id for t in book.titles):
-                    book.titles.append(title_obj)
-
-                if all(
-                    c.chapter_id != chapter.chapter_id
-                    for c in title_obj.chapters
-                ):
-                    title_obj.chapters.append(chapter)
-
-                # Remove the section from the title if it was attached there.
-                if section in title_obj.sections:
-                    title_obj.sections.remove(section)
-            else:
-                if all(
-                    c.chapter_id != chapter.chapter_id for c in book.chapters
-                ):
-                    book.chapters.append(chapter)
-
-                # Remove the section from the book if it was attached there.
-                if section in book.sections:
-                    book.sections.remove(section)
-
-            # Finally, attach the section to the placeholder chapter.
-            if all(
-                s.section_id != section.section_id for s in chapter.sections
-            ):
-                chapter.sections.append(section)
-
-        subsection = _ensure_subsection(
-            art_tag, sections, section_titles, section
-        )
+    Args:
+        index: Element index of the document.
 
-        # Attach the article id to the deepest container available.
-        if subsection:
-            subsection.articles.append(article.article_id)
-        elif section:
-            section.articles.append(article.article_id)
-        elif chapter:
-            chapter.articles.append(article.article_id)
-        elif title_obj:
-            title_obj.articles.append(article.article_id)
-        elif book:
-            book.articles.append(article.article_id)
+    Returns:
+        Annexes in document order.
+    """
 
-        parsed_articles.append(article)
+    # Collect annexes attached at the end of the document.
+    parsed_annexes: list[Annex] = []
 
     # Parse annexes that follow the main body.
-    for ttl_tag in soup.find_all("span", class_="S_ANX_TTL"):
+    for ttl_tag in index.by_class("S_ANX_TTL", "span"):
         annex_id_raw = ttl_tag.get("id", "")
 
         # Determine the base identifier shared by title and body.
@@ -282,24 +211,25 @@ def parse_html(html: str, ver_id: str) -> dict[str, Any]:
         )
 
         title_text = _normalize_whitespace(ttl_tag.get_text(" ", strip=True))
-        bdy_tag = soup.find("span", id=f"{annex_id}_bdy")
+        bdy_tag = index.by_id(f"{annex_id}_bdy", "span")
 
         notes: list[Note] = []
         body_text = ""
         if bdy_tag:
-            for note_tag in bdy_tag.find_all("span", class_="S_PAR"):
-                note_text = _normalize_whitespace(
-                    note_tag.get_text(" ", strip=True)
-                )
+            # Walk the annex body once; notes are left out of the body text
+            # without detaching them from the tree.
+            view = TextView(bdy_tag, skip_placeholders=False)
+            removed: NodeList = []
+            for note_pos in view.find_all(0, ("S_PAR",)):
+                note_text = view.text(note_pos)
 
                 # Treat paragraphs starting with "(la" as amendment notes.
                 if note_text.startswith("(la"):
-                    notes.append(_note_from_tag(note_tag))
-                    note_tag.extract()
+                    note_id = str(view.get(note_pos, "id", ""))
+                    notes.append(_note_from_text(note_id, note_text))
+                    removed.append(note_pos)
 
-            body_text = _normalize_whitespace(
-                bdy_tag.get_text(" ", strip=True)
-            )
+            body_text = view.text(0, removed)
 
         parsed_annexes.append(
             Annex(
@@ -310,25 +240,134 @@ def parse_html(html: str, ver_id: str) -> dict[str, Any]:
             )
         )
 
-    source = f"https://legislatie.just.ro/Public/DetaliiDocument/{ver_id}"
+    return parsed_annexes
 
-    # Store metadata and history in the document info.
-    document = DocumentInfo(
-        source=source,
-        ver_id=ver_id,
-        title=title,
-        description=description,
-        keywords=keywords,
-        history=history,
-        prev_ver=history[0].ver_id if history else None,
-        document_note=document_note,
-        issuer=issuer,
-        published=published,
-    )
 
-    return {
-        "document": asdict(document),
-        "articles": [asdict(a) for a in parsed_articles],
-        "books": [asdict(b) for b in books.values()],
-        "annexes": [asdict(a) for a in parsed_annexes],
-    }
+def _articles(soup: Any) -> tuple[ArticleDataList, HierarchyBuilder]:  # noqa: ANN401
+    """Parse the articles and the hierarchy that contains them.
+
+    Args:
+        soup: Parsed document tree.
+
+    Returns:
+        Articles in document order and the books, titles, chapters and
+        sections built around them.
+    """
+
+    # Store all parsed articles for backward compatibility.
+    parsed_articles: ArticleDataList = []
+
+    # Books, titles, chapters and sections built while walking articles.
+    hierarchy = HierarchyBuilder()
+
+    # Pair every article with its containers in a single walk, then parse
+    # the articles and attach them to the hierarchy.
+    for art_tag, containers in collect_articles(soup):
+        # Parse the article tag into a dataclass.
+        article = _parse_article(art_tag)
+        if article is None:
+            continue
+
+        hierarchy.add_article(article.article_id, containers)
+        parsed_articles.append(article)
+
+    return parsed_articles, hierarchy
+
+
+def parse_html(
+    html: str,
+    ver_id: str,
+    engine: str = DEFAULT_ENGINE,
+    parts: Iterable[str] | None = None,
+) -> dict[str, Any]:
+    """Parse HTML content into structured data.
+
+    Selecting ``parts`` skips the work for the rest of the document. When
+    only metadata is requested, the page is cut where the legal text
+    starts and only the part before it is turned into a tree.
+
+    Args:
+        html: Raw HTML content of the legal document.
+        ver_id: Identifier for the document version.
+        engine: Tree builder used to parse the HTML, such as
+            ``html.parser`` or ``lxml``.
+        parts: Sections to extract, out of ``PARTS``; all of them by
+            default. ``document`` and ``history`` both produce the
+            ``document`` entry, whose history list is only filled when
+            ``history`` is requested.
+
+    Returns:
+        Structured representation of the document, with one entry per
+        requested section.
+
+    Throws:
+        ValueError: If an unknown part is requested.
+    """
+
+    wanted = PARTS if parts is None else frozenset(parts)
+    unknown = wanted - PARTS
+    if unknown:
+        raise ValueError(
+            f"Unknown document parts: {', '.join(sorted(unknown))}. "
+            f"Expected any of: {', '.join(sorted(PARTS))}"
+        )
+
+    # Without the legal text, only the page up to its start is parsed.
+    if not wanted & _BODY_PARTS:
+        end = metadata_end(html)
+        if end is not None:
+            html = html[:end]
+
+    soup = make_soup(html, engine)
+
+    # Index ids, classes and tag names once so the lookups below do not
+    # scan the whole document again.
+    index = ElementIndex(soup)
+
+    result: dict[str, Any] = {}
+    if wanted & {"document", "history"}:
+        document = _document_info(index, ver_id, "history" in wanted)
+        result["document"] = unstructure(document)
+
+    if wanted & {"articles", "books"}:
+        parsed_articles, hierarchy = _articles(soup)
+        if "articles" in wanted:
+            result["articles"] = [unstructure(a) for a in parsed_articles]
+        if "books" in wanted:
+            result["books"] = [
+                unstructure(b) for b in hierarchy.books.values()
+            ]
+
+    if "annexes" in wanted:
+        result["annexes"] = [unstructure(a) for a in _annexes(index)]
+    return result
+
+
+def parse_document(
+    html: str, ver_id: str, engine: str = DEFAULT_ENGINE
+) -> ParseResult:
+    """Parse HTML content into parser objects.
+
+    Unlike ``parse_html``, the articles, books and annexes are returned
+    as they are built, without turning them into dictionaries.
+
+    Args:
+        html: Raw HTML content of the legal document.
+        ver_id: Identifier for the document version.
+        engine: Tree builder used to parse the HTML, such as
+            ``html.parser`` or ``lxml``.
+
+    Returns:
+        The parsed document, with articles indexed by identifier.
+    """
+
+    soup = make_soup(html, engine)
+    index = ElementIndex(soup)
+    document = _document_info(index, ver_id, True)
+    articles, hierarchy = _articles(soup)
+    return ParseResult(
+        document=document,
+        articles=articles,
+        books=list(hierarchy.books.values()),
+        annexes=_annexes(index),
+    )
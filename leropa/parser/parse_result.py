@@ -0,0 +1,113 @@
+"""Parsed document kept as parser objects."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from attrs import define, field
+
+from .annex import Annex
+from .article import Article
+from .book import Book
+from .document_info import DocumentInfo
+from .structure import structure
+from .types import AnnexList, ArticleDataList, BookList
+from .unstructure import to_json_bytes, unstructure
+
+# Position of each article in the document, keyed by its identifier.
+ArticlePositions = dict[str, int]
+
+
+@define(slots=True)
+class ParseResult:
+    """Parsed document kept as parser objects.
+
+    The articles are indexed by identifier when the result is created, so
+    looking one up does not scan the document. The lists are meant to be
+    read; articles added after creation are not indexed.
+
+    Attributes:
+        document: Metadata of the document.
+        articles: Articles in document order.
+        books: Hierarchy of books, titles, chapters and sections.
+        annexes: Annexes attached at the end of the document.
+    """
+
+    document: DocumentInfo
+    articles: ArticleDataList = field(factory=list, repr=False)
+    books: BookList = field(factory=list, repr=False)
+    annexes: AnnexList = field(factory=list, repr=False)
+    _positions: ArticlePositions = field(
+        init=False, factory=dict, repr=False, eq=False
+    )
+
+    def __attrs_post_init__(self: "ParseResult") -> None:
+        """Index the articles by identifier."""
+
+        # The first article with an identifier wins, as in the templates.
+        for pos, article in enumerate(self.articles):
+            self._positions.setdefault(article.article_id, pos)
+
+    @classmethod
+    def from_dict(
+        cls: type["ParseResult"], data: dict[str, Any]
+    ) -> "ParseResult":
+        """Rebuild a result from the structure ``parse_html`` returns.
+
+        Args:
+            data: Parsed document, as loaded from a JSON or YAML file.
+
+        Returns:
+            The document as parser objects.
+        """
+
+        return cls(
+            document=structure(data.get("document") or {}, DocumentInfo),
+            articles=[structure(a, Article) for a in data.get("articles", [])],
+            books=[structure(b, Book) for b in data.get("books", [])],
+            annexes=[structure(a, Annex) for a in data.get("annexes", [])],
+        )
+
+    def article(self: "ParseResult", article_id: str) -> Article | None:
+        """Return an article by identifier.
+
+        Args:
+            article_id: Identifier of the article.
+
+        Returns:
+            The first article with that identifier, or ``None`` if the
+            document has no such article.
+        """
+
+        pos = self._positions.get(article_id)
+        return None if pos is None else self.articles[pos]
+
+    def to_dict(self: "ParseResult") -> dict[str, Any]:
+        """Return the document as ``parse_html`` does.
+
+        Returns:
+            Dictionary with the document, articles, books and annexes.
+        """
+
+        return {
+            "document": unstructure(self.document),
+            "articles": [unstructure(a) for a in self.articles],
+            "books": [unstructure(b) for b in self.books],
+            "annexes": [unstructure(a) for a in self.annexes],
+        }
+
+    def to_json_bytes(self: "ParseResult") -> bytes:
+        """Serialize the document to JSON without building ``to_dict``.
+
+        Returns:
+            UTF-8 encoded JSON equal to ``json_dumps(self.to_dict())``.
+        """
+
+        return to_json_bytes(
+            {
+                "document": self.document,
+                "articles": self.articles,
+                "books": self.books,
+                "annexes": self.annexes,
+            }
+        )
@@ -0,0 +1,70 @@
+"""Token-bucket rate limiting for asynchronous downloads."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Callable
+
+# Function returning a monotonic time in seconds.
+ClockFunc = Callable[[], float]
+
+
+class TokenBucket:
+    """Token-bucket rate limiter for asynchronous tasks.
+
+    The bucket holds up to ``burst`` tokens and gains ``rate`` tokens per
+    second. Each call to ``acquire`` takes one token, waiting until one is
+    available, so over time no more than ``rate`` operations per second
+    go through while short bursts are still allowed.
+
+    Attributes:
+        rate: Tokens added per second.
+        burst: Maximum number of tokens held.
+    """
+
+    def __init__(
+        self: "TokenBucket",
+        rate: float,
+        burst: int = 1,
+        clock: ClockFunc = time.monotonic,
+    ) -> None:
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second.
+            burst: Maximum number of tokens held.
+            clock: Function returning a monotonic time in seconds.
+
+        Throws:
+            ValueError: If the rate or the burst size is not positive.
+        """
+
+        if rate <= 0 or burst < 1:
+            raise ValueError("Rate and burst must be positive.")
+
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self: "TokenBucket") -> None:
+        """Add the tokens earned since the last update."""
+
+        now = self._clock()
+        earned = (now - self._updated) * self.rate
+        self._tokens = min(float(self.burst), self._tokens + earned)
+        self._updated = now
+
+    async def acquire(self: "TokenBucket") -> None:
+        """Take one token, waiting until one is available."""
+
+        # Waiters queue on the lock so tokens are handed out in order.
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
@@ -0,0 +1,303 @@
+"""Persistent cache of parsed documents keyed by their HTML content."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import bs4
+
+from .html_cache import configured_max_bytes
+
+# Parsed document structure as returned by ``parse_html``.
+ParsedDocument = dict[str, Any]
+
+# Name of the directory holding parsed entries inside the cache directory.
+RESULTS_DIR = "parsed"
+
+# Byte budget for the entries of every fingerprint together, used when
+# neither the caller nor ``LEROPA_PARSED_CACHE_MAX_BYTES`` sets one.
+DEFAULT_MAX_BYTES = 1024**3
+
+# Environment variable overriding ``DEFAULT_MAX_BYTES``; ``0`` turns the
+# budget off.
+MAX_BYTES_ENV = "LEROPA_PARSED_CACHE_MAX_BYTES"
+
+# Seconds an entry may stay unused before a sweep deletes it.
+MAX_AGE = 30 * 24 * 3600.0
+
+# Seconds between two sweeps of the cache by any process.
+SWEEP_INTERVAL = 3600.0
+
+# Seconds during which repeated reads of an entry keep its recorded use.
+ACCESS_INTERVAL = 3600.0
+
+# File inside the results directory whose modification time records the
+# last sweep.
+SWEEP_MARKER = ".swept"
+
+# Pickle protocol used for the entries.
+PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+# Errors raised when an entry is truncated, corrupt or unreadable.
+_LOAD_ERRORS = (OSError, EOFError, pickle.UnpicklingError, ValueError)
+
+
+def _library_versions() -> str:
+    """Return the versions of the libraries building the parse trees.
+
+    Returns:
+        BeautifulSoup version, followed by the lxml and libxml2 versions
+        when lxml is installed.
+    """
+
+    versions = [bs4.__version__]
+    try:
+        from lxml import etree
+    except ImportError:
+        return " ".join(versions)
+
+    versions.append(".".join(map(str, etree.LXML_VERSION)))
+    versions.append(".".join(map(str, etree.LIBXML_VERSION)))
+    return " ".join(versions)
+
+
+@lru_cache(maxsize=1)
+def parser_fingerprint() -> str:
+    """Return a fingerprint of the parser source code.
+
+    The fingerprint covers every module of the ``leropa.parser`` package
+    and the versions of BeautifulSoup and lxml, so any change to the
+    parser code or to the tree builders produces a new fingerprint and
+    makes entries written before unreachable. The engine is part of each
+    entry key, see ``result_key``.
+
+    Returns:
+        Hexadecimal digest of the parser sources.
+    """
+
+    digest = hashlib.sha256(_library_versions().encode("utf-8"))
+    package_dir = Path(__file__).parent
+    for source in sorted(package_dir.glob("*.py")):
+        digest.update(source.name.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(source.read_bytes())
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def result_key(html: bytes, ver_id: str, engine: str) -> str:
+    """Return the cache key of a parse.
+
+    Args:
+        html: Raw HTML of the document.
+        ver_id: Identifier of the document version, part of the output.
+        engine: Tree builder used to parse the HTML.
+
+    Returns:
+        Hexadecimal digest identifying the parsed result.
+    """
+
+    digest = hashlib.sha256(html)
+    digest.update(b"\0" + ver_id.encode("utf-8"))
+    digest.update(b"\0" + engine.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Persistent cache of parsed documents keyed by their HTML content.
+
+    Entries are pickled parse results stored under a directory named after
+    the parser fingerprint, so changing the parser code invalidates them
+    automatically. Files are spread over subdirectories named after the
+    first characters of the key and are written atomically.
+
+    The modification time of an entry records its last use. At most once
+    every ``SWEEP_INTERVAL`` seconds, storing an entry sweeps the entries
+    of every fingerprint: the ones unused for ``max_age`` seconds are
+    deleted, then the least recently used ones until the byte budget is
+    met. Entries of other parser code, for example of another install
+    sharing the directory, thus age out instead of being wiped at once;
+    ``prune`` deletes them on request.
+
+    Attributes:
+        base: Directory holding the entries of every fingerprint.
+        root: Directory holding the entries of the current parser code.
+        max_bytes: Byte budget for all entries, if any.
+        max_age: Seconds an entry may stay unused.
+    """
+
+    def __init__(
+        self: "ResultCache",
+        cache_dir: Path,
+        fingerprint: str | None = None,
+        max_bytes: int | None = None,
+        max_age: float = MAX_AGE,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Base cache directory shared with the HTML cache.
+            fingerprint: Parser fingerprint, computed from the parser
+                sources by default.
+            max_bytes: Byte budget for all entries; ``0`` turns it off.
+                Defaults to ``LEROPA_PARSED_CACHE_MAX_BYTES`` or
+                ``DEFAULT_MAX_BYTES``.
+            max_age: Seconds an entry may stay unused.
+        """
+
+        fingerprint = fingerprint or parser_fingerprint()
+        self.base = cache_dir / RESULTS_DIR
+        self.root = self.base / fingerprint
+        if max_bytes is None:
+            self.max_bytes = configured_max_bytes(
+                MAX_BYTES_ENV, DEFAULT_MAX_BYTES
+            )
+        else:
+            self.max_bytes = max_bytes if max_bytes > 0 else None
+        self.max_age = max_age
+
+    def _path(self: "ResultCache", key: str) -> Path:
+        """Return the file storing the entry for ``key``.
+
+        Args:
+            key: Cache key of the entry.
+
+        Returns:
+            Path of the entry file.
+        """
+
+        return self.root / key[:2] / f"{key}.pickle"
+
+    def load(self: "ResultCache", key: str) -> ParsedDocument | None:
+        """Return the parsed document stored for ``key``.
+
+        Args:
+            key: Cache key of the entry.
+
+        Returns:
+            The stored document, or ``None`` if it is missing or unreadable.
+        """
+
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        # Damaged entries are treated as missing and overwritten later.
+        try:
+            doc = pickle.loads(data)
+        except _LOAD_ERRORS:
+            return None
+
+        # Record the use, which sweeps only need to a coarse precision.
+        try:
+            if time.time() - path.stat().st_mtime >= ACCESS_INTERVAL:
+                os.utime(path)
+        except OSError:
+            pass
+        return doc
+
+    def store(self: "ResultCache", key: str, doc: ParsedDocument) -> None:
+        """Store a parsed document under ``key``.
+
+        The entry is written to a temporary file first and then renamed, so
+        concurrent readers never see a partial entry.
+
+        Args:
+            key: Cache key of the entry.
+            doc: Parsed document structure.
+        """
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = pickle.dumps(doc, protocol=PICKLE_PROTOCOL)
+
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as stream:
+                stream.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        self._sweep_if_due()
+
+    def _sweep_if_due(self: "ResultCache") -> None:
+        """Sweep the cache unless a process did so recently."""
+
+        marker = self.base / SWEEP_MARKER
+        try:
+            if time.time() - marker.stat().st_mtime < SWEEP_INTERVAL:
+                return
+        except FileNotFoundError:
+            pass
+
+        # Touch the marker first so concurrent writers skip this sweep.
+        marker.touch()
+        self.sweep()
+
+    def sweep(self: "ResultCache") -> int:
+        """Delete stale entries, then the least recently used ones.
+
+        Entries of every fingerprint count towards the byte budget.
+
+        Returns:
+            Number of entries deleted.
+        """
+
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.base.glob("*/*/*.pickle"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        # Oldest first; stale entries go whatever the budget.
+        entries.sort()
+        oldest_kept = time.time() - self.max_age
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            over_budget = self.max_bytes is not None and total > self.max_bytes
+            if mtime >= oldest_kept and not over_budget:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def prune(self: "ResultCache") -> int:
+        """Delete the entries stored under other parser fingerprints.
+
+        Only runs when called; use it once no other install shares the
+        cache directory.
+
+        Returns:
+            Number of fingerprint directories deleted.
+        """
+
+        try:
+            siblings = list(self.root.parent.iterdir())
+        except FileNotFoundError:
+            return 0
+
+        removed = 0
+        for directory in siblings:
+            if directory == self.root or not directory.is_dir():
+                continue
+
+            # Another process may be removing the same directory.
+            shutil.rmtree(directory, ignore_errors=True)
+            removed += 1
+        return removed
@@ -0,0 +1,164 @@
+"""Rebuild parser objects from plain data with generated functions."""
+
+from __future__ import annotations
+
+import typing
+from types import NoneType, UnionType
+from typing import Any, Callable
+
+import attrs
+
+from .unstructure import PARSER_CLASSES
+
+# Function building one object from a dictionary.
+Structurer = Callable[[dict[str, Any]], Any]
+
+# Classes and defaults referred to by generated code, by their name there.
+Refs = dict[str, Any]
+
+# Names the field annotations of the parser classes refer to.
+_NAMESPACE = {cls.__name__: cls for cls in PARSER_CLASSES}
+
+
+class _Structurers(dict[type, Structurer]):
+    """Generated functions keyed by the class they build.
+
+    Functions are generated the first time a class is looked up, so
+    classes referring to each other or to themselves are handled.
+    """
+
+    def __missing__(self: "_Structurers", cls: type) -> Structurer:
+        """Generate and remember the function for ``cls``.
+
+        Args:
+            cls: Attrs class to build.
+
+        Returns:
+            The generated function.
+        """
+
+        found = self[cls] = _compile(cls)
+        return found
+
+
+_structurers = _Structurers()
+
+
+def _ref(value: Any, refs: Refs) -> str:  # noqa: ANN401
+    """Return the name generated code uses for ``value``.
+
+    Args:
+        value: Class or default value referred to.
+        refs: Values referred to so far; updated in place.
+
+    Returns:
+        Name bound to ``value`` in the namespace of the generated code.
+    """
+
+    for known, ref in refs.items():
+        if ref is value:
+            return known
+    name = f"_r{len(refs)}"
+    refs[name] = value
+    return name
+
+
+def _value_expression(hint: Any, refs: Refs) -> str:  # noqa: ANN401
+    """Return the code converting the ``value`` of one field.
+
+    Args:
+        hint: Resolved type annotation of the field.
+        refs: Values referred to by the generated code; updated in place.
+
+    Returns:
+        Expression building the field value from ``value``, which is
+        never ``None`` when it is evaluated.
+    """
+
+    # Optional fields were already checked for ``None``.
+    args = typing.get_args(hint)
+    if typing.get_origin(hint) in (typing.Union, UnionType):
+        rest = [arg for arg in args if arg is not NoneType]
+        if len(rest) == 1:
+            return _value_expression(rest[0], refs)
+        return "value"
+
+    if attrs.has(hint):
+        return f"_structurers[{_ref(hint, refs)}](value)"
+    if typing.get_origin(hint) is list:
+        item = args[0] if args else Any
+        if attrs.has(item):
+            name = _ref(item, refs)
+            return f"[_structurers[{name}](i) for i in value]"
+        return "list(value)"
+    return "value"
+
+
+def _compile(cls: type) -> Structurer:
+    """Generate the function building instances of ``cls``.
+
+    Args:
+        cls: Attrs class to build.
+
+    Returns:
+        The generated function.
+    """
+
+    hints = typing.get_type_hints(cls, localns=_NAMESPACE)
+    refs: Refs = {"_cls": cls}
+    lines = ["    obj = _cls.__new__(_cls)"]
+    for field in attrs.fields(cls):
+        # Missing keys fall back to the field default, or to ``None``.
+        default = field.default
+        if isinstance(default, attrs.Factory):  # type: ignore[arg-type]
+            missing = f"{_ref(default.factory, refs)}()"
+        elif default is attrs.NOTHING:
+            missing = "None"
+        else:
+            missing = _ref(default, refs)
+
+        convert = _value_expression(hints.get(field.name, Any), refs)
+        if convert != "value":
+            convert = f"None if value is None else {convert}"
+        lines += [
+            f"    value = data.get({field.name!r}, _missing)",
+            f"    obj.{field.name} = (",
+            f"        {missing} if value is _missing else {convert}",
+            "    )",
+        ]
+    lines.append("    return obj")
+
+    name = f"structure_{cls.__name__}"
+    source = "\n".join([f"def {name}(data):", *lines])
+    namespace: dict[str, Any] = {
+        "_structurers": _structurers,
+        "_missing": object(),
+        **refs,
+    }
+    exec(compile(source, f"<leropa {name}>", "exec"), namespace)  # noqa: S102
+    return namespace[name]
+
+
+def structure(data: dict[str, Any], cls: type) -> Any:  # noqa: ANN401
+    """Rebuild a parser object from the data ``unstructure`` produced.
+
+    The object is restored field by field without running its
+    initializer, so values normalized at parse time are kept as they
+    are. Keys missing from ``data`` take the field default, or ``None``
+    for fields without one, so documents written by older releases still
+    load; unknown keys are ignored.
+
+    Args:
+        data: Plain data of the object.
+        cls: Attrs class to build.
+
+    Returns:
+        The rebuilt object.
+    """
+
+    return _structurers[cls](data)
+
+
+# Generate the functions of the parser classes on import.
+for _cls in PARSER_CLASSES:
+    _structurers[_cls]
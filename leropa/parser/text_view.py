@@ -0,0 +1,339 @@
+"""Flattened, read-only view over the text of a document subtree."""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from typing import Any, Iterable
+
+from bs4.element import CData, NavigableString
+
+# Element positions in the view, in document order.
+NodeList = list[int]
+
+# Positions of the elements carrying each class.
+ClassPositions = dict[str, NodeList]
+
+# String types whose content counts as text, like in ``get_text``. Plain
+# ``str`` covers the text nodes returned by the lxml adapter.
+_TEXT_TYPES = (NavigableString, CData, str)
+
+# Placeholder spans that render as an ellipsis and never count as text.
+_SKIPPED_CLASSES = frozenset({"S_LIT_SHORT", "S_LIN_SHORT"})
+
+# Whitespace runs and spaces left in front of punctuation.
+_WHITESPACE = re.compile(r"\s+")
+_SPACE_BEFORE_PUNCTUATION = re.compile(r" ([,.;:!?\)])")
+
+
+def normalize_joined(pieces: Iterable[str]) -> str:
+    """Join text pieces with spaces and normalize the whitespace.
+
+    Produces the same result as ``_normalize_whitespace`` applied to
+    ``get_text(" ", strip=True)``: the pieces do not need to be stripped
+    first because whitespace runs collapse either way.
+
+    Args:
+        pieces: Text nodes in document order.
+
+    Returns:
+        Text with single spaces and no space before punctuation.
+    """
+
+    cleaned = _WHITESPACE.sub(" ", " ".join(pieces)).strip()
+    return _SPACE_BEFORE_PUNCTUATION.sub(r"\1", cleaned)
+
+
+class TextView:
+    """Flattened, read-only view over the text of a document subtree.
+
+    The subtree is walked once. Text nodes are stored in a flat list and
+    every ``span`` element records the range of text nodes and the range
+    of elements it contains. Searching for descendants by class and
+    collecting text then work on these ranges, and elements that the
+    parser treats as removed are passed in as exclusions instead of being
+    detached from the tree. Ellipsis placeholders in article bodies can be
+    left out entirely.
+
+    Elements are referred to by their position in document order; the
+    root has position ``0``.
+
+    Attributes:
+        pieces: Text nodes in document order.
+        tags: Wrapped elements.
+        classes: Classes of each element.
+        text_start: Index of the first text node of each element.
+        text_end: Index after the last text node of each element.
+        node_end: Position after the last descendant of each element.
+        children: Positions of the direct ``span`` children of each element.
+        by_class: Positions of the elements carrying each class.
+    """
+
+    def __init__(
+        self: "TextView",
+        root: Any,  # noqa: ANN401
+        skip_placeholders: bool = True,
+    ) -> None:
+        """Walk ``root`` and record its text and elements.
+
+        Args:
+            root: Element whose subtree is viewed.
+            skip_placeholders: Leave out ``S_LIT_SHORT`` and
+                ``S_LIN_SHORT`` spans together with their content.
+        """
+
+        self.pieces: list[str] = []
+        self.tags: list[Any] = []
+        self.classes: list[list[str]] = []
+        self.text_start: list[int] = []
+        self.text_end: list[int] = []
+        self.node_end: list[int] = []
+        self.children: list[NodeList] = []
+        self.by_class: ClassPositions = {}
+        self._skipped = _SKIPPED_CLASSES if skip_placeholders else frozenset()
+        self._add(root, root.get("class", []))
+
+    def _open(
+        self: "TextView",
+        tag: Any,  # noqa: ANN401
+        classes: list[str],
+    ) -> int:
+        """Record ``tag`` before its subtree.
+
+        Args:
+            tag: Element to record.
+            classes: Classes of the element.
+
+        Returns:
+            Position of the recorded element.
+        """
+
+        pos = len(self.tags)
+        self.tags.append(tag)
+        self.classes.append(classes)
+        self.text_start.append(len(self.pieces))
+        self.text_end.append(0)
+        self.node_end.append(0)
+        self.children.append([])
+        for cls in classes:
+            self.by_class.setdefault(cls, []).append(pos)
+        return pos
+
+    def _add(
+        self: "TextView",
+        root: Any,  # noqa: ANN401
+        classes: list[str],
+    ) -> None:
+        """Record ``root`` and its subtree in document order.
+
+        The subtree is walked with an explicit stack, so deeply nested
+        markup does not exhaust the interpreter stack.
+
+        Args:
+            root: Element to record.
+            classes: Classes of the element.
+        """
+
+        # Elements being recorded, each with its children not seen yet.
+        stack = [(self._open(root, classes), iter(root.children))]
+        while stack:
+            pos, children = stack[-1]
+            for child in children:
+                # Keep regular text nodes and ignore comments and scripts.
+                if isinstance(child, str):
+                    if type(child) in _TEXT_TYPES:
+                        self.pieces.append(child)
+                    continue
+
+                child_classes = child.get("class", [])
+                is_span = child.name == "span"
+
+                # Ellipsis placeholders are dropped with their subtree.
+                if is_span and self._skipped.intersection(child_classes):
+                    continue
+
+                # Only spans are searched for, other elements just hold
+                # text. The child is recorded before the rest of the
+                # children of this element.
+                child_pos = self._open(child, child_classes if is_span else [])
+                if is_span:
+                    self.children[pos].append(child_pos)
+                stack.append((child_pos, iter(child.children)))
+                break
+            else:
+                # Every child was recorded; close the element.
+                stack.pop()
+                self.text_end[pos] = len(self.pieces)
+                self.node_end[pos] = len(self.tags)
+
+    def get(
+        self: "TextView",
+        pos: int,
+        key: str,
+        default: Any = None,  # noqa: ANN401
+    ) -> Any:  # noqa: ANN401
+        """Return an attribute of the element at ``pos``.
+
+        Args:
+            pos: Position of the element.
+            key: Attribute name.
+            default: Value returned when the attribute is missing.
+
+        Returns:
+            The attribute value.
+        """
+
+        return self.tags[pos].get(key, default)
+
+    def _hidden(
+        self: "TextView", pos: int, root: int, removed: NodeList
+    ) -> bool:
+        """Return ``True`` if ``pos`` lies in a removed element below root.
+
+        Args:
+            pos: Position of the element to check.
+            root: Position of the element the search started from.
+            removed: Positions of the elements treated as removed.
+
+        Returns:
+            Whether the element is hidden by one of the removed elements.
+        """
+
+        # Only removed elements inside the searched subtree matter.
+        for rem in removed:
+            if root < rem <= pos < self.node_end[rem]:
+                return True
+        return False
+
+    def find_all(
+        self: "TextView",
+        root: int,
+        classes: Iterable[str],
+        removed: NodeList | None = None,
+    ) -> NodeList:
+        """Return the descendants of ``root`` carrying one of ``classes``.
+
+        Args:
+            root: Position of the element to search.
+            classes: Classes to look for.
+            removed: Positions of elements whose subtrees are skipped.
+
+        Returns:
+            Positions of the matching elements in document order.
+        """
+
+        found: set[int] = set()
+        stop = self.node_end[root]
+        for cls in classes:
+            positions = self.by_class.get(cls, [])
+
+            # Positions are sorted, so the descendants form one slice.
+            start = bisect_left(positions, root + 1)
+            end = bisect_left(positions, stop, lo=start)
+            found.update(positions[start:end])
+
+        result = sorted(found)
+        if removed:
+            result = [p for p in result if not self._hidden(p, root, removed)]
+        return result
+
+    def find(
+        self: "TextView",
+        root: int,
+        cls: str,
+        removed: NodeList | None = None,
+    ) -> int | None:
+        """Return the first descendant of ``root`` carrying ``cls``.
+
+        Args:
+            root: Position of the element to search.
+            cls: Class to look for.
+            removed: Positions of elements whose subtrees are skipped.
+
+        Returns:
+            Position of the first match or ``None``.
+        """
+
+        positions = self.by_class.get(cls, [])
+        stop = self.node_end[root]
+        for i in range(bisect_left(positions, root + 1), len(positions)):
+            pos = positions[i]
+            if pos >= stop:
+                break
+            if not removed or not self._hidden(pos, root, removed):
+                return pos
+        return None
+
+    def _visible_pieces(
+        self: "TextView", root: int, removed: NodeList | None
+    ) -> list[str]:
+        """Return the text nodes of ``root`` outside removed elements.
+
+        Args:
+            root: Position of the element.
+            removed: Positions of elements whose text is skipped.
+
+        Returns:
+            Text nodes in document order.
+        """
+
+        start = self.text_start[root]
+        end = self.text_end[root]
+        if not removed:
+            return self.pieces[start:end]
+
+        # Collect the text ranges of removed elements below the root.
+        gaps = sorted(
+            (self.text_start[rem], self.text_end[rem])
+            for rem in removed
+            if root < rem < self.node_end[root]
+        )
+
+        pieces: list[str] = []
+        cursor = start
+        for gap_start, gap_end in gaps:
+            if gap_start > cursor:
+                pieces.extend(self.pieces[cursor:gap_start])
+            cursor = max(cursor, gap_end)
+        pieces.extend(self.pieces[cursor:end])
+        return pieces
+
+    def text(
+        self: "TextView", root: int, removed: NodeList | None = None
+    ) -> str:
+        """Return the normalized text of ``root``.
+
+        Equivalent to ``_normalize_whitespace(tag.get_text(" ", strip=True))``
+        after detaching the removed elements.
+
+        Args:
+            root: Position of the element.
+            removed: Positions of elements whose text is skipped.
+
+        Returns:
+            Normalized text content.
+        """
+
+        return normalize_joined(self._visible_pieces(root, removed))
+
+    def label(
+        self: "TextView", root: int, removed: NodeList | None = None
+    ) -> str:
+        """Return the text of ``root`` with every piece stripped and glued.
+
+        Equivalent to ``tag.get_text(strip=True)`` after detaching the
+        removed elements.
+
+        Args:
+            root: Position of the element.
+            removed: Positions of elements whose text is skipped.
+
+        Returns:
+            Concatenated stripped text.
+        """
+
+        return "".join(
+            piece.strip()
+            for piece in self._visible_pieces(root, removed)
+            if piece.strip()
+        )
@@ -0,0 +1,259 @@
+"""Cut document pages down to the parts the parser reads."""
+
+from __future__ import annotations
+
+import re
+
+# Offsets of a region of the page, end excluded.
+Region = tuple[int, int]
+
+# Anything the parser may look at: classed spans, the document sheet,
+# the history block and the head tags holding the title.
+_MARKERS = re.compile(r"S_|fisaact|istoric_fa|<(?:meta|title)\b", re.I)
+_CONTENT_MARKERS = re.compile(r"S_|fisaact|istoric_fa", re.IGNORECASE)
+
+# Start tag with attribute values that may contain ``>``.
+_TAG = r"(?:\s(?:[^>\"']|\"[^\"]*\"|'[^']*')*)?/?>"
+
+# Comments, raw text elements and elements whose text is kept verbatim,
+# in document order.
+_RAW = re.compile(
+    r"(?P<comment><!--.*?-->)"
+    r"|(?P<raw_open><(?P<raw>script|style)\b" + _TAG + r")"
+    r".*?(?P<raw_close></(?P=raw)\s*>)"
+    r"|(?P<keep_open><(?P<kept>title|textarea)\b" + _TAG + r")"
+    r"(?P<kept_text>.*?)</(?P=kept)\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Start tags of the page chrome.
+_CHROME = re.compile(
+    r"<(?P<chrome>nav|header|footer|aside|form|select|noscript|svg|iframe"
+    r"|button)\b" + _TAG,
+    re.IGNORECASE,
+)
+
+# The head of the page and the tags in it the parser reads.
+_HEAD = re.compile(r"(<head\b" + _TAG + r")(.*?)(</head\s*>)", re.I | re.S)
+_HEAD_TAGS = re.compile(
+    r"<meta\b" + _TAG + r"|<title\b" + _TAG + r".*?</title\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# ``span`` and ``div`` tags, used to find where elements end.
+_SPANS = re.compile(r"<span\b" + _TAG + r"|</span\s*>", re.IGNORECASE)
+_DIVS = re.compile(r"<div\b" + _TAG + r"|</div\s*>", re.IGNORECASE)
+_HISTORY = re.compile(r"<div\b[^>]*istoric_fa", re.IGNORECASE)
+
+
+def _content_region(html: str) -> Region:
+    """Return the part of the page holding the classed spans.
+
+    The region starts at the first ``span`` with a class starting with
+    ``S_`` and ends once every such span is closed again, or at the last
+    marker of parsed content if that comes later.
+
+    Args:
+        html: Page content.
+
+    Returns:
+        Offsets of the region, empty and at the end of the page when the
+        page has no such span.
+    """
+
+    start = end = -1
+    stack: list[bool] = []
+    classed = 0
+    for match in _SPANS.finditer(html):
+        tag = match.group()
+        if tag[1] == "/":
+            if stack:
+                classed -= stack.pop()
+                if start >= 0 and not classed:
+                    end = match.end()
+            continue
+
+        is_classed = "S_" in tag
+        if is_classed and start < 0:
+            start = match.start()
+        if tag.endswith("/>"):
+            continue
+        stack.append(is_classed)
+        classed += is_classed
+
+    if start < 0:
+        return (len(html), len(html))
+
+    # Spans left open run to the end of the page.
+    if classed:
+        end = len(html)
+    last = max(html.rfind("S_"), html.rfind("s_"))
+    return (start, max(end, last + 2))
+
+
+def _history_regions(html: str) -> list[Region]:
+    """Return where the history blocks of the page lie.
+
+    Args:
+        html: Page content.
+
+    Returns:
+        Offsets of each ``istoric_fa`` block; an unclosed block runs to
+        the end of the page.
+    """
+
+    regions: list[Region] = []
+    for found in _HISTORY.finditer(html):
+        depth = 0
+        end = len(html)
+        for match in _DIVS.finditer(html, found.start()):
+            if match.group()[1] == "/":
+                depth -= 1
+                if depth == 0:
+                    end = match.end()
+                    break
+            elif not match.group().endswith("/>"):
+                depth += 1
+        regions.append((found.start(), end))
+    return regions
+
+
+def _trim_head(html: str) -> str:
+    """Keep only the ``meta`` and ``title`` tags of the page head.
+
+    Args:
+        html: Page content.
+
+    Returns:
+        Page with the rest of the head left out.
+    """
+
+    match = _HEAD.search(html)
+    if match is None:
+        return html
+
+    # Content that strayed into the head is left alone.
+    inner = match.group(2)
+    if _CONTENT_MARKERS.search(inner):
+        return html
+
+    kept = "".join(tag.group() for tag in _HEAD_TAGS.finditer(inner))
+    return (
+        html[: match.start()]
+        + match.group(1)
+        + kept
+        + match.group(3)
+        + html[match.end() :]
+    )
+
+
+def _chrome_end(html: str, name: str, start: int) -> int:
+    """Return where the chrome element opened at ``start`` ends.
+
+    Args:
+        html: Page content.
+        name: Lower-cased tag name of the element.
+        start: Offset just after its start tag.
+
+    Returns:
+        Offset of its closing tag, or ``-1`` if it is not closed before
+        another element with the same name opens.
+    """
+
+    pattern = re.compile(rf"<(/?){name}\b", re.IGNORECASE)
+    match = pattern.search(html, start)
+    if match is None or not match.group(1):
+        return -1
+    return match.start()
+
+
+def _empty_raw(html: str) -> tuple[str, str]:
+    """Empty the comments, scripts and styles of a page.
+
+    Args:
+        html: Page content.
+
+    Returns:
+        The page with those elements emptied, and a copy of it of the
+        same length in which the text of ``title`` and ``textarea``
+        elements is blanked out, for looking up markup.
+    """
+
+    pieces: list[str] = []
+    masked: list[str] = []
+    done = 0
+    for match in _RAW.finditer(html):
+        before = html[done : match.start()]
+        if match.group("comment") is not None:
+            kept = "<!---->"
+            blank = kept
+        elif match.group("raw_open") is not None:
+            kept = match.group("raw_open") + match.group("raw_close")
+            blank = kept
+        else:
+            kept = match.group()
+            text_start, text_end = match.span("kept_text")
+            blank = (
+                html[match.start() : text_start]
+                + " " * (text_end - text_start)
+                + html[text_end : match.end()]
+            )
+        pieces.append(before + kept)
+        masked.append(before + blank)
+        done = match.end()
+    pieces.append(html[done:])
+    masked.append(html[done:])
+    return "".join(pieces), "".join(masked)
+
+
+def trim_html(html: str) -> str:
+    """Cut a document page down to the parts the parser reads.
+
+    Scripts, styles and comments are emptied, the head keeps only its
+    ``meta`` and ``title`` tags, and navigation, forms, footers and
+    similar page chrome outside the legal text and the history block are
+    emptied. Elements are emptied rather than removed, so the tree keeps
+    its shape and ``parse_html`` returns the same result for the trimmed
+    page as for the original one.
+
+    Args:
+        html: Page content.
+
+    Returns:
+        Trimmed page.
+    """
+
+    html, masked = _empty_raw(_trim_head(html))
+    content = _content_region(masked)
+    history = _history_regions(masked)
+
+    pieces: list[str] = []
+    done = 0
+    pos = 0
+    while True:
+        match = _CHROME.search(masked, pos)
+        if match is None:
+            break
+
+        # Page chrome is emptied when nothing in it can be parsed.
+        open_end = match.end()
+        close = _chrome_end(masked, match.group("chrome").lower(), open_end)
+        pos = open_end
+        if close < 0:
+            continue
+        inner = masked[open_end:close]
+        start = match.start()
+        outside = close <= content[0] or start >= content[1]
+        if not outside or _MARKERS.search(inner):
+            continue
+
+        # Links inside the history block are read as versions.
+        if "<a" in inner.lower() and any(
+            first < close and start < last for first, last in history
+        ):
+            continue
+        pieces.append(html[done:open_end])
+        done = pos = close
+
+    pieces.append(html[done:])
+    return "".join(pieces)
@@ -0,0 +1,249 @@
+"""Turn parser objects into plain data with generated functions."""
+
+from __future__ import annotations
+
+import typing
+from types import NoneType, UnionType
+from typing import Any, Callable
+
+import attrs
+
+from leropa.json_utils import json_dumps_bytes
+
+from .annex import Annex
+from .article import Article
+from .article_path import ArticlePath
+from .book import Book
+from .chapter import Chapter
+from .document_info import DocumentInfo
+from .history_entry import HistoryEntry
+from .note import Note
+from .paragraph import Paragraph
+from .section import Section
+from .sub_paragraph import SubParagraph
+from .title import Title
+
+# Function turning one object into a dictionary.
+Unstructurer = Callable[[Any], dict[str, Any]]
+
+# Classes referred to by generated code, by the name it uses for them.
+ClassRefs = dict[str, type]
+
+# Classes produced by the parser; their functions are generated up front.
+PARSER_CLASSES = (
+    Annex,
+    Article,
+    ArticlePath,
+    Book,
+    Chapter,
+    DocumentInfo,
+    HistoryEntry,
+    Note,
+    Paragraph,
+    Section,
+    SubParagraph,
+    Title,
+)
+
+# Names the field annotations of the parser classes refer to.
+_NAMESPACE = {cls.__name__: cls for cls in PARSER_CLASSES}
+
+
+class _Unstructurers(dict[type, Unstructurer]):
+    """Generated functions keyed by the class they convert.
+
+    Functions are generated the first time a class is looked up, so
+    classes referring to each other or to themselves are handled.
+
+    Attributes:
+        deep: Whether the functions convert nested objects too.
+    """
+
+    def __init__(self: "_Unstructurers", deep: bool) -> None:
+        """Create an empty cache.
+
+        Args:
+            deep: Whether the functions convert nested objects too.
+        """
+
+        super().__init__()
+        self.deep = deep
+
+    def __missing__(self: "_Unstructurers", cls: type) -> Unstructurer:
+        """Generate and remember the function for ``cls``.
+
+        Args:
+            cls: Attrs class to convert.
+
+        Returns:
+            The generated function.
+        """
+
+        found = self[cls] = _compile(cls, self.deep)
+        return found
+
+
+_deep = _Unstructurers(deep=True)
+_shallow = _Unstructurers(deep=False)
+
+
+def _ref(cls: type, refs: ClassRefs) -> str:
+    """Return the name generated code uses for ``cls``.
+
+    Args:
+        cls: Class referred to.
+        refs: Classes referred to so far; updated in place.
+
+    Returns:
+        Name bound to ``cls`` in the namespace of the generated code.
+    """
+
+    for known, ref in refs.items():
+        if ref is cls:
+            return known
+    name = f"_c{len(refs)}"
+    refs[name] = cls
+    return name
+
+
+def _field_expression(hint: Any, value: str, refs: ClassRefs) -> str:  # noqa: ANN401
+    """Return the code converting one field the way ``asdict`` does.
+
+    Args:
+        hint: Resolved type annotation of the field.
+        value: Expression reading the field.
+        refs: Classes referred to by the generated code; updated in
+            place.
+
+    Returns:
+        Expression producing the converted value.
+    """
+
+    # Optional fields convert their value unless it is missing.
+    args = typing.get_args(hint)
+    if typing.get_origin(hint) in (typing.Union, UnionType):
+        rest = [arg for arg in args if arg is not NoneType]
+        if len(rest) == 1 and len(rest) < len(args):
+            inner = _field_expression(rest[0], value, refs)
+            if inner == value:
+                return value
+            return f"None if {value} is None else {inner}"
+        return f"_any({value})"
+
+    if attrs.has(hint):
+        return f"_deep[{_ref(hint, refs)}]({value})"
+    if typing.get_origin(hint) is list:
+        item = args[0] if args else Any
+        if attrs.has(item):
+            return f"[_deep[{_ref(item, refs)}](i) for i in {value}]"
+        if item in (str, int, float, bool):
+            return f"list({value})"
+        return f"_any({value})"
+    if hint in (str, int, float, bool):
+        return value
+    return f"_any({value})"
+
+
+def _compile(cls: type, deep: bool) -> Unstructurer:
+    """Generate the function converting instances of ``cls``.
+
+    Args:
+        cls: Attrs class to convert.
+        deep: Convert nested objects and copy lists, as ``asdict`` does;
+            otherwise field values are returned as they are.
+
+    Returns:
+        The generated function.
+    """
+
+    hints = typing.get_type_hints(cls, localns=_NAMESPACE)
+    refs: ClassRefs = {}
+    items = []
+    for field in attrs.fields(cls):
+        value = f"obj.{field.name}"
+        if deep:
+            hint = hints.get(field.name, Any)
+            value = _field_expression(hint, value, refs)
+        items.append(f"        {field.name!r}: {value},")
+
+    name = f"{'unstructure' if deep else 'fields'}_{cls.__name__}"
+    source = "\n".join([f"def {name}(obj):", "    return {", *items, "    }"])
+    namespace: dict[str, Any] = {"_deep": _deep, "_any": _any, **refs}
+    exec(compile(source, f"<leropa {name}>", "exec"), namespace)  # noqa: S102
+    return namespace[name]
+
+
+def _any(value: Any) -> Any:  # noqa: ANN401
+    """Convert a value of no known type the way ``asdict`` does.
+
+    Args:
+        value: Value to convert.
+
+    Returns:
+        Plain data equal to what ``asdict`` produces for the value.
+    """
+
+    if attrs.has(type(value)):
+        return unstructure(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return type(value)(_any(item) for item in value)
+    if isinstance(value, dict):
+        return {_any(key): _any(item) for key, item in value.items()}
+    return value
+
+
+def unstructure(obj: Any) -> dict[str, Any]:  # noqa: ANN401
+    """Convert a parser object into nested dictionaries and lists.
+
+    The result equals ``attrs.asdict(obj)``, but each class is converted
+    by a function generated for its fields instead of inspecting every
+    value.
+
+    Args:
+        obj: Instance of an attrs class.
+
+    Returns:
+        Plain data for ``obj``.
+    """
+
+    return _deep[type(obj)](obj)
+
+
+def _json_default(obj: Any) -> Any:  # noqa: ANN401
+    """Expose the fields of an attrs object to the JSON encoder.
+
+    Nested objects are left in place; the encoder calls this function
+    again when it reaches them, so no copy of the whole tree is built.
+
+    Args:
+        obj: Value the encoder cannot serialize by itself.
+
+    Returns:
+        Dictionary of the object fields.
+
+    Throws:
+        TypeError: If ``obj`` is not an attrs instance.
+    """
+
+    if not attrs.has(type(obj)):
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON")
+    return _shallow[type(obj)](obj)
+
+
+def to_json_bytes(data: Any) -> bytes:  # noqa: ANN401
+    """Serialize data holding parser objects straight to JSON.
+
+    Args:
+        data: Parser objects, or dictionaries and lists containing them.
+
+    Returns:
+        UTF-8 encoded JSON, the same as ``json_dumps`` produces for the
+        unstructured data.
+    """
+
+    return json_dumps_bytes(data, default=_json_default)
+
+
+# Generate the functions of the parser classes on import.
+for _cls in PARSER_CLASSES:
+    _deep[_cls], _shallow[_cls]
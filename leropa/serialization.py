@@ -0,0 +1,203 @@
+"""Read and write documents as UTF-8 bytes in JSON or YAML.
+
+JSON goes through orjson when it is installed and YAML through the
+libyaml bindings of PyYAML when they were compiled in, falling back to
+the pure-Python implementations otherwise. Every function returns or
+accepts bytes, so file contents and response bodies are never decoded
+and encoded again on the way.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Callable
+
+import yaml
+
+from leropa.json_utils import json_dumps_bytes, json_loads
+
+try:
+    import orjson  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+# Use the libyaml loader and dumper when PyYAML was built with them.
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeDumper, SafeLoader  # type: ignore[assignment]
+
+# File extensions and the format they hold.
+FILE_FORMATS = {".json": "json", ".yaml": "yaml", ".yml": "yaml"}
+
+# Whether YAML is handled by the libyaml bindings.
+LIBYAML = SafeLoader.__name__ == "CSafeLoader"
+
+
+def dumps_json(
+    data: object,
+    compact: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> bytes:
+    """Serialize data to UTF-8 encoded JSON.
+
+    Args:
+        data: Data structure to serialize.
+        compact: Write everything on one line without indentation, for
+            responses and records; otherwise the output equals
+            ``json_dumps``.
+        default: Function returning a serializable value for objects the
+            encoder does not support.
+
+    Returns:
+        JSON representation of ``data``.
+    """
+
+    if not compact:
+        return json_dumps_bytes(data, default=default)
+    if orjson is not None:
+        return orjson.dumps(data, default=default)
+    return json.dumps(
+        data, ensure_ascii=False, separators=(",", ":"), default=default
+    ).encode()
+
+
+def loads_json(data: bytes | str) -> Any:  # noqa: ANN401
+    """Deserialize JSON from bytes or a string.
+
+    Args:
+        data: JSON content.
+
+    Returns:
+        Parsed JSON object.
+    """
+
+    return json_loads(data)
+
+
+def dumps_yaml(data: object) -> bytes:
+    """Serialize data to UTF-8 encoded YAML.
+
+    Keys keep their order and non-ASCII text is written as it is, the
+    same as ``yaml.safe_dump(data, allow_unicode=True, sort_keys=False)``.
+
+    Args:
+        data: Data structure to serialize.
+
+    Returns:
+        YAML representation of ``data``.
+    """
+
+    return yaml.dump(
+        data,
+        Dumper=SafeDumper,
+        allow_unicode=True,
+        sort_keys=False,
+        encoding="utf-8",
+    )
+
+
+def loads_yaml(data: bytes | str) -> Any:  # noqa: ANN401
+    """Deserialize YAML from bytes or a string.
+
+    Args:
+        data: YAML content; bytes are decoded by the loader itself.
+
+    Returns:
+        Parsed YAML object.
+    """
+
+    return yaml.load(data, Loader=SafeLoader)  # noqa: S506
+
+
+def dumps(data: object, fmt: str, compact: bool = False) -> bytes:
+    """Serialize data in the given format.
+
+    Args:
+        data: Data structure to serialize.
+        fmt: ``json`` or ``yaml``.
+        compact: Write JSON on one line; ignored for YAML.
+
+    Returns:
+        Serialized ``data``.
+
+    Throws:
+        ValueError: If ``fmt`` is not supported.
+    """
+
+    if fmt == "json":
+        return dumps_json(data, compact=compact)
+    if fmt == "yaml":
+        return dumps_yaml(data)
+    raise ValueError(f"Unsupported format: {fmt}")
+
+
+def loads(data: bytes | str, fmt: str) -> Any:  # noqa: ANN401
+    """Deserialize data in the given format.
+
+    Args:
+        data: Serialized content.
+        fmt: ``json`` or ``yaml``.
+
+    Returns:
+        Parsed object.
+
+    Throws:
+        ValueError: If ``fmt`` is not supported.
+    """
+
+    if fmt == "json":
+        return loads_json(data)
+    if fmt == "yaml":
+        return loads_yaml(data)
+    raise ValueError(f"Unsupported format: {fmt}")
+
+
+def file_format(path: Path) -> str:
+    """Return the format of a file from its extension.
+
+    Args:
+        path: Location of the file.
+
+    Returns:
+        ``json`` or ``yaml``.
+
+    Throws:
+        ValueError: If the extension is not a JSON or YAML one.
+    """
+
+    try:
+        return FILE_FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported file type: {path.name}") from None
+
+
+def read_file(path: Path) -> Any:  # noqa: ANN401
+    """Load a JSON or YAML file, chosen by its extension.
+
+    Args:
+        path: Location of the file.
+
+    Returns:
+        Parsed content of the file.
+    """
+
+    fmt = file_format(path)
+    return loads(path.read_bytes(), fmt)
+
+
+def write_file(path: Path, data: object, compact: bool = False) -> int:
+    """Write data to a JSON or YAML file, chosen by its extension.
+
+    Args:
+        path: Location of the file.
+        data: Data structure to serialize.
+        compact: Write JSON on one line; ignored for YAML.
+
+    Returns:
+        Number of bytes written.
+    """
+
+    return path.write_bytes(dumps(data, file_format(path), compact=compact))
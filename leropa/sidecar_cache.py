@@ -0,0 +1,212 @@
+"""Binary copies of YAML document files for fast loading.
+
+Decoding YAML is far slower than unpickling the same data, even with the
+libyaml bindings. The first time a YAML document is read, a pickled copy
+is written to a cache directory; later reads load that copy as long as
+the modification time and size of the file did not change. Editors keep
+working with the YAML file, which remains the source of truth. JSON files
+decode about as fast as their pickled copy and are always read directly.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from leropa.serialization import file_format, loads
+
+logger = logging.getLogger(__name__)
+
+# Formats whose files get a binary copy.
+SIDECAR_FORMATS = frozenset({"yaml"})
+
+# Pickle protocol used for the copies.
+PICKLE_PROTOCOL = 5
+
+# Start of every copy: a tag, then the modification time and size of the
+# document file when it was read.
+_MAGIC = b"LEROPA01"
+_HEADER = struct.Struct("<8sqq")
+
+# Errors raised when a copy is truncated, corrupt or unreadable.
+_LOAD_ERRORS = (OSError, EOFError, pickle.UnpicklingError, ValueError)
+
+
+def sidecar_dir() -> Path | None:
+    """Return the directory holding the binary copies.
+
+    Returns:
+        Path taken from ``LEROPA_SIDECAR_CACHE``, ``~/.leropa/sidecar`` by
+        default, or ``None`` when the variable is empty, which disables
+        the copies.
+    """
+
+    value = os.environ.get("LEROPA_SIDECAR_CACHE")
+    if value is None:
+        return Path.home() / ".leropa" / "sidecar"
+    return Path(value) if value else None
+
+
+class SidecarCache:
+    """Binary copies of document files, keyed by the path of the file.
+
+    Each copy records the modification time and size of the file it was
+    made from and is ignored once the file changes. Copies are spread over
+    subdirectories named after the first characters of their key and are
+    written atomically.
+
+    Attributes:
+        root: Directory holding the copies.
+    """
+
+    def __init__(self: "SidecarCache", root: Path) -> None:
+        """Initialize the cache.
+
+        Args:
+            root: Directory holding the copies; created when needed.
+        """
+
+        self.root = root
+
+    def _path(self: "SidecarCache", source: Path) -> Path:
+        """Return the file storing the copy of ``source``.
+
+        Args:
+            source: Location of the document file.
+
+        Returns:
+            Path of the copy.
+        """
+
+        key = hashlib.sha256(str(source.resolve()).encode("utf-8"))
+        digest = key.hexdigest()
+        return self.root / digest[:2] / f"{digest}.pickle"
+
+    def load(
+        self: "SidecarCache",
+        source: Path,
+        stat: os.stat_result,
+    ) -> Any:  # noqa: ANN401
+        """Return the data stored for ``source``.
+
+        Args:
+            source: Location of the document file.
+            stat: Current status of the document file.
+
+        Returns:
+            The stored data, or ``None`` if the copy is missing, stale or
+            unreadable.
+        """
+
+        try:
+            content = self._path(source).read_bytes()
+        except OSError:
+            return None
+
+        # Copies made from another state of the file are ignored.
+        if len(content) < _HEADER.size:
+            return None
+        signature = (_MAGIC, stat.st_mtime_ns, stat.st_size)
+        if _HEADER.unpack_from(content) != signature:
+            return None
+
+        # Damaged copies are treated as missing and overwritten later.
+        try:
+            return pickle.loads(memoryview(content)[_HEADER.size :])
+        except _LOAD_ERRORS:
+            return None
+
+    def store(
+        self: "SidecarCache",
+        source: Path,
+        stat: os.stat_result,
+        data: object,
+    ) -> None:
+        """Store the data read from ``source``.
+
+        The copy is written to a temporary file first and then renamed, so
+        concurrent readers never see a partial copy.
+
+        Args:
+            source: Location of the document file.
+            stat: Status of the document file taken before reading it.
+            data: Data decoded from the file.
+        """
+
+        path = self._path(source)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = _HEADER.pack(_MAGIC, stat.st_mtime_ns, stat.st_size)
+        body = pickle.dumps(data, protocol=PICKLE_PROTOCOL)
+
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as stream:
+                stream.write(header)
+                stream.write(body)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def discard(self: "SidecarCache", source: Path) -> None:
+        """Remove the copy of ``source``, if any.
+
+        Args:
+            source: Location of the document file.
+        """
+
+        self._path(source).unlink(missing_ok=True)
+
+
+def read_document_file(path: Path) -> Any:  # noqa: ANN401
+    """Load a JSON or YAML file, through its binary copy for YAML.
+
+    Args:
+        path: Location of the file.
+
+    Returns:
+        Parsed content of the file.
+
+    Throws:
+        ValueError: If the extension is not a JSON or YAML one.
+    """
+
+    fmt = file_format(path)
+    root = sidecar_dir()
+    if root is None or fmt not in SIDECAR_FORMATS:
+        return loads(path.read_bytes(), fmt)
+
+    # The status is taken before reading, so a file rewritten meanwhile
+    # does not match the copy and is read again next time.
+    cache = SidecarCache(root)
+    stat = path.stat()
+    data = cache.load(path, stat)
+    if data is not None:
+        return data
+
+    data = loads(path.read_bytes(), fmt)
+
+    # A cache that cannot be written only makes the next read slower.
+    try:
+        cache.store(path, stat, data)
+    except OSError as exc:
+        logger.warning("Cannot write the binary copy of %s: %s", path, exc)
+    return data
+
+
+def discard_sidecar(path: Path) -> None:
+    """Remove the binary copy of a document file that is going away.
+
+    Args:
+        path: Location of the document file.
+    """
+
+    root = sidecar_dir()
+    if root is not None:
+        SidecarCache(root).discard(path)
@@ -0,0 +1,368 @@
+"""Index of the structured documents stored for the web application."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from attrs import define
+
+from leropa.document_cache import read_document_header
+
+logger = logging.getLogger(__name__)
+
+# Summary of one document as returned by the listing endpoints.
+DocumentSummary = dict[str, str | None]
+
+# File extensions of document files; when several files share a version
+# identifier, the first extension wins.
+DOCUMENT_SUFFIXES = (".json", ".yaml", ".yml")
+
+# Seconds between full rescans of a directory whose modification time did
+# not change, catching files rewritten in place.
+RESCAN_SECONDS = float(os.environ.get("LEROPA_CATALOG_RESCAN", 60))
+
+
+@define(slots=True)
+class CatalogEntry:
+    """Metadata of one document file.
+
+    Attributes:
+        ver_id: Identifier of the document version, the file name stem.
+        path: Location of the document file.
+        mtime_ns: Modification time of the file when it was read.
+        size: Size in bytes of the file when it was read.
+        title: Document title.
+        kind: Document type.
+        state: Document state.
+        date: Document date as ``[day, month, year]``.
+    """
+
+    ver_id: str
+    path: Path
+    mtime_ns: int
+    size: int
+    title: str | None = None
+    kind: str | None = None
+    state: str | None = None
+    date: list[int] | None = None
+
+    def summary(self: "CatalogEntry") -> DocumentSummary:
+        """Return the identifier and title of the document."""
+
+        return {"ver_id": self.ver_id, "title": self.title}
+
+
+def _read_entry(ver_id: str, path: Path, stat: os.stat_result) -> CatalogEntry:
+    """Read the metadata of a document file.
+
+    Args:
+        ver_id: Identifier of the document version.
+        path: Location of the document file.
+        stat: Status of the file, recorded in the entry.
+
+    Returns:
+        Entry built from the ``document`` section of the file.
+
+    Throws:
+        ValueError: If the file does not hold a structured document.
+    """
+
+    # Only the leading ``document`` section of the file is decoded.
+    header = read_document_header(path)
+
+    # Stored documents were normalized when parsed; their values are kept
+    # as they are.
+    return CatalogEntry(
+        ver_id=ver_id,
+        path=path,
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        title=header.get("title"),
+        kind=header.get("kind"),
+        state=header.get("state"),
+        date=header.get("date"),
+    )
+
+
+def _rank(path: Path) -> int:
+    """Return the precedence of a file extension, lowest first.
+
+    Args:
+        path: Location of a file.
+
+    Returns:
+        Position of the extension in ``DOCUMENT_SUFFIXES``, or the length
+        of that tuple for other files.
+    """
+
+    if path.suffix in DOCUMENT_SUFFIXES:
+        return DOCUMENT_SUFFIXES.index(path.suffix)
+    return len(DOCUMENT_SUFFIXES)
+
+
+def _sort_key(ver_id: str) -> tuple[int, int, str]:
+    """Order numeric identifiers by value, before any other identifier."""
+
+    if ver_id.isdigit():
+        return (0, int(ver_id), ver_id)
+    return (1, 0, ver_id)
+
+
+class DocumentCatalog:
+    """Metadata of every document file in a directory, by identifier.
+
+    The catalog is checked against the directory instead of globbing it
+    on every request. Adding, removing or renaming a file changes the
+    modification time of the directory, which triggers a rescan; files
+    whose modification time and size did not change keep their entry, so
+    only new or changed files are read. A file looked up by identifier
+    is checked on its own, and the whole directory is rescanned every
+    ``rescan_seconds`` to pick up files rewritten in place.
+
+    Attributes:
+        directory: Directory holding the document files.
+        rescan_seconds: Longest time between two full rescans.
+    """
+
+    def __init__(
+        self: "DocumentCatalog",
+        directory: Path,
+        rescan_seconds: float = RESCAN_SECONDS,
+    ) -> None:
+        """Create a catalog of ``directory``; it is scanned when used.
+
+        Args:
+            directory: Directory holding the document files.
+            rescan_seconds: Longest time between two full rescans.
+        """
+
+        self.directory = directory
+        self.rescan_seconds = rescan_seconds
+        self._entries: dict[str, CatalogEntry] = {}
+        self._order: list[str] = []
+        self._failed: dict[Path, tuple[int, int]] = {}
+        self._dir_mtime_ns: int | None = None
+        self._scanned_at = 0.0
+        self._lock = threading.RLock()
+
+    def __len__(self: "DocumentCatalog") -> int:
+        """Return the number of documents in the directory."""
+
+        self.refresh()
+        return len(self._entries)
+
+    def __contains__(self: "DocumentCatalog", ver_id: object) -> bool:
+        """Return ``True`` if a document file has identifier ``ver_id``."""
+
+        return isinstance(ver_id, str) and self.get(ver_id) is not None
+
+    def refresh(self: "DocumentCatalog", force: bool = False) -> None:
+        """Rescan the directory if it may have changed.
+
+        Args:
+            force: Rescan even if the directory looks unchanged.
+        """
+
+        with self._lock:
+            try:
+                dir_mtime_ns: int | None = self.directory.stat().st_mtime_ns
+            except FileNotFoundError:
+                dir_mtime_ns = None
+
+            expired = (
+                time.monotonic() - self._scanned_at >= self.rescan_seconds
+            )
+            if force or expired or dir_mtime_ns != self._dir_mtime_ns:
+                self._scan()
+                self._dir_mtime_ns = dir_mtime_ns
+
+    def _scan(self: "DocumentCatalog") -> None:
+        """Rebuild the entries from the files of the directory."""
+
+        # Pick one file per identifier, by order of ``DOCUMENT_SUFFIXES``.
+        found: dict[str, tuple[int, os.DirEntry[str]]] = {}
+        try:
+            with os.scandir(self.directory) as scan:
+                for dir_entry in scan:
+                    stem = os.path.splitext(dir_entry.name)[0]
+                    rank = _rank(Path(dir_entry.name))
+                    if rank == len(DOCUMENT_SUFFIXES):
+                        continue
+                    if stem in found and found[stem][0] <= rank:
+                        continue
+                    if dir_entry.is_file():
+                        found[stem] = (rank, dir_entry)
+        except FileNotFoundError:
+            pass
+
+        entries: dict[str, CatalogEntry] = {}
+        for ver_id, (_, dir_entry) in found.items():
+            entry = self._load(ver_id, Path(dir_entry.path), dir_entry.stat())
+            if entry is not None:
+                entries[ver_id] = entry
+
+        self._entries = entries
+        self._order = sorted(entries, key=_sort_key)
+        self._scanned_at = time.monotonic()
+
+    def _load(
+        self: "DocumentCatalog",
+        ver_id: str,
+        path: Path,
+        stat: os.stat_result,
+    ) -> CatalogEntry | None:
+        """Return the entry of a file, reading it only if it changed.
+
+        Args:
+            ver_id: Identifier of the document version.
+            path: Location of the document file.
+            stat: Current status of the file.
+
+        Returns:
+            The entry, or ``None`` if the file cannot be read.
+        """
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        known = self._entries.get(ver_id)
+        if known is not None and known.path == path:
+            if (known.mtime_ns, known.size) == signature:
+                return known
+
+        # Files that failed to load are retried once they change.
+        if self._failed.get(path) == signature:
+            return None
+        try:
+            entry = _read_entry(ver_id, path, stat)
+        except Exception as exc:
+            logger.warning("Skipping document file %s: %s", path, exc)
+            self._failed[path] = signature
+            return None
+        self._failed.pop(path, None)
+        return entry
+
+    def get(self: "DocumentCatalog", ver_id: str) -> CatalogEntry | None:
+        """Return the entry of one document.
+
+        The file of the document is checked, so an entry rewritten or
+        removed since the last scan is updated.
+
+        Args:
+            ver_id: Identifier of the document version.
+
+        Returns:
+            The entry, or ``None`` if no file has that identifier.
+        """
+
+        with self._lock:
+            self.refresh()
+            entry = self._entries.get(ver_id)
+            if entry is None:
+                return None
+
+            try:
+                stat = entry.path.stat()
+            except FileNotFoundError:
+                self.refresh(force=True)
+                return self._entries.get(ver_id)
+
+            current = self._load(ver_id, entry.path, stat)
+            if current is None:
+                self.discard(ver_id)
+            elif current is not entry:
+                self._entries[ver_id] = current
+            return current
+
+    def path(self: "DocumentCatalog", ver_id: str) -> Path | None:
+        """Return the file of one document.
+
+        Args:
+            ver_id: Identifier of the document version.
+
+        Returns:
+            Location of the file, or ``None`` if no file has that
+            identifier.
+        """
+
+        entry = self.get(ver_id)
+        return entry.path if entry is not None else None
+
+    def entries(
+        self: "DocumentCatalog", offset: int = 0, limit: int | None = None
+    ) -> list[CatalogEntry]:
+        """Return the entries of one page of documents.
+
+        Args:
+            offset: Number of documents to skip.
+            limit: Largest number of documents to return; all of them
+                when ``None``.
+
+        Returns:
+            Entries ordered by identifier, numeric identifiers first.
+        """
+
+        with self._lock:
+            self.refresh()
+            stop = None if limit is None else offset + limit
+            return [self._entries[v] for v in self._order[offset:stop]]
+
+    def update(self: "DocumentCatalog", path: Path) -> CatalogEntry | None:
+        """Record a document file written by the application.
+
+        Args:
+            path: Location of the new or rewritten file.
+
+        Returns:
+            The entry of the file, or ``None`` if it cannot be read.
+        """
+
+        with self._lock:
+            ver_id = path.stem
+
+            # A file with a preferred extension keeps precedence.
+            known = self._entries.get(ver_id)
+            if known is not None and _rank(known.path) < _rank(path):
+                return known
+
+            entry = self._load(ver_id, path, path.stat())
+            if entry is None:
+                return None
+            if ver_id not in self._entries:
+                self._order.append(ver_id)
+                self._order.sort(key=_sort_key)
+            self._entries[ver_id] = entry
+            return entry
+
+    def discard(self: "DocumentCatalog", ver_id: str) -> None:
+        """Forget a document whose file was removed by the application.
+
+        Args:
+            ver_id: Identifier of the document version.
+        """
+
+        with self._lock:
+            if self._entries.pop(ver_id, None) is not None:
+                self._order.remove(ver_id)
+
+
+# Catalogs keyed by the directory they index.
+_CATALOGS: dict[Path, DocumentCatalog] = {}
+
+
+def get_catalog(directory: Path) -> DocumentCatalog:
+    """Return the shared catalog of ``directory``.
+
+    Args:
+        directory: Directory holding the document files.
+
+    Returns:
+        The catalog, created on first use.
+    """
+
+    catalog = _CATALOGS.get(directory)
+    if catalog is None:
+        catalog = _CATALOGS.setdefault(directory, DocumentCatalog(directory))
+    return catalog
@@ -2,35 +2,59 @@
 
 from __future__ import annotations
 
-import os
+import tempfile
 from pathlib import Path
-from tempfile import NamedTemporaryFile
+from typing import IO, Iterator
 
-import yaml  # type: ignore[import-untyped]
 from fastapi import (  # type: ignore[import-not-found]
     APIRouter,
-    BackgroundTasks,
     Query,
     Response,
 )
 from fastapi.responses import (  # type: ignore[import-not-found]
-    FileResponse,
-    JSONResponse,
-    PlainTextResponse,
+    StreamingResponse,
 )
 
 from leropa import parser
+from leropa.batch import document_lines
+from leropa.serialization import dumps_json, dumps_yaml
 from leropa.xlsx import write_workbook
 
 router = APIRouter()
 
+# Media type of Excel workbooks.
+XLSX_MEDIA_TYPE = (
+    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+)
+
+# Size of the chunks a workbook is sent in.
+CHUNK_SIZE = 64 * 1024
+
+
+def _chunks(stream: IO[bytes]) -> Iterator[bytes]:
+    """Yield the content of ``stream`` in chunks of ``CHUNK_SIZE`` bytes.
+
+    The stream is closed once it is exhausted or the download stops.
+
+    Args:
+        stream: Stream positioned at the start of the content.
+
+    Yields:
+        Consecutive chunks of the content.
+    """
+
+    with stream:
+        while chunk := stream.read(CHUNK_SIZE):
+            yield chunk
+
 
 @router.get("/convert")
 async def convert_endpoint(
     ver_id: str,
-    background_tasks: BackgroundTasks,
     cache_dir: str | None = Query(default=None),
-    output_format: str = Query(default="json", enum=["json", "yaml", "xlsx"]),
+    output_format: str = Query(
+        default="json", enum=["json", "yaml", "xlsx", "document-jsonl"]
+    ),
 ) -> Response:
     """Convert a document identifier to structured data.
 
@@ -51,19 +75,35 @@ async def convert_endpoint(
 
     # Return JSON when requested.
     if output_format == "json":
-        return JSONResponse(doc)
+        return Response(
+            dumps_json(doc, compact=True), media_type="application/json"
+        )
+
+    # Stream one JSON record per line; the first bytes go out before the
+    # rest of the document is serialized.
+    if output_format == "document-jsonl":
+        return StreamingResponse(
+            document_lines(doc), media_type="application/x-ndjson"
+        )
 
     # Return YAML output.
     if output_format == "yaml":
-        text = yaml.safe_dump(doc, allow_unicode=True, sort_keys=False)
-        return PlainTextResponse(text, media_type="application/x-yaml")
-
-    # Prepare XLSX output by writing to a temporary file.
-    tmp = NamedTemporaryFile(suffix=".xlsx", delete=False)
-    write_workbook(doc, Path(tmp.name))
-
-    # Schedule file deletion after the response is sent.
-    background_tasks.add_task(os.unlink, tmp.name)
-
-    # Serve the file as a download.
-    return FileResponse(tmp.name, filename=f"{ver_id}.xlsx")
+        return Response(dumps_yaml(doc), media_type="application/x-yaml")
+
+    # Write the workbook to an anonymous temporary file and stream it as
+    # a download, so the file is never held in memory; the file has no
+    # name on disk and goes away when it is closed.
+    stream = tempfile.TemporaryFile()
+    try:
+        write_workbook(doc, stream)
+    except BaseException:
+        stream.close()
+        raise
+    stream.seek(0)
+    return StreamingResponse(
+        _chunks(stream),
+        media_type=XLSX_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": f'attachment; filename="{ver_id}.xlsx"'
+        },
+    )
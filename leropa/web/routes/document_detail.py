@@ -11,11 +11,14 @@ from fastapi import (  # type: ignore[import-not-found]
     Request,
     Response,
 )
-from fastapi.responses import JSONResponse  # type: ignore[import-not-found]
 
+from leropa.parser import ParseResult
+from leropa.serialization import dumps_json
+
+from ..catalog import get_catalog
 from ..utils import (
     create_jinja_context,
-    document_files,
+    get_documents_dir,
     get_translator,
     load_document_file,
     strip_full_text,
@@ -44,7 +47,7 @@ async def get_document(
     """
 
     # Locate the document file matching ``ver_id``.
-    file_path = next((p for p in document_files() if p.stem == ver_id), None)
+    file_path = get_catalog(get_documents_dir()).path(ver_id)
     if file_path is None:
         tr = get_translator(lang)
         raise HTTPException(
@@ -52,23 +55,27 @@ async def get_document(
             detail=tr("document_not_found", "Document not found"),
         )
 
-    doc = strip_full_text(load_document_file(file_path))
+    data = load_document_file(file_path)
 
-    # Render as HTML when requested.
+    # Render as HTML when requested; articles are looked up by identifier
+    # through the parsed result instead of an ad hoc index.
     if format == "html":
-        title = doc.get("document", {}).get("title", "Document")
+        doc = ParseResult.from_dict(data)
+        title = doc.document.title or "Document"
         return templates.TemplateResponse(
             "document_detail.html",
             context=create_jinja_context(
                 request=request,
                 doc=doc,
-                doc_articles={a["article_id"]: a for a in doc["articles"]},
                 title=f"{title} | leropa",
                 lang=lang,
             ),
         )
 
-    return JSONResponse(doc)
+    return Response(
+        dumps_json(strip_full_text(data), compact=True),
+        media_type="application/json",
+    )
 
 
 @router.post("/documents/{ver_id}")
@@ -85,7 +92,7 @@ async def get_document_raw(
     """
 
     # Locate the document file matching ``ver_id``.
-    file_path = next((p for p in document_files() if p.stem == ver_id), None)
+    file_path = get_catalog(get_documents_dir()).path(ver_id)
     if file_path is None:
         tr = get_translator(lang)
         raise HTTPException(
@@ -93,8 +100,8 @@ async def get_document_raw(
             detail=tr("document_not_found", "Document not found"),
         )
 
-    # Read the file contents as text.
-    text = file_path.read_text(encoding="utf-8")
+    # Read the file contents; they are sent as they are stored.
+    content = file_path.read_bytes()
 
     # Choose response media type based on file extension.
     media_type = (
@@ -104,4 +111,4 @@ async def get_document_raw(
     )
 
     # Return the raw document text.
-    return Response(content=text, media_type=media_type)
+    return Response(content=content, media_type=media_type)
@@ -7,7 +7,6 @@ import tempfile
 from pathlib import Path
 from typing import Literal
 
-import yaml  # type: ignore[import-untyped]
 from fastapi import (  # type: ignore[import-not-found]
     APIRouter,
     Query,
@@ -19,13 +18,14 @@ from pydantic import BaseModel  # type: ignore[import-not-found]
 
 from leropa import parser
 from leropa.cli import _import_llm_module
-from leropa.document_cache import load_document_info
+from leropa.serialization import dumps_yaml
+from leropa.sidecar_cache import discard_sidecar
 
+from ..catalog import get_catalog
 from ..utils import (
     DOCUMENTS_DIR,
     DocumentSummaryList,
     create_jinja_context,
-    document_files,
     get_documents_dir,
     get_translator,
     load_document_file,
@@ -39,24 +39,23 @@ RECYCLE_DIR = DOCUMENTS_DIR / "recycle"
 router = APIRouter()
 
 
-def _load_summaries() -> DocumentSummaryList:
+def _load_summaries(
+    offset: int = 0, limit: int | None = None
+) -> DocumentSummaryList:
     """Return summaries for available structured documents.
 
+    Args:
+        offset: Number of documents to skip.
+        limit: Largest number of documents to return; all when ``None``.
+
     Returns:
         List of mappings containing document identifiers and titles.
     """
 
-    summaries: DocumentSummaryList = []
-
-    # Iterate through all known document files.
-    for path in document_files():
-        # Use the same metadata cache employed by RAG operations.
-        info = load_document_info(path)
-
-        # Record identifier and title for later rendering.
-        summaries.append({"ver_id": info.ver_id, "title": info.title})
-
-    return summaries
+    # Only the requested page is read from the catalog; files are read
+    # again only when they change.
+    catalog = get_catalog(get_documents_dir())
+    return [entry.summary() for entry in catalog.entries(offset, limit)]
 
 
 @router.get("/documents")
@@ -64,19 +63,23 @@ async def list_documents(
     request: Request,
     format: str = Query(default="json", enum=["json", "html"]),
     lang: Literal["en", "ro"] = "en",
+    offset: int = Query(default=0, ge=0),
+    limit: int | None = Query(default=None, ge=1),
 ) -> Response:
     """List structured documents available on the server.
 
     Args:
         request: Incoming request used for template rendering.
         format: Desired response format.
+        offset: Number of documents to skip.
+        limit: Largest number of documents to list; all when omitted.
 
     Returns:
         Either a JSON list or an HTML page with document links.
     """
 
-    # Gather summaries using the shared metadata cache.
-    summaries = _load_summaries()
+    # Gather summaries from the document catalog.
+    summaries = _load_summaries(offset, limit)
 
     # Render as HTML when requested.
     if format == "html":
@@ -150,15 +153,15 @@ async def add_document(payload: "AddRequest") -> JSONResponse:
     docs_dir = get_documents_dir()
     docs_dir.mkdir(parents=True, exist_ok=True)
     target = docs_dir / f"{payload.ver_id}.yaml"
-    target.write_text(
-        yaml.safe_dump(doc, allow_unicode=True, sort_keys=False),
-        encoding="utf-8",
-    )
+    target.write_bytes(dumps_yaml(doc))
+    get_catalog(docs_dir).update(target)
 
     # Ingest only the newly created file by copying it into a temp folder.
     with tempfile.TemporaryDirectory() as tmp:
-        shutil.copy2(target, Path(tmp) / target.name)
+        copy = Path(tmp) / target.name
+        shutil.copy2(target, copy)
         _RAG.ingest_folder(tmp, collection="legal_articles")
+        discard_sidecar(copy)
 
     info = doc.get("document", {})
     return JSONResponse(
@@ -178,13 +181,15 @@ async def delete_documents(payload: "DeleteRequest") -> JSONResponse:
     """
 
     removed: list[str] = []
-    recycle_dir = get_documents_dir() / "recycle"
+    docs_dir = get_documents_dir()
+    catalog = get_catalog(docs_dir)
+    recycle_dir = docs_dir / "recycle"
     recycle_dir.mkdir(parents=True, exist_ok=True)
 
     # Iterate over requested identifiers.
     for ver_id in payload.ids:
         # Locate a matching document file.
-        path = next((p for p in document_files() if p.stem == ver_id), None)
+        path = catalog.path(ver_id)
         if not path:
             continue
 
@@ -197,6 +202,8 @@ async def delete_documents(payload: "DeleteRequest") -> JSONResponse:
 
         # Move the file into the recycle bin.
         shutil.move(str(path), recycle_dir / path.name)
+        discard_sidecar(path)
+        catalog.discard(ver_id)
         removed.append(ver_id)
 
     return JSONResponse({"removed": removed})
@@ -6,10 +6,11 @@ import os
 from pathlib import Path
 from typing import Any, Callable, Literal
 
-import yaml  # type: ignore[import-untyped]
 from fastapi.templating import Jinja2Templates  # type: ignore
 
-from leropa.json_utils import json_loads
+from leropa.sidecar_cache import read_document_file
+
+from .catalog import get_catalog
 
 JSONDict = dict[str, Any]
 DocumentSummary = dict[str, str | None]
@@ -85,22 +86,13 @@ def document_files() -> list[Path]:
     """Return available document files from ``DOCUMENTS_DIR``.
 
     Returns:
-        Paths pointing to JSON or YAML files. Nonexistent directories
-        yield an empty list.
+        Paths pointing to JSON or YAML files, one per document, taken from
+        the document catalog. Nonexistent directories yield an empty list.
     """
 
     # Compute the documents directory dynamically to honor environment changes.
-    documents_dir = get_documents_dir()
-
-    # Return early when directory does not exist.
-    if not documents_dir.exists():
-        return []
-
-    # Collect files with supported extensions.
-    files: list[Path] = []
-    for pattern in ("*.json", "*.yaml", "*.yml"):
-        files.extend(documents_dir.glob(pattern))
-    return files
+    catalog = get_catalog(get_documents_dir())
+    return [entry.path for entry in catalog.entries()]
 
 
 def load_document_file(path: Path) -> JSONDict:
@@ -113,12 +105,8 @@ def load_document_file(path: Path) -> JSONDict:
         Parsed document dictionary.
     """
 
-    text = path.read_text(encoding="utf-8")
-
-    # Decode according to file extension.
-    if path.suffix == ".json":
-        return json_loads(text)  # type: ignore[return-value]
-    return yaml.safe_load(text)
+    # YAML files are loaded from their binary copy once it exists.
+    return read_document_file(path)
 
 
 def strip_full_text(doc: JSONDict) -> JSONDict:
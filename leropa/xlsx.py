@@ -2,15 +2,21 @@
 
 from __future__ import annotations
 
+import warnings
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, Generator, Iterable, Iterator, List, Tuple
 from uuid import uuid4
 
 from openpyxl import Workbook  # type: ignore[import-untyped]
-from openpyxl.styles import Alignment  # type: ignore[import-untyped]
+from openpyxl.cell import WriteOnlyCell  # type: ignore[import-untyped]
+from openpyxl.styles import (  # type: ignore[import-untyped]
+    Alignment,
+    NamedStyle,
+)
 from openpyxl.utils import get_column_letter  # type: ignore[import-untyped]
 from openpyxl.worksheet.table import (  # type: ignore[import-untyped]
     Table,
+    TableColumn,
     TableStyleInfo,
 )
 
@@ -18,6 +24,38 @@ from leropa.json_utils import json_dumps
 
 Sheets = Dict[str, List[Dict[str, Any]]]
 
+# Row of a sheet, with the name of the sheet it belongs to.
+SheetRow = Tuple[str, Dict[str, Any]]
+
+# Generator of the rows of one structure, returning its identifier.
+RowGenerator = Generator[SheetRow, None, str]
+
+# Kind of values held by each column, keyed by column name.
+Kinds = Dict[str, str]
+
+# Column kinds and number of rows of each sheet, keyed by sheet name.
+Layouts = Dict[str, Tuple[Kinds, int]]
+
+# Sheets of the workbook, in order.
+SHEET_NAMES = (
+    "Document",
+    "HistoryEntry",
+    "Book",
+    "Title",
+    "Chapter",
+    "Section",
+    "Article",
+    "Paragraph",
+    "SubParagraph",
+    "Note",
+)
+
+# Name of the cell style shared by the wrapped cells.
+WRAPPED_STYLE = "leropa_wrapped"
+
+# Column widths by kind of values held.
+COLUMN_WIDTHS = {"list": 50, "long": 100, "plain": 12}
+
 
 def _ensure_id(item: Dict[str, Any], prefix: str = "id") -> str:
     """Return an existing id for ``item`` or generate one.
@@ -39,29 +77,22 @@ def _ensure_id(item: Dict[str, Any], prefix: str = "id") -> str:
     return new_id
 
 
-def _flatten(doc: Dict[str, Any]) -> Sheets:
-    """Flatten nested document structure into tabular sheet data.
+def iter_rows(doc: Dict[str, Any]) -> Iterator[SheetRow]:
+    """Flatten nested document structure into rows of the sheets.
+
+    Nested lists are replaced by the comma-joined identifiers of their
+    items, and every row gains a ``parent_id`` pointing to its container.
+    Rows are shallow copies of the dictionaries of ``doc``, which is left
+    unchanged, so the same document can be written in other formats.
 
     Args:
         doc: Parsed document structure.
 
-    Returns:
-        Mapping of sheet names to row dictionaries.
+    Yields:
+        Name of the sheet and row dictionary, in the order the rows of
+        each sheet are written.
     """
 
-    sheets: Sheets = {
-        "Document": [],
-        "HistoryEntry": [],
-        "Book": [],
-        "Title": [],
-        "Chapter": [],
-        "Section": [],
-        "Article": [],
-        "Paragraph": [],
-        "SubParagraph": [],
-        "Note": [],
-    }
-
     # Registry of article data keyed by article identifier.
     article_lookup: Dict[str, Dict[str, Any]] = {
         a["article_id"]: a for a in doc.get("articles", [])
@@ -70,208 +101,247 @@ def _flatten(doc: Dict[str, Any]) -> Sheets:
     # Map article identifiers to the parent container identifier.
     article_parent: Dict[str, str] = {}
 
-    def process_book(book: Dict[str, Any], parent_id: str) -> str:
+    def process_book(book: Dict[str, Any], parent_id: str) -> RowGenerator:
         """Process a book structure and its descendants.
 
         Args:
             book: Mapping describing the book structure.
             parent_id: Identifier of the parent container.
 
+        Yields:
+            Rows of the structure and of its descendants.
+
         Returns:
             Generated identifier for the book.
         """
 
-        book_id = _ensure_id(book, "book")
-        book["parent_id"] = parent_id
+        row = dict(book)
+        book_id = _ensure_id(row, "book")
+        row["parent_id"] = parent_id
 
         # Collect identifiers for nested structures.
         title_ids: List[str] = []
         for title in book.get("titles", []):
-            title_ids.append(process_title(title, book_id))
+            title_ids.append((yield from process_title(title, book_id)))
 
         chapter_ids: List[str] = []
         for chapter in book.get("chapters", []):
-            chapter_ids.append(process_chapter(chapter, book_id))
+            chapter_ids.append((yield from process_chapter(chapter, book_id)))
 
         section_ids: List[str] = []
         for section in book.get("sections", []):
-            section_ids.append(process_section(section, book_id))
+            section_ids.append((yield from process_section(section, book_id)))
 
         art_ids = book.get("articles", [])
         for art_id in art_ids:
             article_parent[art_id] = book_id
 
-        book["titles"] = ",".join(title_ids)
-        book["chapters"] = ",".join(chapter_ids)
-        book["sections"] = ",".join(section_ids)
-        book["articles"] = ",".join(art_ids)
+        row["titles"] = ",".join(title_ids)
+        row["chapters"] = ",".join(chapter_ids)
+        row["sections"] = ",".join(section_ids)
+        row["articles"] = ",".join(art_ids)
 
-        sheets["Book"].append(book)
+        yield "Book", row
         return book_id
 
-    def process_title(title: Dict[str, Any], parent_id: str) -> str:
+    def process_title(title: Dict[str, Any], parent_id: str) -> RowGenerator:
         """Process a title structure and its descendants.
 
         Args:
             title: Mapping describing the title structure.
             parent_id: Identifier of the parent container.
 
+        Yields:
+            Rows of the structure and of its descendants.
+
         Returns:
             Generated identifier for the title.
         """
 
-        title_id = _ensure_id(title, "title")
-        title["parent_id"] = parent_id
+        row = dict(title)
+        title_id = _ensure_id(row, "title")
+        row["parent_id"] = parent_id
 
         chapter_ids: List[str] = []
         for chapter in title.get("chapters", []):
-            chapter_ids.append(process_chapter(chapter, title_id))
+            chapter_ids.append((yield from process_chapter(chapter, title_id)))
 
         section_ids: List[str] = []
         for section in title.get("sections", []):
-            section_ids.append(process_section(section, title_id))
+            section_ids.append((yield from process_section(section, title_id)))
 
         art_ids = title.get("articles", [])
         for art_id in art_ids:
             article_parent[art_id] = title_id
 
-        title["chapters"] = ",".join(chapter_ids)
-        title["sections"] = ",".join(section_ids)
-        title["articles"] = ",".join(art_ids)
+        row["chapters"] = ",".join(chapter_ids)
+        row["sections"] = ",".join(section_ids)
+        row["articles"] = ",".join(art_ids)
 
-        sheets["Title"].append(title)
+        yield "Title", row
         return title_id
 
-    def process_chapter(chapter: Dict[str, Any], parent_id: str) -> str:
+    def process_chapter(
+        chapter: Dict[str, Any], parent_id: str
+    ) -> RowGenerator:
         """Process a chapter structure and its descendants.
 
         Args:
             chapter: Mapping describing the chapter structure.
             parent_id: Identifier of the parent container.
 
+        Yields:
+            Rows of the structure and of its descendants.
+
         Returns:
             Generated identifier for the chapter.
         """
 
-        chapter_id = _ensure_id(chapter, "chapter")
-        chapter["parent_id"] = parent_id
+        row = dict(chapter)
+        chapter_id = _ensure_id(row, "chapter")
+        row["parent_id"] = parent_id
 
         section_ids: List[str] = []
         for section in chapter.get("sections", []):
-            section_ids.append(process_section(section, chapter_id))
+            section_ids.append(
+                (yield from process_section(section, chapter_id))
+            )
 
         art_ids = chapter.get("articles", [])
         for art_id in art_ids:
             article_parent[art_id] = chapter_id
 
-        chapter["sections"] = ",".join(section_ids)
-        chapter["articles"] = ",".join(art_ids)
+        row["sections"] = ",".join(section_ids)
+        row["articles"] = ",".join(art_ids)
 
-        sheets["Chapter"].append(chapter)
+        yield "Chapter", row
         return chapter_id
 
-    def process_section(section: Dict[str, Any], parent_id: str) -> str:
+    def process_section(
+        section: Dict[str, Any], parent_id: str
+    ) -> RowGenerator:
         """Process a section structure and its descendants.
 
         Args:
             section: Mapping describing the section structure.
             parent_id: Identifier of the parent container.
 
+        Yields:
+            Rows of the structure and of its descendants.
+
         Returns:
             Generated identifier for the section.
         """
 
-        section_id = _ensure_id(section, "section")
-        section["parent_id"] = parent_id
+        row = dict(section)
+        section_id = _ensure_id(row, "section")
+        row["parent_id"] = parent_id
 
         subsection_ids: List[str] = []
         for subsection in section.get("subsections", []):
-            subsection_ids.append(process_section(subsection, section_id))
+            subsection_ids.append(
+                (yield from process_section(subsection, section_id))
+            )
 
         art_ids = section.get("articles", [])
         for art_id in art_ids:
             article_parent[art_id] = section_id
 
-        section["subsections"] = ",".join(subsection_ids)
-        section["articles"] = ",".join(art_ids)
+        row["subsections"] = ",".join(subsection_ids)
+        row["articles"] = ",".join(art_ids)
 
-        sheets["Section"].append(section)
+        yield "Section", row
         return section_id
 
-    def process_paragraph(paragraph: Dict[str, Any], parent_id: str) -> str:
+    def process_paragraph(
+        paragraph: Dict[str, Any], parent_id: str
+    ) -> RowGenerator:
         """Process a paragraph and its substructures.
 
         Args:
             paragraph: Mapping describing the paragraph structure.
             parent_id: Identifier of the parent article.
 
+        Yields:
+            Rows of the structure and of its descendants.
+
         Returns:
             Generated identifier for the paragraph.
         """
 
-        par_id = _ensure_id(paragraph, "par")
-        paragraph["parent_id"] = parent_id
+        row = dict(paragraph)
+        par_id = _ensure_id(row, "par")
+        row["parent_id"] = parent_id
 
         sub_ids: List[str] = []
         for sub in paragraph.get("subparagraphs", []):
-            sub_ids.append(process_subparagraph(sub, par_id))
+            sub_ids.append((yield from process_subparagraph(sub, par_id)))
 
         note_ids: List[str] = []
         for note in paragraph.get("notes", []):
-            note_ids.append(process_note(note, par_id))
+            note_ids.append((yield from process_note(note, par_id)))
 
-        paragraph["subparagraphs"] = ",".join(sub_ids)
-        paragraph["notes"] = ",".join(note_ids)
+        row["subparagraphs"] = ",".join(sub_ids)
+        row["notes"] = ",".join(note_ids)
 
-        sheets["Paragraph"].append(paragraph)
+        yield "Paragraph", row
         return par_id
 
     def process_subparagraph(
         subparagraph: Dict[str, Any], parent_id: str
-    ) -> str:
+    ) -> RowGenerator:
         """Process a sub-paragraph.
 
         Args:
             subparagraph: Mapping describing the sub-paragraph structure.
             parent_id: Identifier of the parent paragraph.
 
+        Yields:
+            Rows of the structure and of its descendants.
+
         Returns:
             Generated identifier for the sub-paragraph.
         """
 
-        sub_id = _ensure_id(subparagraph, "sub")
-        subparagraph["parent_id"] = parent_id
+        row = dict(subparagraph)
+        sub_id = _ensure_id(row, "sub")
+        row["parent_id"] = parent_id
 
-        sheets["SubParagraph"].append(subparagraph)
+        yield "SubParagraph", row
         return sub_id
 
-    def process_note(note: Dict[str, Any], parent_id: str) -> str:
+    def process_note(note: Dict[str, Any], parent_id: str) -> RowGenerator:
         """Process a note attached to an article or paragraph.
 
         Args:
             note: Mapping describing the note.
             parent_id: Identifier of the parent element.
 
+        Yields:
+            Rows of the structure and of its descendants.
+
         Returns:
             Generated identifier for the note.
         """
 
-        note_id = _ensure_id(note, "note")
-        note["parent_id"] = parent_id
+        row = dict(note)
+        note_id = _ensure_id(row, "note")
+        row["parent_id"] = parent_id
 
-        sheets["Note"].append(note)
+        yield "Note", row
         return note_id
 
     # Process the document metadata and history entries.
-    document = doc.get("document", {})
+    document = dict(doc.get("document", {}))
     doc_id = _ensure_id(document, "doc")
 
     history_entries = document.pop("history", [])
     history_ids: List[str] = []
     for entry in history_entries:
-        entry_id = _ensure_id(entry, "hist")
-        entry["parent_id"] = doc_id
-        sheets["HistoryEntry"].append(entry)
+        entry_row = dict(entry)
+        entry_id = _ensure_id(entry_row, "hist")
+        entry_row["parent_id"] = doc_id
+        yield "HistoryEntry", entry_row
         history_ids.append(entry_id)
 
     document["history"] = ",".join(history_ids)
@@ -279,120 +349,199 @@ def _flatten(doc: Dict[str, Any]) -> Sheets:
     # Process books and their descendants.
     book_ids: List[str] = []
     for book in doc.get("books", []):
-        book_ids.append(process_book(book, doc_id))
+        book_ids.append((yield from process_book(book, doc_id)))
 
     document["books"] = ",".join(book_ids)
 
-    sheets["Document"].append(document)
+    yield "Document", document
 
     # Process all articles, assigning parent references collected earlier.
     for art_id, article in article_lookup.items():
-        article_id = _ensure_id(article, "article")
+        row = dict(article)
+        article_id = _ensure_id(row, "article")
         parent_id = article_parent.get(art_id)
         if parent_id:
-            article["parent_id"] = parent_id
+            row["parent_id"] = parent_id
 
         paragraph_ids: List[str] = []
         for paragraph in article.get("paragraphs", []):
-            paragraph_ids.append(process_paragraph(paragraph, article_id))
+            paragraph_ids.append(
+                (yield from process_paragraph(paragraph, article_id))
+            )
 
         note_ids: List[str] = []
         for note in article.get("notes", []):
-            note_ids.append(process_note(note, article_id))
+            note_ids.append((yield from process_note(note, article_id)))
+
+        row["paragraphs"] = ",".join(paragraph_ids)
+        row["notes"] = ",".join(note_ids)
 
-        article["paragraphs"] = ",".join(paragraph_ids)
-        article["notes"] = ",".join(note_ids)
+        yield "Article", row
 
-        sheets["Article"].append(article)
+
+def _flatten(doc: Dict[str, Any]) -> Sheets:
+    """Flatten nested document structure into tabular sheet data.
+
+    Args:
+        doc: Parsed document structure.
+
+    Returns:
+        Mapping of sheet names to row dictionaries, in the order of
+        ``SHEET_NAMES``; sheets without rows are left out.
+    """
+
+    sheets: Sheets = {name: [] for name in SHEET_NAMES}
+    for name, row in iter_rows(doc):
+        sheets[name].append(row)
 
     # Drop entries for which no data was recorded.
     return {name: rows for name, rows in sheets.items() if rows}
 
 
-def write_workbook(doc: Dict[str, Any], path: Path) -> None:
-    """Write structured data into an Excel workbook.
+def _update_kinds(kinds: Kinds, row: Dict[str, Any]) -> None:
+    """Widen the column kinds of a sheet with the values of one row.
+
+    A column is ``"list"`` once a value is a list or a dictionary,
+    ``"long"`` once a value is text longer than 50 characters and
+    ``"plain"`` otherwise.
+
+    Args:
+        kinds: Kind of every column of the sheet, updated in place.
+        row: Row dictionary of the sheet.
+    """
+
+    for header, kind in kinds.items():
+        if kind == "list":
+            continue
+        value = row.get(header)
+        if isinstance(value, (list, dict)):
+            kinds[header] = "list"
+        elif isinstance(value, str) and len(value) > 50:
+            kinds[header] = "long"
+
+
+def _sheet_layouts(doc: Dict[str, Any]) -> Layouts:
+    """Return the columns of every sheet without keeping the rows.
 
     Args:
         doc: Parsed document structure.
-        path: Destination file path for the workbook.
+
+    Returns:
+        Column kinds, in header order, and number of rows of each sheet
+        with rows, in the order of ``SHEET_NAMES``.
+    """
+
+    layouts: Layouts = {}
+    for name, row in iter_rows(doc):
+        # Headers are the keys of the first row of the sheet.
+        if name not in layouts:
+            layouts[name] = (dict.fromkeys(row, "plain"), 0)
+        kinds, count = layouts[name]
+        _update_kinds(kinds, row)
+        layouts[name] = (kinds, count + 1)
+    return {name: layouts[name] for name in SHEET_NAMES if name in layouts}
+
+
+def _cells(
+    ws: Any,  # noqa: ANN401
+    values: Iterable[Any],
+    wrap: List[bool],
+) -> List[Any]:
+    """Return the cells of a row, styling the wrapped columns.
+
+    Args:
+        ws: Write-only worksheet receiving the row.
+        values: Values of the row, in header order.
+        wrap: Whether each column wraps its cells.
+
+    Returns:
+        Plain values, or cells carrying the wrapped style.
     """
 
-    data = _flatten(doc)
+    out: List[Any] = []
+    for value, wrapped_column in zip(values, wrap, strict=True):
+        if wrapped_column:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = WRAPPED_STYLE
+            value = cell
+        out.append(value)
+    return out
+
+
+def write_workbook(doc: Dict[str, Any], path: Path | IO[bytes]) -> None:
+    """Write structured data into an Excel workbook.
 
-    # Create a workbook and remove the default sheet created by openpyxl.
-    workbook = Workbook()
+    The workbook is written in openpyxl's write-only mode, which keeps
+    each sheet in a temporary file until the workbook is saved. The
+    document is walked twice: once to find the columns of every sheet,
+    which must be sized before the first row is written, and once to
+    append each row as ``iter_rows`` produces it, so no sheet is held in
+    memory.
 
-    # Remove the default sheet created by openpyxl when present.
-    default_sheet = workbook.active
-    if default_sheet is not None:
-        workbook.remove(default_sheet)
+    Args:
+        doc: Parsed document structure.
+        path: Destination file path, or binary stream, for the workbook.
+    """
 
-    for sheet_name, rows in data.items():
+    layouts = _sheet_layouts(doc)
+
+    workbook = Workbook(write_only=True)
+    wrapped = NamedStyle(
+        name=WRAPPED_STYLE, alignment=Alignment(wrapText=True)
+    )
+    workbook.add_named_style(wrapped)
+
+    # Create every sheet with its header row before any data is written.
+    sheets: Dict[str, Tuple[Any, List[str], List[bool]]] = {}
+    for sheet_name, (kinds, _) in layouts.items():
         ws = workbook.create_sheet(title=sheet_name)
+        headers = list(kinds)
 
-        # Write header row based on dictionary keys.
-        headers = list(rows[0].keys())
-        ws.append(headers)
-
-        # Track which column indexes require wrapped text and custom widths.
-        wrap_columns: set[int] = set()
-        list_columns: set[int] = set()
-        long_text_columns: set[int] = set()
-
-        for row in rows:
-            values: List[Any] = []
-
-            # Serialize complex structures to JSON strings.
-            for idx, header in enumerate(headers):
-                cell_value = row.get(header)
-
-                # Mark columns with lists or dictionaries for text wrapping and
-                # custom width.
-                if isinstance(cell_value, (list, dict)):
-                    wrap_columns.add(idx)
-                    list_columns.add(idx)
-                    cell_value = json_dumps(cell_value)
-
-                # Mark columns containing long text for wrapping and custom
-                # width.
-                if isinstance(cell_value, str) and len(cell_value) > 50:
-                    wrap_columns.add(idx)
-                    long_text_columns.add(idx)
-
-                values.append(cell_value)
-
-            ws.append(values)
-
-        # Apply wrap text alignment to the marked columns.
-        for col_idx in wrap_columns:
-            for col_cells in ws.iter_cols(
-                min_col=col_idx + 1,
-                max_col=col_idx + 1,
-                min_row=1,
-                max_row=ws.max_row,
-            ):
-                for cell in col_cells:
-                    cell.alignment = Alignment(wrapText=True)
-
-        # Set column widths based on the contained data type.
-        for idx in range(len(headers)):
+        # Column widths must be known before the first row is written.
+        for idx, header in enumerate(headers):
             col_letter = get_column_letter(idx + 1)
-            if idx in list_columns:
-                ws.column_dimensions[col_letter].width = 50
-            elif idx in long_text_columns:
-                ws.column_dimensions[col_letter].width = 100
-            else:
-                ws.column_dimensions[col_letter].width = 12
+            ws.column_dimensions[col_letter].width = COLUMN_WIDTHS[
+                kinds[header]
+            ]
+
+        # Columns with lists or long text wrap every cell, header included.
+        wrap = [kinds[header] != "plain" for header in headers]
+        ws.append(_cells(ws, headers, wrap))
+        sheets[sheet_name] = (ws, headers, wrap)
+
+    for sheet_name, row in iter_rows(doc):
+        ws, headers, wrap = sheets[sheet_name]
+        values = []
 
+        # Serialize complex structures to JSON strings.
+        for header in headers:
+            cell_value = row.get(header)
+            if isinstance(cell_value, (list, dict)):
+                cell_value = json_dumps(cell_value)
+            values.append(cell_value)
+
+        ws.append(_cells(ws, values, wrap))
+
+    for sheet_name, (ws, headers, _) in sheets.items():
         # Determine table range covering the header and all rows.
         end_column = get_column_letter(len(headers))
-        end_row = len(rows) + 1
+        end_row = layouts[sheet_name][1] + 1
         table = Table(displayName=sheet_name, ref=f"A1:{end_column}{end_row}")
 
+        # Write-only sheets cannot be read back, so the table columns are
+        # named from the headers here instead of from the cells on save.
+        table.tableColumns = [
+            TableColumn(id=idx + 1, name=str(header))
+            for idx, header in enumerate(headers)
+        ]
+
         # Apply a simple table style with row stripes for readability.
         style = TableStyleInfo(name="TableStyleMedium9", showRowStripes=True)
         table.tableStyleInfo = style
 
-        ws.add_table(table)
+        # The columns were added above; silence the reminder to do so.
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", "In write-only mode")
+            ws.add_table(table)
 
     workbook.save(path)
@@ -10,6 +10,7 @@ case to avoid teardown errors when undoing patches.
 
 from __future__ import annotations
 
+import pytest
 from _pytest.monkeypatch import MonkeyPatch, notset, resolve  # type: ignore
 
 _original_setattr = MonkeyPatch.setattr
@@ -47,3 +48,13 @@ def _compat_setattr(
 
 # Install the compatibility shim.
 MonkeyPatch.setattr = _compat_setattr  # type: ignore[assignment]
+
+
+@pytest.fixture(autouse=True)
+def _sidecar_cache(
+    monkeypatch: pytest.MonkeyPatch, tmp_path_factory: pytest.TempPathFactory
+) -> None:
+    """Keep binary copies of documents out of the home directory."""
+
+    cache = tmp_path_factory.mktemp("sidecar")
+    monkeypatch.setenv("LEROPA_SIDECAR_CACHE", str(cache))
@@ -0,0 +1,299 @@
+"""Full-page HTML samples shared by parser equivalence tests.
+
+Each sample mimics a page from legislatie.just.ro: portal chrome around the
+act, the metadata tags, the ``fisaact`` sheet, the ``istoric_fa`` history
+and the structured ``S_*`` spans of the legal text.
+"""
+
+from __future__ import annotations
+
+# Mapping of sample names to ``(ver_id, html)`` pairs.
+CorpusDict = dict[str, tuple[str, str]]
+
+
+def _page(title: str, body: str, history: str = "") -> str:
+    """Wrap the legal text in the portal chrome of a document page.
+
+    Args:
+        title: Content of the ``title`` meta tag.
+        body: Markup of the legal text.
+        history: Links placed inside the ``istoric_fa`` block.
+
+    Returns:
+        Complete HTML page.
+    """
+
+    return f"""<!DOCTYPE html>
+<html lang="ro">
+<head>
+  <meta charset="utf-8">
+  <title>Portal Legislativ</title>
+  <meta name="title" content="{title}">
+  <meta name="description" content="(Descriere **act**)">
+  <meta name="keywords" content="lege, cuvinte cheie">
+  <link rel="stylesheet" href="/Content/site.css">
+  <style>.S_ART {{ display: block; }}</style>
+  <script>
+    var tpl = "<span class='S_ART' id='id_fake'>x</span>";
+    if (1 < 2 && tpl) {{ console.log("</span>"); }}
+  </script>
+</head>
+<body>
+  <div id="header">
+    <nav><ul><li><a href="/">Acasă</a></li><li>Căutare</li></ul></nav>
+  </div>
+  <!-- portal banner <span class="S_ART"> -->
+  <div id="fisa">
+    <span id="fisaact">Fișa actului</span>
+    <span class="S_NTA" id="id_doc_note">
+      (la 03-04-2021, Actul a fost completat de LEGEA nr. 5 din 2 martie
+      2021, publicată în MONITORUL OFICIAL nr. 200 din 3 martie 2021)
+    </span>
+  </div>
+  <div id="istoric_fa">{history}</div>
+  <div id="textdocumentleft">
+    <span class="S_DEN">Denumire act</span>
+    <span class="S_HDR">privind   organizarea
+      activității</span>
+    <span class="S_EMT"><span class="S_EMT_TTL">EMITENT</span>
+      <span class="S_EMT_BDY">PARLAMENTUL ROMÂNIEI</span></span>
+    <span class="S_PUB"><span class="S_PUB_TTL">Publicat în</span>
+      <span class="S_PUB_BDY">MONITORUL OFICIAL nr. 1 din 2 ianuarie
+      2020</span></span>
+{body}
+  </div>
+  <footer><p>&copy; Ministerul Justiției</p><img src="/logo.png"></footer>
+  <script src="/Scripts/app.js"></script>
+</body>
+</html>
+"""
+
+
+HISTORY_LINKS = """
+      <a title='Consolidarea din 02.07.2010'
+         href='~/../../../Public/DetaliiDocument/120341'>02.07.2010</a>
+      <a title='Consolidarea din 12.11.2009'
+         href='~/../../../Public/DetaliiDocument/113617?x=1'>Consolidare</a>
+      <a>Forma curentă</a>
+"""
+
+
+BOOK_BODY = """
+<span class="S_CRT_TTL" id="id_book1_ttl">Cartea I</span>
+<span class="S_CRT_DEN">Despre persoane</span>
+<span class="S_CRT_BDY" id="id_book1_bdy">
+  <span class="S_TTL_TTL" id="id_title1_ttl">Titlul I</span>
+  <span class="S_TTL_DEN">Dispoziții generale</span>
+  <span class="S_TTL_BDY" id="id_title1_bdy">
+    <span class="S_CAP_TTL" id="id_chap1_ttl">Capitolul I</span>
+    <span class="S_CAP_DEN">Principii</span>
+    <span class="S_CAP_BDY" id="id_chap1_bdy">
+      <span class="S_ART" id="id_art1">
+        <span class="S_ART_TTL" id="id_art1_ttl">Articolul 1</span>
+        <span class="S_ART_BDY" id="id_art1_bdy">
+          <span class="S_PAR" id="id_par1">Primul paragraf , cu
+            <a href="#">o legătură</a> .</span>
+          <span class="S_ALN" id="id_aln1">
+            <span class="S_ALN_TTL" id="id_aln1_ttl">(1)</span>
+            <span class="S_ALN_BDY" id="id_aln1_bdy">Textul
+              alineatului:&nbsp;
+              <span class="S_LIT" id="id_lit1a">
+                <span class="S_LIT_TTL" id="id_lit1a_ttl">a)</span>
+                <span class="S_LIT_SHORT" id="id_lit1a_short"
+                      style="display: none"> ... </span>
+                <span class="S_LIT_BDY" id="id_lit1a_bdy">primul punct;</span>
+              </span>
+              <span class="S_LIT" id="id_lit1b">
+                <span class="S_LIT_TTL" id="id_lit1b_ttl">b)</span>
+                <span class="S_LIT_BDY" id="id_lit1b_bdy">al doilea
+                  punct.</span>
+              </span>
+              <span class="S_PAR" id="id_note1">
+                (la 01-01-2020, Alin. (1) al art. 1 a fost modificat de
+                art. I din LEGEA nr. 60 din 10 aprilie 2012, publicată în
+                MONITORUL OFICIAL nr. 255 din 17 aprilie 2012, prin
+                înlocuirea sintagmei "vechi" cu sintagma "nou". ... )
+              </span>
+            </span>
+          </span>
+          <span class="S_NTA" id="id_art1_note">
+            <span class="S_NTA_TTL">Notă</span>
+            <span class="S_NTA_PAR">Notă la articol.</span>
+          </span>
+        </span>
+      </span>
+      <span class="S_SEC_TTL" id="id_sec1_ttl">Secţiunea 1</span>
+      <span class="S_SEC_DEN">Secțiune</span>
+      <span class="S_SEC_BDY" id="id_sec1_bdy">
+        <span class="S_SSEC_TTL" id="id_ssec1_ttl">§1</span>
+        <span class="S_SSEC_DEN">Subsecțiune</span>
+        <span class="S_SSEC_BDY" id="id_ssec1_bdy">
+          <span class="S_ART" id="id_art2">
+            <span class="S_ART_TTL" id="id_art2_ttl">Articolul 2</span>
+            <span class="S_ART_BDY" id="id_art2_bdy">
+              <span class="S_PAR" id="id_par2">Termeni:
+                <span class="S_LIN" id="id_lin2a">
+                  <span class="S_LIN_TTL" id="id_lin2a_ttl">– </span>
+                  <span class="S_LIN_BDY" id="id_lin2a_bdy">termen
+                    unu;</span>
+                  <span class="S_LIN_SHORT" id="id_lin2a_short"
+                        style="display: none"> ... </span>
+                </span>
+                <span class="S_LIN" id="id_lin2b">
+                  <span class="S_LIN_TTL" id="id_lin2b_ttl">– </span>
+                  <span class="S_LIN_BDY" id="id_lin2b_bdy">termen
+                    doi;</span>
+                </span>
+              </span>
+              <span class="S_LIT" id="id_lit2a">
+                <span class="S_LIT_BDY" id="id_lit2a_bdy">
+                  a) Literă fără titlu.
+                </span>
+              </span>
+            </span>
+          </span>
+          <span class="S_ART" id="id_art3">
+            <span class="S_ART_TTL" id="id_art3_ttl">Articolul 3</span>
+            <span class="S_ART_BDY" id="id_art3_bdy">
+              <span class="S_LIT" id="id_lit3p1">
+                <span class="S_LIT_BDY" id="id_lit3p1_bdy">
+                  (1) Primul alineat.
+                </span>
+              </span>
+              <span class="S_LIT" id="id_lit3a">
+                <span class="S_LIT_BDY" id="id_lit3a_bdy">a) Prima
+                  literă.</span>
+              </span>
+              <span class="S_LIT" id="id_lit3p2">
+                <span class="S_LIT_BDY" id="id_lit3p2_bdy">
+                  (2) Al doilea alineat.
+                  <span class="S_PAR" id="id_note3">(la 05-06-2015, Alin.
+                    (2) a fost introdus de LEGEA nr. 7 din 1 iunie 2015,
+                    publicată în MONITORUL OFICIAL nr. 9 din 2 iunie
+                    2015)</span>
+                </span>
+              </span>
+              <span class="S_ALN_BDY" id="id_alnbdy3">(3) Corp fără titlu.
+                <span class="S_PAR" id="id_note3b">(la 01-01-2016, notă
+                  ignorată)</span>
+              </span>
+            </span>
+          </span>
+        </span>
+      </span>
+    </span>
+  </span>
+</span>
+<span class="S_ART" id="id_art_nobody">
+  <span class="S_ART_TTL" id="id_art_nobody_ttl">Articolul 4</span>
+</span>
+<span class="S_ANX_TTL" id="id_anx1_ttl">Anexa nr. 1</span>
+<span class="S_ANX_BDY" id="id_anx1_bdy">
+  <span class="S_PAR" id="id_par_anx1">Conținutul anexei.</span>
+  <span class="S_PAR" id="id_note_anx1">
+    (la 01-01-2020, Anexa nr. 1 a fost modificată de art. I din LEGEA
+    nr. 1 din 3 ianuarie 2020.)
+  </span>
+</span>
+<span class="S_ANX_TTL" id="id_anx2">Anexa nr. 2</span>
+"""
+
+
+NUMBERED_BODY = """
+<span class="S_CAP_TTL" id="id_chap_num_ttl">Capitolul I</span>
+<span class="S_CAP_BDY" id="id_chap_num_bdy">
+  <span class="S_SEC_TTL" id="id_sec_num1_ttl">1</span>
+  <span class="S_SEC_BDY" id="id_sec_num1_bdy">
+    <span class="S_ART" id="id_art_s1">
+      <span class="S_ART_TTL" id="id_art_s1_ttl">Articolul 1</span>
+      <span class="S_ART_BDY" id="id_art_s1_bdy">
+        <span class="S_PAR" id="id_par_s1">Text unu.</span>
+      </span>
+    </span>
+    <span class="S_SEC_TTL" id="id_sec_num1_1_ttl">1.1</span>
+    <span class="S_SEC_BDY" id="id_sec_num1_1_bdy">
+      <span class="S_ART" id="id_art_s11">
+        <span class="S_ART_TTL" id="id_art_s11_ttl">Articolul 2</span>
+        <span class="S_ART_BDY" id="id_art_s11_bdy">
+          <span class="S_PAR" id="id_par_s11">Text doi.</span>
+        </span>
+      </span>
+      <span class="S_ART" id="id_art_s11b">
+        <span class="S_ART_TTL" id="id_art_s11b_ttl">Articolul 2^1</span>
+        <span class="S_ART_BDY" id="id_art_s11b_bdy">
+          <span class="S_PAR" id="id_par_s11b">Text doi bis.</span>
+        </span>
+      </span>
+    </span>
+  </span>
+  <span class="S_PCT" id="id_pct">
+    <span class="S_PCT_TTL" id="id_pct_ttl">2.1.</span>
+    <span class="S_PCT_BDY" id="id_pct_bdy">
+      Cuprinsul cărții funciare
+      <span class="S_ART" id="id_art_pct">
+        <span class="S_ART_TTL" id="id_art_pct_ttl">Articolul 3</span>
+        <span class="S_ART_BDY" id="id_art_pct_bdy">
+          <span class="S_PAR" id="id_par_pct">Text trei.</span>
+        </span>
+      </span>
+    </span>
+  </span>
+</span>
+"""
+
+
+ORPHAN_BODY = """
+<span class="S_TTL_TTL" id="id_title_o_ttl">Titlul II</span>
+<span class="S_TTL_BDY" id="id_title_o_bdy">
+  <span class="S_SEC_TTL" id="id_sec_o_ttl">Secţiunea 1</span>
+  <span class="S_SEC_BDY" id="id_sec_o_bdy">
+    <span class="S_ART" id="id_art_o1">
+      <span class="S_ART_TTL" id="id_art_o1_ttl">Articolul 1</span>
+      <span class="S_ART_BDY" id="id_art_o1_bdy">
+        <span class="S_PAR" id="id_par_o1">Text.</span>
+      </span>
+    </span>
+  </span>
+</span>
+<span class="S_SEC_TTL" id="id_sec_top_ttl">Secţiunea 2</span>
+<span class="S_SEC_BDY" id="id_sec_top_bdy">
+  <span class="S_ART" id="id_art_o2">
+    <span class="S_ART_TTL" id="id_art_o2_ttl">Articolul 2</span>
+    <span class="S_ART_BDY" id="id_art_o2_bdy">
+      <span class="S_PAR" id="id_par_o2">Text.</span>
+    </span>
+  </span>
+</span>
+<span class="S_CAP_TTL" id="id_chap_o_ttl">Capitolul X</span>
+<span class="S_CAP_BDY" id="id_chap_o_bdy">
+  <span class="S_ART" id="id_art_o3">
+    <span class="S_ART_TTL" id="id_art_o3_ttl">Articolul 3</span>
+    <span class="S_ART_BDY" id="id_art_o3_bdy">
+      <span class="S_PAR" id="id_par_o3">Text.</span>
+    </span>
+  </span>
+</span>
+<span class="S_ART" id="id_art_o4">
+  <span class="S_ART_TTL" id="id_art_o4_ttl">NoPrefix</span>
+  <span class="S_ART_BDY" id="id_art_o4_bdy">
+    <span class="S_PAR" id="id_par_o4">Fără container.</span>
+  </span>
+</span>
+"""
+
+
+# Samples used by the equivalence tests, keyed by a descriptive name.
+CORPUS: CorpusDict = {
+    "books": (
+        "1001",
+        _page("LEGE nr. 10 din 01/02/2020 (A)", BOOK_BODY, HISTORY_LINKS),
+    ),
+    "numbered_sections": (
+        "1002",
+        _page("COD din 01/07/2011 (R)", NUMBERED_BODY),
+    ),
+    "orphans": (
+        "1003",
+        _page("HG nr. 3 din 05/05/2005", ORPHAN_BODY, HISTORY_LINKS),
+    ),
+}
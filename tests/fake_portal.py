@@ -0,0 +1,190 @@
+"""Local stand-in for the legislatie.just.ro document pages.
+
+The server runs on a random local port in a background thread and keeps
+track of the requests it receives, so tests can check connection reuse,
+conditional requests and retries without touching the network.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+# Address the server listens on.
+HOST = "127.0.0.1"
+
+# Path prefix of document pages on the portal.
+PAGE_PATH = "/Public/DetaliiDocument/"
+
+# Fixed ``Last-Modified`` value sent with every page.
+LAST_MODIFIED = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve the pages of the portal owning the server."""
+
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def log_message(self: "_Handler", *args: Any) -> None:  # noqa: ANN401
+        """Keep the test output quiet."""
+
+    def do_GET(self: "_Handler") -> None:
+        """Answer a page request."""
+
+        portal = self.server.portal
+        ver_id = self.path.removeprefix(PAGE_PATH)
+        with portal.lock:
+            portal.requests.append((ver_id, dict(self.headers)))
+            portal.connections.add(self.client_address)
+            failures = portal.failures.get(ver_id, 0)
+            if failures:
+                portal.failures[ver_id] = failures - 1
+            portal.in_flight += 1
+            portal.max_in_flight = max(portal.max_in_flight, portal.in_flight)
+
+        # Slow answers let tests observe concurrent requests.
+        try:
+            time.sleep(portal.delay)
+            self._answer(portal, ver_id, failures)
+        finally:
+            with portal.lock:
+                portal.in_flight -= 1
+
+    def _answer(
+        self: "_Handler", portal: "FakePortal", ver_id: str, failures: int
+    ) -> None:
+        """Send the page of ``ver_id`` or an error.
+
+        Args:
+            portal: Portal owning the server.
+            ver_id: Identifier of the requested version.
+            failures: Failures still due for the version, including this
+                request.
+        """
+
+        if failures:
+            self._send(
+                portal.failure_status,
+                b"busy",
+                {"Retry-After": portal.retry_after},
+            )
+            return
+
+        page = portal.pages.get(ver_id)
+        if page is None:
+            self._send(404, b"missing")
+            return
+
+        # Pages that did not change are confirmed without a body.
+        body = page.encode("utf-8")
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", {"ETag": etag})
+            return
+
+        headers = {
+            "Content-Type": "text/html; charset=utf-8",
+            "ETag": etag,
+            "Last-Modified": LAST_MODIFIED,
+        }
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        self._send(200, body, headers)
+
+    def _send(
+        self: "_Handler",
+        status: int,
+        body: bytes,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """Write a complete response.
+
+        Args:
+            status: HTTP status code.
+            body: Response body.
+            headers: Extra response headers.
+        """
+
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _Server(ThreadingHTTPServer):
+    """HTTP server with a reference to the portal it serves."""
+
+    daemon_threads = True
+    portal: "FakePortal"
+
+
+class FakePortal:
+    """Local stand-in for the legislatie.just.ro document pages.
+
+    Attributes:
+        pages: Page content keyed by version identifier.
+        failures: Number of error answers to give before serving a page.
+        failure_status: Status of the error answers.
+        retry_after: ``Retry-After`` value sent with the error answers.
+        requests: Version identifier and headers of each request received.
+        connections: Client addresses of the connections opened so far.
+        delay: Seconds to wait before answering each request.
+        in_flight: Number of requests being answered.
+        max_in_flight: Largest number of requests answered at once.
+        lock: Lock guarding the recorded state.
+    """
+
+    def __init__(self: "FakePortal", pages: dict[str, str]) -> None:
+        """Start serving ``pages`` on a random local port.
+
+        Args:
+            pages: Page content keyed by version identifier.
+        """
+
+        self.pages = dict(pages)
+        self.failures: dict[str, int] = {}
+        self.failure_status = 503
+        self.retry_after = "0"
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self.connections: set[tuple[str, int]] = set()
+        self.delay = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+        self._server = _Server((HOST, 0), _Handler)
+        self._server.portal = self
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def base_url(self: "FakePortal") -> str:
+        """Address of a document page without the identifier."""
+
+        return f"http://{HOST}:{self._server.server_port}{PAGE_PATH}"
+
+    def close(self: "FakePortal") -> None:
+        """Stop the server."""
+
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self: "FakePortal") -> "FakePortal":
+        """Return the portal for use in a ``with`` block."""
+
+        return self
+
+    def __exit__(self: "FakePortal", *exc_info: Any) -> None:  # noqa: ANN401
+        """Stop the server when leaving a ``with`` block."""
+
+        self.close()
@@ -0,0 +1,228 @@
+"""Tests for converting batches of documents with a manifest."""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+from attrs import asdict
+from click.testing import CliRunner
+
+from leropa import batch, cli, parser
+
+from .corpus import CORPUS
+from .fake_portal import FakePortal
+
+# Corpus pages keyed by version identifier.
+PAGES = dict(CORPUS.values())
+
+
+def _cache(tmp_path: Path) -> Path:
+    """Store every corpus page in an HTML cache under ``tmp_path``."""
+
+    cache_dir = tmp_path / "cache"
+    with parser.HtmlCache(cache_dir) as store:
+        for ver_id, html in PAGES.items():
+            store.put(ver_id, html)
+    return cache_dir
+
+
+def _run(tmp_path: Path, *args: str) -> list[dict]:
+    """Run ``convert-batch`` over the corpus and return the manifest."""
+
+    ids_file = tmp_path / "ids.txt"
+    ids = "\n".join(PAGES)
+    ids_file.write_text(f"# corpus\n{ids}\n\n", encoding="utf-8")
+
+    result = CliRunner().invoke(
+        cli.cli,
+        [
+            "convert-batch",
+            "--ids-file",
+            str(ids_file),
+            "--output",
+            str(tmp_path / "out"),
+            "--cache-dir",
+            str(_cache(tmp_path)),
+            "--workers",
+            "1",
+            *args,
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    manifest = tmp_path / "out" / batch.MANIFEST_NAME
+    return [json.loads(line) for line in manifest.read_text().splitlines()]
+
+
+@pytest.mark.parametrize("ver_id", sorted(PAGES))
+def test_article_records_match_streaming(ver_id: str) -> None:
+    """Lines built from the parsed document match the streamed ones."""
+
+    html = PAGES[ver_id]
+    doc = parser.parse_html(html, ver_id)
+    records = list(batch.article_records(doc, html))
+
+    expected = [
+        {**asdict(article), "path": asdict(path)}
+        for article, path in parser.iter_articles(html)
+    ]
+    assert records == json.loads(json.dumps(expected))
+
+
+def test_article_records_use_container_spans() -> None:
+    """Nested numbered sections keep the path of their own container."""
+
+    html = PAGES["1002"]
+    records = batch.article_records(parser.parse_html(html, "1002"), html)
+    paths = {record["article_id"]: record["path"] for record in records}
+
+    assert paths["id_art_s1"]["book_id"] is None
+    assert paths["id_art_s1"]["chapter_id"] == "id_chap_num_bdy"
+    assert paths["id_art_s1"]["section_id"] == "id_sec_num1_bdy"
+    assert paths["id_art_s11"]["section_id"] == "id_sec_num1_1_bdy"
+    assert paths["id_art_s11"]["subsection_id"] is None
+
+
+def test_jsonl_output_needs_html(tmp_path: Path) -> None:
+    """Article lines cannot be written without the page they came from."""
+
+    doc = parser.parse_html(PAGES["1002"], "1002")
+
+    with pytest.raises(ValueError, match="HTML"):
+        batch.write_document(doc, tmp_path / "1002.jsonl", "jsonl")
+
+
+def test_batch_writes_formats_and_manifest(tmp_path: Path) -> None:
+    """One parse produces every format, recorded with hashes."""
+
+    formats = ("xlsx", "json", "jsonl")
+    records = _run(tmp_path, *(f"--format={fmt}" for fmt in formats))
+
+    assert len(records) == len(PAGES)
+    for record in records:
+        assert record["status"] == "ok"
+        assert set(record["seconds"]) == {"fetch", "parse", "write", "total"}
+        for output_format in formats:
+            output = record["outputs"][output_format]
+            target = tmp_path / "out" / output["file"]
+            assert output["bytes"] == target.stat().st_size
+            assert output["sha256"] == batch._file_sha256(target)
+
+        # Formats written after the workbook see the document unchanged.
+        ver_id = record["ver_id"]
+        written = json.loads((tmp_path / "out" / f"{ver_id}.json").read_text())
+        expected = parser.parse_html(PAGES[ver_id], ver_id)
+        assert written == json.loads(json.dumps(expected))
+
+
+def test_batch_resumes_finished_documents(tmp_path: Path) -> None:
+    """A second run skips documents already converted."""
+
+    _run(tmp_path, "--format", "json")
+    ver_ids = list(PAGES)
+
+    # Losing an output file makes its document run again.
+    (tmp_path / "out" / f"{ver_ids[0]}.json").unlink()
+    out_dir = tmp_path / "out"
+    records = list(
+        batch.run_batch(
+            ver_ids, out_dir, ["json"], workers=1, cache_dir=tmp_path / "cache"
+        )
+    )
+
+    statuses = {record["ver_id"]: record["status"] for record in records}
+    assert statuses[ver_ids[0]] == "ok"
+    assert all(statuses[ver_id] == "skipped" for ver_id in ver_ids[1:])
+
+    # Asking for a new format converts every document again.
+    records = list(
+        batch.run_batch(
+            ver_ids, out_dir, ["yaml"], workers=1, cache_dir=tmp_path / "cache"
+        )
+    )
+    assert {record["status"] for record in records} == {"ok"}
+
+
+def test_batch_reports_failures(tmp_path: Path) -> None:
+    """Failed documents are recorded and retried on the next run."""
+
+    out_dir = tmp_path / "out"
+    (tmp_path / "cache").mkdir()
+    with parser.HtmlCache(tmp_path / "cache") as store:
+        store.put("1", "<html><head><title>x</title></head></html>")
+
+    records = list(
+        batch.run_batch(["1"], out_dir, ["json"], cache_dir=tmp_path / "cache")
+    )
+    assert records[0]["status"] == "error"
+    assert records[0]["error"]
+    assert not batch.is_done(
+        batch.read_manifest(out_dir / batch.MANIFEST_NAME)["1"],
+        ["json"],
+        out_dir,
+    )
+
+
+def test_document_lines_hold_whole_document() -> None:
+    """The header line and one line per entry rebuild the document."""
+
+    doc = parser.parse_html(PAGES["1002"], "1002")
+    lines = [json.loads(line) for line in batch.document_lines(doc)]
+
+    assert lines[0] == {"type": "document", "data": doc["document"]}
+    for key, kind in batch.DOCUMENT_SECTIONS:
+        entries = [line["data"] for line in lines if line["type"] == kind]
+        assert entries == json.loads(json.dumps(doc[key]))
+
+
+def test_batch_downloads_respect_host_rate(tmp_path: Path) -> None:
+    """Pages missing from the cache are downloaded within the rate."""
+
+    with FakePortal(PAGES) as portal:
+        portal.delay = 0.05
+        fetcher = parser.Fetcher(base_url=portal.base_url)
+        start = time.perf_counter()
+        records = list(
+            batch.run_batch(
+                list(PAGES),
+                tmp_path / "out",
+                ["json"],
+                workers=1,
+                cache_dir=tmp_path / "cache",
+                concurrency=2,
+                rate=10,
+                fetcher=fetcher,
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+    assert all(record["status"] == "ok" for record in records)
+    assert len(portal.requests) == len(PAGES)
+    assert portal.max_in_flight <= 2
+    assert elapsed >= (len(PAGES) - 1) / 10
+    assert all(record["seconds"]["fetch"] > 0 for record in records)
+
+
+def test_batch_records_failed_downloads(tmp_path: Path) -> None:
+    """A page the portal does not have is recorded as an error."""
+
+    with FakePortal(PAGES) as portal:
+        fetcher = parser.Fetcher(base_url=portal.base_url)
+        records = list(
+            batch.run_batch(
+                ["missing"],
+                tmp_path / "out",
+                ["json"],
+                workers=1,
+                cache_dir=tmp_path / "cache",
+                rate=1000,
+                fetcher=fetcher,
+            )
+        )
+
+    assert records[0]["status"] == "error"
+    assert "404" in records[0]["error"]
+    manifest = tmp_path / "out" / batch.MANIFEST_NAME
+    assert json.loads(manifest.read_text())["status"] == "error"
@@ -1,7 +1,9 @@
 """Tests for the command line interface."""
 
 import importlib
+import io
 import json
+import subprocess
 import sys
 from pathlib import Path
 from types import ModuleType, SimpleNamespace
@@ -316,6 +318,69 @@ def test_convert_wraps_long_and_list_values(tmp_path: Path) -> None:
     assert article_id_width == 12
 
 
+def test_convert_streams_jsonl(tmp_path: Path) -> None:
+    """Ensure JSONL output holds one article per line with its path."""
+
+    html = (
+        '<html><body><span class="S_CAP_BDY" id="c1">'
+        '<span class="S_ART" id="a1"><span class="S_ART_TTL">Articolul 1'
+        '</span><span class="S_ART_BDY"><span class="S_PAR" id="p1">Text.'
+        "</span></span></span></span></body></html>"
+    )
+    with patch("leropa.parser.open_html", return_value=io.StringIO(html)):
+        runner = CliRunner()
+        result = runner.invoke(
+            cli.cli,
+            ["convert", "123", "--format", "jsonl", "--output", str(tmp_path)],
+        )
+
+    assert result.exit_code == 0
+    lines = (tmp_path / "123.jsonl").read_text().splitlines()
+    assert len(lines) == 1
+    record = json.loads(lines[0])
+    assert record["article_id"] == "a1"
+    assert record["full_text"] == "Text."
+    assert record["path"]["chapter_id"] == "c1"
+
+
+def test_convert_streams_document_jsonl(tmp_path: Path) -> None:
+    """Ensure document lines hold the header, then one entry per line."""
+
+    sample = {
+        "document": {"ver_id": "123"},
+        "articles": [{"article_id": "a1"}, {"article_id": "a2"}],
+        "books": [{"book_id": "b1"}],
+        "annexes": [],
+    }
+    with patch("leropa.parser.fetch_document", return_value=sample):
+        runner = CliRunner()
+        printed = runner.invoke(
+            cli.cli, ["convert", "123", "--format", "document-jsonl"]
+        )
+        written = runner.invoke(
+            cli.cli,
+            [
+                "convert",
+                "123",
+                "--format",
+                "document-jsonl",
+                "--output",
+                str(tmp_path),
+            ],
+        )
+
+    assert written.exit_code == 0
+    lines = (tmp_path / "123.document.jsonl").read_text().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"type": "document", "data": {"ver_id": "123"}},
+        {"type": "article", "data": {"article_id": "a1"}},
+        {"type": "article", "data": {"article_id": "a2"}},
+        {"type": "book", "data": {"book_id": "b1"}},
+    ]
+    assert printed.exit_code == 0
+    assert printed.output.splitlines() == lines
+
+
 def test_export_md_requires_llm_deps() -> None:
     """Ensure missing LLM deps are reported to the user."""
 
@@ -470,3 +535,21 @@ def test_web_command_invokes_uvicorn() -> None:
         "port": 1234,
         "reload": True,
     }
+
+
+def test_cli_does_not_import_pyarrow() -> None:
+    """Parquet support is only loaded by the commands writing Parquet."""
+
+    code = (
+        "import sys; from click.testing import CliRunner; "
+        "from leropa import cli; "
+        "CliRunner().invoke(cli.cli, ['--help']); "
+        "print('leropa.columnar' in sys.modules, 'pyarrow' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.split() == ["False", "False"]
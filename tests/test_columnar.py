@@ -0,0 +1,92 @@
+"""Tests for the Parquet export of the document tables."""
+
+from __future__ import annotations
+
+import copy
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from leropa import cli, columnar, parser
+from leropa.xlsx import _flatten
+
+from .corpus import CORPUS
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+# Parsed corpus documents keyed by version identifier.
+DOCS = {
+    ver_id: parser.parse_html(html, ver_id) for ver_id, html in CORPUS.values()
+}
+
+
+@pytest.mark.parametrize("ver_id", sorted(DOCS))
+def test_tables_hold_flattened_rows(ver_id: str) -> None:
+    """Each table holds the rows of the Excel export with typed columns."""
+
+    doc = DOCS[ver_id]
+    before = copy.deepcopy(doc)
+    sheets = _flatten(doc)
+    tables = columnar.document_tables(doc)
+
+    # Building the tables leaves the document as it was.
+    assert doc == before
+
+    assert list(tables) == list(columnar.table_schemas())
+    for name, table in tables.items():
+        assert table.schema == columnar.table_schemas()[name]
+        assert table.num_rows == len(sheets.get(name, []))
+        assert set(table.column("document_id").to_pylist()) <= {ver_id}
+
+    articles = tables["Article"].to_pylist()
+    for row, expected in zip(articles, sheets["Article"], strict=True):
+        assert row["article_id"] == expected["article_id"]
+        assert row["parent_id"] == expected.get("parent_id")
+        assert ",".join(row["paragraphs"]) == expected["paragraphs"]
+
+
+def test_dataset_stacks_documents(tmp_path: Path) -> None:
+    """A dataset writes one file per table with the rows of every file."""
+
+    docs_dir = tmp_path / "docs"
+    docs_dir.mkdir()
+    for ver_id, doc in DOCS.items():
+        (docs_dir / f"{ver_id}.json").write_text(json.dumps(doc))
+    (docs_dir / "manifest.json").write_text(json.dumps({"versions": []}))
+
+    result = CliRunner().invoke(
+        cli.cli, ["export-parquet", str(docs_dir), str(tmp_path / "out")]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert f"Exported {len(DOCS)} documents" in result.output
+    for name, schema in columnar.table_schemas().items():
+        table = pq.read_table(tmp_path / "out" / f"{name}.parquet")
+        assert table.schema == schema
+    documents = pq.read_table(tmp_path / "out" / "Document.parquet")
+    assert sorted(documents.column("document_id").to_pylist()) == sorted(DOCS)
+
+
+def test_convert_writes_parquet_directory(tmp_path: Path) -> None:
+    """``convert --format parquet`` writes the tables of one document."""
+
+    doc = copy.deepcopy(DOCS["1001"])
+    with patch("leropa.parser.fetch_document", return_value=doc):
+        result = CliRunner().invoke(
+            cli.cli,
+            [
+                "convert",
+                "1001",
+                "--format",
+                "parquet",
+                "--output",
+                str(tmp_path),
+            ],
+        )
+
+    assert result.exit_code == 0, result.output
+    articles = pq.read_table(tmp_path / "Article.parquet")
+    assert articles.num_rows == len(DOCS["1001"]["articles"])
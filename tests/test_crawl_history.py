@@ -0,0 +1,97 @@
+"""Tests for crawling the version history of a document."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from leropa import cli, parser
+
+from .fake_portal import FakePortal
+
+# Versions of one act with their consolidation dates.
+VERSIONS = {"30": "03.03.2022", "20": "02.02.2021", "10": "01.01.2020"}
+
+
+def _history_page(ver_id: str) -> str:
+    """Return a page linking to every other version of the act."""
+
+    links = "".join(
+        f"<a href='~/../../../Public/DetaliiDocument/{other}'>{date}</a>"
+        for other, date in VERSIONS.items()
+        if other != ver_id
+    )
+    return (
+        f"<html><head><title>Legea {ver_id}</title></head><body>"
+        f"<div id='istoric_fa'><a>Forma curentă</a>{links}</div>"
+        "</body></html>"
+    )
+
+
+PAGES = {ver_id: _history_page(ver_id) for ver_id in VERSIONS}
+
+
+def test_crawl_visits_each_version_once(tmp_path: Path) -> None:
+    """Every reachable version is fetched once despite the cycles."""
+
+    async def run() -> list[parser.DocumentResult]:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = parser.crawl_history(
+                "30",
+                cache_dir=tmp_path,
+                rate=1000,
+                fetcher=parser.Fetcher(base_url=portal.base_url),
+                executor=executor,
+            )
+            return [result async for result in results]
+
+    with FakePortal(PAGES) as portal:
+        results = asyncio.run(run())
+
+    assert sorted(result.ver_id for result in results) == ["10", "20", "30"]
+    assert sorted(ver_id for ver_id, _ in portal.requests) == [
+        "10",
+        "20",
+        "30",
+    ]
+
+
+def test_crawl_history_command_writes_manifest(tmp_path: Path) -> None:
+    """The command writes each version and a chronological manifest."""
+
+    cache_dir = tmp_path / "cache"
+    with parser.HtmlCache(cache_dir) as store:
+        for ver_id, page in PAGES.items():
+            store.put(ver_id, page)
+
+    out_dir = tmp_path / "out"
+    result = CliRunner().invoke(
+        cli.cli,
+        [
+            "crawl-history",
+            "20",
+            "--output",
+            str(out_dir),
+            "--cache-dir",
+            str(cache_dir),
+            "--workers",
+            "1",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    manifest = json.loads((out_dir / "manifest.json").read_text())
+    assert manifest["start"] == "20"
+    assert [v["ver_id"] for v in manifest["versions"]] == ["10", "20", "30"]
+    assert [v["date"] for v in manifest["versions"]] == [
+        "01.01.2020",
+        "02.02.2021",
+        "03.03.2022",
+    ]
+    for version in manifest["versions"]:
+        assert version["status"] == "ok"
+        assert (out_dir / version["file"]).exists()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Dict
 
@@ -9,6 +10,7 @@ import pytest
 import yaml  # type: ignore[import-untyped]
 
 from leropa import document_cache
+from leropa.json_utils import json_dumps, json_dumps_line
 
 JSONDict = Dict[str, Any]
 
@@ -32,35 +34,107 @@ def _sample_doc(ver_id: str) -> JSONDict:
     }
 
 
+def _count_header_reads(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    """Record every file whose header is read."""
+
+    reads: list[Path] = []
+    read_header = document_cache.read_document_header
+
+    def counting(path: Path) -> JSONDict:
+        reads.append(path)
+        return read_header(path)
+
+    monkeypatch.setattr(document_cache, "read_document_header", counting)
+    return reads
+
+
 def test_load_document_info_caches(
     monkeypatch: pytest.MonkeyPatch, tmp_path: Path
 ) -> None:
     """Repeated calls should reuse cached ``DocumentInfo`` instances."""
     path = tmp_path / "1.yaml"
-
-    # Prepare fake loader to count invocations.
-    doc = _sample_doc("1")
-    calls = {"count": 0}
-
-    def fake_loader(p: Path) -> JSONDict:
-        calls["count"] += 1
-        return doc
-
-    monkeypatch.setattr(document_cache, "_load_document_file", fake_loader)
+    path.write_text(yaml.safe_dump(_sample_doc("1"), sort_keys=False))
+    reads = _count_header_reads(monkeypatch)
 
     # First call parses and caches.
     info1 = document_cache.load_document_info(path)
-    assert calls["count"] == 1
+    assert len(reads) == 1
+    assert info1.title == "T"
 
     # Second call should hit cache.
     info2 = document_cache.load_document_info(path)
-    assert calls["count"] == 1
+    assert len(reads) == 1
     assert info1 is info2
 
-    # Expire cache and ensure reload.
-    document_cache._CACHE[path] = (0.0, info1)
-    document_cache.load_document_info(path)
-    assert calls["count"] == 2
+    # Rewriting the file invalidates the entry.
+    doc = _sample_doc("1")
+    doc["document"]["title"] = "Changed"
+    path.write_text(yaml.safe_dump(doc, sort_keys=False))
+    assert document_cache.load_document_info(path).title == "Changed"
+    assert len(reads) == 2
+
+
+def test_load_document_info_evicts_least_recently_used(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """The cache keeps at most ``CACHE_SIZE`` documents."""
+    monkeypatch.setattr(document_cache, "CACHE_SIZE", 2)
+    monkeypatch.setattr(document_cache, "_CACHE", OrderedDict())
+    paths = []
+    for ver_id in ("1", "2", "3"):
+        path = tmp_path / f"{ver_id}.json"
+        path.write_text(json_dumps(_sample_doc(ver_id)))
+        paths.append(path)
+    reads = _count_header_reads(monkeypatch)
+
+    document_cache.load_document_info(paths[0])
+    document_cache.load_document_info(paths[1])
+    document_cache.load_document_info(paths[0])
+    document_cache.load_document_info(paths[2])
+
+    assert list(document_cache._CACHE) == [paths[0], paths[2]]
+    document_cache.load_document_info(paths[1])
+    assert reads == [paths[0], paths[1], paths[2], paths[1]]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_read_document_header_reads_leading_section(
+    tmp_path: Path, compact: bool
+) -> None:
+    """Only the leading ``document`` section needs to be valid."""
+    doc = _sample_doc("1")
+    doc["document"]["history"] = [{"ver_id": "0", "date": "01/01/2020"}]
+    header = doc["document"]
+
+    # The files are cut off after the header, so a full decode fails.
+    json_text = json_dumps_line(doc) if compact else json_dumps(doc)
+    json_path = tmp_path / "1.json"
+    json_path.write_text(json_text[: json_text.index('"articles"')])
+    yaml_path = tmp_path / "1.yaml"
+    yaml_text = yaml.safe_dump(doc, allow_unicode=True, sort_keys=False)
+    yaml_path.write_text(yaml_text.replace("articles: []", "articles: ["))
+
+    assert document_cache.read_document_header(json_path) == header
+    assert document_cache.read_document_header(yaml_path) == header
+
+
+def test_read_document_header_falls_back_to_whole_file(
+    tmp_path: Path,
+) -> None:
+    """Files not starting with ``document`` are decoded in full."""
+    doc = _sample_doc("1")
+    reordered = {"articles": [], "document": doc["document"]}
+    path = tmp_path / "1.json"
+    path.write_text(json_dumps(reordered))
+    yaml_path = tmp_path / "2.yaml"
+    yaml_path.write_text(yaml.safe_dump(reordered, sort_keys=False))
+
+    assert document_cache.read_document_header(path) == doc["document"]
+    assert document_cache.read_document_header(yaml_path) == doc["document"]
+
+    (tmp_path / "3.json").write_text("[]")
+    with pytest.raises(ValueError):
+        document_cache.read_document_header(tmp_path / "3.json")
 
 
 def test_ask_with_context_includes_document_info(
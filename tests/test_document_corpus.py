@@ -0,0 +1,61 @@
+"""Tests for the corpus sharing content between parsed documents."""
+
+from __future__ import annotations
+
+from leropa import parser
+
+from .corpus import CORPUS
+
+# Version identifiers and pages of every corpus sample.
+PAGES = list(CORPUS.values())
+
+
+def test_documents_keep_their_content() -> None:
+    """Stored documents convert to the same data as ``parse_html``."""
+
+    corpus = parser.DocumentCorpus()
+    for ver_id, html in PAGES:
+        corpus.add_html(html, ver_id)
+
+    assert len(corpus) == len({ver_id for ver_id, _ in PAGES})
+    for ver_id, html in PAGES:
+        assert ver_id in corpus
+        assert corpus[ver_id].to_dict() == parser.parse_html(html, ver_id)
+
+
+def test_identical_content_is_shared() -> None:
+    """Two versions of one page share articles, notes and strings."""
+
+    ver_id, html = PAGES[0]
+    corpus = parser.DocumentCorpus()
+    first = corpus.add_html(html, ver_id)
+    unique = corpus.stats()["unique_objects"]
+    second = corpus.add_html(html.replace(ver_id, "999999"), "999999")
+
+    assert list(corpus) == [ver_id, "999999"]
+    assert first.articles
+    for left, right in zip(first.articles, second.articles):
+        assert left is right
+    assert first.books[0] is second.books[0]
+    assert first.document is not second.document
+    assert first.document.title is second.document.title
+
+    assert corpus.stats()["unique_objects"] == unique
+
+
+def test_changed_content_is_not_shared() -> None:
+    """Articles that differ stay separate; their common notes do not."""
+
+    ver_id, html = PAGES[0]
+    first = parser.parse_document(html, ver_id)
+    changed = parser.parse_document(html, "2")
+    article = changed.articles[0]
+    article.full_text += " Modificat."
+
+    corpus = parser.DocumentCorpus()
+    kept = corpus.add(first)
+    other = corpus.add(changed)
+
+    assert kept.articles[0] is not other.articles[0]
+    assert kept.articles[0].paragraphs[0] is other.articles[0].paragraphs[0]
+    assert other.article(article.article_id) is other.articles[0]
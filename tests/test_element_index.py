@@ -0,0 +1,60 @@
+"""Tests for the document element index."""
+
+from leropa import parser
+from leropa.parser.element_index import ElementIndex
+from leropa.parser.engine import make_soup
+
+from .corpus import _page
+
+INDEX_HTML = """
+<div id="dup"><span class="A B" id="dup">one</span></div>
+<span class="B">two</span>
+"""
+
+
+def test_index_groups_elements_by_id_class_and_name() -> None:
+    """Lookups return elements in document order with name filters."""
+
+    index = ElementIndex(make_soup(INDEX_HTML))
+
+    assert index.by_id("dup").name == "div"
+    assert index.by_id("dup", "span").get_text() == "one"
+    assert index.by_id("missing") is None
+    assert [t.get_text() for t in index.by_class("B")] == ["one", "two"]
+    assert index.by_class("A", "div") == []
+    assert len(index.by_name("span")) == 2
+    assert index.first("p") is None
+
+
+def test_parse_html_resolves_many_annexes() -> None:
+    """Each annex title is matched with its own body."""
+
+    body = "".join(
+        f'<span class="S_ANX_TTL" id="anx{i}_ttl">Anexa {i}</span>'
+        f'<span class="S_ANX_BDY" id="anx{i}_bdy">Conţinut {i}</span>'
+        for i in range(300)
+    )
+    html = _page("LEGE nr. 5 din 01/01/2021", body)
+
+    annexes = parser.parse_html(html, "5")["annexes"]
+
+    assert len(annexes) == 300
+    assert annexes[299] == {
+        "annex_id": "anx299",
+        "title": "Anexa 299",
+        "text": "Conţinut 299",
+        "notes": [],
+    }
+
+
+def test_parse_html_without_document_sheet() -> None:
+    """Pages lacking the ``fisaact`` sheet parse without a document note."""
+
+    html = (
+        '<html><head><meta name="title" content="LEGE nr. 1 din '
+        '01/01/2020"></head><body></body></html>'
+    )
+
+    doc = parser.parse_html(html, "1")
+
+    assert doc["document"]["document_note"] is None
@@ -1,7 +1,17 @@
+import importlib
+import os
+import time
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import patch
+
+import pytest
 
 from leropa import parser
+from leropa.parser import result_cache
+from leropa.parser.fetcher import Fetcher
+from leropa.parser.result_cache import ResultCache, result_key
+
+from .fake_portal import FakePortal
 
 
 def test_fetch_document_uses_cache(tmp_path: Path) -> None:
@@ -9,15 +19,142 @@ def test_fetch_document_uses_cache(tmp_path: Path) -> None:
 
     html = "<html><head><title>t</title></head><body></body></html>"
     ver_id = "123"
-    response = Mock(text=html)
 
-    with patch("requests.get", return_value=response) as mock_get:
-        result = parser.fetch_document(ver_id, cache_dir=tmp_path)
-        assert mock_get.called
+    with FakePortal({ver_id: html}) as portal:
+        fetcher = Fetcher(base_url=portal.base_url)
+        result = parser.fetch_document(ver_id, tmp_path, fetcher=fetcher)
+        assert len(portal.requests) == 1
+
+        with parser.HtmlCache(tmp_path) as store:
+            assert store.get(ver_id) == html
+        assert result["document"]["ver_id"] == ver_id
+
+        parser.fetch_document(ver_id, tmp_path, fetcher=fetcher)
+        assert len(portal.requests) == 1
+
+
+def test_fetch_document_reuses_parsed_result(tmp_path: Path) -> None:
+    """Parses cached HTML once and loads the stored result afterwards."""
+
+    with parser.HtmlCache(tmp_path) as store:
+        store.put(
+            "5",
+            "<html><head><title>Legea 1</title></head><body></body></html>",
+        )
+    module = importlib.import_module("leropa.parser.fetch_document")
+
+    with patch.object(
+        module, "parse_html", wraps=module.parse_html
+    ) as mock_parse:
+        first = parser.fetch_document("5", cache_dir=tmp_path)
+        second = parser.fetch_document("5", cache_dir=tmp_path)
+
+    assert mock_parse.call_count == 1
+    assert first == second
+    assert first is not second
+
+    # Changed HTML is parsed again instead of served from the cache.
+    with parser.HtmlCache(tmp_path) as store:
+        store.put(
+            "5",
+            "<html><head><title>Legea 2</title></head><body></body></html>",
+        )
+    third = parser.fetch_document("5", cache_dir=tmp_path)
+    assert third["document"]["title"] == "Legea 2"
+
+
+def test_parsed_results_depend_on_parser_fingerprint(tmp_path: Path) -> None:
+    """Entries written by other parser code are not visible."""
+
+    key = result_key(b"<html></html>", "1", "html.parser")
+    ResultCache(tmp_path, fingerprint="old").store(key, {"document": {}})
+
+    assert ResultCache(tmp_path, fingerprint="old").load(key) == {
+        "document": {}
+    }
+    assert ResultCache(tmp_path, fingerprint="new").load(key) is None
+    assert ResultCache(tmp_path).load(key) is None
+
+
+def test_damaged_parsed_result_is_ignored(tmp_path: Path) -> None:
+    """Unreadable entries behave like missing ones."""
+
+    results = ResultCache(tmp_path)
+    key = result_key(b"<html></html>", "1", "html.parser")
+    results.store(key, {"document": {}})
+    entry = next(results.root.rglob("*.pickle"))
+    entry.write_bytes(entry.read_bytes()[:5])
+
+    assert results.load(key) is None
+
+
+def test_new_fingerprint_keeps_other_results(tmp_path: Path) -> None:
+    """Installs sharing a cache do not wipe each other's entries."""
+
+    key = result_key(b"<html></html>", "1", "html.parser")
+    old = ResultCache(tmp_path, fingerprint="old")
+    old.store(key, {"document": {}})
+
+    new = ResultCache(tmp_path, fingerprint="new")
+    new.store(key, {"document": {"ver_id": "1"}})
+
+    assert old.load(key) == {"document": {}}
+    assert new.load(key) == {"document": {"ver_id": "1"}}
+
+    # Other fingerprints only go away when asked.
+    assert new.prune() == 1
+    assert not old.root.exists()
+    assert new.load(key) == {"document": {"ver_id": "1"}}
+
+
+def test_sweep_removes_stale_and_least_recently_used(tmp_path: Path) -> None:
+    """Sweeps enforce the age limit and the byte budget over all entries."""
+
+    now = time.time()
+    stored = []
+    for index, age in enumerate((90, 40, 20, 10)):
+        cache = ResultCache(tmp_path, fingerprint="ab"[index % 2], max_bytes=0)
+        key = result_key(str(index).encode(), "1", "html.parser")
+        cache.store(key, {"document": {"n": "x" * 1000}})
+        entry = cache._path(key)
+        os.utime(entry, (now - age * 86400, now - age * 86400))
+        stored.append((cache, key))
+    size = entry.stat().st_size
+
+    # The entry unused for 90 days is stale; the one unused for 40 days
+    # is the least recently used once over the budget.
+    sweeper = ResultCache(
+        tmp_path, fingerprint="a", max_bytes=size * 2, max_age=60 * 86400
+    )
+    assert sweeper.sweep() == 2
+    kept = [cache.load(key) is not None for cache, key in stored]
+    assert kept == [False, False, True, True]
+
+
+def test_loading_records_use(tmp_path: Path) -> None:
+    """Reading an entry marks it as recently used."""
+
+    results = ResultCache(tmp_path, fingerprint="a")
+    key = result_key(b"<html></html>", "1", "html.parser")
+    results.store(key, {"document": {}})
+    entry = results._path(key)
+    os.utime(entry, (0, 0))
+
+    assert results.load(key) == {"document": {}}
+    assert entry.stat().st_mtime > time.time() - 60
+
+
+def test_fingerprint_follows_lxml_version(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Results parsed by another lxml release are not reused."""
 
-    assert (tmp_path / "123.html").exists()
-    assert result["document"]["ver_id"] == ver_id
+    etree = pytest.importorskip("lxml.etree")
+    before = result_cache.parser_fingerprint()
 
-    with patch("requests.get", return_value=response) as mock_get:
-        parser.fetch_document(ver_id, cache_dir=tmp_path)
-        mock_get.assert_not_called()
+    result_cache.parser_fingerprint.cache_clear()
+    monkeypatch.setattr(etree, "LXML_VERSION", (0, 0, 1, 0))
+    try:
+        assert result_cache.parser_fingerprint() != before
+    finally:
+        result_cache.parser_fingerprint.cache_clear()
@@ -0,0 +1,142 @@
+"""Tests for concurrent fetching and parsing of many documents."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from click.testing import CliRunner
+
+from leropa import cli, parser
+from leropa.parser.rate_limit import TokenBucket
+
+from .fake_portal import FakePortal
+
+PAGES = {
+    str(i): f"<html><head><title>Legea {i}</title></head><body></body></html>"
+    for i in range(1, 9)
+}
+
+
+def _collect(ver_ids: list[str], **kwargs: Any) -> list[parser.DocumentResult]:  # noqa: ANN401
+    """Run ``fetch_documents`` parsing in threads and collect the results."""
+
+    async def run() -> list[parser.DocumentResult]:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = parser.fetch_documents(
+                ver_ids, executor=executor, **kwargs
+            )
+            return [result async for result in results]
+
+    return asyncio.run(run())
+
+
+def test_streams_documents_with_bounded_concurrency(tmp_path: Path) -> None:
+    """All documents arrive, downloads overlap up to the given limit."""
+
+    with FakePortal(PAGES) as portal:
+        portal.delay = 0.1
+        fetcher = parser.Fetcher(base_url=portal.base_url, pool_size=3)
+        results = _collect(
+            [*PAGES, "1"],
+            concurrency=3,
+            cache_dir=tmp_path,
+            rate=1000,
+            burst=10,
+            fetcher=fetcher,
+        )
+
+    titles = {}
+    for result in results:
+        assert result.document is not None
+        titles[result.ver_id] = result.document["document"]["title"]
+    assert titles == {ver_id: f"Legea {ver_id}" for ver_id in PAGES}
+    assert len(portal.requests) == len(PAGES)
+    assert portal.max_in_flight == 3
+
+
+def test_failures_are_reported_per_document(tmp_path: Path) -> None:
+    """A missing page does not stop the other documents."""
+
+    with FakePortal(PAGES) as portal:
+        fetcher = parser.Fetcher(base_url=portal.base_url)
+        results = _collect(
+            ["1", "missing"], cache_dir=tmp_path, rate=1000, fetcher=fetcher
+        )
+
+    by_id = {result.ver_id: result for result in results}
+    assert by_id["1"].error is None
+    assert by_id["missing"].document is None
+    assert "404" in (by_id["missing"].error or "")
+
+
+def test_downloads_respect_host_rate(tmp_path: Path) -> None:
+    """New downloads to a host start no faster than the rate allows."""
+
+    with FakePortal(PAGES) as portal:
+        fetcher = parser.Fetcher(base_url=portal.base_url)
+        start = time.perf_counter()
+        _collect(
+            list(PAGES)[:5],
+            concurrency=5,
+            cache_dir=tmp_path,
+            rate=20,
+            fetcher=fetcher,
+        )
+        elapsed = time.perf_counter() - start
+
+        # Cached pages do not use the rate limit.
+        start = time.perf_counter()
+        _collect(list(PAGES)[:5], concurrency=5, cache_dir=tmp_path, rate=1)
+        cached_elapsed = time.perf_counter() - start
+
+    assert elapsed >= 0.19
+    assert cached_elapsed < 1
+    assert len(portal.requests) == 5
+
+
+def test_token_bucket_allows_bursts() -> None:
+    """A full bucket hands out its burst at once and then waits."""
+
+    async def run() -> float:
+        bucket = TokenBucket(rate=10, burst=3)
+        start = time.perf_counter()
+        for _ in range(4):
+            await bucket.acquire()
+        return time.perf_counter() - start
+
+    assert 0.09 <= asyncio.run(run()) < 0.5
+
+
+def test_convert_many_writes_each_document(tmp_path: Path) -> None:
+    """The command writes one file per document from the cache."""
+
+    cache_dir = tmp_path / "cache"
+    with parser.HtmlCache(cache_dir) as store:
+        for ver_id in ("1", "2"):
+            store.put(ver_id, PAGES[ver_id])
+
+    out_dir = tmp_path / "out"
+    result = CliRunner().invoke(
+        cli.cli,
+        [
+            "convert-many",
+            "1",
+            "2",
+            "--output",
+            str(out_dir),
+            "--cache-dir",
+            str(cache_dir),
+            "--workers",
+            "1",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    for ver_id in ("1", "2"):
+        doc = json.loads((out_dir / f"{ver_id}.json").read_text())
+        assert doc["document"]["title"] == f"Legea {ver_id}"
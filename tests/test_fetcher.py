@@ -0,0 +1,158 @@
+"""Tests for the pooled, retrying page fetcher."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+import requests  # type: ignore[import-untyped]
+
+from leropa import parser
+from leropa.parser.fetcher import Fetcher
+
+from .fake_portal import LAST_MODIFIED, FakePortal
+
+PAGES = {
+    "1": "<html><head><title>Legea 1</title></head><body>ă</body></html>",
+    "2": "<html><head><title>Legea 2</title></head><body></body></html>",
+}
+
+
+def _fetcher(
+    portal: FakePortal,
+    sleeps: list[float],
+    max_retries: int = 3,
+    max_backoff: float = 8,
+) -> Fetcher:
+    """Return a fetcher pointed at ``portal`` that records its waits."""
+
+    return Fetcher(
+        base_url=portal.base_url,
+        max_retries=max_retries,
+        max_backoff=max_backoff,
+        sleep=sleeps.append,
+    )
+
+
+def test_reuses_connection_and_requests_compression() -> None:
+    """Consecutive downloads share one compressed keep-alive connection."""
+
+    with FakePortal(PAGES) as portal, _fetcher(portal, []) as fetcher:
+        pages = [fetcher.fetch(ver_id) for ver_id in ("1", "2", "1")]
+
+    assert [page.text for page in pages if page] == [
+        PAGES["1"],
+        PAGES["2"],
+        PAGES["1"],
+    ]
+    assert len(portal.connections) == 1
+    assert all(
+        "gzip" in headers["Accept-Encoding"] for _, headers in portal.requests
+    )
+
+
+def test_revalidates_with_validators() -> None:
+    """Cached copies are confirmed with ``ETag`` and ``Last-Modified``."""
+
+    with FakePortal(PAGES) as portal, _fetcher(portal, []) as fetcher:
+        page = fetcher.fetch("1")
+        assert page is not None
+        assert page.last_modified == LAST_MODIFIED
+
+        assert fetcher.fetch("1", page.etag, page.last_modified) is None
+
+    headers = portal.requests[-1][1]
+    assert headers["If-None-Match"] == page.etag
+    assert headers["If-Modified-Since"] == LAST_MODIFIED
+
+
+def test_retries_transient_errors_with_backoff() -> None:
+    """Server errors are retried with doubling delays."""
+
+    sleeps: list[float] = []
+    with FakePortal(PAGES) as portal, _fetcher(portal, sleeps) as fetcher:
+        portal.failures["1"] = 2
+        page = fetcher.fetch("1")
+
+    assert page is not None and page.text == PAGES["1"]
+    assert sleeps == [0.5, 1.0]
+    assert len(portal.requests) == 3
+
+
+def test_gives_up_after_bounded_retries() -> None:
+    """Persistent failures raise once the retries are used up."""
+
+    sleeps: list[float] = []
+    with FakePortal(PAGES) as portal:
+        portal.failures["1"] = 10
+        with _fetcher(portal, sleeps, max_retries=4, max_backoff=2) as fetcher:
+            with pytest.raises(requests.HTTPError):
+                fetcher.fetch("1")
+
+    assert sleeps == [0.5, 1.0, 2.0, 2.0]
+    assert len(portal.requests) == 5
+
+
+@pytest.mark.parametrize(
+    ("retry_after", "expected"),
+    [("5", [5.0]), ("20", [8.0]), ("not a date", [0.5])],
+)
+def test_throttled_requests_honour_retry_after(
+    retry_after: str, expected: list[float]
+) -> None:
+    """``Retry-After`` sets the wait, within the bound of the backoff."""
+
+    sleeps: list[float] = []
+    with FakePortal(PAGES) as portal, _fetcher(portal, sleeps) as fetcher:
+        portal.failures["1"] = 1
+        portal.failure_status = 429
+        portal.retry_after = retry_after
+        page = fetcher.fetch("1")
+
+    assert page is not None and page.text == PAGES["1"]
+    assert sleeps == expected
+
+
+def test_client_errors_are_not_retried() -> None:
+    """Missing pages fail at once."""
+
+    sleeps: list[float] = []
+    with FakePortal(PAGES) as portal, _fetcher(portal, sleeps) as fetcher:
+        with pytest.raises(requests.HTTPError):
+            fetcher.fetch("404")
+
+    assert sleeps == []
+    assert len(portal.requests) == 1
+
+
+def test_connection_errors_are_retried() -> None:
+    """Unreachable servers are retried before the error is raised."""
+
+    with FakePortal(PAGES) as portal:
+        base_url = portal.base_url
+
+    sleeps: list[float] = []
+    fetcher = Fetcher(base_url=base_url, max_retries=2, sleep=sleeps.append)
+    with pytest.raises(requests.ConnectionError):
+        fetcher.fetch("1")
+    assert sleeps == [0.5, 1.0]
+
+
+def test_fetch_document_revalidates_cached_page(tmp_path: Path) -> None:
+    """Revalidation downloads a page again only when it changed."""
+
+    with FakePortal(PAGES) as portal, _fetcher(portal, []) as fetcher:
+        first = parser.fetch_document("1", tmp_path, fetcher=fetcher)
+        parser.fetch_document("1", tmp_path, fetcher=fetcher, revalidate=True)
+        assert len(portal.requests) == 2
+        assert "If-None-Match" in portal.requests[-1][1]
+
+        portal.pages["1"] = PAGES["2"]
+        second = parser.fetch_document("1", tmp_path, fetcher=fetcher)
+        third = parser.fetch_document(
+            "1", tmp_path, fetcher=fetcher, revalidate=True
+        )
+
+    assert first["document"]["title"] == "Legea 1"
+    assert second == first
+    assert third["document"]["title"] == "Legea 2"
@@ -0,0 +1,120 @@
+"""Tests for the single-pass hierarchy builder."""
+
+import sys
+
+from leropa.parser.engine import make_soup
+from leropa.parser.hierarchy import (
+    DEFAULT_BOOK_ID,
+    DEFAULT_CHAPTER_ID,
+    ArticleContainers,
+    ContainerInfo,
+    HierarchyBuilder,
+    collect_articles,
+)
+
+NESTED_HTML = """
+<span class="S_CRT_TTL">Cartea I</span>
+<span class="S_CRT_BDY" id="book">
+  <span class="S_CAP_TTL">Capitolul I</span>
+  <span class="S_CAP_DEN">Dispoziţii</span>
+  <span class="S_CAP_BDY" id="chap">
+    <div>
+      <span class="S_ART" id="art1"></span>
+    </div>
+    <span class="S_PCT_TTL">2.</span>
+    <span class="S_PCT_BDY" id="pct">Punct
+      <span class="S_ART" id="art2"></span>
+    </span>
+  </span>
+</span>
+<span class="S_ART" id="art3"></span>
+"""
+
+
+def test_collect_articles_tracks_open_containers() -> None:
+    """Articles are paired with their innermost containers and labels."""
+
+    pairs = collect_articles(make_soup(NESTED_HTML))
+    found = {tag.get("id"): containers for tag, containers in pairs}
+
+    assert list(found) == ["art1", "art2", "art3"]
+    assert found["art1"].book == ContainerInfo("book", "Cartea I")
+    assert found["art1"].chapter == ContainerInfo(
+        "chap", "Capitolul I", "Dispoziţii"
+    )
+    assert found["art2"].section == ContainerInfo("pct", "2.", "Punct")
+    assert found["art3"] == ArticleContainers()
+
+
+def test_orphan_section_moves_under_placeholders() -> None:
+    """Sections without a chapter are hosted by placeholder containers."""
+
+    builder = HierarchyBuilder()
+    section = ContainerInfo("sec", "Secţiunea 1")
+    builder.add_article("a1", ArticleContainers(section=section))
+    builder.add_article("a2", ArticleContainers(section=section))
+
+    book = builder.books[DEFAULT_BOOK_ID]
+    assert [c.chapter_id for c in book.chapters] == [DEFAULT_CHAPTER_ID]
+    assert book.sections == []
+    chapter = builder.chapters[DEFAULT_CHAPTER_ID]
+    assert [s.section_id for s in chapter.sections] == ["sec"]
+    assert chapter.sections[0].articles == ["a1", "a2"]
+
+
+def test_numeric_sections_nest_under_parent() -> None:
+    """Numbered sections are nested under the section with the prefix."""
+
+    builder = HierarchyBuilder()
+    chapter = ContainerInfo("chap", "Capitolul I")
+    parent = ContainerInfo("s1", "1.")
+    child = ContainerInfo("s11", "1.1.")
+    builder.add_article(
+        "a1", ArticleContainers(chapter=chapter, section=parent)
+    )
+    builder.add_article(
+        "a2", ArticleContainers(chapter=chapter, section=child)
+    )
+
+    section = builder.sections["s1"]
+    assert [s.section_id for s in section.subsections] == ["s11"]
+    assert builder.sections["s11"].level == 2
+    assert builder.sections["s11"].articles == ["a2"]
+
+
+def test_collect_articles_keeps_nested_articles() -> None:
+    """Articles inside articles are collected in document order."""
+
+    html = """
+    <span class="S_CAP_TTL">Capitolul I</span>
+    <span class="S_CAP_BDY" id="chap">
+      <span class="S_ART" id="outer">
+        <span class="S_SEC_TTL">Secţiunea 1</span>
+        <span class="S_SEC_BDY" id="sec">
+          <span class="S_ART" id="inner"></span>
+        </span>
+      </span>
+      <span class="S_ART" id="after"></span>
+    </span>
+    """
+
+    pairs = collect_articles(make_soup(html))
+    found = {tag.get("id"): containers for tag, containers in pairs}
+
+    assert list(found) == ["outer", "inner", "after"]
+    assert found["outer"].section is None
+    assert found["inner"].section == ContainerInfo("sec", "Secţiunea 1")
+    assert found["inner"].chapter == ContainerInfo("chap", "Capitolul I")
+    assert found["after"].section is None
+
+
+def test_collect_articles_handles_deep_nesting() -> None:
+    """Deeply nested markup does not exhaust the interpreter stack."""
+
+    depth = sys.getrecursionlimit() + 200
+    html = "<div>" * depth + '<span class="S_ART" id="deep"></span>'
+    html += "</div>" * depth
+
+    pairs = collect_articles(make_soup(html))
+
+    assert [tag.get("id") for tag, _ in pairs] == ["deep"]
@@ -0,0 +1,184 @@
+"""Tests for the compressed HTML cache store."""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from leropa.parser import html_cache
+from leropa.parser.html_cache import HtmlCache
+
+PAGE = "<html><body>" + "Articolul 1\r\n" * 200 + "</body></html>"
+
+
+@pytest.mark.parametrize("codec", ["gzip", "zstd"])
+def test_round_trip_is_compressed(tmp_path: Path, codec: str) -> None:
+    """Pages are stored compressed and read back with newlines unified."""
+
+    if codec == "zstd":
+        pytest.importorskip("zstandard")
+
+    with HtmlCache(tmp_path, codec=codec) as store:
+        digest = store.put("1", PAGE)
+
+        assert store.get("1") == PAGE.replace("\r\n", "\n")
+        stream = store.open("1")
+        assert stream is not None
+        with stream:
+            assert stream.read(6) == "<html>"
+        assert store.digest("1") == digest
+        assert store.get("2") is None
+
+    blob = next(tmp_path.glob(f"html/{digest[:2]}/{digest}.*"))
+    assert blob.stat().st_size < len(PAGE) // 4
+
+
+def test_identical_pages_share_one_blob(tmp_path: Path) -> None:
+    """Content addressing stores repeated pages once."""
+
+    with HtmlCache(tmp_path, codec="gzip") as store:
+        first = store.put("1", PAGE)
+        second = store.put("2", PAGE)
+        size = store.total_bytes()
+
+    assert first == second
+    assert len(list((tmp_path / "html").glob("*/*.html.gz"))) == 1
+    assert size == next((tmp_path / "html").glob("*/*.html.gz")).stat().st_size
+
+
+def test_evicts_least_recently_used(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Blobs not read recently are removed once over the byte budget."""
+
+    monkeypatch.setattr(html_cache, "ACCESS_INTERVAL", 0.0)
+
+    pages = {str(i): f"<p>{os.urandom(2000).hex()}</p>" for i in range(3)}
+    with HtmlCache(tmp_path, codec="gzip") as store:
+        for ver_id, page in pages.items():
+            store.put(ver_id, page)
+        blob_size = store.total_bytes() // 3
+
+    # Reading "0" makes "1" the least recently used page.
+    with HtmlCache(tmp_path, max_bytes=blob_size * 3, codec="gzip") as store:
+        assert store.get("0") == pages["0"]
+        store.max_bytes = blob_size * 2 + blob_size // 2
+        store.put("3", pages["0"] + "!")
+
+        assert store.get("1") is None
+        assert store.get("0") == pages["0"]
+        assert store.get("3") == pages["0"] + "!"
+        assert store.total_bytes() <= store.max_bytes
+
+
+def test_reads_do_not_rewrite_fresh_access_times(tmp_path: Path) -> None:
+    """Hits within the access interval leave the index untouched."""
+
+    with HtmlCache(tmp_path, codec="gzip") as store:
+        store.put("1", PAGE)
+        changes = store._db.total_changes
+        for _ in range(5):
+            assert store.get("1") is not None
+
+        assert store._db.total_changes == changes
+
+
+def test_replaced_page_removes_unused_blob(tmp_path: Path) -> None:
+    """A page fetched again with new content does not leave its old blob."""
+
+    with HtmlCache(tmp_path, codec="gzip") as store:
+        old = store.put("1", PAGE)
+        store.put("2", PAGE)
+        store.put("1", PAGE + "v2")
+
+        # The old page is still used by another version.
+        assert list(tmp_path.glob(f"html/*/{old}.*"))
+
+        store.put("2", PAGE + "v3")
+        assert not list(tmp_path.glob(f"html/*/{old}.*"))
+        assert len(list(tmp_path.glob("html/*/*.html.gz"))) == 2
+        assert store.total_bytes() == sum(
+            p.stat().st_size for p in tmp_path.glob("html/*/*.html.gz")
+        )
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, html_cache.DEFAULT_MAX_BYTES),
+        ("1000", 1000),
+        ("0", None),
+        ("lots", html_cache.DEFAULT_MAX_BYTES),
+    ],
+)
+def test_budget_comes_from_environment(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    value: str | None,
+    expected: int | None,
+) -> None:
+    """The budget is read when the store opens; bad values fall back."""
+
+    if value is None:
+        monkeypatch.delenv(html_cache.MAX_BYTES_ENV, raising=False)
+    else:
+        monkeypatch.setenv(html_cache.MAX_BYTES_ENV, value)
+
+    with HtmlCache(tmp_path, codec="gzip") as store:
+        assert store.max_bytes == expected
+    with HtmlCache(tmp_path, max_bytes=0, codec="gzip") as store:
+        assert store.max_bytes is None
+
+
+def test_imports_legacy_flat_files(tmp_path: Path) -> None:
+    """Pages cached as ``<ver_id>.html`` move into the store on first use."""
+
+    (tmp_path / "7.html").write_text(PAGE, encoding="utf-8")
+
+    with HtmlCache(tmp_path, codec="gzip") as store:
+        assert "7" in store
+        assert store.get("7") == PAGE.replace("\r\n", "\n")
+
+    assert not (tmp_path / "7.html").exists()
+
+
+def test_missing_blob_counts_as_miss(tmp_path: Path) -> None:
+    """Blobs removed outside the store are dropped from the index."""
+
+    with HtmlCache(tmp_path, codec="gzip") as store:
+        digest = store.put("1", PAGE)
+        next(tmp_path.glob(f"html/*/{digest}.*")).unlink()
+
+        assert store.get("1") is None
+        assert store.total_bytes() == 0
+
+
+def test_concurrent_writers(tmp_path: Path) -> None:
+    """Several stores sharing a directory can write at the same time."""
+
+    def write(offset: int) -> None:
+        with HtmlCache(tmp_path, codec="gzip") as store:
+            for i in range(20):
+                store.put(str(offset + i), f"{PAGE}{i}")
+
+    threads = [
+        threading.Thread(target=write, args=(n * 20,)) for n in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with HtmlCache(tmp_path, codec="gzip") as store:
+        assert all(str(i) in store for i in range(80))
+    assert not list(tmp_path.glob("html/*/*.tmp"))
+
+
+def test_unknown_codec_is_rejected(tmp_path: Path) -> None:
+    """Only the supported codecs can be selected."""
+
+    with pytest.raises(ValueError):
+        HtmlCache(tmp_path, codec="brotli")
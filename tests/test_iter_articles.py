@@ -0,0 +1,121 @@
+"""Tests for the streaming article iterator."""
+
+import importlib
+import io
+from pathlib import Path
+
+import pytest
+from attrs import asdict
+
+from leropa import parser
+from leropa.parser.article_path import ArticlePath
+
+from .corpus import BOOK_BODY, CORPUS, _page
+
+# The package re-exports the function under the module name.
+iter_module = importlib.import_module("leropa.parser.iter_articles")
+
+
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_iter_articles_matches_parse_html(name: str) -> None:
+    """Streamed articles equal the ones produced by the full parser."""
+
+    ver_id, html = CORPUS[name]
+    expected = parser.parse_html(html, ver_id)["articles"]
+
+    streamed = [asdict(article) for article, _ in parser.iter_articles(html)]
+
+    assert streamed == expected
+
+
+def test_iter_articles_reports_container_path() -> None:
+    """Each article carries the identifiers of its enclosing containers."""
+
+    _, html = CORPUS["books"]
+    paths = {
+        article.article_id: path
+        for article, path in parser.iter_articles(html)
+    }
+
+    assert paths["id_art1"] == ArticlePath(
+        book_id="id_book1_bdy",
+        title_id="id_title1_bdy",
+        chapter_id="id_chap1_bdy",
+    )
+    assert paths["id_art2"].section_id == "id_sec1_bdy"
+    assert paths["id_art2"].subsection_id == "id_ssec1_bdy"
+
+
+def test_iter_articles_reads_files_in_small_chunks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Files and streams are scanned incrementally with the same result."""
+
+    ver_id, html = CORPUS["numbered_sections"]
+    html_file = tmp_path / "doc.html"
+    html_file.write_text(html, encoding="utf-8")
+    expected = list(parser.iter_articles(html))
+
+    # Tiny chunks split tags and attributes across reads.
+    monkeypatch.setattr(iter_module, "CHUNK_SIZE", 5)
+
+    assert list(parser.iter_articles(html_file)) == expected
+    assert list(parser.iter_articles(io.StringIO(html))) == expected
+
+
+def test_scanner_releases_consumed_input() -> None:
+    """The scanner only retains the article currently being read."""
+
+    body = "".join(BOOK_BODY.replace('id="', f'id="r{i}_') for i in range(50))
+    html = _page("LEGE nr. 1 din 01/01/2020", body)
+    scanner = iter_module._ArticleScanner()
+
+    # Feed the document in chunks and track the retained input.
+    retained = 0
+    fragments = 0
+    for start in range(0, len(html), 1024):
+        scanner.feed(html[start : start + 1024])
+        retained = max(retained, len(scanner._buffer))
+        fragments += len(scanner.ready)
+        scanner.ready.clear()
+
+    assert fragments == 200
+    assert retained < len(BOOK_BODY)
+
+
+def _article(art_id: str, text: str, close: bool = True) -> str:
+    """Return the markup of an article with one paragraph."""
+
+    markup = (
+        f'<span class="S_ART" id="{art_id}">'
+        f'<span class="S_ART_TTL">Articolul {art_id}</span>'
+        f'<span class="S_ART_BDY"><span class="S_PAR" id="{art_id}_p">'
+        f"{text}</span></span>"
+    )
+    return markup + "</span>" if close else markup
+
+
+@pytest.mark.parametrize("engine", parser.available_engines())
+def test_iter_articles_handles_nested_and_unclosed_articles(
+    engine: str,
+) -> None:
+    """Nested and unclosed articles are streamed like ``parse_html``."""
+
+    # The second article holds a third one and is never closed, so it
+    # swallows the last article too.
+    body = (
+        _article("a1", "Primul.")
+        + _article("a2", "Al doilea.", close=False)
+        + _article("a3", "Al treilea.")
+        + _article("a4", "Ultimul.")
+    )
+    html = _page("LEGE nr. 1 din 01/01/2020", body)
+    expected = parser.parse_html(html, "1", engine=engine)["articles"]
+
+    streamed = [
+        asdict(article)
+        for article, _ in parser.iter_articles(html, engine=engine)
+    ]
+
+    assert [a["article_id"] for a in expected] == ["a1", "a2", "a3", "a4"]
+    assert streamed == expected
@@ -51,3 +51,13 @@ def test_json_loads_with_orjson(monkeypatch: MonkeyPatch) -> None:
 
     monkeypatch.setattr(json_utils, "orjson", Fake())
     assert json_utils.json_loads(b"{}") == {"b": 2}
+
+
+def test_json_dumps_line_is_single_line() -> None:
+    """Serialize nested data to one line of JSON."""
+
+    data = {"a": [1, {"b": "ă"}]}
+    line = json_utils.json_dumps_line(data)
+
+    assert "\n" not in line
+    assert json.loads(line) == data
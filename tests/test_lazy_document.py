@@ -0,0 +1,116 @@
+"""Tests for parsing article bodies on demand."""
+
+from __future__ import annotations
+
+import pytest
+
+from leropa import parser
+from leropa.parser import lazy_document
+
+from .corpus import CORPUS, _page
+
+
+@pytest.mark.parametrize("engine", parser.available_engines())
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_materialized_document_matches_parse_html(
+    engine: str, name: str
+) -> None:
+    """The fully parsed lazy document equals the eager result."""
+
+    ver_id, html = CORPUS[name]
+    doc = parser.parse_lazy(html, ver_id, engine=engine)
+
+    assert doc.to_dict() == parser.parse_html(html, ver_id, engine=engine)
+
+
+def test_articles_are_parsed_on_access(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Only the requested article body is parsed, and only once."""
+
+    calls: list[str] = []
+    parse_article = lazy_document._parse_article
+
+    def counting(art_tag: object) -> object:
+        calls.append(art_tag.get("id"))  # type: ignore[attr-defined]
+        return parse_article(art_tag)
+
+    monkeypatch.setattr(lazy_document, "_parse_article", counting)
+
+    ver_id, html = CORPUS["books"]
+    doc = parser.parse_lazy(html, ver_id)
+    assert calls == []
+    assert doc.article_ids == [
+        a["article_id"] for a in parser.parse_html(html, ver_id)["articles"]
+    ]
+
+    article = doc.article("id_art2")
+    assert article is not None
+    assert article.label == "2"
+    assert doc.article("id_art2") is article
+    assert calls == ["id_art2"]
+    assert doc.article("missing") is None
+
+
+def test_spans_point_at_the_articles() -> None:
+    """Each span covers the article element in the source."""
+
+    ver_id, html = CORPUS["books"]
+    doc = parser.parse_lazy(html, ver_id)
+
+    for article_id, span in doc.spans.items():
+        source = html[span.start : span.end]
+        assert source.startswith(f'<span class="S_ART" id="{article_id}">')
+        assert source.endswith("</span>")
+
+
+def test_scan_skips_comments_and_scripts() -> None:
+    """Article markup in comments and scripts is not an article."""
+
+    html = (
+        "<!-- <span class='S_ART' id='c'> -->"
+        "<script>var s = \"<span class='S_ART' id='s'>\";</script>"
+        "<span class=\"S_ART\" id='a'><span class=S_ART_BDY>x</span></span>"
+        "<span class='S_ART' id='b'/>"
+        "<span class='S_ART' id='open'><span class='S_ART_BDY'>y"
+    )
+
+    spans = lazy_document.find_article_spans(html)
+
+    assert [(s.article_id, s.has_body) for s in spans] == [
+        ("a", True),
+        ("b", False),
+        ("open", True),
+    ]
+    assert spans[-1].end == len(html)
+
+
+_ARTICLE = (
+    '<span class="S_ART" id="{0}"><span class="S_ART_TTL">Articolul {0}'
+    '</span><span class="S_ART_BDY"><span class="S_PAR" id="{0}_p">'
+    "Textul {0}.</span></span></span>"
+)
+
+
+@pytest.mark.parametrize("engine", parser.available_engines())
+@pytest.mark.parametrize(
+    "body",
+    [
+        # A section title left open swallows the following articles.
+        '<span class="S_SEC_TTL">1<span>nr. 5</span>'
+        '<span class="S_SEC_BDY" id="sec">'
+        + _ARTICLE.format("a1")
+        + "</span>",
+        # An article nested in another one.
+        _ARTICLE.format("a1")[:-7] + _ARTICLE.format("a2") + "</span>",
+        # A stray closing tag before an article.
+        "</span>" + _ARTICLE.format("a1"),
+    ],
+)
+def test_malformed_spans_match_parse_html(engine: str, body: str) -> None:
+    """Pages whose spans need repairing are parsed like ``parse_html``."""
+
+    html = _page("LEGE nr. 1 din 01/01/2020", body)
+    doc = parser.parse_lazy(html, "1", engine=engine)
+
+    assert doc.to_dict() == parser.parse_html(html, "1", engine=engine)
@@ -0,0 +1,82 @@
+"""Tests for parsing only the metadata of a document."""
+
+from __future__ import annotations
+
+import pytest
+
+from leropa import parser
+from leropa.parser.metadata_prefix import metadata_end
+
+from .corpus import CORPUS
+
+
+@pytest.mark.parametrize("engine", parser.available_engines())
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_metadata_parts_match_full_parse(engine: str, name: str) -> None:
+    """Metadata parsed from the page header equals the full result."""
+
+    ver_id, html = CORPUS[name]
+    full = parser.parse_html(html, ver_id, engine=engine)
+    meta = parser.parse_html(
+        html, ver_id, engine=engine, parts={"document", "history"}
+    )
+
+    assert meta == {"document": full["document"]}
+
+
+def test_cut_skips_scripts_and_comments() -> None:
+    """Spans mentioned in scripts and comments do not end the header."""
+
+    _, html = CORPUS["books"]
+    end = metadata_end(html)
+
+    assert end is not None
+    assert html[end:].startswith('<span class="S_CRT_TTL"')
+    assert "istoric_fa" in html[:end]
+
+
+def test_cut_waits_for_open_metadata() -> None:
+    """A body span inside the history block does not end the header."""
+
+    html = (
+        "<div id='istoric_fa'><span class='S_ART'>x</span>"
+        "<a href='/1'>01.01.2020</a></div>"
+        "<span class='S_ART' id='a'>y</span>"
+    )
+
+    assert html[metadata_end(html) :].startswith("<span class='S_ART' id='a'>")
+
+
+def test_late_metadata_parses_whole_page() -> None:
+    """Pages keeping metadata after the legal text are not cut."""
+
+    html = (
+        "<span class='S_ART' id='a'>x</span>"
+        "<span class='S_PUB_BDY'>MONITORUL OFICIAL</span>"
+    )
+
+    assert metadata_end(html) is None
+    doc = parser.parse_html(html, "1", parts={"document"})
+    assert doc["document"]["published"] == ["MONITORUL OFICIAL"]
+
+
+def test_parts_select_entries() -> None:
+    """Only the requested sections are returned."""
+
+    ver_id, html = CORPUS["books"]
+    doc = parser.parse_html(html, ver_id, parts={"document", "annexes"})
+
+    assert list(doc) == ["document", "annexes"]
+    assert doc["document"]["history"] == []
+    assert doc["document"]["prev_ver"] is None
+
+    doc = parser.parse_html(html, ver_id, parts={"books"})
+    assert list(doc) == ["books"]
+    assert doc["books"] == parser.parse_html(html, ver_id)["books"]
+
+
+def test_unknown_part_is_rejected() -> None:
+    """Asking for a section that does not exist raises ``ValueError``."""
+
+    with pytest.raises(ValueError, match="Unknown document parts"):
+        parser.parse_html("<html></html>", "1", parts={"nope"})
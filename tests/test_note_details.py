@@ -0,0 +1,53 @@
+"""Tests for the amendment note detail extractor."""
+
+from leropa.parser.note_details import (
+    NOTE_FIELDS,
+    _note_values,
+    clear_note_cache,
+    parse_note_details,
+)
+
+NOTE = (
+    "(la 01-01-2020, Alin. (2) al art. 287 a fost modificat de art. IX din "
+    "Legea NR. 60 din 10 aprilie 2012, publicată în Monitorul Oficial "
+    'nr. 255 din 17 aprilie 2012, prin ÎNLOCUIREA SINTAGMEI "vechi" cu '
+    'sintagma "nou".)'
+)
+
+
+def test_parse_note_details_extracts_all_fields() -> None:
+    """Every field is found regardless of the case of the keywords."""
+
+    assert parse_note_details(NOTE) == {
+        "date": "01-01-2020",
+        "subject": "Alin. (2) al art. 287",
+        "law_number": "60",
+        "law_date": "10 aprilie 2012",
+        "monitor_number": "255",
+        "monitor_date": "17 aprilie 2012",
+        "replaced": "vechi",
+        "replacement": "nou",
+    }
+
+
+def test_notes_without_details_are_rejected() -> None:
+    """Notes lacking every marker yield empty fields."""
+
+    assert parse_note_details("Article note.") == dict.fromkeys(NOTE_FIELDS)
+
+    # The subject is only looked for in dated notes.
+    details = parse_note_details("Text, ceva a fost modificat.")
+    assert details["subject"] is None
+
+
+def test_repeated_notes_are_served_from_cache() -> None:
+    """Identical note texts are parsed once and copies are returned."""
+
+    clear_note_cache()
+    first = parse_note_details(NOTE)
+    first["date"] = "changed"
+    second = parse_note_details(NOTE)
+
+    assert second["date"] == "01-01-2020"
+    assert _note_values.cache_info().hits == 1
+    assert _note_values.cache_info().misses == 1
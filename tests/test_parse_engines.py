@@ -0,0 +1,49 @@
+"""Differential tests comparing the available parser engines."""
+
+import pytest
+
+from leropa.json_utils import json_dumps
+from leropa.parser import DEFAULT_ENGINE, available_engines, parse_html
+from leropa.parser.engine import make_soup
+
+from .corpus import CORPUS
+
+# Engines other than the reference one that can run in this environment.
+ALTERNATE_ENGINES = [e for e in available_engines() if e != DEFAULT_ENGINE]
+
+
+@pytest.mark.parametrize("engine", ALTERNATE_ENGINES)
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_engines_produce_identical_json(engine: str, name: str) -> None:
+    """Every engine serializes each corpus page to the same bytes."""
+
+    ver_id, html = CORPUS[name]
+    expected = json_dumps(parse_html(html, ver_id)).encode("utf-8")
+    actual = json_dumps(parse_html(html, ver_id, engine=engine)).encode(
+        "utf-8"
+    )
+
+    assert actual == expected
+
+
+def test_unknown_engine_is_rejected() -> None:
+    """Asking for an unsupported engine raises ``ValueError``."""
+
+    with pytest.raises(ValueError, match="Unknown parser engine"):
+        make_soup("<html></html>", "nope")
+
+
+@pytest.mark.parametrize("engine", ALTERNATE_ENGINES)
+def test_engines_agree_on_deeply_nested_pages(engine: str) -> None:
+    """Elements nested hundreds of levels deep are kept by every engine."""
+
+    ver_id, html = CORPUS[sorted(CORPUS)[0]]
+    depth = 600
+    html = html.replace("<body>", "<body>" + "<div>" * depth, 1)
+    html = html.replace("</body>", "</div>" * depth + "</body>", 1)
+    expected = parse_html(html, ver_id)
+
+    assert expected["articles"]
+    assert json_dumps(parse_html(html, ver_id, engine=engine)) == json_dumps(
+        expected
+    )
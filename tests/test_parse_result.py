@@ -0,0 +1,71 @@
+"""Tests for the typed parse result."""
+
+from __future__ import annotations
+
+import pytest
+
+from leropa import parser
+from leropa.json_utils import json_dumps
+from leropa.parser.article import Article
+from leropa.parser.document_info import DocumentInfo
+
+from .corpus import CORPUS
+
+
+@pytest.mark.parametrize("engine", parser.available_engines())
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_result_matches_parse_html(engine: str, name: str) -> None:
+    """The typed result converts to the same data as ``parse_html``."""
+
+    ver_id, html = CORPUS[name]
+    result = parser.parse_document(html, ver_id, engine=engine)
+    expected = parser.parse_html(html, ver_id, engine=engine)
+
+    assert result.to_dict() == expected
+    assert result.to_json_bytes() == json_dumps(expected).encode()
+
+
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_from_dict_round_trips(name: str) -> None:
+    """Results rebuilt from their data equal the parsed ones."""
+
+    ver_id, html = CORPUS[name]
+    result = parser.parse_document(html, ver_id)
+    rebuilt = parser.ParseResult.from_dict(result.to_dict())
+
+    assert rebuilt == result
+    for article in result.articles:
+        assert rebuilt.article(article.article_id) == article
+
+
+def test_article_lookup() -> None:
+    """Articles are found by identifier; the first duplicate wins."""
+
+    first = Article("a1", "1", "one")
+    result = parser.ParseResult(
+        document=DocumentInfo(source="s", ver_id="1"),
+        articles=[first, Article("a2", "2", "two"), Article("a1", "3", "x")],
+    )
+
+    assert result.article("a1") is first
+    assert result.article("a2") is result.articles[1]
+    assert result.article("missing") is None
+
+
+def test_from_dict_fills_missing_fields() -> None:
+    """Documents written without some fields still load."""
+
+    result = parser.ParseResult.from_dict(
+        {
+            "document": {"source": "s", "ver_id": "1", "title": "Doc1"},
+            "articles": [{"article_id": "a1", "label": "1"}],
+        }
+    )
+
+    assert result.document.title == "Doc1"
+    assert result.document.history == []
+    article = result.article("a1")
+    assert article is not None
+    assert article.full_text is None
+    assert article.paragraphs == []
+    assert result.books == []
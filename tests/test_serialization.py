@@ -0,0 +1,57 @@
+"""Tests for the bytes-based JSON and YAML helpers."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+
+from leropa import parser, serialization
+from leropa.json_utils import json_dumps
+
+from .corpus import CORPUS
+
+
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_dumps_match_text_serializers(name: str) -> None:
+    """The bytes equal what the text serializers produce."""
+
+    ver_id, html = CORPUS[name]
+    doc = parser.parse_html(html, ver_id)
+
+    expected = yaml.safe_dump(doc, allow_unicode=True, sort_keys=False)
+    assert serialization.dumps_yaml(doc) == expected.encode()
+    assert serialization.dumps_json(doc) == json_dumps(doc).encode()
+    assert serialization.loads_yaml(serialization.dumps_yaml(doc)) == doc
+
+
+def test_compact_json_is_one_line() -> None:
+    """Compact JSON has no indentation and keeps non-ASCII text."""
+
+    data = {"titlu": "Legea educației", "n": [1, 2]}
+    content = serialization.dumps_json(data, compact=True)
+
+    assert content == '{"titlu":"Legea educației","n":[1,2]}'.encode()
+    assert json.loads(content) == data
+
+
+@pytest.mark.parametrize("suffix", [".json", ".yaml", ".yml"])
+def test_files_round_trip(tmp_path: Path, suffix: str) -> None:
+    """Files are written and read in the format of their extension."""
+
+    path = tmp_path / f"doc{suffix}"
+    data = {"document": {"ver_id": "1", "title": "Ștefan"}, "articles": []}
+
+    assert serialization.write_file(path, data) == path.stat().st_size
+    assert serialization.read_file(path) == data
+
+
+def test_unknown_format_is_rejected(tmp_path: Path) -> None:
+    """Only JSON and YAML are handled."""
+
+    with pytest.raises(ValueError):
+        serialization.read_file(tmp_path / "doc.txt")
+    with pytest.raises(ValueError):
+        serialization.dumps({}, "xml")
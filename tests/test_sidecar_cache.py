@@ -0,0 +1,105 @@
+"""Tests for the binary copies of YAML document files."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from leropa import parser, sidecar_cache
+from leropa.serialization import dumps_json, dumps_yaml
+
+from .corpus import CORPUS
+
+
+def _count_decodes(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Record the format of every file decoded from its text."""
+
+    decodes: list[str] = []
+    loads = sidecar_cache.loads
+
+    def counting(data: bytes, fmt: str) -> object:
+        decodes.append(fmt)
+        return loads(data, fmt)
+
+    monkeypatch.setattr(sidecar_cache, "loads", counting)
+    return decodes
+
+
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_copy_matches_yaml(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, name: str
+) -> None:
+    """Documents loaded from the copy equal the decoded YAML."""
+
+    ver_id, html = CORPUS[name]
+    doc = parser.parse_html(html, ver_id)
+    path = tmp_path / f"{ver_id}.yaml"
+    path.write_bytes(dumps_yaml(doc))
+    decodes = _count_decodes(monkeypatch)
+
+    first = sidecar_cache.read_document_file(path)
+    second = sidecar_cache.read_document_file(path)
+
+    assert first == second == doc
+    assert first is not second
+    assert decodes == ["yaml"]
+
+
+def test_changed_file_is_read_again(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """A copy is ignored once the file changes or when it is damaged."""
+
+    path = tmp_path / "1.yaml"
+    path.write_bytes(dumps_yaml({"document": {"title": "A"}}))
+    decodes = _count_decodes(monkeypatch)
+    sidecar_cache.read_document_file(path)
+
+    # Same size, later modification time.
+    path.write_bytes(dumps_yaml({"document": {"title": "B"}}))
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert sidecar_cache.read_document_file(path)["document"]["title"] == "B"
+    assert len(decodes) == 2
+
+    # A truncated copy is replaced.
+    root = sidecar_cache.sidecar_dir()
+    assert root is not None
+    cache = sidecar_cache.SidecarCache(root)
+    copy = cache._path(path)
+    copy.write_bytes(copy.read_bytes()[:30])
+    assert sidecar_cache.read_document_file(path)["document"]["title"] == "B"
+    assert sidecar_cache.read_document_file(path)["document"]["title"] == "B"
+    assert len(decodes) == 3
+
+    sidecar_cache.discard_sidecar(path)
+    assert not copy.exists()
+
+    # A copy that cannot be read is skipped, not raised.
+    copy.mkdir()
+    assert sidecar_cache.read_document_file(path)["document"]["title"] == "B"
+    assert len(decodes) == 4
+
+
+def test_json_and_disabled_cache_read_the_file(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """JSON files and a disabled cache never use copies."""
+
+    json_path = tmp_path / "1.json"
+    json_path.write_bytes(dumps_json({"document": {}}))
+    yaml_path = tmp_path / "2.yaml"
+    yaml_path.write_bytes(dumps_yaml({"document": {}}))
+    decodes = _count_decodes(monkeypatch)
+
+    sidecar_cache.read_document_file(json_path)
+    sidecar_cache.read_document_file(json_path)
+    assert decodes == ["json", "json"]
+
+    monkeypatch.setenv("LEROPA_SIDECAR_CACHE", "")
+    sidecar_cache.read_document_file(yaml_path)
+    sidecar_cache.read_document_file(yaml_path)
+    assert decodes == ["json", "json", "yaml", "yaml"]
+    assert sidecar_cache.sidecar_dir() is None
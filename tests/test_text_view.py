@@ -0,0 +1,85 @@
+"""Tests for the flattened text view used by the article parser."""
+
+import sys
+
+from leropa.parser.engine import make_soup
+from leropa.parser.text_view import TextView, normalize_joined
+
+BODY_HTML = (
+    '<span class="S_ART_BDY">'
+    '<span class="S_PAR" id="p1">Primul <b>text</b> , cu '
+    '<span class="S_LIT" id="l1"><span class="S_LIT_TTL"> a) </span>'
+    '<span class="S_LIT_BDY">literă</span></span>'
+    '<span class="S_LIT_SHORT">...</span>'
+    "<!-- ascuns -->"
+    '<span class="S_PAR" id="n1">(la 01-01-2020, nota)</span> final.'
+    "</span></span>"
+)
+
+
+def test_normalize_joined_matches_get_text_normalization() -> None:
+    """Joined pieces collapse whitespace and tidy punctuation."""
+
+    assert normalize_joined([" a ", "\n", "b", " .", "c )"]) == "a b. c)"
+
+
+def test_text_skips_placeholders_and_removed_elements() -> None:
+    """Removed elements and placeholders do not contribute text."""
+
+    soup = make_soup(BODY_HTML)
+    view = TextView(soup.find("span", class_="S_ART_BDY"))
+    par = view.children[0][0]
+    item = view.find(par, "S_LIT")
+    note = view.find(par, "S_PAR")
+    assert item is not None and note is not None
+    title = view.find(item, "S_LIT_TTL")
+    assert title is not None
+
+    assert view.text(par, [item, note]) == "Primul text, cu final."
+    assert view.text(note) == "(la 01-01-2020, nota)"
+    assert view.label(title) == "a)"
+    assert "S_LIT_SHORT" not in view.by_class
+
+
+def test_find_ignores_matches_inside_removed_elements() -> None:
+    """Searches skip removed subtrees but not the search root itself."""
+
+    soup = make_soup(BODY_HTML)
+    view = TextView(soup.find("span", class_="S_ART_BDY"))
+    par = view.children[0][0]
+    item = view.find(par, "S_LIT")
+    assert item is not None
+
+    assert view.find(par, "S_LIT_BDY", [item]) is None
+    assert view.find(item, "S_LIT_BDY", [item]) is not None
+    assert view.find_all(par, ("S_LIT", "S_PAR")) == [item, item + 3]
+
+
+def test_placeholders_can_be_kept() -> None:
+    """Annex bodies keep placeholder spans as regular text."""
+
+    soup = make_soup(BODY_HTML)
+    view = TextView(
+        soup.find("span", class_="S_ART_BDY"), skip_placeholders=False
+    )
+
+    assert "..." in view.text(0)
+
+
+def test_deeply_nested_text_is_collected() -> None:
+    """Deeply nested markup does not exhaust the interpreter stack."""
+
+    depth = sys.getrecursionlimit() + 200
+    html = (
+        '<span class="S_ART_BDY"><span class="S_PAR" id="p1">Început '
+        + "<i>" * depth
+        + "adânc"
+        + "</i>" * depth
+        + " sfârșit.</span></span>"
+    )
+    soup = make_soup(html)
+    view = TextView(soup.find("span", class_="S_ART_BDY"))
+    par = view.children[0][0]
+
+    assert view.text(par) == "Început adânc sfârșit."
+    assert view.node_end[0] == len(view.tags) == depth + 2
@@ -0,0 +1,91 @@
+"""Tests for cutting pages down to the parsed content."""
+
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+import pytest
+
+from leropa import parser
+from leropa.parser.html_cache import HtmlCache
+
+from .corpus import CORPUS
+
+# Page chrome wrapped around the legal text of the corpus pages.
+CHROME = (
+    '<nav><a href="/Public/DetaliiDocument/1">Acasa 01.01.2020</a></nav>'
+    "<script>var tpl = \"<span class='S_ART' id='x'>\";</script>"
+    '<form action="/cauta"><input name="q"><button>Cauta</button></form>'
+    "<!-- <span class='S_ART'> -->"
+)
+FOOTER = "<footer><p>" + "Portal Legislativ " * 50 + "</p></footer>"
+
+
+def _wrap(html: str) -> str:
+    """Return ``html`` with extra chrome around its legal text."""
+
+    return html.replace("<body>", "<body>" + CHROME, 1).replace(
+        "</body>", FOOTER + "</body>", 1
+    )
+
+
+@pytest.mark.parametrize("engine", parser.available_engines())
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_trimmed_page_parses_the_same(engine: str, name: str) -> None:
+    """Trimmed and untrimmed pages produce identical parse output."""
+
+    ver_id, html = CORPUS[name]
+    html = _wrap(html)
+    trimmed = parser.trim_html(html)
+
+    assert len(trimmed) < len(html)
+    assert parser.parse_html(trimmed, ver_id, engine=engine) == (
+        parser.parse_html(html, ver_id, engine=engine)
+    )
+    assert list(parser.iter_articles(io.StringIO(trimmed), engine)) == list(
+        parser.iter_articles(io.StringIO(html), engine)
+    )
+
+
+def test_chrome_is_emptied_outside_the_legal_text() -> None:
+    """Scripts, comments and chrome lose their content, not their tags."""
+
+    html = (
+        "<html><head><title>T</title><link rel='x'><script>a()</script>"
+        "</head><body><nav><ul><li>Meniu</li></ul></nav>"
+        '<span class="S_ART" id="a1"><span class="S_ART_BDY">'
+        "<form><input></form>Text</span></span>"
+        "<!-- x --><footer>Subsol</footer></body></html>"
+    )
+
+    assert parser.trim_html(html) == (
+        "<html><head><title>T</title></head><body><nav></nav>"
+        '<span class="S_ART" id="a1"><span class="S_ART_BDY">'
+        "<form><input></form>Text</span></span>"
+        "<!----><footer></footer></body></html>"
+    )
+
+
+def test_history_links_are_kept() -> None:
+    """Chrome holding the links of the history block is left alone."""
+
+    html = (
+        '<div id="istoric_fa"><nav>'
+        '<a href="/Public/DetaliiDocument/2">01.01.2020</a></nav></div>'
+        '<span class="S_ART" id="a1"></span>'
+    )
+
+    assert parser.trim_html(html) == html
+
+
+def test_cache_stores_trimmed_pages(tmp_path: Path) -> None:
+    """The cache trims pages before storing them when asked to."""
+
+    ver_id, html = CORPUS[sorted(CORPUS)[0]]
+    with HtmlCache(tmp_path, codec="gzip", trim=True) as store:
+        store.put(ver_id, html)
+        cached = store.get(ver_id)
+
+    assert cached == parser.trim_html(html)
+    assert cached is not None and len(cached) < len(html)
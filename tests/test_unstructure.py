@@ -0,0 +1,79 @@
+"""Tests for the generated unstructure functions."""
+
+from __future__ import annotations
+
+import pytest
+from attrs import AttrsInstance, asdict, define, field
+
+from leropa import parser
+from leropa.json_utils import json_dumps
+from leropa.parser.element_index import ElementIndex
+from leropa.parser.engine import make_soup
+from leropa.parser.note import Note
+from leropa.parser.parse_html import _annexes, _articles, _document_info
+from leropa.parser.section import Section
+
+from .corpus import CORPUS
+
+
+def _objects(name: str) -> list[AttrsInstance]:
+    """Return every top-level parser object of a corpus page."""
+
+    ver_id, html = CORPUS[name]
+    soup = make_soup(html, parser.DEFAULT_ENGINE)
+    index = ElementIndex(soup)
+    articles, hierarchy = _articles(soup)
+    return [
+        _document_info(index, ver_id, True),
+        *articles,
+        *hierarchy.books.values(),
+        *_annexes(index),
+    ]
+
+
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_unstructure_matches_asdict(name: str) -> None:
+    """Generated functions give the same data as ``attrs.asdict``."""
+
+    for obj in _objects(name):
+        data = parser.unstructure(obj)
+
+        assert data == asdict(obj)
+        assert type(data) is dict
+
+
+@pytest.mark.parametrize("name", sorted(CORPUS))
+def test_json_bytes_match_json_dumps(name: str) -> None:
+    """Objects serialize to the same JSON as their unstructured data."""
+
+    objects = _objects(name)
+    expected = json_dumps({"items": [asdict(obj) for obj in objects]})
+
+    assert parser.to_json_bytes({"items": objects}) == expected.encode()
+
+
+def test_lists_are_copied() -> None:
+    """Lists in the result are new objects, as with ``asdict``."""
+
+    section = Section(
+        "s1", "Secțiunea 1", subsections=[Section("s2", "Secțiunea 2")]
+    )
+    section.articles.append("art_1")
+    data = parser.unstructure(section)
+    data["articles"].append("art_2")
+
+    assert section.articles == ["art_1"]
+    assert data["subsections"][0] == asdict(section.subsections[0])
+
+
+def test_other_attrs_classes_are_generated_on_demand() -> None:
+    """Classes outside the parser get their function on first use."""
+
+    @define(slots=True)
+    class Holder:
+        note: Note | None
+        notes: tuple[Note, ...] = field(factory=tuple)
+
+    holder = Holder(Note("n1", "text"), (Note("n2", "other"),))
+
+    assert parser.unstructure(holder) == asdict(holder)
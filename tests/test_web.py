@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import json
 from copy import deepcopy
+from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, cast
 
 import pytest
 import yaml  # type: ignore[import-untyped]
+from openpyxl import load_workbook  # type: ignore[import-untyped]
 
 pytest.importorskip("fastapi.testclient")
 
@@ -44,6 +47,57 @@ def test_convert_endpoint(monkeypatch: pytest.MonkeyPatch) -> None:
     assert response.json() == {"ver_id": "123"}
 
 
+def test_convert_endpoint_streams_document_jsonl(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Endpoint should stream one JSON record per line."""
+
+    doc = {
+        "document": {"ver_id": "123"},
+        "articles": [{"article_id": "a1"}],
+        "annexes": [{"annex_id": "x1"}],
+    }
+    monkeypatch.setattr(parser, "fetch_document", lambda *args: doc)
+
+    client = _client()
+    response = client.get(
+        "/convert", params={"ver_id": "123", "output_format": "document-jsonl"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in response.text.splitlines()] == [
+        {"type": "document", "data": {"ver_id": "123"}},
+        {"type": "article", "data": {"article_id": "a1"}},
+        {"type": "annex", "data": {"annex_id": "x1"}},
+    ]
+
+
+def test_convert_endpoint_streams_xlsx(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Endpoint should stream the workbook as a download."""
+
+    doc = {
+        "document": {"ver_id": "123"},
+        "articles": [{"article_id": "a1", "full_text": "x" * 60}],
+    }
+    monkeypatch.setattr(parser, "fetch_document", lambda *args: doc)
+
+    client = _client()
+    response = client.get(
+        "/convert", params={"ver_id": "123", "output_format": "xlsx"}
+    )
+
+    assert response.status_code == 200
+    assert 'filename="123.xlsx"' in response.headers["content-disposition"]
+    workbook = load_workbook(BytesIO(response.content))
+    article_sheet = workbook["Article"]
+    assert article_sheet.cell(row=2, column=1).value == "a1"
+    assert article_sheet.cell(row=2, column=2).style == "leropa_wrapped"
+    assert "Article" in article_sheet.tables
+
+
 def test_chat_endpoint(monkeypatch: pytest.MonkeyPatch) -> None:
     """Chat form should display the generated answer."""
 
@@ -290,7 +344,7 @@ def test_documents_admin_page_shows_forms(
 def test_documents_listing_uses_cache(
     monkeypatch: pytest.MonkeyPatch, tmp_path: Path
 ) -> None:
-    """Listing documents should use the metadata cache."""
+    """Listing documents reads each file once, until it changes."""
 
     doc = {
         "document": {
@@ -315,20 +369,19 @@ def test_documents_listing_uses_cache(
 
     calls = {"n": 0}
 
-    from leropa.parser.document_info import DocumentInfo
+    from leropa.web import catalog
 
-    def fake_load(path: Path) -> DocumentInfo:
+    def counting_read(path: Path) -> JSONDict:
         calls["n"] += 1
-        data = yaml.safe_load(path.read_text())
-        return DocumentInfo(**data["document"])
+        return yaml.safe_load(path.read_text())["document"]
 
-    monkeypatch.setattr(
-        "leropa.web.routes.documents.load_document_info", fake_load
-    )
+    monkeypatch.setattr(catalog, "read_document_header", counting_read)
 
     client = _client()
-    response = client.get("/documents")
-    assert response.status_code == 200
+    for _ in range(2):
+        response = client.get("/documents")
+        assert response.status_code == 200
+        assert response.json() == [{"ver_id": "1", "title": "Doc1"}]
     assert calls["n"] == 1
 
 
@@ -0,0 +1,123 @@
+"""Tests for the catalog of stored documents."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from leropa.json_utils import json_dumps
+from leropa.web import catalog
+from leropa.web.catalog import DocumentCatalog
+
+
+def _write(path: Path, title: str, kind: str | None = None) -> None:
+    """Store a minimal document with ``title`` at ``path``."""
+
+    header = {"ver_id": path.stem, "title": title, "kind": kind}
+    path.write_text(json_dumps({"document": header, "articles": []}))
+
+
+def _counting_reads(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    """Record every file the catalog reads."""
+
+    reads: list[Path] = []
+    read_header = catalog.read_document_header
+
+    def counting(path: Path) -> dict:
+        reads.append(path)
+        return read_header(path)
+
+    monkeypatch.setattr(catalog, "read_document_header", counting)
+    return reads
+
+
+def test_entries_hold_header_and_page(tmp_path: Path) -> None:
+    """Entries keep the header values, ordered and paged by identifier."""
+
+    for ver_id in ("10", "9", "100"):
+        _write(tmp_path / f"{ver_id}.json", f"Doc{ver_id}", kind="LEGE")
+    (tmp_path / "notes.txt").write_text("ignored")
+    docs = DocumentCatalog(tmp_path)
+
+    assert [e.ver_id for e in docs.entries()] == ["9", "10", "100"]
+    assert [e.ver_id for e in docs.entries(1, 1)] == ["10"]
+    entry = docs.get("100")
+    assert entry is not None
+    assert (entry.title, entry.kind) == ("Doc100", "LEGE")
+    assert entry.path == tmp_path / "100.json"
+    assert len(docs) == 3
+    assert "missing" not in docs
+
+
+def test_unchanged_files_are_not_read_again(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Only new or changed files are read when the directory changes."""
+
+    _write(tmp_path / "1.json", "Doc1")
+    _write(tmp_path / "2.json", "Doc2")
+    reads = _counting_reads(monkeypatch)
+    docs = DocumentCatalog(tmp_path)
+
+    docs.entries()
+    docs.get("1")
+    assert len(reads) == 2
+
+    _write(tmp_path / "3.json", "Doc3")
+    assert [e.ver_id for e in docs.entries()] == ["1", "2", "3"]
+    assert reads[2:] == [tmp_path / "3.json"]
+
+
+def test_rewritten_and_removed_files_are_noticed(tmp_path: Path) -> None:
+    """Looking up a document checks its file, even in place rewrites."""
+
+    _write(tmp_path / "1.json", "Doc1")
+    docs = DocumentCatalog(tmp_path)
+    assert docs.get("1") is not None
+
+    # Rewriting a file does not change the directory modification time.
+    _write(tmp_path / "1.json", "Renamed document")
+    stat = (tmp_path / "1.json").stat()
+    os.utime(tmp_path / "1.json", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    entry = docs.get("1")
+    assert entry is not None
+    assert entry.title == "Renamed document"
+
+    (tmp_path / "1.json").unlink()
+    assert docs.get("1") is None
+    assert docs.entries() == []
+
+
+def test_json_wins_over_yaml_and_bad_files_are_skipped(
+    tmp_path: Path,
+) -> None:
+    """One file is kept per identifier; unreadable files are left out."""
+
+    (tmp_path / "1.yaml").write_text("document:\n  title: From YAML\n")
+    _write(tmp_path / "1.json", "From JSON")
+    (tmp_path / "2.yaml").write_text("not: a document\n")
+    (tmp_path / "3.json").write_text("{broken")
+    docs = DocumentCatalog(tmp_path)
+
+    assert [e.summary() for e in docs.entries()] == [
+        {"ver_id": "1", "title": "From JSON"}
+    ]
+
+    # Writing the YAML file again does not replace the JSON one.
+    docs.update(tmp_path / "1.yaml")
+    assert docs.path("1") == tmp_path / "1.json"
+
+
+def test_missing_directory_is_empty(tmp_path: Path) -> None:
+    """A directory that does not exist yet has no documents."""
+
+    docs = DocumentCatalog(tmp_path / "missing")
+
+    assert docs.entries() == []
+    (tmp_path / "missing").mkdir()
+    _write(tmp_path / "missing" / "1.json", "Doc1")
+    assert docs.path("1") == tmp_path / "missing" / "1.json"